@@ -56,6 +56,32 @@ hyb_filter -i "${OUT_DIR}/${IN_HYB/.hyb/_evaluated.hyb}" \
            --exclude any_seg_type_is rRNA \
            --exclude_2 any_seg_type_is mitoch-rRNA \
 
+hyb_filter -i "${OUT_DIR}/${IN_HYB/.hyb/_evaluated.hyb}" --verbose \
+           --out_dir "${OUT_DIR}" \
+           --out_suffix "_where" \
+           --where "has_mirna AND NOT (any_seg_type_is rRNA OR any_seg_type_is mitoch-rRNA)"
+
+hyb_index -i "${OUT_DIR}/${IN_HYB/.hyb/_evaluated.hyb}" --verbose
+
+gzip -c "${FULL_IN_HYB}" > "${OUT_DIR}/${IN_HYB}.gz"
+gzip -c "${FULL_IN_VIENNA}" > "${OUT_DIR}/${IN_VIENNA}.gz"
+
+hyb_eval -i "${OUT_DIR}/${IN_HYB}.gz" \
+         -f "${OUT_DIR}/${IN_VIENNA}.gz" \
+         --verbose \
+         --out_dir "${OUT_DIR}" \
+         --eval_types type mirna \
+         --hybformat_id True \
+         --seq_type dynamic
+
+hyb_filter -i "${OUT_DIR}/${IN_HYB/.hyb/_evaluated.hyb}.gz" \
+           -f "${OUT_DIR}/${IN_HYB/.hyb/_evaluated.vienna}.gz" \
+           --verbose \
+           --seq_type dynamic \
+           --out_dir "${OUT_DIR}" \
+           --processes 2 \
+           --exclude any_seg_type_is rRNA
+
 for mode in "energy" "type" "mirna" "target" "fold" "energy type mirna target fold"; do
   hyb_analyze -i "${OUT_DIR}/${IN_HYB/.hyb/_evaluated_filtered.hyb}" --verbose \
               -f "${OUT_DIR}/${IN_HYB/.hyb/_evaluated_filtered.vienna}" \
@@ -67,6 +93,44 @@ for mode in "energy" "type" "mirna" "target" "fold" "energy type mirna target fo
 
 done
 
+# The single-pass pipeline output should match the output of the scripts run in turn.
+if ! [ -d "${OUT_DIR}/pipeline" ]; then
+  mkdir "${OUT_DIR}/pipeline"
+fi
+
+hyb_pipeline -i "${FULL_IN_HYB}" \
+             -f "${FULL_IN_VIENNA}" \
+             --verbose \
+             --out_dir "${OUT_DIR}/pipeline" \
+             --eval_types type mirna \
+             --hybformat_id True \
+             --seq_type dynamic \
+             --set_dataset \
+             --write_evaluated True \
+             --exclude any_seg_type_is rRNA \
+             --exclude_2 any_seg_type_is mitoch-rRNA \
+             --analysis_types energy type mirna target fold \
+             --analysis_name "TEST_FOLD" \
+             --allowed_mismatches 0
+
+for out_file in "${IN_HYB/.hyb/_evaluated.hyb}" \
+                "${IN_HYB/.hyb/_evaluated.vienna}" \
+                "${IN_HYB/.hyb/_evaluated_filtered.hyb}" \
+                "${IN_HYB/.hyb/_evaluated_filtered.vienna}" \
+                "${IN_HYB/.hyb/_evaluated_filtered_multi-analysis_mirna_results.csv}" \
+                "${IN_HYB/.hyb/_evaluated_filtered_multi-analysis_fold_main_results.csv}"; do
+  cmp "${OUT_DIR}/${out_file}" "${OUT_DIR}/pipeline/${out_file}"
+done
+
+hyb_analyze -i "${OUT_DIR}/${IN_HYB/.hyb/_evaluated.hyb}" \
+               "${OUT_DIR}/${IN_HYB/.hyb/_evaluated_filtered.hyb}" \
+            --verbose \
+            --out_dir "${OUT_DIR}" \
+            --analysis_types energy type mirna target \
+            --combined_basename "${OUT_DIR}/test_hybrid_combined" \
+            --processes 2 \
+            --chunk_size 20
+
 set +v
 echo -e "\nDone with Autotests\n"
 
@@ -9,8 +9,12 @@ Automatic testing of hybkit code.
 
 # ruff: noqa: ANN001 ANN201
 
+import array
+import json
 import os
+import pickle
 
+import numpy as np
 import pytest
 
 import hybkit
@@ -346,3 +350,346 @@ def test_analysis_fold(tmp_path):
     hyb_analysis.plot_analysis_results(out_basename=out_special_file_base,
                                        analysis='fold')
     hyb_analysis.plot_analysis_results(out_basename=out_special_file_base)
+
+
+# ----- Test Analysis Merge and State -----
+def test_analysis_merge_state():
+    """Test merging of Analysis objects and analysis state conversion."""
+    analysis_types = ['energy', 'type', 'mirna', 'target', 'fold']
+    hyb_records = []
+    for props in [ART_HYB_VIENNA_PROPS_1, ART_HYB_VIENNA_PROPS_2] * 3:
+        hyb_record = hybkit.HybRecord.from_line(props['hyb_str'])
+        fold_record = hybkit.FoldRecord.from_vienna_string(
+            props['vienna_str'], seq_type='dynamic'
+        )
+        hyb_record.set_fold_record(fold_record)
+        hyb_record.eval_types()
+        hyb_record.eval_mirna()
+        hyb_records.append(hyb_record)
+
+    full_analysis = hybkit.analysis.Analysis(analysis_types, name='test_analysis')
+    full_analysis.add_hyb_records(hyb_records)
+    expected_results = full_analysis.get_all_results()
+
+    merged_analysis = hybkit.analysis.Analysis(analysis_types, name='test_analysis')
+    merged_analysis.add_hyb_records(hyb_records[:1])
+    for chunk_start in [1, 4]:
+        chunk_analysis = hybkit.analysis.Analysis(analysis_types)
+        chunk_analysis.add_hyb_records(hyb_records[chunk_start:(chunk_start + 3)])
+        if chunk_start == 1:
+            merged_analysis.merge(chunk_analysis)
+        else:
+            merged_analysis += chunk_analysis
+    assert merged_analysis.name == 'test_analysis'
+    assert merged_analysis.get_all_results() == expected_results
+    assert merged_analysis.get_analysis_delim_str() == full_analysis.get_analysis_delim_str()
+
+    state = full_analysis.get_state()
+    for state_copy in [json.loads(json.dumps(state)), pickle.loads(pickle.dumps(state))]:
+        restored_analysis = hybkit.analysis.Analysis.from_state(state_copy)
+        assert restored_analysis.get_all_results() == expected_results
+        assert restored_analysis.name == full_analysis.name
+        assert restored_analysis.quant_mode == full_analysis.quant_mode
+
+    with pytest.raises(HybkitArgError):
+        merged_analysis.merge('not_an_analysis')
+    with pytest.raises(HybkitArgError):
+        merged_analysis.merge(hybkit.analysis.Analysis(['energy']))
+    with pytest.raises(HybkitArgError):
+        merged_analysis.merge(hybkit.analysis.Analysis(analysis_types, quant_mode='reads'))
+    bad_state = full_analysis.get_state()
+    del bad_state['data']['fold']
+    with pytest.raises(HybkitArgError):
+        hybkit.analysis.Analysis.from_state(bad_state)
+
+
+# ----- Test Analysis Energy Statistics -----
+@pytest.mark.parametrize('store_energy_vals', [False, True])
+def test_analysis_energy_stats(store_energy_vals):
+    """Test running and exact energy statistics."""
+    energies = [-30.5, -12.25, -12.0, -0.5, -22.75, -8.0, -15.5]
+    hyb_records = [
+        hybkit.HybRecord(id='test_%i' % i, seq='ATCG', energy=str(energy))
+        for i, energy in enumerate(energies)
+    ]
+    old_setting = hybkit.analysis.Analysis.settings['store_energy_vals']
+    try:
+        hybkit.analysis.Analysis.settings['store_energy_vals'] = store_energy_vals
+        energy_analysis = hybkit.analysis.Analysis('energy')
+        energy_analysis.add_hyb_records(hyb_records[:3])
+        other_analysis = hybkit.analysis.Analysis('energy')
+        other_analysis.add_hyb_records(hyb_records[3:])
+        energy_analysis += other_analysis
+        if store_energy_vals:
+            assert list(energy_analysis._energy_vals) == energies
+        else:
+            assert energy_analysis._energy_vals is None
+    finally:
+        hybkit.analysis.Analysis.settings['store_energy_vals'] = old_setting
+
+    energy_results = energy_analysis.get_analysis_results('energy')
+    assert energy_results['energy_min'] == min(energies)
+    assert energy_results['energy_max'] == max(energies)
+    assert energy_results['energy_mean'] == pytest.approx(np.mean(energies), abs=1e-12)
+    assert energy_results['energy_std'] == pytest.approx(np.std(energies), abs=1e-12)
+    assert energy_results['binned_energy_vals'][-12] == 2  # noqa: PLR2004
+    assert sum(energy_results['binned_energy_vals'].values()) == len(energies)
+
+    restored_analysis = hybkit.analysis.Analysis.from_state(energy_analysis.get_state())
+    assert restored_analysis.get_all_results() == energy_analysis.get_all_results()
+    mismatched_analysis = hybkit.analysis.Analysis('energy')
+    mismatched_analysis._energy_vals = None if store_energy_vals else array.array('d')
+    with pytest.raises(HybkitArgError):
+        energy_analysis.merge(mismatched_analysis)
+
+
+# ----- Test Analysis Batch Ingestion -----
+def _get_batch_test_records(with_fold):
+    hyb_records = []
+    if with_fold:
+        all_props = [ART_HYB_VIENNA_PROPS_1, ART_HYB_VIENNA_PROPS_2]
+    else:
+        all_props = ART_HYB_PROPS_ALL
+    for i, props in enumerate(all_props * 4):
+        hyb_record = hybkit.HybRecord.from_line(props['hyb_str'])
+        if with_fold:
+            hyb_record.set_fold_record(hybkit.FoldRecord.from_vienna_string(
+                props['vienna_str'], seq_type='dynamic'
+            ))
+        hyb_record.eval_types()
+        hyb_record.eval_mirna()
+        hyb_record.energy = str(-5.5 * (i % 3) - 0.25 * i)
+        hyb_record.set_flag('read_count', str(i % 5 + 1))
+        hyb_record.set_flag('count_total', str(i % 2 + 1))
+        hyb_records.append(hyb_record)
+    hyb_records[1].energy = None
+    return hyb_records
+
+
+@pytest.mark.parametrize('quant_mode', ['single', 'reads', 'records'])
+@pytest.mark.parametrize('analysis_types', [
+    ['energy', 'type', 'mirna', 'target'],
+    ['fold'],
+])
+def test_analysis_batch(analysis_types, quant_mode):
+    """Test batch ingestion gives results identical to adding records individually."""
+    hyb_records = _get_batch_test_records(with_fold=(analysis_types == ['fold']))
+    record_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode=quant_mode)
+    record_analysis.add_hyb_records(hyb_records)
+    expected_state = record_analysis.get_state()
+
+    batch_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode=quant_mode)
+    batch = batch_analysis.make_batch(hyb_records)
+    assert set(batch) == set(batch_analysis._get_batch_column_names())
+    batch_analysis.add_batch({key: column[:5] for key, column in batch.items()})
+    batch_analysis.add_batch({key: column[5:5] for key, column in batch.items()})
+    batch_analysis.add_batch({key: list(column[5:]) for key, column in batch.items()})
+    assert batch_analysis.get_state() == expected_state
+    assert batch_analysis.get_analysis_delim_str() == record_analysis.get_analysis_delim_str()
+
+    records_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode=quant_mode)
+    records_analysis.add_batch(hyb_records)
+    assert records_analysis.get_state() == expected_state
+
+
+def test_analysis_batch_hybbatch(tmp_path):
+    """Test batch ingestion from HybBatch objects, and errors for invalid batches."""
+    hyb_records = _get_batch_test_records(with_fold=False)
+    hyb_file_name = os.path.join(tmp_path, 'batch_autotest.hyb')
+    with hybkit.HybFile.open(hyb_file_name, 'w') as hyb_file:
+        hyb_file.write_records(hyb_records)
+    analysis_types = ['energy', 'type', 'mirna', 'target']
+    record_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode='reads')
+    batch_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode='reads')
+    with hybkit.HybFile.open(hyb_file_name, 'r') as hyb_file:
+        for hyb_batch in hyb_file.read_batches(batch_size=7):
+            record_analysis.add_hyb_records(hyb_batch)
+            batch_analysis.add_batch(hyb_batch)
+    assert batch_analysis.get_state() == record_analysis.get_state()
+
+    batch = batch_analysis.make_batch(hyb_records)
+    upper_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode='reads')
+    upper_analysis.add_batch({
+        **batch,
+        'mirna_seg': [None if seg is None else seg.upper() for seg in batch['mirna_seg']],
+    })
+    assert upper_analysis.get_state() == record_analysis.get_state()
+    with pytest.raises(HybkitArgError):
+        batch_analysis.add_batch({key: batch[key] for key in list(batch)[1:]})
+    with pytest.raises(HybkitArgError):
+        batch_analysis.add_batch({**batch, 'energy': batch['energy'][1:]})
+    for column_name in ['seg1_type', 'mirna_seg']:
+        with pytest.raises(HybkitError):
+            batch_analysis.add_batch({**batch, column_name: [None] * len(hyb_records)})
+    with pytest.raises(HybkitError):
+        batch_analysis.add_batch({**batch, 'read_count': [-1] * len(hyb_records)})
+    fold_analysis = hybkit.analysis.Analysis('fold')
+    with pytest.raises(HybkitError):
+        fold_analysis.add_batch(hyb_records)
+
+
+# ----- Test Analysis Sketch Memory Mode -----
+@pytest.mark.parametrize('sketch_capacity', [1000, 2])
+def test_analysis_sketch(sketch_capacity, tmp_path):
+    """Test fixed-memory sketch analyses against exact analyses."""
+    hyb_records = _get_batch_test_records(with_fold=False)
+    analysis_types = ['energy', 'target']
+    exact_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode='reads')
+    exact_analysis.add_hyb_records(hyb_records)
+    exact_results = exact_analysis.get_all_results()
+    old_setting = hybkit.analysis.Analysis.settings['sketch_capacity']
+    try:
+        hybkit.analysis.Analysis.settings['sketch_capacity'] = sketch_capacity
+        sketch_analysis = hybkit.analysis.Analysis(
+            analysis_types, quant_mode='reads', memory_mode='sketch'
+        )
+        sketch_analysis.add_hyb_records(hyb_records[:10])
+        other_analysis = hybkit.analysis.Analysis(
+            analysis_types, quant_mode='reads', memory_mode='sketch'
+        )
+        other_analysis.add_batch(hyb_records[10:])
+        sketch_analysis += other_analysis
+    finally:
+        hybkit.analysis.Analysis.settings['sketch_capacity'] = old_setting
+    sketch_results = sketch_analysis.get_all_results()
+
+    for key in exact_analysis._result_keys['energy']:
+        assert sketch_results['energy'][key] == pytest.approx(exact_results['energy'][key])
+    energies = sorted(float(hyb_record.energy) for hyb_record in hyb_records
+                      if hyb_record.energy is not None)
+    for q, energy in sketch_results['energy']['energy_quantiles'].items():
+        rank = np.searchsorted(energies, energy) / len(energies)
+        assert abs(rank - q) <= sketch_results['energy']['energy_quantile_rank_errors'][q] + 0.01
+
+    target_results = sketch_results['target']
+    exact_names = exact_results['target']['target_names']
+    max_error = target_results['target_names_max_error']
+    assert len(target_results['target_names']) <= sketch_capacity
+    for name, count in target_results['target_names'].items():
+        assert exact_names[name] <= count <= exact_names[name] + max_error
+    for name, count in exact_names.items():
+        assert count <= max_error or name in target_results['target_names']
+    if sketch_capacity >= len(exact_names):
+        assert max_error == 0
+        assert target_results['target_names'] == exact_names
+    assert target_results['target_names_distinct'] == pytest.approx(len(exact_names), rel=0.05)
+    assert target_results['target_names_distinct_error'] == pytest.approx(1.04 / 128)
+    assert sketch_analysis.get_specific_result('target_names_max_error') == max_error
+    assert 'target_names_distinct' in sketch_analysis.get_analysis_delim_str('target')
+
+    state = json.loads(json.dumps(sketch_analysis.get_state()))
+    restored_analysis = hybkit.analysis.Analysis.from_state(state)
+    assert restored_analysis.get_all_results() == sketch_results
+    out_files = restored_analysis.write_analysis_results_special(
+        os.path.join(tmp_path, 'sketch_autotest')
+    )
+    assert any(out_file.endswith('_energy_quantiles.csv') for out_file in out_files)
+
+    with pytest.raises(HybkitArgError):
+        sketch_analysis.merge(hybkit.analysis.Analysis(analysis_types, quant_mode='reads'))
+    with pytest.raises(HybkitArgError):
+        exact_analysis.get_specific_result('energy_quantiles')
+    with pytest.raises(HybkitArgError):
+        hybkit.analysis.Analysis(analysis_types, memory_mode='not_a_mode')
+
+
+# ----- Test Grouped Analysis -----
+def _get_seg_types_key(hyb_record):
+    return (hyb_record.flags['seg1_type'], hyb_record.flags['seg2_type'])
+
+
+@pytest.mark.parametrize('group_by', ['seg1_type', 'mirna_ref', 'dataset', _get_seg_types_key])
+def test_grouped_analysis(group_by, tmp_path, monkeypatch):
+    """Test grouped analyses give the results of a separate analysis of each group."""
+    hyb_records = _get_batch_test_records(with_fold=False)
+    analysis_types = ['energy', 'type', 'mirna', 'target']
+    grouped_analysis = hybkit.analysis.GroupedAnalysis(
+        analysis_types, group_by=group_by, quant_mode='reads'
+    )
+    grouped_analysis.add_hyb_records(hyb_records)
+
+    get_key = grouped_analysis._get_key
+    expected_states = {}
+    for key in dict.fromkeys(get_key(hyb_record) for hyb_record in hyb_records):
+        group_analysis = hybkit.analysis.Analysis(analysis_types, quant_mode='reads')
+        group_analysis.add_hyb_records(
+            [hyb_record for hyb_record in hyb_records if get_key(hyb_record) == key]
+        )
+        expected_states[key] = group_analysis.get_state()
+    assert len(grouped_analysis) == len(expected_states)
+    assert list(grouped_analysis.groups) == list(expected_states)
+    assert {
+        key: group_analysis.get_state() for key, group_analysis in grouped_analysis.groups.items()
+    } == expected_states
+    if group_by == 'mirna_ref':
+        assert None in grouped_analysis.groups
+
+    monkeypatch.setattr(hybkit.analysis.GroupedAnalysis, '_min_batch_group_size', 3)
+    batch_analysis = hybkit.analysis.GroupedAnalysis(
+        analysis_types, group_by=group_by, quant_mode='reads'
+    )
+    batch_analysis.add_batch(hyb_records[:7])
+    columns = hybkit.analysis.Analysis(analysis_types, quant_mode='reads').make_batch(
+        hyb_records[7:]
+    )
+    keys = [get_key(hyb_record) for hyb_record in hyb_records[7:]]
+    batch_analysis.add_batch(columns, keys=keys)
+    assert batch_analysis.get_state() == grouped_analysis.get_state()
+
+    merged_analysis = hybkit.analysis.GroupedAnalysis(
+        analysis_types, group_by=group_by, quant_mode='reads'
+    )
+    other_analysis = hybkit.analysis.GroupedAnalysis(
+        analysis_types, group_by=group_by, quant_mode='reads'
+    )
+    merged_analysis.add_hyb_records(hyb_records[:9])
+    other_analysis.add_hyb_records(hyb_records[9:])
+    merged_analysis += other_analysis
+    # Merged running energy statistics may differ in floating-point rounding.
+    assert merged_analysis.get_grouped_delim_str() == grouped_analysis.get_grouped_delim_str()
+
+    state = json.loads(json.dumps(grouped_analysis.get_state()))
+    restore_group_by = None if isinstance(group_by, str) else group_by
+    restored_analysis = hybkit.analysis.GroupedAnalysis.from_state(state, restore_group_by)
+    assert restored_analysis.get_state() == grouped_analysis.get_state()
+
+    out_file_name = os.path.join(tmp_path, 'grouped_autotest.csv')
+    grouped_analysis.write_grouped_delim_str(out_file_name)
+    with open(out_file_name) as out_file:
+        table_lines = out_file.read().splitlines()
+    assert table_lines[0] == ','.join(hybkit.analysis.GroupedAnalysis.table_columns)
+    num_rows = 0
+    for key, group_analysis in grouped_analysis.groups.items():
+        group_rows = group_analysis.get_analysis_delim_str().splitlines()
+        num_rows += len(group_rows)
+        label = grouped_analysis._get_group_label(key)
+        assert label + ',energy,has_energy_val,,' in '\n'.join(table_lines)
+    assert len(table_lines) == num_rows + 1
+    assert all(len(line.split(',')) == 5 for line in table_lines)  # noqa: PLR2004
+
+
+def test_grouped_analysis_problems():
+    """Test errors for invalid grouped analysis arguments."""
+    hyb_records = _get_batch_test_records(with_fold=False)
+    for bad_group_by in ['', 5, None]:
+        with pytest.raises(HybkitArgError):
+            hybkit.analysis.GroupedAnalysis('energy', group_by=bad_group_by)
+    with pytest.raises(HybkitArgError):
+        hybkit.analysis.GroupedAnalysis('not_an_analysis', group_by='dataset')
+    grouped_analysis = hybkit.analysis.GroupedAnalysis('energy', group_by=_get_seg_types_key)
+    columns = hybkit.analysis.Analysis('energy').make_batch(hyb_records)
+    with pytest.raises(HybkitArgError):
+        grouped_analysis.add_batch(columns)
+    with pytest.raises(HybkitArgError):
+        grouped_analysis.add_batch(hyb_records, keys=['a'])
+    with pytest.raises(HybkitArgError):
+        grouped_analysis.merge(hybkit.analysis.GroupedAnalysis('energy', group_by='dataset'))
+    with pytest.raises(HybkitArgError):
+        grouped_analysis.merge(hybkit.analysis.Analysis('energy'))
+    with pytest.raises(HybkitArgError):
+        hybkit.analysis.GroupedAnalysis.from_state(grouped_analysis.get_state())
+    unevaluated_record = hybkit.HybRecord.from_line(ART_HYB_PROPS_ALL[0]['hyb_str'])
+    with pytest.raises(HybkitError):
+        hybkit.analysis.GroupedAnalysis('energy', group_by='mirna_ref').add_hyb_record(
+            unevaluated_record
+        )
@@ -9,9 +9,13 @@ Automatic testing of hybkit CtFile Class.
 
 # ruff: noqa: ANN001 ANN201
 
+import io
+
 # from contextlib import nullcontext as does_not_raise
 # import pytest
-# import hybkit
+import hybkit
+from auto_tests.test_helper_data import ART_HYB_VIENNA_PROPS_1
+
 # from auto_tests.test_helper_data import ART_HYB_Ct_PROPS_1, ART_HYB_Ct_PROPS_2
 # from auto_tests.test_helper_functions import ()
 
@@ -57,3 +61,47 @@ Automatic testing of hybkit CtFile Class.
 #             Ct_autotest_file.write_records([Ct_record, Ct_record])
 #             Ct_autotest_file.write_record(Ct_record)
 #             Ct_autotest_file.write_fh(Ct_str)
+
+
+# ----- Start CtFile Test Reading of Ct Records -----
+def _vienna_props_to_ct_str(test_props):
+    name, seq, fold_line = test_props['vienna_str'].strip().split('\n')
+    fold, energy = fold_line.split('\t')
+    energy = energy.strip('()')
+    pair_indexes = [0] * len(seq)
+    open_indexes = []
+    for index, char in enumerate(fold, start=1):
+        if char == '(':
+            open_indexes.append(index)
+        elif char == ')':
+            open_index = open_indexes.pop()
+            pair_indexes[open_index - 1] = index
+            pair_indexes[index - 1] = open_index
+    ct_str = '%i\tdG = %s\tdH = %s\t%s\n' % (len(seq), energy, energy, name.lstrip('>'))
+    for index, (base, pair_index) in enumerate(zip(seq, pair_indexes), start=1):
+        next_index = index + 1 if index < len(seq) else 0
+        ct_str += '%i\t%s\t%i\t%i\t%i\t%i\n' % (
+            index, base, index - 1, next_index, pair_index, index
+        )
+    return ct_str
+
+
+def test_ctfile_hybfolditer():
+    """Test reading CtFile records and iterating paired with a HybFile."""
+    test_props = ART_HYB_VIENNA_PROPS_1
+    ct_str = _vienna_props_to_ct_str(test_props)
+    expected_record = hybkit.FoldRecord.from_vienna_string(test_props['vienna_str'])
+
+    ct_file = hybkit.CtFile(io.StringIO(ct_str), from_file_like=True)
+    fold_record = ct_file.read_record(override_error_mode='raise')
+    assert fold_record.seq == expected_record.seq
+    assert fold_record.fold == expected_record.fold
+    assert fold_record.energy == expected_record.energy
+
+    hyb_file = hybkit.HybFile(io.StringIO(test_props['hyb_str'] * 2), from_file_like=True)
+    ct_file = hybkit.CtFile(io.StringIO(ct_str * 2), from_file_like=True)
+    hyb_fold_iter = hybkit.HybFoldIter(hyb_file, ct_file, combine=True)
+    hyb_records = list(hyb_fold_iter)
+    assert len(hyb_records) == 2
+    assert all(hyb_record.fold_record.fold == expected_record.fold for hyb_record in hyb_records)
+    assert hyb_fold_iter.counters['pair_skips'] == 0
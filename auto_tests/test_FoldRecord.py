@@ -36,7 +36,7 @@ from auto_tests.test_helper_functions import (
     get_expected_result_context,
     get_expected_result_string,
 )
-from hybkit.errors import HybkitConstructorError
+from hybkit.errors import HybkitArgError, HybkitConstructorError
 
 # ----- Linting Directives:
 # ruff: noqa: SLF001 ARG001
@@ -240,6 +240,51 @@ def test_foldrecord_vienna_io_warnings(test_name, test_kws):
     """Test FoldRecord reading vienna-format records with allowed errors."""
     hybkit.FoldRecord.from_vienna_lines(**test_kws)
 
+# ----- FoldRecord test sequence mismatch counting. -----
+MISMATCH_SEQ_PAIRS = [
+    ('ACGT', 'ACGT'),
+    ('ACGT', 'AGGA'),
+    ('ACGTAA', 'ACG'),
+    ('AC', 'ACGTTT'),
+    ('ACGU', 'ACGT'),
+    ('ACGÜ', 'ACGU'),
+    ('ÅCGT', 'ÅCG'),
+]
+
+
+def _loop_seq_mismatch_string(seq1, seq2):
+    match_str = ''
+    for i in range(max([len(seq1), len(seq2)])):
+        if seq1[i:(i + 1)] == seq2[i:(i + 1)]:
+            match_str += '|'
+        else:
+            match_str += '.'
+    return match_str, match_str.count('.')
+
+
+@pytest.mark.parametrize(('seq1', 'seq2'), MISMATCH_SEQ_PAIRS)
+def test_foldrecord_seq_mismatches(seq1, seq2):
+    """Test mismatch counts and strings match a position-by-position comparison."""
+    match_str, mismatch_count = _loop_seq_mismatch_string(seq1, seq2)
+    hyb_record = hybkit.HybRecord('test_id', seq1)
+    fold_record = hybkit.FoldRecord('test_id', seq2, '.' * len(seq2), -1.0)
+    assert fold_record.static_count_hyb_record_mismatches(hyb_record) == mismatch_count
+    assert fold_record._get_seq_mismatch_string(seq1, seq2) == (match_str, mismatch_count)
+    assert fold_record._get_seq_mismatch_string(seq2, seq1) == (match_str, mismatch_count)
+
+
+def test_foldrecord_batch_seq_mismatches():
+    """Test counting mismatches for many sequence pairs at once."""
+    seqs_1, seqs_2 = zip(*MISMATCH_SEQ_PAIRS)
+    expected = [_loop_seq_mismatch_string(*seq_pair)[1] for seq_pair in MISMATCH_SEQ_PAIRS]
+    assert hybkit.FoldRecord.batch_count_seq_mismatches(seqs_1, seqs_2).tolist() == expected
+    assert hybkit.FoldRecord.batch_count_seq_mismatches(
+        seqs_1[:4], seqs_2[:4]).tolist() == expected[:4]
+    assert hybkit.FoldRecord.batch_count_seq_mismatches([], []).tolist() == []
+    with pytest.raises(HybkitArgError):
+        hybkit.FoldRecord.batch_count_seq_mismatches(seqs_1, seqs_2[1:])
+
+
 # ----- Begin CT-format FoldRecord tests -----
 # TODO: Implement CT format tests
 # # ----- FoldRecord test reading/writing of ct-format records. -----
@@ -10,10 +10,12 @@ Automatic testing of the hybkit HybRecord class.
 # ruff: noqa: ANN001 ANN201
 
 # import copy
+import io
 import os
 
 # import sys
 # from contextlib import nullcontext as does_not_raise
+import numpy as np
 import pytest
 
 import hybkit
@@ -21,9 +23,10 @@ from auto_tests.test_helper_data import (
     ART_BAD_HYB_STRS,
     ART_HYB_PROPS_1,
     ART_HYB_PROPS_ALL,
+    TEST_HYB_MINIMAL_STRING,
 )
 from auto_tests.test_helper_functions import get_expected_result_context
-from hybkit.errors import HybkitMiscError
+from hybkit.errors import HybkitArgError, HybkitConstructorError, HybkitMiscError
 
 # ----- Linting Directives:
 # ruff: noqa: SLF001 ARG001
@@ -74,7 +77,233 @@ def test_hybfile_io(test_name, expectation, hyb_strs, tmp_path):
         with hybkit.HybFile.open(hyb_autotest_file_name, 'r') as hyb_autotest_file:
             all_records = hyb_autotest_file.read_records()
         assert first_record == all_records[0]
+        with hybkit.HybFile.open(hyb_autotest_file_name, 'r', compact=True) as hyb_autotest_file:
+            compact_records = hyb_autotest_file.read_records()
+        assert all(isinstance(record, hybkit.CompactHybRecord) for record in compact_records)
+        assert ([record.to_line() for record in compact_records]
+                == [record.to_line() for record in all_records])
+        with hybkit.HybFile.open(hyb_autotest_file_name, 'r', lazy=True) as hyb_autotest_file:
+            lazy_records = hyb_autotest_file.read_records()
+        assert all(isinstance(record, hybkit.LazyHybRecord) for record in lazy_records)
+        assert ''.join(record.to_line() for record in lazy_records) == all_hyb_strs
+        with pytest.raises(HybkitArgError):
+            hybkit.HybFile(hyb_autotest_file_name, 'r', compact=True, lazy=True)
         with hybkit.HybFile(hyb_autotest_file_name, 'w') as hyb_autotest_file:
             hyb_autotest_file.write_records(write_records=[hyb_record, hyb_record])
             hyb_autotest_file.write_record(write_record=hyb_record)
             hyb_autotest_file.write_fh(all_hyb_strs)
+
+
+# ----- HybFile test writing of unmodified records as source lines. -----
+@pytest.mark.parametrize('write_source_lines', [True, False])
+def test_hybfile_write_source_lines(write_source_lines):
+    """Test writing unmodified records as their original lines."""
+    # Flags out of hybkit-specification order are reordered when records are re-formatted.
+    hyb_str = ART_HYB_PROPS_1['hyb_str'].replace('dataset=artificial', 'dataset=test;read_count=2')
+    hyb_record = hybkit.HybRecord.from_line(hyb_str)
+    reformatted_str = hyb_record.to_line()
+    assert reformatted_str != hyb_str
+
+    out_hyb = hybkit.HybFile(
+        io.StringIO(), from_file_like=True, write_source_lines=write_source_lines
+    )
+    out_hyb.write_record(hyb_record)
+    lazy_record = hybkit.LazyHybRecord.from_line(hyb_str)
+    lazy_record.seg1_props  # noqa: B018
+    out_hyb.write_record(lazy_record)
+    hyb_record.set_flag('dataset', 'test_2')
+    out_hyb.write_record(hyb_record)
+    out_lines = out_hyb.fh.getvalue().splitlines(keepends=True)
+    if write_source_lines:
+        assert out_lines[:2] == [hyb_str, hyb_str]
+    else:
+        assert out_lines[0] == reformatted_str
+    assert out_lines[2] == hyb_record.to_line()
+    assert not hybkit.HybFile(io.StringIO(), from_file_like=True).write_source_lines
+
+
+# ----- RecordWriter test buffered writing of hyb records. -----
+class _CountingStringIO(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.write_count = 0
+
+    def write(self, write_str):
+        self.write_count += 1
+        return super().write(write_str)
+
+
+@pytest.mark.parametrize(('buffer_size', 'flush_records', 'expected_writes'), [
+    (None, None, 1), (1, None, 10), (None, 3, 4), (250, None, None),
+])
+def test_record_writer(buffer_size, flush_records, expected_writes):
+    """Test buffered writing of hyb records matches writing each record."""
+    hyb_records = [hybkit.HybRecord.from_line(props['hyb_str']) for props in ART_HYB_PROPS_ALL]
+    hyb_records = (hyb_records * 3)[:10]
+    hyb_records[0].set_flag('dataset', 'modified')
+    expected_hyb = hybkit.HybFile(io.StringIO(), from_file_like=True)
+    for hyb_record in hyb_records:
+        expected_hyb.write_record(hyb_record)
+    expected_str = expected_hyb.fh.getvalue()
+
+    out_hyb = hybkit.HybFile(_CountingStringIO(), from_file_like=True)
+    with hybkit.RecordWriter(
+            out_hyb, buffer_size=buffer_size, flush_records=flush_records, close_file=False
+            ) as writer:
+        writer.write_record(hyb_records[0])
+        writer.write_records(hyb_records[1:])
+        assert writer.record_count == len(hyb_records)
+    assert out_hyb.fh.getvalue() == expected_str
+    if expected_writes is not None:
+        assert out_hyb.fh.write_count == expected_writes
+    else:
+        assert 1 < out_hyb.fh.write_count < len(hyb_records)
+
+    out_hyb = hybkit.HybFile(io.StringIO(), from_file_like=True)
+    out_hyb.write_records(hyb_records)
+    assert out_hyb.fh.getvalue() == expected_str
+
+
+def test_record_writer_misc(tmp_path):
+    """Test RecordWriter file handling and errors."""
+    hyb_file_name = os.path.join(tmp_path, 'record_writer.hyb')
+    hyb_record = hybkit.HybRecord.from_line(ART_HYB_PROPS_1['hyb_str'])
+    with hybkit.RecordWriter.open(hyb_file_name, 'w') as writer:
+        writer.write_record(hyb_record)
+        writer.write_fh('# Comment\n')
+        writer.flush()
+        assert os.path.getsize(hyb_file_name) == 0 or writer.out_file.fh.tell()
+    assert writer.out_file.fh.closed
+    with open(hyb_file_name) as hyb_file:
+        assert hyb_file.read() == ART_HYB_PROPS_1['hyb_str'] + '# Comment\n'
+
+    with pytest.raises(HybkitArgError):
+        hybkit.RecordWriter(io.StringIO())
+    with pytest.raises(HybkitArgError):
+        hybkit.RecordWriter(hybkit.HybFile(io.StringIO(), from_file_like=True), buffer_size=0)
+    writer = hybkit.RecordWriter(hybkit.HybFile(io.StringIO(), from_file_like=True))
+    with pytest.raises(HybkitMiscError):
+        writer.write_record('not_a_record')
+
+
+# ----- HybFile test reading of columnar record batches. -----
+@pytest.mark.parametrize('batch_size', [1, 3, 100])
+def test_hybfile_read_batches(batch_size, tmp_path):
+    """Test reading hyb records as columnar batches."""
+    hyb_autotest_file_name = os.path.join(tmp_path, 'hyb_autotest_file.hyb')
+    hyb_strs = [props['hyb_str'] for props in ART_HYB_PROPS_ALL]
+    with open(hyb_autotest_file_name, mode='w') as hyb_autotest_file:
+        hyb_autotest_file.write(''.join(hyb_strs))
+
+    with hybkit.HybFile.open(hyb_autotest_file_name, 'r') as hyb_autotest_file:
+        expected_records = hyb_autotest_file.read_records()
+
+    with hybkit.HybFile.open(hyb_autotest_file_name, 'r') as hyb_autotest_file:
+        batches = list(hyb_autotest_file.read_batches(batch_size=batch_size))
+
+    assert all(len(batch) <= batch_size for batch in batches)
+    batch_records = [record for batch in batches for record in batch]
+    assert len(batch_records) == len(expected_records)
+    for batch_record, expected_record in zip(batch_records, expected_records):
+        assert batch_record.to_line() == expected_record.to_line()
+        assert batch_record.seg1_props == expected_record.seg1_props
+        assert batch_record.seg2_props == expected_record.seg2_props
+        assert batch_record.flags == expected_record.flags
+
+    first_batch = batches[0]
+    assert first_batch.columns['seg1_read_start'].dtype == np.int64
+    assert first_batch.columns['energy'].dtype == np.float64
+    assert first_batch.columns['id'][0] == expected_records[0].id
+    assert first_batch[0].id == expected_records[0].id
+    assert list(first_batch.get_flag_column('seg1_type')) == [
+        record.flags.get('seg1_type') for record in expected_records[:len(first_batch)]
+    ]
+
+
+def test_hybfile_read_batches_missing_values():
+    """Test batch placeholders for missing values and errors for bad lines."""
+    batch = hybkit.HybBatch.from_lines([TEST_HYB_MINIMAL_STRING])
+    assert batch.columns['seg1_read_start'][0] == hybkit.HybBatch.MISSING_INT
+    assert np.isnan(batch.columns['energy'][0])
+    assert batch[0].seg1_props['read_start'] is None
+    assert batch.to_records()[0].energy is None
+    for bad_hyb_str in ART_BAD_HYB_STRS:
+        with pytest.raises(HybkitConstructorError):
+            hybkit.HybBatch.from_lines([bad_hyb_str])
+    with pytest.raises(HybkitArgError):
+        next(hybkit.HybFile(io.StringIO(''), from_file_like=True).read_batches(batch_size=0))
+
+
+# ----- MappedHybFile test random access to records. -----
+@pytest.mark.parametrize('final_newline', [True, False])
+@pytest.mark.parametrize('record_option', [{}, {'compact': True}, {'lazy': True}])
+def test_mapped_hybfile(record_option, final_newline, tmp_path):
+    """Test indexing, slicing, sampling, and sharding of memory-mapped hyb files."""
+    hyb_autotest_file_name = os.path.join(tmp_path, 'hyb_autotest_file.hyb')
+    hyb_strs = [props['hyb_str'] for props in ART_HYB_PROPS_ALL]
+    hyb_text = ''.join(hyb_strs)
+    if not final_newline:
+        hyb_text = hyb_text.rstrip('\n')
+    with open(hyb_autotest_file_name, mode='w') as hyb_autotest_file:
+        hyb_autotest_file.write(hyb_text)
+
+    with hybkit.HybFile.open(hyb_autotest_file_name, 'r', hybformat_id=True) as hyb_file:
+        expected_records = hyb_file.read_records()
+    num_records = len(expected_records)
+
+    offsets_file_name = os.path.join(tmp_path, 'hyb_autotest_file.npz')
+    with hybkit.MappedHybFile(
+            hyb_autotest_file_name, hybformat_id=True, offsets_file=offsets_file_name,
+            **record_option) as mapped_file:
+        assert len(mapped_file) == num_records
+        assert mapped_file[0] == expected_records[0]
+        assert mapped_file[-1] == expected_records[-1]
+        assert mapped_file[2:5] == expected_records[2:5]
+        assert mapped_file[::-3] == expected_records[::-3]
+        assert mapped_file[100:] == []
+        assert list(mapped_file) == expected_records
+        assert isinstance(mapped_file[1], mapped_file.record_class)
+        with pytest.raises(IndexError):
+            mapped_file[num_records]
+
+        sample_records = mapped_file.sample(3, seed=0)
+        assert len(sample_records) == 3
+        assert all(record in expected_records for record in sample_records)
+        assert mapped_file.sample(3, seed=0) == sample_records
+        assert len(mapped_file.sample(num_records + 5)) == num_records
+
+        for byte_ranges in (mapped_file.byte_ranges(num_shards=3),
+                            mapped_file.byte_ranges(shard_records=2)):
+            shard_lines = [line for byte_range in byte_ranges
+                           for line in hybkit.parallel.read_byte_range(byte_range)]
+            assert ''.join(shard_lines) == hyb_text
+        assert len(mapped_file.byte_ranges(num_shards=3)) == 3
+        assert len(mapped_file.byte_ranges(num_shards=(num_records + 5))) == num_records
+        offsets = mapped_file.offsets
+
+    # Saved offsets are reloaded, and rebuilt if the file is changed.
+    with hybkit.MappedHybFile(hyb_autotest_file_name, offsets_file=offsets_file_name) as mapped:
+        assert mapped.offsets.tolist() == offsets.tolist()
+    with open(hyb_autotest_file_name, mode='a') as hyb_autotest_file:
+        hyb_autotest_file.write(('' if final_newline else '\n') + hyb_strs[0])
+    with hybkit.MappedHybFile(hyb_autotest_file_name, offsets_file=offsets_file_name) as mapped:
+        assert len(mapped) == num_records + 1
+
+
+def test_mapped_hybfile_misc(tmp_path):
+    """Test empty files and disallowed options of memory-mapped hyb files."""
+    hyb_autotest_file_name = os.path.join(tmp_path, 'hyb_autotest_file.hyb')
+    with open(hyb_autotest_file_name, mode='w'):
+        pass
+    with hybkit.MappedHybFile(hyb_autotest_file_name) as mapped_file:
+        assert len(mapped_file) == 0
+        assert list(mapped_file) == []
+        assert mapped_file.byte_ranges(num_shards=2) == []
+        with pytest.raises(HybkitArgError):
+            mapped_file.byte_ranges()
+        with pytest.raises(HybkitArgError):
+            mapped_file.byte_ranges(shard_records=0)
+    with pytest.raises(HybkitArgError):
+        hybkit.MappedHybFile(hyb_autotest_file_name, compact=True, lazy=True)
+    with pytest.raises(HybkitArgError):
+        hybkit.MappedHybFile(hyb_autotest_file_name + '.gz')
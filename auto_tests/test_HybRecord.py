@@ -10,8 +10,12 @@ Automatic testing of the hybkit HybRecord class.
 # ruff: noqa: ANN001 ANN201
 
 import copy
+import io
+import tracemalloc
 
 import pytest
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
 
 import hybkit
 from auto_tests.test_helper_data import (
@@ -19,6 +23,7 @@ from auto_tests.test_helper_data import (
     ART_HYB_PROPS_2,
     ART_HYB_PROPS_3,
     ART_HYB_PROPS_4,
+    ART_HYB_PROPS_ALL,
     ART_HYB_STR_PROPS,
     EMPTY_SEG_PROPS,
     ENERGY_ALLOWED_TYPES,
@@ -197,6 +202,91 @@ def test_hybrecord_methods_misc():
         test_record.set_flag('BadFlag', 'BadVal')
 
 
+# ----- HybRecord Constructor Tests - Parsed / Fast-Path Construction -----
+@pytest.mark.parametrize('test_params', [ART_HYB_PROPS_1, ART_HYB_PROPS_2, ART_HYB_PROPS_3])
+def test_hybrecord_constructor_parsed(test_params):
+    """Test fast-path record construction matches the full constructor."""
+    line_record = hybkit.HybRecord.from_line(test_params['hyb_str'])
+    init_record = hybkit.HybRecord(
+        line_record.id,
+        line_record.seq,
+        line_record.energy,
+        line_record.seg1_props,
+        line_record.seg2_props,
+        line_record.flags,
+    )
+    assert line_record.to_line() == init_record.to_line()
+    assert line_record.seg1_props == init_record.seg1_props
+    assert line_record.flags == init_record.flags
+    assert isinstance(line_record.seg1_props['read_start'], int)
+
+    seg1_seq = test_params['hyb_str'].split('\t')[1][:FIVE_I]
+    seg2_seq = test_params['hyb_str'].split('\t')[1][FIVE_I:TEN_I]
+    seg1_record = SeqRecord(Seq(seg1_seq), id='seg1_id', description='seg1_desc')
+    seg2_record = SeqRecord(Seq(seg2_seq), id='seg2_id', description='seg2_desc')
+    fasta_record = hybkit.HybRecord.from_fasta_records(seg1_record, seg2_record)
+    assert fasta_record.seq == seg1_seq + seg2_seq
+    assert fasta_record.id == 'seg1_id--seg2_id'
+    assert fasta_record.seg2_props['read_start'] == FIVE_I + 1
+    assert fasta_record.flags == {'seg1_det': 'seg1_desc', 'seg2_det': 'seg2_desc'}
+    with pytest.raises(HybkitMiscError):
+        hybkit.HybRecord.from_fasta_records(seg1_record, seg2_record, flags={'badflag': '1'})
+
+
+# ----- HybRecord Source Line Tests -----
+@pytest.mark.parametrize('test_params', [ART_HYB_PROPS_1, ART_HYB_PROPS_2, ART_HYB_PROPS_3])
+def test_hybrecord_source_line(test_params):
+    """Test detection of changes to records since being read from a line."""
+    hyb_str = test_params['hyb_str']
+    assert not hybkit.HybRecord.from_line(hyb_str).is_modified()
+    assert hybkit.HybRecord.from_line(hyb_str, hybformat_id=True).is_modified()
+    assert hybkit.HybRecord('1_100', 'ACTG').is_modified()
+    assert copy.deepcopy(hybkit.HybRecord.from_line(hyb_str))._source_line == hyb_str.strip()
+    compact_record = hybkit.CompactHybRecord.from_line(hyb_str)
+    assert compact_record.is_modified()
+    assert compact_record._source_line is None
+
+    def set_id(record):
+        record.id = 'New_ID'
+
+    def set_seg_props(record):
+        record.seg1_props['ref_start'] = 0
+
+    def set_flags(record):
+        record.flags['dataset'] = 'test'
+
+    def set_flag(record):
+        record.set_flag('dataset', 'test')
+
+    def set_energy(record):
+        record.energy = '-99.0'
+
+    def set_ref_name(record):
+        record.seg1_props['ref_name'] = 'New_Ref'
+
+    # Direct changes to attributes are detected by comparison to the values read.
+    for modify in (set_id, set_energy, set_seg_props, set_ref_name, set_flags):
+        hyb_record = hybkit.HybRecord.from_line(hyb_str)
+        modify(hyb_record)
+        assert hyb_record.is_modified()
+        out_hyb = hybkit.HybFile(io.StringIO(), from_file_like=True, write_source_lines=True)
+        out_hyb.write_record(hyb_record)
+        assert out_hyb.fh.getvalue() == hyb_record.to_line()
+
+    hyb_record = hybkit.HybRecord.from_line(hyb_str)
+    hyb_record.mark_modified()
+    assert hyb_record.is_modified()
+
+    def eval_mirna(record):
+        record.eval_types()
+        record.eval_mirna()
+
+    for modify in (set_flag, hybkit.HybRecord.eval_types, eval_mirna):
+        hyb_record = hybkit.HybRecord.from_line(hyb_str)
+        modify(hyb_record)
+        assert hyb_record.is_modified()
+
+
 # ----- HybRecord Constructor Failure Tests -----
 default_params = [
     TEST_HYB_ID_STR, TEST_SEQ_STR, TEST_ENERGY_STR, TEST_SEG_PROPS_STR,
@@ -640,3 +730,111 @@ def test_hybrecord_misc_private():
             == ['dataset', 'read_count', 'seg1_type', 'seg2_type', 'badflag'])
     test_record._flagset = None
     test_record._make_flags_dict({})
+
+
+# ----- CompactHybRecord Tests -----
+@pytest.mark.parametrize('test_params', ART_HYB_PROPS_ALL)
+def test_compact_hybrecord(test_params):
+    """Test CompactHybRecord matches HybRecord behavior."""
+    compact_record = hybkit.CompactHybRecord.from_line(
+        test_params['hyb_str'], hybformat_id=True
+    )
+    hyb_record = hybkit.HybRecord.from_line(test_params['hyb_str'], hybformat_id=True)
+    assert isinstance(compact_record, hybkit.HybRecord)
+    assert compact_record.to_line() == hyb_record.to_line()
+    assert compact_record.seg1_props == hyb_record.seg1_props
+    assert hyb_record.seg2_props == compact_record.seg2_props
+    assert dict(compact_record.seg1_props) == hyb_record.seg1_props
+    assert copy.deepcopy(compact_record.seg1_props) == hyb_record.seg1_props
+    assert copy.deepcopy(compact_record).to_line() == hyb_record.to_line()
+    assert compact_record.to_record().to_line() == hyb_record.to_line()
+    assert hybkit.CompactHybRecord.from_record(hyb_record).to_line() == hyb_record.to_line()
+    compact_record.eval_types()
+    compact_record.eval_mirna()
+    assert compact_record.is_modified()
+    assert not vars(compact_record)
+    for argset in test_params['true_prop_argsets']:
+        assert compact_record.prop(*argset)
+
+    compact_record.seg1_props['ref_name'] = 'New_Ref'
+    assert compact_record.seg1_props['ref_name'] == 'New_Ref'
+    assert compact_record.to_line().split('\t')[3] == 'New_Ref'
+    with pytest.raises(HybkitMiscError):
+        compact_record.seg1_props['bad_key'] = 'bad_val'
+    with pytest.raises(HybkitMiscError):
+        del compact_record.seg1_props['ref_name']
+    with pytest.raises(HybkitConstructorError):
+        compact_record.seg2_props = {'bad_key': 'bad_val'}
+
+
+def test_compact_hybrecord_memory():
+    """Test CompactHybRecord uses less memory than HybRecord."""
+    hyb_strs = [ART_HYB_PROPS_1['hyb_str'].replace('1_1000', '1_%i' % i, 1) for i in range(500)]
+    record_bytes = {}
+    for record_class in (hybkit.HybRecord, hybkit.CompactHybRecord):
+        tracemalloc.start()
+        records = [record_class.from_line(hyb_str) for hyb_str in hyb_strs]
+        record_bytes[record_class], _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del records
+    assert record_bytes[hybkit.CompactHybRecord] < record_bytes[hybkit.HybRecord]
+
+
+# ----- LazyHybRecord Tests -----
+@pytest.mark.parametrize('hybformat_id', [True, False])
+@pytest.mark.parametrize('test_params', ART_HYB_PROPS_ALL)
+def test_lazy_hybrecord(test_params, hybformat_id):
+    """Test LazyHybRecord matches HybRecord behavior and writes unmodified lines as read."""
+    hyb_str = test_params['hyb_str']
+    hyb_record = hybkit.HybRecord.from_line(hyb_str, hybformat_id=hybformat_id)
+    lazy_record = hybkit.LazyHybRecord.from_line(hyb_str, hybformat_id=hybformat_id)
+    assert isinstance(lazy_record, hybkit.HybRecord)
+    assert 'seg1_props' not in vars(lazy_record)
+    assert lazy_record.id == hyb_record.id
+    assert 'seg1_props' not in vars(lazy_record)
+    for attr in ('seq', 'energy', 'seg1_props', 'seg2_props', 'flags'):
+        assert getattr(lazy_record, attr) == getattr(hyb_record, attr)
+    with pytest.raises(AttributeError):
+        lazy_record.not_an_attribute  # noqa: B018
+
+    # Flags added from the record id with "hybformat_id" are a modification of the line.
+    assert lazy_record.is_modified() == hybformat_id
+    if not hybformat_id:
+        assert lazy_record.to_line() == hyb_str
+        assert lazy_record.to_line(newline=False) == hyb_str.rstrip('\n')
+        assert copy.deepcopy(lazy_record).to_line() == hyb_str
+    assert lazy_record.to_line(sep=',') == hyb_record.to_line(sep=',')
+
+    lazy_record.eval_types()
+    lazy_record.eval_mirna()
+    hyb_record.eval_types()
+    hyb_record.eval_mirna()
+    assert lazy_record.to_line() == hyb_record.to_line()
+    for argset in test_params['true_prop_argsets']:
+        assert lazy_record.prop(*argset)
+
+    for modify in ('attr', 'seg_props', 'flags'):
+        lazy_record = hybkit.LazyHybRecord.from_line(hyb_str)
+        if modify == 'attr':
+            lazy_record.id = 'New_ID'
+        elif modify == 'seg_props':
+            lazy_record.seg1_props['ref_name'] = 'New_Ref'
+        else:
+            lazy_record.set_flag('dataset', 'New_Dataset')
+        assert lazy_record.is_modified()
+        assert lazy_record.to_line() != hyb_str
+
+
+def test_lazy_hybrecord_errors():
+    """Test LazyHybRecord errors for invalid lines."""
+    hyb_items = ART_HYB_PROPS_1['hyb_str'].split('\t')
+    with pytest.raises(HybkitConstructorError):
+        hybkit.LazyHybRecord.from_line('\t'.join(hyb_items[:10]))
+    hyb_items[4] = 'X'
+    lazy_record = hybkit.LazyHybRecord.from_line('\t'.join(hyb_items))
+    assert lazy_record.seg2_props['read_start'] == int(hyb_items[10])
+    with pytest.raises(HybkitConstructorError):
+        lazy_record.seg1_props  # noqa: B018
+    direct_record = hybkit.LazyHybRecord('1_100', 'ACTG')
+    assert direct_record.is_modified()
+    assert direct_record.to_line() == hybkit.HybRecord('1_100', 'ACTG').to_line()
@@ -11,6 +11,7 @@ Automatic testing of the hybkit TypeFinder class.
 
 import copy
 import os
+import pickle
 
 import pytest
 
@@ -139,3 +140,93 @@ def test_typefinder_methods(method, expect_str, method_params, test_params, hyb_
                 use_test_hyb_record_2 = copy.deepcopy(test_hyb_record)
                 with pytest.raises(HybkitMiscError):
                     use_test_hyb_record_2.eval_types()
+
+
+# ----- TypeFinder Compiled String Match -----
+STRING_MATCHER_PARAMS = {
+    'startswith': [('MIMAT', 'miRNA_start'), ('', 'any_start'), ('MI', 'mi_start')],
+    'contains': [('_miR-21_', 'mir21'), ('Base', 'base'), ('_mi', 'mi_contains')],
+    'endswith': [('_mRNA', 'mRNA'), ('RNA', 'RNA'), ('_lncRNA', 'lncRNA')],
+    'matches': [('ENSG_exact', 'exact'), ('ENSG_exact', 'exact_dup')],
+}
+STRING_MATCHER_TESTS = [
+    'MIMAT0000076_MirBase_miR-21_microRNA',
+    'ENSG00000XXXXXX_ABC_lncRNA',
+    'ENSG00000XXXXXX_ABC_mRNA',
+    'ENSG_exact',
+    'XX_miR-21_mi',
+    '',
+]
+
+
+@pytest.mark.parametrize('num_search_types', [1, 2, 3, 4])
+def test_typefinder_string_matcher(num_search_types):
+    """Test compiled string matching gives the same results as linear string matching."""
+    params = {
+        search_type: STRING_MATCHER_PARAMS[search_type]
+        for search_type in hybkit.type_finder.StringMatcher.search_types[-num_search_types:]
+    }
+    string_matcher = hybkit.type_finder.StringMatcher(params)
+    assert string_matcher == params
+    for test_params in [string_matcher, pickle.loads(pickle.dumps(string_matcher))]:
+        for seg_name in STRING_MATCHER_TESTS:
+            seg_props = {'ref_name': seg_name}
+            expected = hybkit.type_finder.TypeFinder.method_string_match(seg_props, dict(params))
+            assert test_params.find(seg_name) == expected
+            assert hybkit.type_finder.TypeFinder.method_string_match(
+                seg_props, test_params) == expected
+
+    hybkit.type_finder.TypeFinder._reset()
+    hybkit.type_finder.TypeFinder.set_method('string_match', params)
+    assert isinstance(hybkit.type_finder.TypeFinder.params, hybkit.type_finder.StringMatcher)
+    hybkit.type_finder.TypeFinder._reset()
+
+
+# ----- TypeFinder Cache -----
+def test_typefinder_cache():
+    """Test caching of found segment types by ref_name."""
+    type_finder = hybkit.type_finder.TypeFinder
+    type_finder._reset()
+    assert not type_finder.cache_info()['enabled']
+    seg_props_1 = {'ref_name': 'MIMAT0000076_MirBase_miR-21_microRNA'}
+    seg_props_2 = {'ref_name': 'ENSG00000XXXXXX_ABC_mRNA'}
+
+    type_finder.set_method('hybformat')
+    for seg_props in [seg_props_1, seg_props_2, seg_props_1, seg_props_1]:
+        type_finder.find(seg_props)
+    cache_info = type_finder.cache_info()
+    assert cache_info['enabled']
+    assert (cache_info['hits'], cache_info['misses'], cache_info['size']) == (2, 2, 2)
+
+    # Cache is cleared when the method changes.
+    type_finder.set_method('string_match', STRING_MATCHER_PARAMS)
+    assert type_finder.cache_info()['size'] == 0
+    assert type_finder.find(seg_props_1) == 'miRNA_start'
+    assert type_finder.find(seg_props_1) == 'miRNA_start'
+    assert type_finder.cache_info()['hits'] == 1
+
+    # Least-recently-used entries are discarded.
+    old_cache_size = type_finder.cache_size
+    try:
+        type_finder.cache_size = 1
+        type_finder.clear_cache()
+        type_finder.find(seg_props_1)
+        type_finder.find(seg_props_2)
+        type_finder.find(seg_props_1)
+        cache_info = type_finder.cache_info()
+        assert (cache_info['hits'], cache_info['misses'], cache_info['size']) == (0, 3, 1)
+    finally:
+        type_finder.cache_size = old_cache_size
+
+    # Custom methods are only cached if requested.
+    def custom_method(self, seg_props, params):
+        return seg_props['ref_name'][:3]
+
+    type_finder.set_custom_method(custom_method)
+    assert type_finder.find(seg_props_1) == 'MIM'
+    assert not type_finder.cache_info()['enabled']
+    type_finder.set_custom_method(custom_method, cache=True)
+    type_finder.find(seg_props_1)
+    assert type_finder.find(seg_props_1) == 'MIM'
+    assert type_finder.cache_info()['hits'] == 1
+    type_finder._reset()
@@ -90,6 +90,13 @@ def test_viennafile_io(test_name, expectation, test_props, tmp_path):
             vienna_autotest_file.write_records([vienna_record, vienna_record])
             vienna_autotest_file.write_record(vienna_record)
             vienna_autotest_file.write_fh(vienna_str)
+        with hybkit.RecordWriter.open(
+                vienna_autotest_file_name, 'w', file_class=hybkit.ViennaFile, flush_records=2
+                ) as vienna_writer:
+            vienna_writer.write_records([vienna_record, vienna_record])
+            vienna_writer.write_record(vienna_record)
+        with open(vienna_autotest_file_name) as vienna_autotest_file:
+            assert vienna_autotest_file.read() == vienna_str * 3
 
 
 # ----- Test ViennaFile Misc -----
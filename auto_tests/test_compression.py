@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Automatic testing of hybkit compression module.
+"""
+
+# ruff: noqa: ANN001 ANN201
+
+import gzip
+import os
+
+import pytest
+
+import hybkit
+import hybkit.compression
+from auto_tests.test_helper_data import test_hyb_file_name, test_vienna_file_name
+from hybkit.errors import HybkitArgError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+COMPRESSION_SUFFIXES = [
+    '.gz',
+    '.bgz',
+    pytest.param('.zst', marks=pytest.mark.skipif(
+        hybkit.compression.zstandard is None, reason='zstandard package not installed'
+    )),
+]
+
+
+# ----- Begin Compression Tests -----
+@pytest.mark.parametrize(('file_name', 'expected'), [
+    ('my_file.hyb', ('my_file.hyb', '', None)),
+    ('my_file.hyb.gz', ('my_file.hyb', '.gz', 'gzip')),
+    ('PATH/MY_FILE.HYB.GZ', ('PATH/MY_FILE.HYB', '.GZ', 'gzip')),
+    ('my_file.vienna.bgz', ('my_file.vienna', '.bgz', 'bgzf')),
+    ('my_file.ct.Zst', ('my_file.ct', '.Zst', 'zstd')),
+    ('my_file.gz.hyb', ('my_file.gz.hyb', '', None)),
+])
+def test_compression_suffix(file_name, expected):
+    """Test detection of compression formats from file suffixes."""
+    assert hybkit.compression.split_compression_suffix(file_name) == expected
+    assert hybkit.compression.get_compression(file_name) == expected[2]
+
+
+@pytest.mark.parametrize('threads', [1, 3])
+@pytest.mark.parametrize('compression_suffix', COMPRESSION_SUFFIXES)
+def test_compression_hybfile_io(compression_suffix, threads, tmp_path, monkeypatch):
+    """Test reading and writing compressed files in multiple blocks."""
+    monkeypatch.setattr(hybkit.settings, 'COMPRESSION_BLOCK_SIZE', 500)
+    with hybkit.HybFile.open(test_hyb_file_name, 'r') as in_file:
+        hyb_records = in_file.read_records()
+    plain_file_name = os.path.join(tmp_path, 'plain.hyb')
+    with hybkit.HybFile.open(plain_file_name, 'w') as out_file:
+        out_file.write_records(hyb_records)
+    with open(plain_file_name) as in_file:
+        hyb_text = in_file.read()
+
+    out_file_name = os.path.join(tmp_path, 'compressed.hyb' + compression_suffix)
+    with hybkit.HybFile.open(out_file_name, 'w', threads=threads) as out_file:
+        out_file.write_records(hyb_records)
+    with hybkit.HybFile.open(out_file_name, 'a', threads=threads) as out_file:
+        out_file.write_records(hyb_records)
+    with hybkit.HybFile.open(out_file_name, 'r') as in_file:
+        assert in_file.read_records() == hyb_records * 2
+    with hybkit.compression.open_file(out_file_name, 'rb') as in_file:
+        assert in_file.read() == (hyb_text * 2).encode()
+    if compression_suffix != '.zst':
+        with gzip.open(out_file_name, 'rt') as in_file:
+            assert in_file.read() == hyb_text * 2
+
+    # Close before reading all data, with the decompressing thread waiting.
+    in_file = hybkit.compression.open_file(out_file_name, 'r')
+    assert in_file.readline() == hyb_text.splitlines(keepends=True)[0]
+    in_file.close()
+
+
+def test_compression_viennafile_io(tmp_path):
+    """Test reading and writing compressed Vienna files with RecordWriter."""
+    with hybkit.ViennaFile.open(test_vienna_file_name, 'r') as in_file:
+        fold_records = in_file.read_records()
+    out_file_name = os.path.join(tmp_path, 'compressed.vienna.gz')
+    with hybkit.RecordWriter.open(
+            out_file_name, 'w', file_class=hybkit.ViennaFile, flush_records=2) as writer:
+        writer.write_records(fold_records)
+    with hybkit.ViennaFile.open(out_file_name, 'r') as in_file:
+        assert in_file.read_records() == fold_records
+
+
+def test_compression_errors(tmp_path):
+    """Test errors for unsupported arguments and invalid compressed files."""
+    file_name = os.path.join(tmp_path, 'compressed.hyb.gz')
+    with pytest.raises(HybkitArgError):
+        hybkit.compression.open_file(file_name, 'r+')
+    with pytest.raises(HybkitArgError):
+        hybkit.compression.open_file(file_name, 'w', compression='not_a_format')
+    with pytest.raises(HybkitArgError):
+        hybkit.compression.open_file(file_name, 'wb', encoding='utf-8')
+    with pytest.raises(HybkitArgError):
+        hybkit.compression.open_file(file_name, 'w', threads=0)
+
+    with open(test_hyb_file_name, 'rb') as in_file:
+        compressed = gzip.compress(in_file.read())
+    with open(file_name, 'wb') as out_file:
+        out_file.write(compressed[:len(compressed) // 2])
+    with hybkit.HybFile.open(file_name, 'r') as in_file, pytest.raises(EOFError):
+        in_file.read_records()
+
+    # Files are opened uncompressed if compression is None.
+    with hybkit.compression.open_file(file_name, 'rb', compression=None) as in_file:
+        assert in_file.read() == compressed[:len(compressed) // 2]
+
+
+def test_compression_util(tmp_path):
+    """Test toolkit path utilities with compressed file names."""
+    file_name = os.path.join(tmp_path, 'my_file.hyb.gz')
+    with hybkit.HybFile.open(file_name, 'w'):
+        pass
+    assert hybkit.util.hyb_exists(file_name) == file_name
+    out_file_name = hybkit.util.make_out_file_name(
+        file_name, name_suffix='out', in_suffix='.hyb', out_suffix='.hyb', out_dir=tmp_path,
+    )
+    assert out_file_name == os.path.join(tmp_path, 'my_file_out.hyb.gz')
+    out_file_name = hybkit.util.make_out_file_name(
+        file_name, name_suffix='out', in_suffix='.hyb', out_suffix='', out_dir=tmp_path,
+    )
+    assert out_file_name == os.path.join(tmp_path, 'my_file_out')
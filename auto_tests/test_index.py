@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Automatic testing of hybkit index module.
+"""
+
+# ruff: noqa: ANN001 ANN201
+
+import io
+import os
+
+import pytest
+
+import hybkit
+import hybkit.index
+from auto_tests.test_helper_data import ART_HYB_PROPS_ALL
+from hybkit.errors import HybkitArgError, HybkitMiscError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+QUERY_VALUES = ['ARTSEG1', 'ART', 'mRNA', 'microRNA', 'RNA', '1_1000', 'X', '']
+
+
+def _write_hyb_file(tmp_path):
+    hyb_file_name = os.path.join(tmp_path, 'index_autotest.hyb')
+    records = []
+    for test_props in ART_HYB_PROPS_ALL:
+        hyb_record = hybkit.HybRecord.from_line(test_props['hyb_str'])
+        if test_props is not ART_HYB_PROPS_ALL[0]:
+            hyb_record.eval_types()
+        records.append(hyb_record)
+    with hybkit.HybFile.open(hyb_file_name, 'w') as hyb_file:
+        hyb_file.write_records(records * 2)
+    return hyb_file_name
+
+
+def _get_field_values(hyb_record, field):
+    if field == 'id':
+        return [hyb_record.id]
+    if field in hybkit.index.ANY_FIELDS:
+        fields = hybkit.index.ANY_FIELDS[field]
+    else:
+        fields = [field]
+    values = []
+    for use_field in fields:
+        if use_field.endswith('ref_name'):
+            values.append(getattr(hyb_record, use_field[:4] + '_props')['ref_name'])
+        elif hyb_record.flags.get(use_field) is not None:
+            values.append(hyb_record.flags[use_field])
+    return values
+
+
+def _value_matches(field_value, value, match):
+    if match == 'is':
+        return field_value == value
+    if match == 'prefix':
+        return field_value.startswith(value)
+    if match == 'contains':
+        return value in field_value
+    return field_value.endswith(value)
+
+
+# ----- Begin Index Tests -----
+@pytest.mark.parametrize('match', hybkit.index.MATCH_MODES)
+@pytest.mark.parametrize('field', [*hybkit.index.INDEX_FIELDS, *hybkit.index.ANY_FIELDS])
+def test_index_query(field, match, tmp_path):
+    """Test index queries return the same records as a scan of the file."""
+    hyb_file_name = _write_hyb_file(tmp_path)
+    assert hybkit.index.build_index(hyb_file_name) == len(ART_HYB_PROPS_ALL) * 2
+    with hybkit.HybFile.open(hyb_file_name, 'r') as hyb_file:
+        all_records = hyb_file.read_records()
+        for value in [*QUERY_VALUES, all_records[1].id, all_records[2].seg2_props['ref_name']]:
+            expected = [
+                hyb_record for hyb_record in all_records
+                if any(_value_matches(field_value, value, match)
+                       for field_value in _get_field_values(hyb_record, field))
+            ]
+            assert hyb_file.query_index(field, value, match) == expected, value
+
+
+def test_index_misc(tmp_path):
+    """Test index information, and errors for invalid queries and out-of-date indexes."""
+    hyb_file_name = _write_hyb_file(tmp_path)
+    index_file_name = os.path.join(tmp_path, 'other_name.hki')
+    with hybkit.HybFile.open(hyb_file_name, 'r') as hyb_file, pytest.raises(HybkitMiscError):
+        hyb_file.query_index('id', 'X')
+    hybkit.index.build_index(hyb_file_name, index_file_name)
+
+    with hybkit.index.HybIndex(index_file_name) as hyb_index:
+        assert len(hyb_index) == len(ART_HYB_PROPS_ALL) * 2
+        assert hyb_index.is_current(hyb_file_name)
+        seg1_types = hyb_index.get_counts('seg1_type')
+        assert sum(seg1_types.values()) == (len(ART_HYB_PROPS_ALL) - 1) * 2
+        with pytest.raises(HybkitArgError):
+            hyb_index.query('seq', 'A')
+        with pytest.raises(HybkitArgError):
+            hyb_index.query('id', 'A', match='not_a_match')
+        with pytest.raises(HybkitArgError):
+            hyb_index.get_counts('any_ref_name')
+
+    with open(hyb_file_name) as in_file:
+        hyb_text = in_file.read()
+    with hybkit.HybFile(io.StringIO(hyb_text), from_file_like=True) as hyb_file:
+        with pytest.raises(HybkitArgError):
+            hyb_file.query_index('id', 'X')
+        assert len(hyb_file.query_index('id', '1_1000', index_file=index_file_name)) == 8
+
+    with open(hyb_file_name, 'a') as hyb_file:
+        hyb_file.write(hyb_text.splitlines(keepends=True)[0])
+    with hybkit.HybFile.open(hyb_file_name, 'r') as hyb_file, pytest.raises(HybkitMiscError):
+        hyb_file.query_index('id', 'X', index_file=index_file_name)
+
+    with pytest.raises(HybkitMiscError):
+        hybkit.index.HybIndex(hyb_file_name)
+    with pytest.raises(HybkitArgError):
+        hybkit.index.build_index(hyb_file_name + '.gz')
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Automatic testing of hybkit code.
+"""
+
+# ruff: noqa: ANN001 ANN201
+
+import collections
+import io
+
+import pytest
+
+import hybkit
+import hybkit.parallel
+from auto_tests.test_helper_data import ART_HYB_VIENNA_PROPS_1
+from hybkit.errors import HybkitArgError, HybkitIterError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+hybkit.util.set_setting('error_mode', 'raise')
+hybkit.util.set_setting('iter_error_mode', 'raise')
+
+# ----- Test Data -----
+NUM_TEST_RECORDS = 11
+TEST_HYB_LINES = [ART_HYB_VIENNA_PROPS_1['hyb_str'].rstrip('\n') + '\n'] * NUM_TEST_RECORDS
+TEST_VIENNA_LINES = [
+    line + '\n' for line in ART_HYB_VIENNA_PROPS_1['vienna_str'].strip('\n').split('\n')
+] * NUM_TEST_RECORDS
+
+
+def _serial_eval(hyb_lines, fold_lines, dataset):
+    out_hyb = hybkit.HybFile(io.StringIO(), from_file_like=True)
+    out_fold = hybkit.ViennaFile(io.StringIO(), from_file_like=True)
+    record_iter, _ = hybkit.parallel.iter_chunk_records(hyb_lines, fold_lines)
+    for hyb_record in record_iter:
+        hyb_record.set_flag('dataset', dataset)
+        hyb_record.eval_types()
+        hyb_record.eval_mirna()
+        out_hyb.write_record(hyb_record)
+        out_fold.write_record(hyb_record.fold_record)
+    return out_hyb.fh.getvalue(), out_fold.fh.getvalue()
+
+
+# ----- Begin Parallel Tests -----
+# ----- Chunking Tests -----
+@pytest.mark.parametrize('chunk_size', [1, 3, NUM_TEST_RECORDS, 100])
+def test_parallel_iter_line_chunks(chunk_size):
+    """Test splitting of paired hyb and vienna files into chunks of records."""
+    chunks = list(hybkit.parallel.iter_line_chunks(
+        iter(TEST_HYB_LINES), iter(TEST_VIENNA_LINES), chunk_size=chunk_size
+    ))
+    assert len(chunks) == -(-NUM_TEST_RECORDS // chunk_size)
+    for hyb_lines, fold_lines in chunks:
+        assert len(hyb_lines) <= chunk_size
+        assert len(fold_lines) == 3 * len(hyb_lines)
+    assert [line for chunk in chunks for line in chunk[0]] == TEST_HYB_LINES
+    assert [line for chunk in chunks for line in chunk[1]] == TEST_VIENNA_LINES
+
+    hyb_only_chunks = list(hybkit.parallel.iter_line_chunks(
+        iter(TEST_HYB_LINES), chunk_size=chunk_size
+    ))
+    assert all(fold_lines is None for _, fold_lines in hyb_only_chunks)
+
+    with pytest.raises(HybkitArgError):
+        next(hybkit.parallel.iter_line_chunks(iter(TEST_HYB_LINES), chunk_size=0))
+    with pytest.raises(HybkitArgError):
+        next(hybkit.parallel.iter_line_chunks(
+            iter(TEST_HYB_LINES), iter(TEST_VIENNA_LINES), fold_type='ct'
+        ))
+
+
+def test_parallel_check_sequential_skips():
+    """Test the max_sequential_skips limit across chunk boundaries."""
+    check = hybkit.parallel.check_sequential_skips
+    assert check(0, (0, 0), 5) == 0
+    assert check(3, (1, 2), 5) == 2
+    assert check(3, (None, 2), 5) == 5
+    with pytest.raises(HybkitIterError):
+        check(3, (3, 0), 5)
+    with pytest.raises(HybkitIterError):
+        check(4, (None, 2), 5)
+
+
+# ----- Settings Tests -----
+def test_parallel_settings_snapshot():
+    """Test copying and applying class-level settings."""
+    snapshot = hybkit.parallel.get_settings_snapshot()
+    assert set(snapshot) == set(hybkit.parallel.SETTINGS_CLASSES)
+    old_value = hybkit.HybRecord.settings['mirna_types']
+    try:
+        hybkit.HybRecord.settings['mirna_types'] = ['test_type']
+        hybkit.parallel.apply_settings_snapshot(snapshot)
+        assert hybkit.HybRecord.settings['mirna_types'] == old_value
+        assert hybkit.HybRecord._flagset is None
+    finally:
+        hybkit.HybRecord.settings['mirna_types'] = old_value
+
+
+# ----- Task Tests -----
+def test_parallel_eval_chunk():
+    """Test chunked evaluation matches serial evaluation."""
+    options = {'eval_types': ['type', 'mirna'], 'dataset': 'test_dataset'}
+    expected_hyb, expected_fold = _serial_eval(TEST_HYB_LINES, TEST_VIENNA_LINES, 'test_dataset')
+    hyb_texts, fold_texts = [], []
+    for hyb_lines, fold_lines in hybkit.parallel.iter_line_chunks(
+            iter(TEST_HYB_LINES), iter(TEST_VIENNA_LINES), chunk_size=4):
+        result = hybkit.parallel.eval_chunk(((hyb_lines, fold_lines), options))
+        assert result['counters']['pair_skips'] == 0
+        assert result['skips'] == (0, 0)
+        hyb_texts.append(result['hyb_text'])
+        fold_texts.append(result['fold_text'])
+    assert ''.join(hyb_texts) == expected_hyb
+    assert ''.join(fold_texts) == expected_fold
+
+    result = hybkit.parallel.eval_chunk(
+        ((TEST_HYB_LINES, None), {'eval_types': ['type'], 'dataset': None})
+    )
+    assert result['fold_text'] is None
+    assert not result['counters']
+    assert len(result['hyb_text'].splitlines()) == NUM_TEST_RECORDS
+
+
+def test_parallel_analyze_chunk():
+    """Test merged chunk analyses match a serial analysis."""
+    options = {'analysis_types': ['energy']}
+    record_iter, _ = hybkit.parallel.iter_chunk_records(TEST_HYB_LINES, TEST_VIENNA_LINES)
+    expected = hybkit.analysis.Analysis(['energy'])
+    for hyb_record in record_iter:
+        expected.add_hyb_record(hyb_record)
+    combined = hybkit.analysis.Analysis(['energy'])
+    for hyb_lines, fold_lines in hybkit.parallel.iter_line_chunks(
+            iter(TEST_HYB_LINES), iter(TEST_VIENNA_LINES), chunk_size=4):
+        result = hybkit.parallel.analyze_chunk(((hyb_lines, fold_lines), options))
+        assert result['skips'] == (0, 0)
+        combined.merge(hybkit.analysis.Analysis.from_state(result['state']))
+    assert combined.get_all_results() == expected.get_all_results()
+
+
+def test_parallel_pool():
+    """Test ordered evaluation of chunks using a process pool."""
+    with pytest.raises(HybkitArgError):
+        hybkit.parallel.make_pool(0)
+    options = {'eval_types': ['type', 'mirna'], 'dataset': 'test_dataset'}
+    expected_hyb, expected_fold = _serial_eval(TEST_HYB_LINES, TEST_VIENNA_LINES, 'test_dataset')
+    tasks = (
+        (chunk, options)
+        for chunk in hybkit.parallel.iter_line_chunks(
+            iter(TEST_HYB_LINES), iter(TEST_VIENNA_LINES), chunk_size=2
+        )
+    )
+    pool = hybkit.parallel.make_pool(2, 'hybformat')
+    try:
+        results = list(hybkit.parallel.ordered_map(
+            pool, hybkit.parallel.eval_chunk, tasks, max_pending=3
+        ))
+    finally:
+        pool.close()
+        pool.join()
+    assert ''.join(result['hyb_text'] for result in results) == expected_hyb
+    assert ''.join(result['fold_text'] for result in results) == expected_fold
+
+
+# ----- Filter Tests -----
+def _make_dup_id_hyb_lines():
+    hyb_str = ART_HYB_VIENNA_PROPS_1['hyb_str'].rstrip('\n')
+    hyb_id = hyb_str.split('\t')[0]
+    run_lengths = [1, 3, 2, 1, 4, 1, 2]
+    lines = []
+    for run_i, run_length in enumerate(run_lengths):
+        for line_i in range(run_length):
+            line = hyb_str.replace(hyb_id, 'read_%i' % run_i, 1)
+            if line_i % 2:
+                line = line.replace('microRNA', 'excludeRNA')
+            lines.append(line + '\n')
+    return lines
+
+
+def test_parallel_byte_ranges(tmp_path):
+    """Test splitting a file into byte ranges at line boundaries."""
+    hyb_lines = _make_dup_id_hyb_lines()
+    file_name = str(tmp_path / 'test_byte_ranges.hyb')
+    with open(file_name, 'w') as file_obj:
+        file_obj.writelines(hyb_lines)
+    assert hybkit.parallel.estimate_line_bytes(file_name) == pytest.approx(
+        sum(len(line) for line in hyb_lines) / len(hyb_lines)
+    )
+    for chunk_bytes in [1, 50, 500, 10 ** 6]:
+        byte_ranges = list(hybkit.parallel.iter_byte_ranges(file_name, chunk_bytes))
+        chunk_lines = [hybkit.parallel.read_byte_range(b_range) for b_range in byte_ranges]
+        assert all(chunk_lines)
+        assert [line for lines in chunk_lines for line in lines] == hyb_lines
+    with pytest.raises(HybkitArgError):
+        next(hybkit.parallel.iter_byte_ranges(file_name, 0))
+
+
+@pytest.mark.parametrize(('skip_dup_id_before', 'skip_dup_id_after'), [
+    (False, False), (True, False), (False, True), (True, True),
+])
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5])
+def test_parallel_filter_chunk(skip_dup_id_before, skip_dup_id_after, chunk_size):
+    """Test joined chunked filtering matches filtering of all records at once."""
+    hyb_lines = _make_dup_id_hyb_lines()
+    options = {
+        'filter_params': [],
+        'exclude_params': [('any_seg_contains', 'excludeRNA')],
+        'filter_mode': 'all',
+        'skip_dup_id_before': skip_dup_id_before,
+        'skip_dup_id_after': skip_dup_id_after,
+        'dataset': None,
+    }
+    expected = hybkit.parallel.filter_chunk(((hyb_lines, None), options))
+    hyb_text = ''
+    include_count, exclude_count = 0, 0
+    last_record_id = None
+    for hyb_chunk, fold_chunk in hybkit.parallel.iter_line_chunks(iter(hyb_lines), None, chunk_size):
+        result = hybkit.parallel.filter_chunk(((hyb_chunk, fold_chunk), options))
+        last_record_id = hybkit.parallel.join_filter_chunk(result, last_record_id, options)
+        hyb_text += result['hyb_text']
+        include_count += result['include_count']
+        exclude_count += result['exclude_count']
+    assert hyb_text == expected['hyb_text']
+    assert include_count == expected['include_count']
+    assert exclude_count == expected['exclude_count']
+
+
+def test_parallel_filter_chunk_where():
+    """Test chunked filtering with a where-expression, and combined term counts."""
+    hyb_lines = _make_dup_id_hyb_lines()
+    options = {
+        'filter_params': [],
+        'exclude_params': [],
+        'filter_mode': 'any',
+        'where': 'any_seg_contains microRNA AND NOT id_suffix _3',
+        'where_optimize': True,
+        'skip_dup_id_before': False,
+        'skip_dup_id_after': False,
+        'dataset': None,
+    }
+    expected = hybkit.parallel.filter_chunk(((hyb_lines, None), options))
+    assert 0 < expected['include_count'] < len(hyb_lines)
+    where_query = hybkit.query.WhereQuery(options['where'])
+    hyb_text = ''
+    for hyb_chunk, fold_chunk in hybkit.parallel.iter_line_chunks(iter(hyb_lines), None, 3):
+        result = hybkit.parallel.filter_chunk(((hyb_chunk, fold_chunk), options))
+        hyb_text += result['hyb_text']
+        where_query.add_counts(result['where_counts'])
+    assert hyb_text == expected['hyb_text']
+    assert where_query.get_counts() == expected['where_counts']
+
+
+# ----- File Results Tests -----
+def test_parallel_iter_file_results(tmp_path):
+    """Test processing chunks of multiple files matches serial processing of each file."""
+    file_tasks = []
+    options = {'analysis_types': ['energy']}
+    for name, hyb_lines, fold_lines in [
+            ('paired', TEST_HYB_LINES, TEST_VIENNA_LINES),
+            ('empty', [], []),
+            ('hyb_only', TEST_HYB_LINES, None)]:
+        hyb_file_name = str(tmp_path / (name + '.hyb'))
+        with open(hyb_file_name, 'w') as hyb_file:
+            hyb_file.writelines(hyb_lines)
+        fold_file_name = None
+        if fold_lines is not None:
+            fold_file_name = str(tmp_path / (name + '.vienna'))
+            with open(fold_file_name, 'w') as fold_file:
+                fold_file.writelines(fold_lines)
+        file_tasks.append((hyb_file_name, fold_file_name, options))
+
+    chunks = list(hybkit.parallel.iter_file_chunks(*file_tasks[0][:2], chunk_size=4))
+    assert [len(hyb_lines) for hyb_lines, _ in chunks] == [4, 4, 3]
+    chunks = list(hybkit.parallel.iter_file_chunks(file_tasks[2][0], chunk_size=4))
+    assert all(isinstance(chunk, hybkit.parallel.ByteRange) for chunk in chunks)
+
+    expected_analyses = []
+    expected_counters = collections.Counter()
+    for hyb_file_name, fold_file_name, _ in file_tasks:
+        expected = hybkit.analysis.Analysis(['energy'])
+        with hybkit.HybFile(hyb_file_name) as hyb_file:
+            record_iter = hyb_file
+            if fold_file_name is not None:
+                fold_file = hybkit.ViennaFile(fold_file_name)
+                record_iter = hybkit.HybFoldIter(hyb_file, fold_file, combine=True)
+            for hyb_record in record_iter:
+                expected.add_hyb_record(hyb_record)
+            if fold_file_name is not None:
+                expected_counters.update(record_iter.counters)
+                fold_file.close()
+        expected_analyses.append(expected.get_all_results())
+
+    counters = collections.Counter()
+    file_indexes = []
+    file_results = hybkit.parallel.iter_file_results(
+        hybkit.parallel.analyze_chunk, file_tasks, 2, chunk_size=4, counters=counters
+    )
+    for file_i, chunk_results in file_results:
+        file_indexes.append(file_i)
+        combined = hybkit.analysis.Analysis(['energy'])
+        for result in chunk_results:
+            combined.merge(hybkit.analysis.Analysis.from_state(result['state']))
+        assert combined.get_all_results() == expected_analyses[file_i]
+    assert file_indexes == [0, 1, 2]
+    assert counters == expected_counters
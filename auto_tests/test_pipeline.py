@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Automatic testing of hybkit pipeline module.
+"""
+
+# ruff: noqa: ANN001 ANN201
+
+import collections
+import os
+
+import pytest
+
+import hybkit
+import hybkit.pipeline
+from auto_tests.test_helper_data import ART_HYB_PROPS_ALL, ART_HYB_VIENNA_PROPS_1
+from hybkit.errors import HybkitArgError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+hybkit.util.set_setting('error_mode', 'raise')
+hybkit.util.set_setting('iter_error_mode', 'raise')
+
+NUM_TEST_RECORDS = 5
+
+
+def _write_test_files(tmp_path):
+    hyb_file_name = os.path.join(tmp_path, 'pipeline_autotest.hyb')
+    vienna_file_name = os.path.join(tmp_path, 'pipeline_autotest.vienna')
+    with open(hyb_file_name, 'w') as hyb_file, open(vienna_file_name, 'w') as vienna_file:
+        for _ in range(NUM_TEST_RECORDS):
+            hyb_file.write(ART_HYB_VIENNA_PROPS_1['hyb_str'].rstrip('\n') + '\n')
+            vienna_file.write(ART_HYB_VIENNA_PROPS_1['vienna_str'].strip('\n') + '\n')
+    return hyb_file_name, vienna_file_name
+
+
+# ----- Begin Pipeline Tests -----
+@pytest.mark.parametrize('exclude_type', ['rRNA', 'microRNA'])
+def test_pipeline_stages(exclude_type, tmp_path):
+    """Test a chained pipeline matches evaluating, filtering, and analyzing in turn."""
+    hyb_file_name, vienna_file_name = _write_test_files(tmp_path)
+    out_eval_name = os.path.join(tmp_path, 'pipeline_autotest_evaluated.hyb')
+    out_filter_name = os.path.join(tmp_path, 'pipeline_autotest_evaluated_filtered.hyb')
+    out_fold_name = os.path.join(tmp_path, 'pipeline_autotest_evaluated_filtered.vienna')
+    record_filter = hybkit.query.compile_filter(exclude_params=[('any_seg_type_is', exclude_type)])
+
+    expected_eval, expected_filter = [], []
+    expected_analysis = hybkit.analysis.Analysis(['energy', 'type', 'mirna', 'fold'])
+    with hybkit.HybFile(hyb_file_name, 'r') as in_hyb, \
+         hybkit.ViennaFile(vienna_file_name, 'r') as in_fold:
+        for hyb_record in hybkit.HybFoldIter(in_hyb, in_fold, combine=True):
+            hyb_record.set_flag('dataset', 'test')
+            hyb_record.eval_types()
+            hyb_record.eval_mirna()
+            expected_eval.append(hyb_record.to_line())
+            if record_filter(hyb_record):
+                expected_filter.append(hyb_record.to_line())
+                expected_analysis.add_hyb_record(hyb_record)
+
+    counters = collections.Counter()
+    filter_counts = collections.Counter()
+    analysis = hybkit.analysis.Analysis(['energy', 'type', 'mirna', 'fold'])
+    records = hybkit.pipeline.read_records(hyb_file_name, vienna_file_name, counters)
+    records = hybkit.pipeline.eval_stage(records, dataset='test')
+    records = hybkit.pipeline.tap(records, out_eval_name)
+    records = hybkit.pipeline.filter_stage(records, record_filter, counts=filter_counts)
+    records = hybkit.pipeline.tap(records, out_filter_name, out_fold_name)
+    records = hybkit.pipeline.analyze_stage(records, analysis)
+    assert hybkit.pipeline.run(records) == len(expected_filter)
+
+    assert counters['hyb_record_read_attempts'] == NUM_TEST_RECORDS + 1
+    assert filter_counts['included'] == len(expected_filter)
+    assert filter_counts['excluded'] == NUM_TEST_RECORDS - len(expected_filter)
+    with open(out_eval_name) as out_eval:
+        assert out_eval.read() == ''.join(expected_eval)
+    with open(out_filter_name) as out_filter:
+        assert out_filter.read() == ''.join(expected_filter)
+    with hybkit.ViennaFile(out_fold_name, 'r') as out_fold:
+        assert len(out_fold.read_records()) == len(expected_filter)
+    assert analysis.get_all_results() == expected_analysis.get_all_results()
+
+
+def test_pipeline_misc(tmp_path):
+    """Test pipeline stages without fold files, and errors for invalid arguments."""
+    hyb_file_name = os.path.join(tmp_path, 'pipeline_autotest.hyb')
+    with open(hyb_file_name, 'w') as hyb_file:
+        for test_props in ART_HYB_PROPS_ALL:
+            hyb_file.write(test_props['hyb_str'].rstrip('\n') + '\n')
+        hyb_file.write(ART_HYB_PROPS_ALL[-1]['hyb_str'].rstrip('\n') + '\n')
+
+    counters = collections.Counter()
+    records = hybkit.pipeline.read_records(hyb_file_name, counters=counters)
+    assert hybkit.pipeline.run(records) == len(ART_HYB_PROPS_ALL) + 1
+    assert not counters
+    # All test records share the same id.
+    records = hybkit.pipeline.read_records(hyb_file_name)
+    records = hybkit.pipeline.filter_stage(
+        records, lambda hyb_record: True, skip_dup_id_before=True
+    )
+    assert hybkit.pipeline.run(records) == 1
+
+    assert hybkit.pipeline.get_fold_class('test.vienna.gz') is hybkit.ViennaFile
+    assert hybkit.pipeline.get_fold_class('test.ct') is hybkit.CtFile
+    with pytest.raises(HybkitArgError):
+        hybkit.pipeline.get_fold_class('test.hyb')
+    with pytest.raises(HybkitArgError):
+        hybkit.pipeline.run(hybkit.pipeline.eval_stage([], eval_types=['fold']))
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Automatic testing of hybkit query module.
+"""
+
+# ruff: noqa: ANN001 ANN201
+
+import pytest
+
+import hybkit
+import hybkit.query
+from auto_tests.test_helper_data import ART_HYB_PROPS_ALL
+from hybkit.errors import HybkitArgError, HybkitError, HybkitMiscError
+
+# ----- Test Data -----
+PROP_COMPARES = ['ARTSEG1', 'microRNA', 'mRNA', 'RNA', 'NAME_mRNA', '1_1000', 'AAAA', 'X']
+EVAL_STEPS = ['none', 'types', 'mirna']
+
+
+def _make_record(hyb_str, eval_step, record_class=hybkit.HybRecord):
+    hyb_record = record_class.from_line(hyb_str, hybformat_id=True)
+    if eval_step in {'types', 'mirna'}:
+        hyb_record.eval_types()
+    if eval_step == 'mirna':
+        hyb_record.eval_mirna()
+    return hyb_record
+
+
+def _get_result(func, *args):
+    try:
+        return func(*args)
+    except HybkitError as error:
+        return (type(error), str(error))
+
+
+# ----- Begin Query Tests -----
+@pytest.mark.parametrize('record_class', [
+    hybkit.HybRecord, hybkit.CompactHybRecord, hybkit.LazyHybRecord,
+])
+@pytest.mark.parametrize('eval_step', EVAL_STEPS)
+@pytest.mark.parametrize('test_props', ART_HYB_PROPS_ALL)
+def test_query_compile_prop(test_props, eval_step, record_class):
+    """Test compiled properties give results and errors identical to HybRecord.prop()."""
+    hyb_record = _make_record(test_props['hyb_str'], eval_step, record_class)
+    for prop in hybkit.HybRecord.HAS_PROPS:
+        if prop in hybkit.HybRecord._ALL_STR_PROPS_SET:  # noqa: SLF001
+            prop_compares = PROP_COMPARES
+        else:
+            prop_compares = [None]
+        for prop_compare in prop_compares:
+            expected = _get_result(hyb_record.prop, prop, prop_compare)
+            pred = hybkit.query.compile_prop(prop, prop_compare)
+            assert _get_result(pred, hyb_record) == expected, (prop, prop_compare)
+
+
+def test_query_compile_prop_errors():
+    """Test validation of properties when compiled."""
+    with pytest.raises(HybkitMiscError):
+        hybkit.query.compile_prop('not_a_prop')
+    with pytest.raises(HybkitMiscError):
+        hybkit.query.compile_prop('any_seg_contains')
+    with pytest.raises(HybkitArgError):
+        hybkit.query.compile_filter([('has_mirna', None)], filter_mode='none')
+
+
+@pytest.mark.parametrize('filter_mode', hybkit.query.FILTER_MODES)
+@pytest.mark.parametrize('exclude_params', [
+    [], [('mirna_dimer', None)], [('seg1_type_is', 'mRNA'), ('any_seg_suffix', 'X')],
+])
+@pytest.mark.parametrize('filter_params', [
+    [],
+    [('has_mirna', None)],
+    [('5p_mirna', None), ('seg2_contains', 'ARTSEG')],
+    [('any_seg_type_is', 'mRNA'), ('id_prefix', '1_'), ('seq_contains', 'AAAA')],
+])
+def test_query_compile_filter(filter_params, exclude_params, filter_mode):
+    """Test compiled filters match all/any/exclude logic of HybRecord.prop()."""
+    record_filter = hybkit.query.compile_filter(filter_params, exclude_params, filter_mode)
+    for test_props in ART_HYB_PROPS_ALL:
+        hyb_record = _make_record(test_props['hyb_str'], 'mirna')
+        filter_results = [hyb_record.prop(*params) for params in filter_params]
+        if filter_mode == 'all':
+            expected = all(filter_results)
+        else:
+            expected = any(filter_results)
+        expected = expected and not any(hyb_record.prop(*params) for params in exclude_params)
+        assert record_filter(hyb_record) is expected
+
+
+# ----- Begin Where Expression Tests -----
+@pytest.mark.parametrize(('expression', 'expected_str'), [
+    ('has_mirna', 'has_mirna'),
+    ('id_is "a b" and not 5p_mirna', 'id_is "a b" AND NOT 5p_mirna'),
+    ("seq_contains 'AC' OR has_mirna AND mirna_dimer",
+     'seq_contains AC OR has_mirna AND mirna_dimer'),
+    ('(seq_contains AC OR has_mirna) AND mirna_dimer',
+     '(seq_contains AC OR has_mirna) AND mirna_dimer'),
+    ('NOT (has_mirna AND mirna_dimer)', 'NOT (has_mirna AND mirna_dimer)'),
+    ('((NOT NOT has_mirna))', 'NOT NOT has_mirna'),
+    ('id_is "AND"', 'id_is "AND"'),
+])
+def test_query_parse_where(expression, expected_str):
+    """Test parsing of where-expressions, and their string representations."""
+    parsed = hybkit.query.parse_where(expression)
+    assert str(parsed) == expected_str
+    assert str(hybkit.query.parse_where(str(parsed))) == expected_str
+
+
+@pytest.mark.parametrize('expression', [
+    '', 'not_a_prop', 'id_is', '(has_mirna', 'has_mirna)', 'has_mirna AND OR mirna_dimer',
+    'has_mirna mirna_dimer', 'NOT', 'id_is "unclosed',
+])
+def test_query_parse_where_errors(expression):
+    """Test errors for invalid where-expressions."""
+    with pytest.raises(HybkitArgError):
+        hybkit.query.parse_where(expression)
+
+
+def test_query_optimize_where():
+    """Test reordering of where-expression terms by cost and selectivity."""
+    optimized = hybkit.query.optimize_where(hybkit.query.parse_where(
+        'mirna_contains X AND id_prefix Y'
+    ))
+    assert isinstance(optimized, hybkit.query.CheckedExpr)
+    assert optimized.required == ('eval_mirna',)
+    assert str(optimized) == 'id_prefix Y AND mirna_contains X'
+    optimized = hybkit.query.optimize_where(hybkit.query.parse_where(
+        'seq_contains A AND any_seg_type_contains RNA AND (id_prefix 1 AND mirna_dimer)'
+        ' AND has_mirna AND mirna_contains miR AND seq_contains A AND id_is A'
+    ))
+    assert isinstance(optimized.child, hybkit.query.AndExpr)
+    assert optimized.required == ('eval_types', 'eval_mirna')
+    assert str(optimized) == (
+        'mirna_dimer AND id_is A AND id_prefix 1 AND seq_contains A AND seq_contains A'
+        ' AND has_mirna AND any_seg_type_contains RNA AND mirna_contains miR'
+    )
+    optimized = hybkit.query.optimize_where(hybkit.query.parse_where(
+        'mirna_dimer OR NOT has_mirna OR id_is B OR any_seg_is A'
+    ))
+    assert str(optimized) == 'NOT has_mirna OR any_seg_is A OR id_is B OR mirna_dimer'
+    assert str(hybkit.query.optimize_where(optimized)) == str(optimized)
+    optimized = hybkit.query.optimize_where(hybkit.query.parse_where(
+        'id_prefix B OR seq_contains A'
+    ))
+    assert isinstance(optimized, hybkit.query.OrExpr)
+    assert str(optimized) == 'seq_contains A OR id_prefix B'
+    assert hybkit.query.PropTerm('mirna_is', 'A').may_raise()
+    for prop, prop_compare in [('any_seg_contains', 'A'), ('seg1_type_is', 'A'),
+                               ('has_mirna', None), ('has_indels', None)]:
+        assert not hybkit.query.PropTerm(prop, prop_compare).may_raise()
+    for prop, prop_compare, required in [
+        ('any_seg_contains', 'A', set()),
+        ('seg1_type_is', 'A', {'eval_types'}),
+        ('has_mirna', None, {'eval_mirna'}),
+        ('mirna_seg_type_is', 'A', {'eval_types', 'eval_mirna'}),
+        ('has_indels', None, {'full_seg_props'}),
+    ]:
+        assert hybkit.query.PropTerm(prop, prop_compare).requires() == required
+    with pytest.raises(TypeError):
+        hybkit.query.WhereExpr()
+
+
+@pytest.mark.parametrize('optimize', [True, False])
+@pytest.mark.parametrize('expression', [
+    'any_seg_type_is microRNA AND id_is 7_1',
+    'id_is 7_1 OR has_mirna',
+    'id_is 7_1 OR seg1_type_is microRNA',
+])
+def test_query_where_query_missing_eval(expression, optimize):
+    """Test where-queries raise errors for records missing evaluations regardless of order."""
+    where_query = hybkit.query.WhereQuery(expression, optimize=optimize)
+    hyb_record = _make_record(ART_HYB_PROPS_ALL[0]['hyb_str'], 'none')
+    with pytest.raises(HybkitMiscError):
+        where_query(hyb_record)
+
+
+@pytest.mark.parametrize('optimize', [True, False])
+@pytest.mark.parametrize('expression', [
+    'has_mirna AND mirna_contains ARTSEG1',
+    'NOT (any_seg_type_is mRNA OR mirna_dimer) OR seq_prefix AAAA AND id_is 1_1000',
+    '(seg1_contains ARTSEG OR seg2_suffix mRNA) AND NOT 3p_mirna AND any_seg_type_contains RNA',
+])
+def test_query_where_query(expression, optimize):
+    """Test where-queries give the same results as prop(), and count term checks."""
+    where_query = hybkit.query.WhereQuery(expression, optimize=optimize)
+    hyb_records = [_make_record(test_props['hyb_str'], 'mirna')
+                   for test_props in ART_HYB_PROPS_ALL]
+
+    def eval_expr(expr, hyb_record):
+        if isinstance(expr, hybkit.query.PropTerm):
+            return hyb_record.prop(expr.prop, expr.prop_compare)
+        elif isinstance(expr, hybkit.query.NotExpr):
+            return not eval_expr(expr.child, hyb_record)
+        results = [eval_expr(child, hyb_record) for child in expr.children]
+        if isinstance(expr, hybkit.query.AndExpr):
+            return all(results)
+        return any(results)
+
+    # miRNA string properties raise errors for records without a miRNA,
+    #   so are only checked after the "has_mirna" guard.
+    for hyb_record in hyb_records:
+        if 'mirna_contains' in expression and not hyb_record.prop('has_mirna'):
+            assert where_query(hyb_record) is False
+        else:
+            assert where_query(hyb_record) == eval_expr(where_query.parsed, hyb_record)
+
+    counts = where_query.get_counts()
+    assert sum(check_count for check_count, _ in counts) >= len(hyb_records)
+    assert all(true_count <= check_count for check_count, true_count in counts)
+    where_query.add_counts(counts)
+    assert where_query.get_counts() == [(2 * checks, 2 * trues) for checks, trues in counts]
+    report = where_query.make_report()
+    assert len(report) == 2 + len(where_query.terms)
+
+    record_filter = hybkit.query.compile_filter(
+        [('has_mirna', None)], [('mirna_dimer', None)], 'any', where=where_query
+    )
+    for hyb_record in hyb_records:
+        expected = (hyb_record.prop('has_mirna') and where_query(hyb_record)
+                    and not hyb_record.prop('mirna_dimer'))
+        assert record_filter(hyb_record) == expected
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Automatic testing of hybkit sketch module.
+"""
+
+# ruff: noqa: ANN001 ANN201
+
+import json
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import hybkit
+import hybkit.sketch
+from hybkit.errors import HybkitArgError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+
+def _get_skewed_keys(num_keys, seed):
+    rng = random.Random(seed)
+    return ['key_%i' % int(rng.paretovariate(1.0)) for _ in range(num_keys)]
+
+
+def _check_space_saving(summary, true_counts):
+    assert len(summary) <= summary.capacity
+    assert summary.total == sum(true_counts.values())
+    for key, count in summary.most_common():
+        assert true_counts[key] <= count <= true_counts[key] + summary.get_error(key)
+        assert summary.get_error(key) <= summary.max_error
+    for key, count in true_counts.items():
+        assert count <= summary.max_error or key in summary
+
+
+# ----- Begin Sketch Tests -----
+@pytest.mark.parametrize('capacity', [1, 10, 100, 10000])
+def test_sketch_space_saving(capacity):
+    """Test Space-Saving count bounds, for added and merged summaries."""
+    keys = _get_skewed_keys(5000, seed=capacity)
+    true_counts = Counter(keys)
+    summary = hybkit.sketch.SpaceSaving(capacity)
+    for key in keys:
+        summary[key] += 1
+    _check_space_saving(summary, true_counts)
+    assert len(summary._heap) <= 2 * capacity + 16
+    if capacity >= len(true_counts):
+        assert summary.max_error == 0
+        assert summary.to_counter() == true_counts
+
+    merged_summary = hybkit.sketch.SpaceSaving(capacity)
+    other_summary = hybkit.sketch.SpaceSaving(capacity)
+    for i, key in enumerate(keys):
+        (merged_summary if i % 3 else other_summary).add(key, 2)
+    merged_summary.merge(other_summary)
+    double_counts = Counter({key: count * 2 for key, count in true_counts.items()})
+    _check_space_saving(merged_summary, double_counts)
+
+    state = json.loads(json.dumps(summary.get_state()))
+    restored_summary = hybkit.sketch.SpaceSaving.from_state(state)
+    assert restored_summary.most_common() == summary.most_common()
+    assert restored_summary.max_error == summary.max_error
+
+
+@pytest.mark.parametrize('precision', [4, 10, 14])
+def test_sketch_hyperloglog(precision):
+    """Test HyperLogLog distinct count estimates, for added and merged summaries."""
+    for num_keys in [0, 10, 1000, 50000]:
+        summary = hybkit.sketch.HyperLogLog(precision)
+        other_summary = hybkit.sketch.HyperLogLog(precision)
+        summary.update('key_%i' % i for i in range(num_keys // 2))
+        other_summary.update('key_%i' % i for i in range(num_keys // 4, num_keys))
+        summary.merge(other_summary)
+        assert summary.estimate() == pytest.approx(num_keys, rel=4 * summary.relative_error)
+        restored_summary = hybkit.sketch.HyperLogLog.from_state(
+            json.loads(json.dumps(summary.get_state()))
+        )
+        assert restored_summary.estimate() == summary.estimate()
+    with pytest.raises(HybkitArgError):
+        summary.merge(hybkit.sketch.HyperLogLog(precision + 1))
+
+
+@pytest.mark.parametrize('compression', [10, 100])
+def test_sketch_tdigest(compression):
+    """Test t-digest quantile estimates are within the reported rank errors."""
+    rng = np.random.default_rng(compression)
+    values = np.concatenate((rng.normal(-20.0, 5.0, 30000), rng.exponential(3.0, 10000)))
+    summary = hybkit.sketch.TDigest(compression)
+    other_summary = hybkit.sketch.TDigest(compression)
+    for value in values[:1000].tolist():
+        summary.add(value)
+    summary.update(values[1000:20000])
+    other_summary.update(values[20000:].tolist())
+    summary.merge(other_summary)
+    assert summary.count == len(values)
+    assert len(summary) <= compression * 2
+    sorted_values = np.sort(values)
+    for q in [0.0, 0.001, 0.05, 0.25, 0.5, 0.75, 0.95, 0.999, 1.0]:
+        estimate = summary.quantile(q)
+        rank = np.searchsorted(sorted_values, estimate) / len(values)
+        assert abs(rank - q) <= summary.get_rank_error(q)
+    assert summary.quantile(0.0) == values.min()
+    assert summary.quantile(1.0) == values.max()
+
+    restored_summary = hybkit.sketch.TDigest.from_state(
+        json.loads(json.dumps(summary.get_state()))
+    )
+    assert restored_summary.quantile(0.5) == summary.quantile(0.5)
+
+
+def test_sketch_misc():
+    """Test empty summaries and errors for invalid arguments."""
+    assert hybkit.sketch.TDigest().quantile(0.5) is None
+    assert hybkit.sketch.TDigest().get_rank_error(0.5) is None
+    assert hybkit.sketch.HyperLogLog().estimate() == 0.0
+    assert hybkit.sketch.SpaceSaving()['key'] == 0
+    for bad_args in [
+        (hybkit.sketch.SpaceSaving, 0),
+        (hybkit.sketch.SpaceSaving, 1.5),
+        (hybkit.sketch.HyperLogLog, 3),
+        (hybkit.sketch.HyperLogLog, 19),
+        (hybkit.sketch.TDigest, 5),
+    ]:
+        with pytest.raises(HybkitArgError):
+            bad_args[0](bad_args[1])
+    summary = hybkit.sketch.SpaceSaving(2)
+    summary['key'] += 2
+    with pytest.raises(HybkitArgError):
+        summary['key'] = 1
+    with pytest.raises(HybkitArgError):
+        summary.merge(Counter())
+    with pytest.raises(HybkitArgError):
+        hybkit.sketch.TDigest().quantile(1.5)
+    with pytest.raises(HybkitArgError):
+        hybkit.sketch.TDigest().merge(summary)
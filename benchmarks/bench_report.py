@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Reporting of benchmark results shared by the hybkit benchmarks.
+
+Each result is a :obj:`dict` with the keys ``name``, ``num_records``,
+``records_per_sec``, and ``peak_bytes``.
+"""
+
+import json
+
+
+def print_results(results, title):
+    """Print a table of benchmark results."""
+    name_width = max([len(result['name']) for result in results] + [len(title)])
+    print(('{:<%i}  {:>10}  {:>14}  {:>10}' % name_width).format(
+        title, 'Records', 'Records/sec', 'Peak MiB'
+    ))
+    for result in results:
+        print(('{:<%i}  {:>10}  {:>14,.0f}  {:>10.2f}' % name_width).format(
+            result['name'], result['num_records'], result['records_per_sec'],
+            result['peak_bytes'] / 2 ** 20,
+        ))
+
+
+def write_json(out_file_name, results, **info):
+    """Write benchmark results and additional information to a JSON file."""
+    output = dict(info)
+    output['results'] = results
+    with open(out_file_name, 'w') as out_file:
+        json.dump(output, out_file, indent=2)
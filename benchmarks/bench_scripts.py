@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Throughput and memory benchmark of the hybkit command-line scripts.
+
+Synthetic hyb, Vienna, and CT files from :mod:`synthetic_data` are written to a
+temporary directory, and each script is run on them as a subprocess. Throughput is
+reported as the best records/sec of several runs, and peak memory as the
+maximum resident set size of the script process.
+
+Usage::
+
+    python benchmarks/bench_scripts.py [-n NUM_RECORDS] [-r REPEAT] [--scripts SCRIPT ...]
+        [--processes PROCESSES] [--json OUT_FILE]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import bench_report
+import synthetic_data
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SCRIPTS_DIR = os.path.join(REPO_DIR, 'scripts')
+DEFAULT_NUM_RECORDS = 10000
+DEFAULT_REPEAT = 3
+# Fold analysis requires hybrids with a single miRNA, so is not included.
+ANALYSIS_TYPES = ['energy', 'type', 'mirna', 'target']
+
+
+def make_script_runs(files, out_dir, processes=None):
+    """
+    Return (name, script, args) tuples of script runs.
+
+    Args:
+        files (dict): Synthetic file names, as returned by :func:`synthetic_data.write_files`.
+        out_dir (str): Directory for script output.
+        processes (:obj:`int`, optional): Number of worker processes for scripts
+            supporting parallel processing.
+    """
+    in_args = ['-i', files['hyb'], '-f', files['vienna']]
+    out_args = ['-d', out_dir]
+    parallel_args = [] if processes is None else ['--processes', str(processes)]
+    evaluated_base = os.path.join(out_dir, os.path.basename(files['hyb']).rsplit('.', 1)[0])
+    evaluated_args = ['-i', evaluated_base + '_evaluated.hyb',
+                      '-f', evaluated_base + '_evaluated.vienna']
+    return [
+        ('hyb_check (Vienna)', 'hyb_check', in_args),
+        ('hyb_check (CT)', 'hyb_check', ['-i', files['hyb'], '-f', files['ct']]),
+        ('hyb_eval', 'hyb_eval', in_args + out_args + ['-t', 'type', 'mirna'] + parallel_args),
+        ('hyb_filter', 'hyb_filter',
+            evaluated_args + out_args + ['--filter', 'has_mirna'] + parallel_args),
+        ('hyb_analyze', 'hyb_analyze',
+            evaluated_args + out_args + ['-p', 'False', '-a'] + ANALYSIS_TYPES),
+    ]
+
+
+def measure_script(script, args, num_records, repeat=DEFAULT_REPEAT):
+    """
+    Return (records/sec, peak bytes) of a script run.
+
+    Args:
+        script (str): Name of the script in the ``scripts`` directory.
+        args (list): Command-line arguments of the script.
+        num_records (int): Number of records processed by each run.
+        repeat (:obj:`int`, optional): Number of runs. The fastest run is reported.
+    """
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, script), '--silent'] + args
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_DIR, env.get('PYTHONPATH')]))
+    best_seconds = None
+    peak_bytes = 0
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+        # Use wait4 to get the resource usage of this child process only.
+        _pid, status, rusage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start_time
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode:
+            message = 'Script failed with exit code %i: %s' % (
+                process.returncode, ' '.join(command)
+            )
+            raise RuntimeError(message)
+        if best_seconds is None or seconds < best_seconds:
+            best_seconds = seconds
+        # ru_maxrss is in kilobytes on Linux.
+        peak_bytes = max(peak_bytes, rusage.ru_maxrss * 1024)
+    return num_records / best_seconds, peak_bytes
+
+
+def make_parser():
+    """Return the argument parser of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--num_records', type=int, default=DEFAULT_NUM_RECORDS)
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=synthetic_data.DEFAULT_SEED)
+    parser.add_argument('--scripts', nargs='+', metavar='SCRIPT',
+                        help='Run only script runs with names containing one of these strings.')
+    parser.add_argument('--processes', type=int,
+                        help='Number of worker processes for hyb_eval and hyb_filter.')
+    parser.add_argument('--json', metavar='OUT_FILE', help='Write results as JSON.')
+    return parser
+
+
+def main(argv=None):
+    """Run the script benchmarks and print the results."""
+    args = make_parser().parse_args(argv)
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Write files in a subprocess, as the resident set size of this process at the
+        #   time of forking each script process is included in its maximum.
+        subprocess.run([
+            sys.executable, synthetic_data.__file__, '-n', str(args.num_records),
+            '--seed', str(args.seed), '-d', temp_dir,
+        ], check=True, stdout=subprocess.DEVNULL)
+        files = {
+            file_type: os.path.join(temp_dir, 'synthetic.' + file_type)
+            for file_type in ('hyb', 'vienna', 'ct')
+        }
+        out_dir = os.path.join(temp_dir, 'out')
+        os.mkdir(out_dir)
+        for name, script, script_args in make_script_runs(files, out_dir, args.processes):
+            # Script runs depend on output of hyb_eval, so it is always run.
+            if args.scripts and not any(run in name for run in args.scripts) \
+                    and script != 'hyb_eval':
+                continue
+            records_per_sec, peak_bytes = measure_script(
+                script, script_args, args.num_records, args.repeat
+            )
+            results.append({
+                'name': name,
+                'num_records': args.num_records,
+                'records_per_sec': records_per_sec,
+                'peak_bytes': peak_bytes,
+            })
+
+    print('Processes: %s\n' % (args.processes or 1))
+    bench_report.print_results(results, 'Script')
+    if args.json:
+        bench_report.write_json(args.json, results, processes=args.processes)
+    return results
+
+
+if __name__ == '__main__':
+    main()
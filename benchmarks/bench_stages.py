@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Throughput and memory benchmark of hybkit record-processing stages.
+
+Each stage is run over synthetic records from :mod:`synthetic_data`. Throughput is
+reported as the best records/sec of several timed runs, and peak memory as the
+peak allocation of a separate run measured with :mod:`tracemalloc`, so that tracing
+overhead does not affect timing. Results can be saved as JSON to compare
+between hybkit versions.
+
+Usage::
+
+    python benchmarks/bench_stages.py [-n NUM_RECORDS] [-r REPEAT] [--stages STAGE ...]
+        [--json OUT_FILE]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import bench_report
+import hybkit
+import synthetic_data
+
+DEFAULT_NUM_RECORDS = 10000
+DEFAULT_REPEAT = 3
+PROPS = [
+    ('has_mirna', None),
+    ('any_seg_type_is', 'mRNA'),
+    ('seg1_contains', 'MirBase'),
+    ('any_seg_contains', 'GENE1'),
+    ('mirna_dimer', None),
+]
+# Fold analysis requires hybrids with a single miRNA, so is benchmarked separately.
+ANALYSIS_TYPES = ['energy', 'type', 'mirna', 'target']
+
+
+def _group_lines(lines, num_lines_list):
+    grouped = []
+    start = 0
+    for num_lines in num_lines_list:
+        grouped.append(lines[start:(start + num_lines)])
+        start += num_lines
+    return grouped
+
+
+def _parse_records(hyb_lines, eval_types=False, eval_mirna=False, vienna_lines=None):
+    if vienna_lines is None:
+        records = [hybkit.HybRecord.from_line(line) for line in hyb_lines]
+    else:
+        hyb_file = hybkit.HybFile(io.StringIO(''.join(hyb_lines)), from_file_like=True)
+        fold_file = hybkit.ViennaFile(io.StringIO(''.join(vienna_lines)), from_file_like=True)
+        records = list(hybkit.HybFoldIter(hyb_file, fold_file, combine=True))
+    for record in records:
+        if eval_types:
+            record.eval_types()
+        if eval_mirna:
+            record.eval_mirna()
+    return records
+
+
+def make_stages(records):
+    """
+    Return benchmark stages for synthetic records.
+
+    Each stage is a tuple of (name, num_records, setup, run), where ``setup()`` returns
+    the input of the stage, ``run(input)`` performs the benchmarked work on num_records
+    records, and only ``run`` is timed.
+    """
+    num_records = len(records)
+    hyb_lines = synthetic_data.make_hyb_lines(records)
+    vienna_lines = synthetic_data.make_vienna_lines(records)
+    ct_lines = synthetic_data.make_ct_lines(records)
+    vienna_groups = _group_lines(vienna_lines, [3] * len(records))
+    ct_groups = _group_lines(ct_lines, [len(record.seq) + 1 for record in records])
+    hyb_text, vienna_text, ct_text = (
+        ''.join(lines) for lines in (hyb_lines, vienna_lines, ct_lines)
+    )
+
+    def run_hyb_fold_iter(file_texts, fold_class):
+        hyb_file = hybkit.HybFile(io.StringIO(file_texts[0]), from_file_like=True)
+        fold_file = fold_class(io.StringIO(file_texts[1]), from_file_like=True)
+        for _ in hybkit.HybFoldIter(hyb_file, fold_file, combine=True):
+            pass
+
+    def parse_pairs():
+        hyb_file = hybkit.HybFile(io.StringIO(hyb_text), from_file_like=True)
+        fold_file = hybkit.ViennaFile(io.StringIO(vienna_text), from_file_like=True)
+        return list(hybkit.HybFoldIter(hyb_file, fold_file))
+
+    def run_count_mismatches(pairs):
+        for hyb_record, fold_record in pairs:
+            fold_record.count_hyb_record_mismatches(hyb_record)
+
+    def run_batch_count_mismatches(pairs):
+        hybkit.FoldRecord.batch_count_seq_mismatches(
+            [hyb_record.seq for hyb_record, _ in pairs],
+            [fold_record.seq for _, fold_record in pairs],
+        )
+
+    def run_eval_types(hyb_records):
+        for record in hyb_records:
+            record.eval_types()
+
+    def run_eval_mirna(hyb_records):
+        for record in hyb_records:
+            record.eval_mirna()
+
+    def run_prop(hyb_records):
+        for record in hyb_records:
+            for prop, prop_compare in PROPS:
+                record.prop(prop, prop_compare)
+
+    def parse_single_mirna_records():
+        hyb_records = _parse_records(hyb_lines, True, True, vienna_lines)
+        return [
+            record for record in hyb_records
+            if record.prop('has_mirna') and not record.prop('mirna_dimer')
+        ]
+
+    num_single_mirna = len(parse_single_mirna_records())
+
+    def run_analysis(hyb_records, analysis_types=ANALYSIS_TYPES):
+        analysis = hybkit.analysis.Analysis(analysis_types)
+        for record in hyb_records:
+            analysis.add_hyb_record(record)
+
+    return [
+        ('HybRecord.from_line', num_records,
+            lambda: hyb_lines,
+            lambda lines: [hybkit.HybRecord.from_line(line) for line in lines]),
+        ('HybRecord.to_line', num_records,
+            lambda: _parse_records(hyb_lines),
+            lambda hyb_records: [record.to_line() for record in hyb_records]),
+        ('FoldRecord.from_vienna_lines', num_records,
+            lambda: vienna_groups,
+            lambda groups: [hybkit.FoldRecord.from_vienna_lines(lines) for lines in groups]),
+        ('FoldRecord.from_ct_lines', num_records,
+            lambda: ct_groups,
+            lambda groups: [hybkit.FoldRecord.from_ct_lines(lines) for lines in groups]),
+        ('HybFoldIter (Vienna)', num_records,
+            lambda: (hyb_text, vienna_text),
+            lambda file_texts: run_hyb_fold_iter(file_texts, hybkit.ViennaFile)),
+        ('HybFoldIter (CT)', num_records,
+            lambda: (hyb_text, ct_text),
+            lambda file_texts: run_hyb_fold_iter(file_texts, hybkit.CtFile)),
+        ('FoldRecord.count_hyb_record_mismatches', num_records,
+            parse_pairs,
+            run_count_mismatches),
+        ('FoldRecord.batch_count_seq_mismatches', num_records,
+            parse_pairs,
+            run_batch_count_mismatches),
+        ('HybRecord.eval_types', num_records,
+            lambda: _parse_records(hyb_lines),
+            run_eval_types),
+        ('HybRecord.eval_mirna', num_records,
+            lambda: _parse_records(hyb_lines, eval_types=True),
+            run_eval_mirna),
+        ('HybRecord.prop (%i props)' % len(PROPS), num_records,
+            lambda: _parse_records(hyb_lines, eval_types=True, eval_mirna=True),
+            run_prop),
+        ('Analysis.add_hyb_record', num_records,
+            lambda: _parse_records(hyb_lines, True, True, vienna_lines),
+            run_analysis),
+        ('Analysis.add_hyb_record (fold)', num_single_mirna,
+            parse_single_mirna_records,
+            lambda hyb_records: run_analysis(hyb_records, ['fold'])),
+    ]
+
+
+def measure_stage(setup, run, num_records, repeat=DEFAULT_REPEAT):
+    """
+    Return (records/sec, peak bytes) of a benchmark stage.
+
+    Args:
+        setup (callable): Function returning the input of the stage.
+        run (callable): Function performing the work of the stage on the input.
+        num_records (int): Number of records processed by each run.
+        repeat (:obj:`int`, optional): Number of timed runs. The fastest run is reported.
+    """
+    best_seconds = None
+    for _ in range(repeat):
+        stage_input = setup()
+        start_time = time.perf_counter()
+        run(stage_input)
+        seconds = time.perf_counter() - start_time
+        if best_seconds is None or seconds < best_seconds:
+            best_seconds = seconds
+        del stage_input
+
+    stage_input = setup()
+    tracemalloc.start()
+    run(stage_input)
+    _current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return num_records / best_seconds, peak_bytes
+
+
+def make_parser():
+    """Return the argument parser of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--num_records', type=int, default=DEFAULT_NUM_RECORDS)
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=synthetic_data.DEFAULT_SEED)
+    parser.add_argument('--stages', nargs='+', metavar='STAGE',
+                        help='Run only stages with names containing one of these strings.')
+    parser.add_argument('--json', metavar='OUT_FILE', help='Write results as JSON.')
+    return parser
+
+
+def main(argv=None):
+    """Run the stage benchmarks and print the results."""
+    args = make_parser().parse_args(argv)
+    hybkit.util.set_setting('error_mode', 'raise')
+    records = synthetic_data.make_records(args.num_records, seed=args.seed)
+    results = []
+    for name, num_records, setup, run in make_stages(records):
+        if args.stages and not any(stage in name for stage in args.stages):
+            continue
+        records_per_sec, peak_bytes = measure_stage(setup, run, num_records, args.repeat)
+        results.append({
+            'name': name,
+            'num_records': num_records,
+            'records_per_sec': records_per_sec,
+            'peak_bytes': peak_bytes,
+        })
+
+    print('hybkit: %s\n' % hybkit.__version__)
+    bench_report.print_results(results, 'Stage')
+    if args.json:
+        bench_report.write_json(args.json, results, hybkit_version=hybkit.__version__)
+    return results
+
+
+if __name__ == '__main__':
+    main()
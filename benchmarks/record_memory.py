@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Memory benchmark comparing :class:`hybkit.HybRecord` and :class:`hybkit.CompactHybRecord`.
+
+Reports the memory allocated per record (measured with :mod:`tracemalloc`) when holding
+a list of records parsed from synthetic hyb-format lines, the relative saving of
+:class:`hybkit.CompactHybRecord`, and whether record instances have a populated ``__dict__``.
+
+Usage::
+
+    python benchmarks/record_memory.py [num_records]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import hybkit
+
+DEFAULT_NUM_RECORDS = 100000
+HYB_LINE_TEMPLATE = (
+    '{read_id}_{count}\tATCACATTGCCAGGGATTTCCAATCCCCAACAATGTGAAAACGGCTGTC\t-12.{decimal}\t'
+    'MIMAT0000078_MirBase_miR-23a_microRNA\t1\t21\t1\t21\t0.0027\t'
+    'ENSG00000188229_ENST00000340384_TUBB2C_mRNA\t23\t49\t{ref_start}\t{ref_end}\t1.2e-06\t'
+    'read_count={count};seg1_type=microRNA;seg2_type=mRNA\n'
+)
+
+
+def make_lines(num_records):
+    """Return a list of synthetic hyb-format lines."""
+    return [
+        HYB_LINE_TEMPLATE.format(
+            read_id=i,
+            count=(i % 50) + 1,
+            decimal=i % 10,
+            ref_start=1000 + i,
+            ref_end=1026 + i,
+        ) for i in range(num_records)
+    ]
+
+
+def measure_bytes_per_record(record_class, lines):
+    """Return the bytes allocated per record for holding all records from lines in memory."""
+    tracemalloc.start()
+    records = [record_class.from_line(line) for line in lines]
+    current_bytes, _peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current_bytes / len(lines)
+
+
+def describe_instance_dict(record_class, line):
+    """Return a description of the instance ``__dict__`` of an evaluated record read from line."""
+    record = record_class.from_line(line)
+    record.eval_types()
+    record.eval_mirna()
+    if not hasattr(record, '__dict__'):
+        return 'none'
+    return '%i keys' % len(vars(record))
+
+
+def main(num_records=DEFAULT_NUM_RECORDS):
+    """Run the memory benchmark and print the results."""
+    lines = make_lines(num_records)
+    results = {}
+    instance_dicts = {}
+    for record_class in (hybkit.HybRecord, hybkit.CompactHybRecord):
+        results[record_class.__name__] = measure_bytes_per_record(record_class, lines)
+        instance_dicts[record_class.__name__] = describe_instance_dict(record_class, lines[0])
+
+    print('Records: %i' % num_records)
+    for class_name, bytes_per_record in results.items():
+        print('  {:<18} {:>8.1f} bytes/record  (__dict__ after evaluation: {})'.format(
+            class_name, bytes_per_record, instance_dicts[class_name]
+        ))
+    ratio = results['CompactHybRecord'] / results['HybRecord']
+    print('  CompactHybRecord / HybRecord: %.2f (%.0f%% saved)' % (ratio, (1 - ratio) * 100))
+    return results
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUM_RECORDS)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Deterministic generator of synthetic hyb, Vienna, and CT files for benchmarking.
+
+Records are generated from a seeded :class:`random.Random` instance, so the same
+size, composition, and seed always produce identical files. Each hyb record has
+a matching fold record in both the Vienna and CT formats with an identical sequence
+and energy, so paired files iterate with :class:`hybkit.HybFoldIter` without skips.
+
+Usage::
+
+    python benchmarks/synthetic_data.py [-n NUM_RECORDS] [--seed SEED] [-d OUT_DIR]
+"""
+
+import argparse
+import os
+import random
+
+BASES = 'ACGT'
+MIRNA_TYPE = 'microRNA'
+DEFAULT_NUM_RECORDS = 10000
+DEFAULT_SEED = 0
+DEFAULT_COMPOSITION = {
+    # Fraction of records with a miRNA in segment 1, segment 2, or both segments.
+    #   The remaining records contain no miRNA.
+    'mirna_5p_fraction': 0.6,
+    'mirna_3p_fraction': 0.2,
+    'mirna_dimer_fraction': 0.05,
+    # Fraction of records sharing the read id of the prior record.
+    'dup_id_fraction': 0.1,
+    # Number of distinct miRNA and target reference names.
+    'num_mirna_refs': 300,
+    'num_target_refs': 3000,
+    # Segment types of non-miRNA references.
+    'target_types': ('mRNA', 'lncRNA', 'rRNA', 'snoRNA', 'tRNA'),
+    # Range of lengths of miRNA and target segments.
+    'mirna_length': (19, 24),
+    'target_length': (18, 60),
+    # Maximum read count of a record.
+    'max_read_count': 50,
+}
+
+
+class SyntheticRecord(object):
+    """
+    Synthetic hybrid record with matching hyb and fold representations.
+
+    Args:
+        read_id (str): Read identifier, shared by duplicate-id records.
+        seg_refs (tuple): Reference names of segment 1 and segment 2.
+        seg_seqs (tuple): Sequences of segment 1 and segment 2.
+        fold (str): Dot-bracket fold representation of the full sequence.
+        energy (str): Predicted energy of the fold as a string (Ex: ``'-12.3'``).
+        read_count (int): Read count of the hybrid.
+    """
+
+    def __init__(self, read_id, seg_refs, seg_seqs, fold, energy, read_count):
+        self.read_id = read_id
+        self.seg_refs = seg_refs
+        self.seg_seqs = seg_seqs
+        self.seq = ''.join(seg_seqs)
+        self.fold = fold
+        self.energy = energy
+        self.read_count = read_count
+
+    def _seg_coords(self):
+        seg1_len = len(self.seg_seqs[0])
+        return ((1, seg1_len), (seg1_len + 1, len(self.seq)))
+
+    def fold_name(self):
+        """Return the name of the fold record in the Hyb program Vienna naming style."""
+        name_items = []
+        for ref, (read_start, read_end) in zip(self.seg_refs, self._seg_coords()):
+            name_items.append('%s_%s_%i_%i' % (self.read_id, ref, read_start, read_end))
+        return '-'.join(name_items)
+
+    def hyb_line(self):
+        """Return the record as a hyb-format line."""
+        items = [self.read_id, self.seq, self.energy]
+        for ref, (read_start, read_end) in zip(self.seg_refs, self._seg_coords()):
+            ref_start = 100 + read_start
+            items += [
+                ref, str(read_start), str(read_end),
+                str(ref_start), str(ref_start + read_end - read_start), '0.001',
+            ]
+        items.append('read_count=%i;' % self.read_count)
+        return '\t'.join(items) + '\n'
+
+    def vienna_lines(self):
+        """Return the fold record as a list of Vienna-format lines."""
+        return [
+            '>' + self.fold_name() + '\n',
+            self.seq + '\n',
+            '%s\t(%s)\n' % (self.fold, self.energy),
+        ]
+
+    def ct_lines(self):
+        """Return the fold record as a list of CT-format lines."""
+        seq_len = len(self.seq)
+        pair_indexes = [0] * seq_len
+        open_stack = []
+        for index, char in enumerate(self.fold, start=1):
+            if char == '(':
+                open_stack.append(index)
+            elif char == ')':
+                open_index = open_stack.pop()
+                pair_indexes[open_index - 1] = index
+                pair_indexes[index - 1] = open_index
+        lines = ['%i\tdG = %s\tdH = %s\t%s\n' % (
+            seq_len, self.energy, self.energy, self.fold_name()
+        )]
+        for index, (base, pair_index) in enumerate(zip(self.seq, pair_indexes), start=1):
+            next_index = index + 1 if index < seq_len else 0
+            lines.append('%i\t%s\t%i\t%i\t%i\t%i\n' % (
+                index, base, index - 1, next_index, pair_index, index
+            ))
+        return lines
+
+
+def make_records(num_records=DEFAULT_NUM_RECORDS, seed=DEFAULT_SEED, composition=None):
+    """
+    Return a deterministic list of synthetic records.
+
+    Args:
+        num_records (:obj:`int`, optional): Number of records to generate.
+        seed (:obj:`int`, optional): Seed of the random number generator.
+        composition (:obj:`dict`, optional): Values overriding those
+            in :data:`DEFAULT_COMPOSITION`.
+    """
+    comp = dict(DEFAULT_COMPOSITION)
+    if composition:
+        comp.update(composition)
+    rand = random.Random(seed)
+
+    mirna_refs = [
+        'MIMAT%07i_MirBase_miR-%i_%s' % (i, i, MIRNA_TYPE)
+        for i in range(comp['num_mirna_refs'])
+    ]
+    target_types = comp['target_types']
+    target_refs = [
+        'ENSG%011i_ENST%011i_GENE%i_%s' % (i, i, i, target_types[i % len(target_types)])
+        for i in range(comp['num_target_refs'])
+    ]
+    mirna_5p_cutoff = comp['mirna_5p_fraction']
+    mirna_3p_cutoff = mirna_5p_cutoff + comp['mirna_3p_fraction']
+    mirna_dimer_cutoff = mirna_3p_cutoff + comp['mirna_dimer_fraction']
+
+    def make_seg(is_mirna):
+        if is_mirna:
+            ref = rand.choice(mirna_refs)
+            seq_len = rand.randint(*comp['mirna_length'])
+        else:
+            ref = rand.choice(target_refs)
+            seq_len = rand.randint(*comp['target_length'])
+        return ref, ''.join(rand.choice(BASES) for _ in range(seq_len))
+
+    records = []
+    read_num = 0
+    for record_i in range(num_records):
+        # Records with a duplicate id share the read id and count of the prior record.
+        if not record_i or rand.random() >= comp['dup_id_fraction']:
+            read_num += 1
+            read_count = rand.randint(1, comp['max_read_count'])
+            read_id = '%i_%i' % (read_num, read_count)
+        composition_val = rand.random()
+        is_dimer = (mirna_3p_cutoff <= composition_val < mirna_dimer_cutoff)
+        is_mirna = (
+            composition_val < mirna_5p_cutoff or is_dimer,
+            mirna_5p_cutoff <= composition_val < mirna_3p_cutoff or is_dimer,
+        )
+        seg_refs, seg_seqs = zip(*(make_seg(seg_is_mirna) for seg_is_mirna in is_mirna))
+
+        # Pair a stem between the two segments, with unpaired bases at each end.
+        seg1_len, seg2_len = len(seg_seqs[0]), len(seg_seqs[1])
+        stem_len = rand.randint(1, min(seg1_len, seg2_len) - 1)
+        fold = (
+            '.' * (seg1_len - stem_len) + '(' * stem_len
+            + ')' * stem_len + '.' * (seg2_len - stem_len)
+        )
+        energy = '-%.1f' % (stem_len * rand.uniform(0.5, 2.0))
+        records.append(SyntheticRecord(
+            read_id=read_id,
+            seg_refs=seg_refs,
+            seg_seqs=seg_seqs,
+            fold=fold,
+            energy=energy,
+            read_count=read_count,
+        ))
+    return records
+
+
+def make_hyb_lines(records):
+    """Return a list of hyb-format lines of records."""
+    return [record.hyb_line() for record in records]
+
+
+def make_vienna_lines(records):
+    """Return a list of Vienna-format lines of records."""
+    return [line for record in records for line in record.vienna_lines()]
+
+
+def make_ct_lines(records):
+    """Return a list of CT-format lines of records."""
+    return [line for record in records for line in record.ct_lines()]
+
+
+def write_files(out_dir, basename='synthetic', **kwargs):
+    """
+    Write synthetic hyb, Vienna, and CT files and return their names.
+
+    Args:
+        out_dir (str): Directory to write files to.
+        basename (:obj:`str`, optional): Basename of the written files.
+        **kwargs: Passed to :func:`make_records`.
+
+    Returns:
+        :obj:`dict` of file names, keyed by format (``'hyb'``, ``'vienna'``, ``'ct'``).
+    """
+    records = make_records(**kwargs)
+    file_names = {}
+    for file_type, make_lines in (
+            ('hyb', make_hyb_lines), ('vienna', make_vienna_lines), ('ct', make_ct_lines)):
+        file_name = os.path.join(out_dir, basename + '.' + file_type)
+        with open(file_name, 'w') as out_file:
+            out_file.writelines(make_lines(records))
+        file_names[file_type] = file_name
+    return file_names
+
+
+def make_parser():
+    """Return the argument parser of the generator."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--num_records', type=int, default=DEFAULT_NUM_RECORDS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('-d', '--out_dir', default='.')
+    parser.add_argument('-b', '--basename', default='synthetic')
+    return parser
+
+
+def main(argv=None):
+    """Write synthetic files and print their names."""
+    args = make_parser().parse_args(argv)
+    file_names = write_files(
+        args.out_dir, args.basename, num_records=args.num_records, seed=args.seed
+    )
+    for file_name in file_names.values():
+        print(file_name)
+    return file_names
+
+
+if __name__ == '__main__':
+    main()
@@ -49,6 +49,10 @@ hyb_analyze = imp.load_source(
     'hyb_analyze',
     os.path.join(scripts_dir, 'hyb_analyze'),
 )
+hyb_pipeline = imp.load_source(
+    'hyb_pipeline',
+    os.path.join(scripts_dir, 'hyb_pipeline'),
+)
 
 # -- Project information -----------------------------------------------------
 
@@ -21,6 +21,10 @@ chimeric genomic sequences and associated fold-information:
 +----------------------------+---------------------------------------------------------------+
 | :class:`HybRecord`         | Class to store a single hyb (hybrid) sequence record          |
 +----------------------------+---------------------------------------------------------------+
+| :class:`CompactHybRecord`  | Memory-compact (slotted) variant of :class:`HybRecord`        |
++----------------------------+---------------------------------------------------------------+
+| :class:`LazyHybRecord`     | Variant of :class:`HybRecord` parsing fields on first access  |
++----------------------------+---------------------------------------------------------------+
 | :class:`FoldRecord`        | Class to store predicted RNA                                  |
 |                            | secondary structure information for hybrid reads              |
 +----------------------------+---------------------------------------------------------------+
@@ -45,16 +49,29 @@ information:
 | :class:`HybFoldIter`    | Class for concurrent iteration over a :class:`HybFile` and       |
 |                         | a :class:`ViennaFile` or :class:`CtFile`                         |
 +-------------------------+------------------------------------------------------------------+
+| :class:`RecordWriter`   | Class for buffered writing of records to a :class:`HybFile` or   |
+|                         | :class:`ViennaFile`                                              |
++-------------------------+------------------------------------------------------------------+
+| :class:`MappedHybFile`  | Class for memory-mapped reading of hyb-format files with         |
+|                         | random access to records by index                                |
++-------------------------+------------------------------------------------------------------+
+| :class:`HybBatch`       | Class storing a batch of hyb records as column arrays, as        |
+|                         | returned by :meth:`HybFile.read_batches`                         |
++-------------------------+------------------------------------------------------------------+
 
 """
 
 import copy
+import itertools
 import logging
+import mmap
 import os
 import sys
 from collections import Counter
-from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Type, Union
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Type, Union
 
+import numpy as np
 from typing_extensions import Self
 
 Bio, Seq, SeqRecord = None, None, None
@@ -520,6 +537,9 @@ class HybRecord:
             raise HybkitMiscError(message)
 
         self.flags[flag_key] = str(flag_val)
+        # Records not read from a line are always treated as modified.
+        if not self._dirty:
+            self._dirty = True
 
     # HybRecord : Public Methods : Flag_Info : seg_type
     def get_seg1_type(
@@ -789,6 +809,8 @@ class HybRecord:
                 message += 'and FoldRecord energy: %s ' % self.fold_record.energy
                 message += 'do not match!'
                 raise HybkitConstructorError(message)
+            if not self._dirty and self.energy != self.fold_record.energy:
+                self._dirty = True
             self.energy = self.fold_record.energy
 
     # HybRecord : Public Methods : eval_mirna
@@ -1185,6 +1207,35 @@ class HybRecord:
             ret_string += '\n'
         return ret_string
 
+    # HybRecord : Public Methods : Record Parsing
+    def is_modified(self) -> bool:
+        """
+        Return ``True`` if the record differs from the hyb-format line it was read from.
+
+        Records read with :meth:`from_line` store their source line, which is written
+        by :meth:`HybFile.write_record` in place of re-formatting the record while it
+        is unmodified (if :attr:`HybFile.write_source_lines` is ``True``).
+        Records are marked as modified by :meth:`set_flag` (including
+        by evaluation methods such as :meth:`eval_types` and :meth:`eval_mirna`),
+        by :meth:`set_fold_record` when the record energy is changed, and by
+        :meth:`mark_modified`. Otherwise, the record :attr:`id`, :attr:`seq`, :attr:`energy`,
+        :attr:`seg1_props`, :attr:`seg2_props`, and :attr:`flags` are compared to their
+        values when read, so direct changes to these attributes are also detected.
+        Records not read from a line are always considered modified.
+        """
+        if self._dirty:
+            return True
+        return self._get_source_items() != self._source_items
+
+    # HybRecord : Public Methods : Record Parsing
+    def mark_modified(self) -> None:
+        """
+        Mark the record as modified since being read, so that it is re-formatted when written.
+
+        See :meth:`is_modified`.
+        """
+        self._dirty = True
+
     # HybRecord : Public Methods : Record Parsing
     def to_csv(
             self,
@@ -1399,7 +1450,8 @@ class HybRecord:
         Returns:
             :class:`HybRecord` instance containing record information.
         """
-        line_items = line.strip().split('\t')
+        source_line = line.strip()
+        line_items = source_line.split('\t')
         if (len(line_items) < hybkit.settings.MIN_RECORD_FIELDS
             or len(line_items) > hybkit.settings.MAX_RECORD_FIELDS
             ):
@@ -1429,41 +1481,19 @@ class HybRecord:
         if len(line_items) > hybkit.settings.MIN_RECORD_FIELDS:
             flags = cls._read_flags(line_items[15])
 
-        if hybformat_id:
-            # If 'seq_IDs_in_cluster' flag is set, use it to set count information
-            if 'seq_IDs_in_cluster' in flags and flags['seq_IDs_in_cluster'].strip():
-                if 'read_count' not in flags or 'count_total' not in flags:
-                    combined_read_count = 0
-                    combined_record_count = 0
-                    for cluster_hyb_id in flags['seq_IDs_in_cluster'].strip(' ,').split(','):
-                        cluster_id, cluster_count = cls._parse_hybformat_id(cluster_hyb_id)
-                        combined_read_count += int(cluster_count)
-                        combined_record_count += 1
-                    if 'read_count' not in flags:
-                        flags['read_count'] = combined_read_count
-                    if 'count_total' not in flags:
-                        flags['count_total'] = combined_record_count
-
-            # Otherwise, read count information directly from hybrid identifier
-            elif 'read_count' not in flags:
-                read_id, read_count = cls._parse_hybformat_id(hyb_id)
-                flags['read_count'] = read_count
-
-        if hybformat_ref:
-            for i, seg_props in enumerate([seg1_props, seg2_props], start=1):
-                ref = seg_props['ref_name']
-                seg_type_key = 'seg%i_type' % i
-                gene_id, transcript_id, gene_name, seg_type = cls._parse_hybformat_ref(ref)
-                if seg_type_key in flags and flags[seg_type_key] != seg_type:
-                    message = 'Problem reading in hybformat ref for reference: %s\n' % ref
-                    message += 'Inferred type: %s\n' % seg_type
-                    message += 'Does not equal current type flag: %s' % flags[seg_type_key]
-                    raise HybkitConstructorError(message)
-                elif seg_type_key not in flags:
-                    flags[seg_type_key] = seg_type
+        # Records with flags added from identifiers no longer match the source line.
+        num_line_flags = len(flags)
+        if hybformat_id or hybformat_ref:
+            cls._add_hybformat_flags(
+                hyb_id, seg1_props['ref_name'], seg2_props['ref_name'], flags,
+                hybformat_id=hybformat_id,
+                hybformat_ref=hybformat_ref,
+            )
 
-        return_obj = cls(hyb_id, seq, energy, seg1_props, seg2_props, flags)
-        return return_obj
+        record = cls._from_parsed(hyb_id, seq, energy, seg1_props, seg2_props, flags)
+        if len(flags) == num_line_flags:
+            record._set_source_line(source_line)
+        return record
 
     # HybRecord : Public Classmethods : Record Construction
     @classmethod
@@ -1524,7 +1554,7 @@ class HybRecord:
 
         if hyb_id is None:
             hyb_id = seg1_record.id + '--' + seg2_record.id
-        seq = seg1_record.seq + seg2_record.seq
+        seq = str(seg1_record.seq + seg2_record.seq)
         # energy =
         seg1_len = len(seg1_record.seq)
         seg2_len = len(seg2_record.seq)
@@ -1547,8 +1577,9 @@ class HybRecord:
         if 'seg2_det' not in flags:
             flags['seg2_det'] = seg2_record.description
 
-        return_obj = cls(hyb_id, seq, energy, seg1_props, seg2_props, flags)
-        return return_obj
+        return cls._from_parsed(
+            hyb_id, seq, energy, seg1_props, seg2_props, flags, check_flags=True
+        )
 
     @classmethod
     # HybRecord : Public Classmethods : Record Parsing
@@ -1582,6 +1613,43 @@ class HybRecord:
             ret_str += '\n'
         return ret_str
 
+    # HybRecord : Private Classmethods : Record Construction
+    @classmethod
+    def _from_parsed(
+            cls,
+            id: str,
+            seq: str,
+            energy: Optional[StrOrNum],
+            seg1_props: SegProps,
+            seg2_props: SegProps,
+            flags: FlagsDict,
+            check_flags: bool = False,
+            ) -> Self:
+        # Trusted construction path for freshly-parsed record values.
+        # Takes ownership of the provided seg_props and flags dicts without copying them.
+        #   seg_props dicts must contain all keys in SEGMENT_COLUMNS,
+        #   and str positional values are converted to int in place (once).
+        #   Flags values are expected to be str unless "check_flags" is True,
+        #   in which case they are checked against defined flags and converted to str.
+        if id is None or seq is None:
+            message = 'HybRecord initialization requires "id" '
+            message += 'and "seq" parameters to be defined.\n'
+            message += f'ID: "{id}", Seq: "{seq}"'
+            raise HybkitConstructorError(message)
+        record = cls.__new__(cls)
+        record.id = record._ensure_attr_types(id, 'id')
+        record.seq = record._ensure_attr_types(seq, 'seq')
+        record.energy = record._ensure_attr_types(energy, 'energy')
+        record.seg1_props = record._ensure_attr_types(seg1_props, 'seg_props')
+        record.seg2_props = record._ensure_attr_types(seg2_props, 'seg_props')
+        record.allow_undefined_flags = cls.settings['allow_undefined_flags']
+        if check_flags:
+            flags = record._make_flags_dict(flags)
+        record.flags = flags
+        record.fold_record = None
+        record._post_init_tasks()
+        return record
+
     # Start HybRecord Private Constants
     # HybRecord : Private Constants
     _SET_PROPS_SET = frozenset(SET_PROPS)
@@ -1596,12 +1664,39 @@ class HybRecord:
     # Placeholder for set of allowed flags filled on first use.
     _flagset = None
 
+    # Placeholders for the source line of records read from a line, and whether the record
+    #   has been modified since being read (records not read from a line are always modified).
+    _source_line = None
+    _source_items = None
+    _dirty = True
+
     # Start HybRecord Private Methods
     # HybRecord : Private Methods : Initialization
     def _post_init_tasks(self) -> None:
         # Stub for subclassing
         pass
 
+    # HybRecord : Private Methods : Record Parsing
+    def _set_source_line(self, source_line: str) -> None:
+        # Store the line a record was read from, written while the record is unmodified,
+        #   with the field values read from it for detection of direct changes.
+        self._source_line = source_line
+        self._source_items = self._get_source_items()
+        self._dirty = False
+
+    # HybRecord : Private Methods : Record Parsing
+    def _get_source_items(self) -> Tuple[Any, ...]:
+        # Return a flat tuple of the values of all fields written by to_line(),
+        #   as a single tuple to minimize the memory used per record.
+        return (
+            self.id,
+            self.seq,
+            self.energy,
+            *self.seg1_props.values(),
+            *self.seg2_props.values(),
+            *itertools.chain.from_iterable(self.flags.items()),
+        )
+
     # HybRecord : Private Methods : Record Parsing
     # Ensure attributes passed to constructor are valid for the respective HybRecord attributes
     def _ensure_attr_types(
@@ -1939,6 +2034,50 @@ class HybRecord:
 
         return (split_ref[0], split_ref[1], split_ref[2], split_ref[3])
 
+    # HybRecord : Private Classmethods : hybformat record parsing
+    @classmethod
+    def _add_hybformat_flags(
+            cls,
+            hyb_id: str,
+            seg1_ref: str,
+            seg2_ref: str,
+            flags: FlagsDict,
+            hybformat_id: bool = False,
+            hybformat_ref: bool = False,
+            ) -> None:
+        # Add information read from Hyb-program-format identifiers to "flags" (in place).
+        if hybformat_id:
+            # If 'seq_IDs_in_cluster' flag is set, use it to set count information
+            if 'seq_IDs_in_cluster' in flags and flags['seq_IDs_in_cluster'].strip():
+                if 'read_count' not in flags or 'count_total' not in flags:
+                    combined_read_count = 0
+                    combined_record_count = 0
+                    for cluster_hyb_id in flags['seq_IDs_in_cluster'].strip(' ,').split(','):
+                        cluster_id, cluster_count = cls._parse_hybformat_id(cluster_hyb_id)
+                        combined_read_count += int(cluster_count)
+                        combined_record_count += 1
+                    if 'read_count' not in flags:
+                        flags['read_count'] = str(combined_read_count)
+                    if 'count_total' not in flags:
+                        flags['count_total'] = str(combined_record_count)
+
+            # Otherwise, read count information directly from hybrid identifier
+            elif 'read_count' not in flags:
+                read_id, read_count = cls._parse_hybformat_id(hyb_id)
+                flags['read_count'] = read_count
+
+        if hybformat_ref:
+            for i, ref in enumerate([seg1_ref, seg2_ref], start=1):
+                seg_type_key = 'seg%i_type' % i
+                gene_id, transcript_id, gene_name, seg_type = cls._parse_hybformat_ref(ref)
+                if seg_type_key in flags and flags[seg_type_key] != seg_type:
+                    message = 'Problem reading in hybformat ref for reference: %s\n' % ref
+                    message += 'Inferred type: %s\n' % seg_type
+                    message += 'Does not equal current type flag: %s' % flags[seg_type_key]
+                    raise HybkitConstructorError(message)
+                elif seg_type_key not in flags:
+                    flags[seg_type_key] = seg_type
+
     # HybRecord : Private Classmethods : flags
     @classmethod
     def _read_flags(
@@ -1975,6 +2114,354 @@ class HybRecord:
             cls._flagset = frozenset(cls.ALL_FLAGS + tuple(cls.settings['custom_flags']))
 
 
+# ----- Begin CompactHybRecord Class -----
+class CompactHybRecord(HybRecord):
+    """
+    Memory-compact variant of :class:`HybRecord` with slot attributes and tuple segment storage.
+
+    Behaves identically to :class:`HybRecord`, but stores record attributes
+    (including modification-tracking attributes) in fixed slots,
+    stores the properties of each segment as a single tuple rather than a six-key dict,
+    and does not store the source line of records read with :meth:`from_line`.
+    As :class:`HybRecord` does not define ``__slots__``, instances still have a
+    ``__dict__`` attribute, but it remains empty unless additional attributes are set on a
+    record, including after evaluation with :meth:`eval_types` and :meth:`eval_mirna`
+    (see ``benchmarks/record_memory.py`` for the memory saved). The :attr:`seg1_props` and
+    :attr:`seg2_props` attributes are provided as dict-like views of the stored segment
+    tuples for compatibility with code written for :class:`HybRecord`. Assigning
+    a new value to a key of a view updates the underlying record.
+
+    This class is intended for holding large numbers of records in memory, such as with
+    :meth:`HybFile.read_records` on a :class:`HybFile` opened with ``compact=True``.
+    Access to segment properties is slightly slower than for :class:`HybRecord`.
+
+    Arguments are identical to :class:`HybRecord`.
+    """
+
+    __slots__ = (
+        'id', 'seq', 'energy', '_seg1', '_seg2', 'flags', 'fold_record', 'allow_undefined_flags',
+        '_source_line', '_source_items', '_dirty',
+    )
+
+    # CompactHybRecord : Public Methods : Segment Properties
+    @property
+    def seg1_props(self) -> 'SegPropsView':
+        """Dict-like view of the properties of the first (5p) segment."""
+        return SegPropsView(self, '_seg1')
+
+    @seg1_props.setter
+    def seg1_props(self, seg_props: SegProps) -> None:
+        self._seg1 = self._pack_seg_props(seg_props)
+
+    # CompactHybRecord : Public Methods : Segment Properties
+    @property
+    def seg2_props(self) -> 'SegPropsView':
+        """Dict-like view of the properties of the second (3p) segment."""
+        return SegPropsView(self, '_seg2')
+
+    @seg2_props.setter
+    def seg2_props(self, seg_props: SegProps) -> None:
+        self._seg2 = self._pack_seg_props(seg_props)
+
+    # CompactHybRecord : Public Classmethods : Record Construction
+    @classmethod
+    def from_record(cls, hyb_record: HybRecord) -> Self:
+        """
+        Construct a CompactHybRecord from an existing :class:`HybRecord` object.
+
+        Args:
+            hyb_record (HybRecord): Record to copy information from.
+        """
+        record = cls._from_parsed(
+            hyb_record.id,
+            hyb_record.seq,
+            hyb_record.energy,
+            dict(hyb_record.seg1_props),
+            dict(hyb_record.seg2_props),
+            dict(hyb_record.flags),
+        )
+        record.allow_undefined_flags = hyb_record.allow_undefined_flags
+        record.fold_record = hyb_record.fold_record
+        return record
+
+    # CompactHybRecord : Public Methods : Conversion
+    def to_record(self) -> HybRecord:
+        """Return a standard :class:`HybRecord` object with the information of this record."""
+        record = HybRecord._from_parsed(
+            self.id,
+            self.seq,
+            self.energy,
+            dict(self.seg1_props),
+            dict(self.seg2_props),
+            dict(self.flags),
+        )
+        record.allow_undefined_flags = self.allow_undefined_flags
+        record.fold_record = self.fold_record
+        return record
+
+    # CompactHybRecord : Private Methods : Initialization
+    def _post_init_tasks(self) -> None:
+        # Initialize slots that shadow the HybRecord class-level defaults.
+        self._source_line = None
+        self._source_items = None
+        self._dirty = True
+
+    # CompactHybRecord : Private Methods : Record Parsing
+    def _set_source_line(self, source_line: str) -> None:
+        # Source lines are not stored, to minimize memory use.
+        pass
+
+    # CompactHybRecord : Private Methods : Segment Properties
+    def _pack_seg_props(self, seg_props: SegProps) -> Tuple[Any, ...]:
+        # Pack a (complete or partial) seg_props mapping into a tuple in SEGMENT_COLUMNS order.
+        for key in seg_props:
+            if key not in SegPropsView.KEY_INDEX:
+                message = 'segN_props must be have only keys: ref_name, read_start, read_end, '
+                message += 'ref_start, ref_end, score. Provided segN_props has key %s' % key
+                raise HybkitConstructorError(message)
+        return tuple(seg_props.get(key) for key in self.SEGMENT_COLUMNS)
+
+
+# ----- Begin SegPropsView Class -----
+class SegPropsView(MutableMapping):
+    """
+    Dict-like view of the segment properties stored by a :class:`CompactHybRecord`.
+
+    Supports item access, assignment of existing keys, iteration, and comparison
+    with dicts. Copies made with :func:`copy.copy` or :func:`copy.deepcopy`
+    are returned as plain dicts. Keys cannot be removed.
+
+    Args:
+        record (CompactHybRecord): Record to provide a view of.
+        attr (str): Name of the record attribute storing the segment tuple.
+    """
+
+    __slots__ = ('_attr', '_record')
+
+    #: Index of each segment property key in stored segment tuples.
+    KEY_INDEX = {key: i for i, key in enumerate(HybRecord.SEGMENT_COLUMNS)}
+
+    # SegPropsView : Public Methods : Initialization
+    def __init__(self, record: CompactHybRecord, attr: str) -> None:
+        """Describe __init__ method description in class docstring."""
+        self._record = record
+        self._attr = attr
+
+    # SegPropsView : Public MagicMethods : Mapping
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        """Return the value of segment property ``key``."""
+        return getattr(self._record, self._attr)[self.KEY_INDEX[key]]
+
+    # SegPropsView : Public MagicMethods : Mapping
+    def __setitem__(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """Set the value of segment property ``key``."""
+        if key not in self.KEY_INDEX:
+            message = 'segN_props must be have only keys: ref_name, read_start, read_end, '
+            message += 'ref_start, ref_end, score. Provided key %s' % key
+            raise HybkitMiscError(message)
+        values = list(getattr(self._record, self._attr))
+        values[self.KEY_INDEX[key]] = value
+        setattr(self._record, self._attr, tuple(values))
+
+    # SegPropsView : Public MagicMethods : Mapping
+    def __delitem__(self, key: str) -> None:
+        """Disallow removal of segment property keys."""
+        message = 'Segment property keys cannot be removed from a CompactHybRecord.'
+        raise HybkitMiscError(message)
+
+    # SegPropsView : Public MagicMethods : Mapping
+    def __iter__(self) -> Iterable[str]:
+        """Iterate over segment property keys."""
+        return iter(HybRecord.SEGMENT_COLUMNS)
+
+    # SegPropsView : Public MagicMethods : Mapping
+    def __len__(self) -> int:
+        """Return the number of segment property keys."""
+        return len(self.KEY_INDEX)
+
+    # SegPropsView : Public MagicMethods : Copying
+    def __copy__(self) -> SegProps:
+        """Return a plain dict copy of the segment properties."""
+        return dict(zip(HybRecord.SEGMENT_COLUMNS, getattr(self._record, self._attr)))
+
+    # SegPropsView : Public MagicMethods : Copying
+    def __deepcopy__(self, memo: dict) -> SegProps:
+        """Return a plain dict copy of the segment properties."""
+        return copy.deepcopy(self.__copy__(), memo)
+
+    # SegPropsView : Public MagicMethods : Printing
+    def __repr__(self) -> str:
+        """Print the segment properties as a dict."""
+        return repr(self.__copy__())
+
+
+# ----- Begin LazyHybRecord Class -----
+class LazyHybRecord(HybRecord):
+    """
+    Variant of :class:`HybRecord` that parses fields from its source line on first access.
+
+    Records constructed with :meth:`from_line` (such as by iterating over a
+    :class:`HybFile` opened with ``lazy=True``) store the hyb-format line without splitting
+    it. The line is split into fields when a record attribute is first accessed, and each
+    of the :attr:`id`, :attr:`seq`, :attr:`energy`, :attr:`seg1_props`, :attr:`seg2_props`,
+    and :attr:`flags` attributes is converted and validated only when it is first accessed.
+    This avoids the cost of fully parsing records where only a few fields are used,
+    such as filtering records by identifier or segment reference name.
+
+    :meth:`to_line` returns the original line of a record that has not been modified,
+    without re-serializing the record fields. A record is modified by assigning to
+    a record attribute, by changing segment properties or flags (such as with
+    :meth:`set_flag`, :meth:`eval_types`, or :meth:`eval_mirna`), or when flags are added
+    from identifiers during parsing with ``hybformat_id`` or ``hybformat_ref``.
+
+    The number of fields in the line is checked during construction, while
+    errors for invalid field values are raised when the field is first accessed.
+    Records constructed directly rather than with :meth:`from_line` behave identically to
+    :class:`HybRecord`.
+
+    Arguments are identical to :class:`HybRecord`.
+    """
+
+    # Record attributes parsed from the source line on first access.
+    _LAZY_ATTRS = frozenset(('id', 'seq', 'energy', 'seg1_props', 'seg2_props', 'flags'))
+    # Index of the first field of each segment in split lines.
+    _SEG_START_INDEX = {'seg1_props': 3, 'seg2_props': 9}
+
+    # LazyHybRecord : Public Methods : Record Parsing
+    def to_line(
+            self,
+            newline: bool = True,
+            sep: str = '\t',
+            ) -> str:
+        r"""
+        Return a hyb-format string representation of the record.
+
+        If the record has not been modified, the original line is returned.
+
+        Args:
+            newline (:obj:`bool`, optional): Terminate returned string with
+                a newline (default: ``True``)
+            sep (:obj:`str`, optional): Separator between fields (Default: "\\t")
+
+        """
+        if sep == '\t' and not self.is_modified():
+            if newline:
+                return self._source_line + '\n'
+            return self._source_line
+        return super().to_line(newline=newline, sep=sep)
+
+    # LazyHybRecord : Public Methods : Record Parsing
+    def is_modified(self) -> bool:
+        """Return ``True`` if the record differs from the line it was constructed from."""
+        if self._dirty:
+            return True
+        if ((self._hybformat_id or self._hybformat_ref)
+                and 'flags' not in self.__dict__):
+            # Parse flags to check for flags added from hybformat identifiers.
+            self.flags  # noqa: B018
+        record_dict = self.__dict__
+        for attr, parsed_items in self._parsed_items.items():
+            if tuple(record_dict[attr].items()) != parsed_items:
+                return True
+        return False
+
+    # LazyHybRecord : Public Classmethods : Record Construction
+    @classmethod
+    def from_line(
+            cls,
+            line: str,
+            hybformat_id: bool = False,
+            hybformat_ref: bool = False,
+            ) -> Self:
+        """
+        Construct a LazyHybRecord instance from a single-line hyb-format string.
+
+        Fields of the line are parsed when first accessed.
+        Arguments are identical to :meth:`HybRecord.from_line`.
+
+        Returns:
+            :class:`LazyHybRecord` instance storing the line.
+        """
+        source_line = line.strip()
+        num_fields = source_line.count('\t') + 1
+        if (num_fields < hybkit.settings.MIN_RECORD_FIELDS
+            or num_fields > hybkit.settings.MAX_RECORD_FIELDS
+            ):
+            message = 'Hyb record lines require 15 or 16 fields '
+            message += 'separated by tab ("\\t") characters, '
+            message += 'but only %i were found:\n"%s"' % (num_fields, source_line)
+            message += 'Line:\n%s' % line
+            raise HybkitConstructorError(message)
+        record = cls.__new__(cls)
+        # Set attributes directly to bypass modification tracking.
+        record.__dict__.update({
+            '_source_line': source_line,
+            '_line_items': None,
+            '_parsed_items': {},
+            '_hybformat_id': hybformat_id,
+            '_hybformat_ref': hybformat_ref,
+            '_dirty': False,
+            'allow_undefined_flags': cls.settings['allow_undefined_flags'],
+            'fold_record': None,
+        })
+        record._post_init_tasks()
+        return record
+
+    # LazyHybRecord : Public MagicMethods : Attributes
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        """Parse a record attribute from the source line on first access."""
+        # Only called for attributes that have not yet been set on the record.
+        if attr not in self._LAZY_ATTRS or self._source_line is None:
+            message = "'%s' object has no attribute '%s'" % (type(self).__name__, attr)
+            raise AttributeError(message)
+        line_items = self._line_items
+        if line_items is None:
+            line_items = self._source_line.split('\t')
+            self.__dict__['_line_items'] = line_items
+
+        if attr == 'flags':
+            value = {}
+            if len(line_items) > hybkit.settings.MIN_RECORD_FIELDS:
+                value = self._read_flags(line_items[15])
+            self._parsed_items[attr] = tuple(value.items())
+            if self._hybformat_id or self._hybformat_ref:
+                self._add_hybformat_flags(
+                    line_items[0], line_items[3], line_items[9], value,
+                    hybformat_id=self._hybformat_id,
+                    hybformat_ref=self._hybformat_ref,
+                )
+        elif attr in self._SEG_START_INDEX:
+            start_index = self._SEG_START_INDEX[attr]
+            seg_items = line_items[start_index:(start_index + 6)]
+            ref_name, read_start, read_end, ref_start, ref_end, score = seg_items
+            # Convert positions directly when all are integers, otherwise check each value.
+            if (ref_name.strip() and read_start.isdecimal() and read_end.isdecimal()
+                    and ref_start.isdecimal() and ref_end.isdecimal()):
+                value = {
+                    'ref_name': ref_name,
+                    'read_start': int(read_start),
+                    'read_end': int(read_end),
+                    'ref_start': int(ref_start),
+                    'ref_end': int(ref_end),
+                    'score': score,
+                }
+            else:
+                value = dict(zip(self.SEGMENT_COLUMNS, seg_items))
+                self._ensure_attr_types(value, 'seg_props')
+            self._parsed_items[attr] = tuple(value.items())
+        else:
+            value = self._ensure_attr_types(line_items[self.HYBRID_COLUMNS.index(attr)], attr)
+        self.__dict__[attr] = value
+        return value
+
+    # LazyHybRecord : Public MagicMethods : Attributes
+    def __setattr__(self, attr: str, value: Any) -> None:  # noqa: ANN401
+        """Set a record attribute, marking the record as modified."""
+        if attr in self._LAZY_ATTRS:
+            self.__dict__['_dirty'] = True
+        super().__setattr__(attr, value)
+
+
 # ----- Begin HybFile Class -----
 class HybFile:
     r"""
@@ -1982,7 +2469,9 @@ class HybFile:
 
     Args:
         path (str): Path to text file to open as hyb-format file.
-        *args: Arguments passed to :func:`open` function to open a text file for reading/writing.
+        *args: Arguments passed to :func:`hybkit.compression.open_file` to open a text file
+            for reading/writing. Files with a compressed suffix (such as ``.hyb.gz``)
+            are decompressed or compressed transparently.
         hybformat_id (:obj:`bool`, optional): If ``True``, during parsing of lines read count
             information from identifier in ``<read_number>_<read_count>`` format.
             Defaults to value in :attr:`settings['hybformat_id'] <HybFile.settings>`.
@@ -1990,16 +2479,30 @@ class HybFile:
             additional record information from
             identifier in ``<gene_id>_<transcript_id>_<gene_name>_<seg_type>`` format.
             Defaults to value in :attr:`settings['hybformat_ref'] <HybFile.settings>`.
+        write_source_lines (:obj:`bool`, optional): If ``True``, write records that have not
+            been modified since being read as their original line (see
+            :meth:`HybRecord.is_modified`) rather than re-formatting them. Unmodified
+            records are then written exactly as read, without applying the
+            :attr:`settings['reorder_flags'] <HybRecord.settings>` setting.
+            Defaults to value in :attr:`settings['write_source_lines'] <HybFile.settings>`.
         from_file_like (:obj:`bool`, optional): If ``True``, the first argument is treated as a
             file-like object (such as io.StringIO or gzip.GzipFile) and the remaining positional
             arguments are ignored. (Default False``)
-        **kwargs: Keyword arguments passed to :func:`open` function to open a text file for
-            reading/writing.
+        compact (:obj:`bool`, optional): If ``True``, return records read from the file as
+            memory-compact :class:`CompactHybRecord` objects. (Default ``False``)
+        lazy (:obj:`bool`, optional): If ``True``, return records read from the file as
+            :class:`LazyHybRecord` objects, which parse fields from the line on first
+            access. (Default ``False``)
+        **kwargs: Keyword arguments passed to :func:`hybkit.compression.open_file`
+            to open a text file for reading/writing.
 
     Attributes:
         hybformat_id (bool): Read count information from identifier during line parsing
         hybformat_ref (bool): Read type information from reference name
             during line parsing
+        write_source_lines (bool): Write unmodified records as their original line
+        record_class (type): Class used for records read from the file
+            (:class:`HybRecord`, :class:`CompactHybRecord`, or :class:`LazyHybRecord`).
         fh (file): Underlying file handle for the HybFile object.
 
     """
@@ -2015,14 +2518,26 @@ class HybFile:
             *args: Any, # noqa: ANN401
             hybformat_id: Optional[bool] = None,
             hybformat_ref: Optional[bool] = None,
+            write_source_lines: Optional[bool] = None,
             from_file_like: bool = False,
+            compact: bool = False,
+            lazy: bool = False,
             **kwargs: Any, # noqa: ANN401
             ) -> None:
         """Describe __init__ method description in class docstring."""
+        if compact and lazy:
+            message = 'Only one of "compact" and "lazy" record options can be used.'
+            raise HybkitArgError(message)
         if from_file_like:
             self.fh = path
         else:
-            self.fh = open(path, *args, **kwargs)  # noqa: SIM115
+            self.fh = hybkit.compression.open_file(path, *args, **kwargs)
+        if compact:
+            self.record_class = CompactHybRecord
+        elif lazy:
+            self.record_class = LazyHybRecord
+        else:
+            self.record_class = HybRecord
         if hybformat_id is None:
             self.hybformat_id = self.settings['hybformat_id']
         else:
@@ -2031,6 +2546,11 @@ class HybFile:
             self.hybformat_ref = self.settings['hybformat_ref']
         else:
             self.hybformat_ref = hybformat_ref
+        if write_source_lines is None:
+            self.write_source_lines = self.settings['write_source_lines']
+        else:
+            self.write_source_lines = write_source_lines
+        self._index = None
 
     # HybFile : Public Methods : Initialization / Closing
     def __enter__(self, *args: Any, **kwargs: Any) -> Self: # noqa: ANN401
@@ -2051,7 +2571,7 @@ class HybFile:
     def __next__(self) -> Self:
         """Return next line as HybRecord object."""
         next_line = self.fh.__next__()
-        return HybRecord.from_line(
+        return self.record_class.from_line(
             next_line,
             hybformat_id=self.hybformat_id,
             hybformat_ref=self.hybformat_ref,
@@ -2059,8 +2579,11 @@ class HybFile:
 
     # HybFile : Public Methods : Reading
     def close(self) -> None:
-        """Close the file."""
+        """Close the file (and any open index)."""
         self.fh.close()
+        if self._index is not None:
+            self._index.close()
+            self._index = None
 
     # HybFile : Public Methods : Reading
     def read_record(self) -> str:
@@ -2075,6 +2598,91 @@ class HybFile:
             records.append(record)  # noqa: PERF402
         return records
 
+    # HybFile : Public Methods : Reading
+    def read_batches(self, batch_size: int = 10000) -> Iterable['HybBatch']:
+        """
+        Iterate over the (remaining) records in the hyb file as columnar :class:`HybBatch` objects.
+
+        Each batch is parsed directly from up to ``batch_size`` lines into
+        column arrays, without constructing individual :class:`HybRecord` objects.
+        Records can be created from a batch on demand with :meth:`HybBatch.get_record`
+        or by iterating over the batch.
+
+        Example usage:
+            ::
+
+                with HybFile.open('path/to/file.hyb', 'r') as hyb_file:
+                    for batch in hyb_file.read_batches(batch_size=50000):
+                        energies = batch.columns['energy']
+
+        Args:
+            batch_size (:obj:`int`, optional): Maximum number of lines to parse into each batch.
+
+        Yields:
+            :class:`HybBatch` objects containing the parsed columns of each batch of lines.
+        """
+        if batch_size < 1:
+            message = 'batch_size must be a positive integer. Provided: %s' % batch_size
+            raise HybkitArgError(message)
+        while True:
+            lines = list(itertools.islice(self.fh, batch_size))
+            if not lines:
+                return
+            yield HybBatch.from_lines(
+                lines,
+                hybformat_id=self.hybformat_id,
+                hybformat_ref=self.hybformat_ref,
+            )
+
+    # HybFile : Public Methods : Reading
+    def query_index(
+            self,
+            field: str,
+            value: str,
+            match: str = 'is',
+            index_file: Optional[str] = None,
+            ) -> List[HybRecord]:
+        """
+        Return the records with a field matching a value, using a sidecar index of the file.
+
+        The index (see :mod:`hybkit.index`) provides the byte offset of each matching
+        record, and each record is read by seeking directly to it,
+        without reading the remainder of the file.
+        This changes the current position in the file, so iteration over the
+        file should not be combined with queries.
+
+        Example usage:
+            ::
+
+                with HybFile.open('path/to/file.hyb', 'r') as hyb_file:
+                    target_records = hyb_file.query_index('any_ref_name', 'TUBB2C', 'contains')
+                    read_records = hyb_file.query_index('id', '2407_718')
+
+        Args:
+            field (str): Field to query, from :data:`hybkit.index.INDEX_FIELDS`
+                (``id``, ``seg1_ref_name``, ``seg2_ref_name``, ``seg1_type``, ``seg2_type``)
+                or :data:`hybkit.index.ANY_FIELDS` (``any_ref_name``, ``any_seg_type``).
+            value (str): Value to match.
+            match (:obj:`str`, optional): Method of matching field values,
+                from :data:`hybkit.index.MATCH_MODES`
+                (``is``, ``prefix``, ``contains``, ``suffix``).
+            index_file (:obj:`str`, optional): Path to the index file. Defaults to the
+                file name with an added :data:`hybkit.settings.INDEX_SUFFIX` suffix.
+
+        Returns:
+            :obj:`list` of matching records, in file order.
+        """
+        hyb_index = self._get_index(index_file)
+        records = []
+        for offset, _length in hyb_index.query(field, value, match):
+            self.fh.seek(offset)
+            records.append(self.record_class.from_line(
+                self.fh.readline(),
+                hybformat_id=self.hybformat_id,
+                hybformat_ref=self.hybformat_ref,
+            ))
+        return records
+
     # HybFile : Public Methods : Writing
     def write_record(self, write_record: HybRecord) -> None:
         """
@@ -2082,12 +2690,16 @@ class HybFile:
 
         Unlike the file.write() method, this method will add a newline to the
         end of each written record line.
+        If :attr:`write_source_lines` is ``True``, records that have not been modified
+        since being read (see :meth:`HybRecord.is_modified`) are written as their
+        original line, without applying the
+        :attr:`settings['reorder_flags'] <HybRecord.settings>` setting.
 
         Args:
             write_record (HybRecord): Record to write.
         """
         self._ensure_hybrecord(write_record)
-        record_string = write_record.to_line(newline=True)
+        record_string = self._to_record_string(write_record, newline=True)
         self.fh.write(record_string)
 
     # HybFile : Public Methods : Writing
@@ -2097,12 +2709,13 @@ class HybFile:
 
         Unlike the file.writelines() method, this method will add a newline to the
         end of each written record line.
+        Records are written in buffered blocks using a :class:`RecordWriter`.
 
         Args:
             write_records (list): List of :class:`HybRecord` objects to write.
         """
-        for write_record in write_records:
-            self.write_record(write_record)
+        with RecordWriter(self, close_file=False) as writer:
+            writer.write_records(write_records)
 
     # HybFile : Public Methods : Writing
     def write_fh(self:Self, *args, **kwargs) -> None:  # noqa: ANN002 ANN003
@@ -2129,13 +2742,17 @@ class HybFile:
             *args: Any,  # noqa: ANN401
             hybformat_id: Optional[bool] = None,
             hybformat_ref: Optional[bool] = None,
+            write_source_lines: Optional[bool] = None,
+            compact: bool = False,
+            lazy: bool = False,
             **kwargs: Any,  # noqa: ANN401
             ) -> Self:
         """
         Open a path to a text file using :func:`open` and return a HybFile object.
 
         Arguments match those of the Python3 built-in :func:`open` function and are
-        passed directly to it.
+        passed to :func:`hybkit.compression.open_file`, which transparently
+        decompresses or compresses files with a compressed suffix (such as ``.gz``).
 
         This method is provided as a convenience function for drop-in replacement of the
         built-in :func:`open` function.
@@ -2151,6 +2768,13 @@ class HybFile:
                 additional record information from
                 identifier in ``<gene_id>_<transcript_id>_<gene_name>_<seg_type>`` format.
                 Defaults to value in :attr:`settings['hybformat_ref'] <HybFile.settings>`.
+            write_source_lines (:obj:`bool`, optional): If ``True``, write unmodified records
+                as their original line (without applying the ``reorder_flags`` setting).
+                Defaults to value in :attr:`settings['write_source_lines'] <HybFile.settings>`.
+            compact (:obj:`bool`, optional): If ``True``, return records as
+                memory-compact :class:`CompactHybRecord` objects.
+            lazy (:obj:`bool`, optional): If ``True``, return records as
+                :class:`LazyHybRecord` objects parsing fields on first access.
 
         Example usage:
             ::
@@ -2160,8 +2784,8 @@ class HybFile:
                         print(record)
 
         Args:
-            *args: Passed directly to :func:`open`.
-            **kwargs: Passed directly to :func:`open`.
+            *args: Passed to :func:`hybkit.compression.open_file`.
+            **kwargs: Passed to :func:`hybkit.compression.open_file`.
 
         Returns:
             :class:`HybFile` object.
@@ -2171,7 +2795,10 @@ class HybFile:
             *args,
             hybformat_id=hybformat_id,
             hybformat_ref=hybformat_ref,
+            write_source_lines=write_source_lines,
             from_file_like=False,
+            compact=compact,
+            lazy=lazy,
             **kwargs,
         )
 
@@ -2181,6 +2808,586 @@ class HybFile:
         if not isinstance(record, HybRecord):
             raise HybkitMiscError('Item: "%s" is not a HybRecord object.' % record)
 
+    # HybFile : Private Methods
+    def _get_index(self, index_file: Optional[str]) -> 'hybkit.index.HybIndex':
+        # Return the open index of the file, opening and checking it if required.
+        file_name = getattr(self.fh, 'name', None)
+        if index_file is None:
+            if not isinstance(file_name, str):
+                message = 'An index_file must be provided for files opened without a path.'
+                raise HybkitArgError(message)
+            index_file = hybkit.index.get_index_file_name(file_name)
+        if self._index is not None and self._index.index_file_name == index_file:
+            return self._index
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        hyb_index = hybkit.index.HybIndex(index_file)
+        if isinstance(file_name, str) and not hyb_index.is_current(file_name):
+            hyb_index.close()
+            message = 'Index file: %s is out of date for file: %s\n' % (index_file, file_name)
+            message += 'Please rebuild the index with the "hyb_index" script.'
+            raise HybkitMiscError(message)
+        self._index = hyb_index
+        return hyb_index
+
+    # HybFile : Private Methods
+    def _to_record_string(self, write_record: HybRecord, newline: bool) -> str:
+        """Return a :class:`HybRecord` as a hyb-format string."""
+        if self.write_source_lines and not write_record.is_modified():
+            if newline:
+                return write_record._source_line + '\n'
+            return write_record._source_line
+        return write_record.to_line(newline=newline)
+
+# ----- Begin MappedHybFile Class -----
+class MappedHybFile:
+    """
+    Memory-mapped hyb-format file with random access to records by index.
+
+    The file is mapped with :mod:`mmap` and a line-offset index is built on opening
+    by a vectorized scan for newlines, so that any record can be read directly by
+    index without reading the preceding lines. Records are only parsed when requested,
+    via indexing, slicing, or iteration. Byte-range shards of the file aligned to
+    record boundaries can be provided to worker processes with :meth:`byte_ranges`.
+
+    The line-offset index can be saved to and loaded from a NumPy ``.npz`` file
+    with ``offsets_file``, avoiding the scan when the same file is reopened. A saved
+    index is only used if the size and modification time of the hyb file are unchanged.
+
+    Compressed files cannot be mapped, and must be read with :class:`HybFile`.
+
+    Example usage:
+        ::
+
+            with hybkit.MappedHybFile('path/to/file.hyb') as hyb_file:
+                num_records = len(hyb_file)
+                last_record = hyb_file[-1]
+                first_records = hyb_file[:100]
+                sample_records = hyb_file.sample(1000, seed=0)
+
+    Args:
+        path (str): Path to an uncompressed hyb-format file.
+        hybformat_id (:obj:`bool`, optional): If ``True``, during parsing of lines read count
+            information from identifier in ``<read_number>_<read_count>`` format.
+            Defaults to value in :attr:`settings['hybformat_id'] <HybFile.settings>`.
+        hybformat_ref (:obj:`bool`, optional): If ``True``, during parsing of lines read
+            additional record information from
+            identifier in ``<gene_id>_<transcript_id>_<gene_name>_<seg_type>`` format.
+            Defaults to value in :attr:`settings['hybformat_ref'] <HybFile.settings>`.
+        offsets_file (:obj:`str`, optional): Path to a ``.npz`` file to load the line-offset
+            index from if it matches the hyb file, or otherwise to save the built index to.
+        compact (:obj:`bool`, optional): If ``True``, return records as
+            memory-compact :class:`CompactHybRecord` objects. (Default ``False``)
+        lazy (:obj:`bool`, optional): If ``True``, return records as
+            :class:`LazyHybRecord` objects. (Default ``False``)
+
+    Attributes:
+        path (str): Path to the mapped hyb file.
+        hybformat_id (bool): Read count information from identifier during line parsing
+        hybformat_ref (bool): Read type information from reference name
+            during line parsing
+        record_class (type): Class used for returned records.
+        offsets (numpy.ndarray): Array of ``int64`` byte offsets of the start of each line,
+            followed by the size of the file.
+    """
+
+    # Number of bytes scanned for newlines at once while building the line-offset index.
+    _SCAN_BLOCK_SIZE = 67108864
+
+    # MappedHybFile : Public Methods : Initialization / Closing
+    def __init__(
+            self,
+            path: str,
+            hybformat_id: Optional[bool] = None,
+            hybformat_ref: Optional[bool] = None,
+            offsets_file: Optional[str] = None,
+            compact: bool = False,
+            lazy: bool = False,
+            ) -> None:
+        """Describe __init__ method description in class docstring."""
+        if compact and lazy:
+            message = 'Only one of "compact" and "lazy" record options can be used.'
+            raise HybkitArgError(message)
+        if hybkit.compression.get_compression(path) is not None:
+            message = 'Compressed file: %s cannot be memory-mapped.\n' % path
+            message += 'Please use HybFile to read compressed files.'
+            raise HybkitArgError(message)
+        if compact:
+            self.record_class = CompactHybRecord
+        elif lazy:
+            self.record_class = LazyHybRecord
+        else:
+            self.record_class = HybRecord
+        if hybformat_id is None:
+            self.hybformat_id = HybFile.settings['hybformat_id']
+        else:
+            self.hybformat_id = hybformat_id
+        if hybformat_ref is None:
+            self.hybformat_ref = HybFile.settings['hybformat_ref']
+        else:
+            self.hybformat_ref = hybformat_ref
+
+        self.path = path
+        with open(path, 'rb') as raw_fh:
+            if os.fstat(raw_fh.fileno()).st_size:
+                self._map = mmap.mmap(raw_fh.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # Empty files cannot be mapped.
+                self._map = b''
+
+        self.offsets = None
+        if offsets_file is not None and os.path.isfile(offsets_file):
+            self.offsets = self._load_offsets(offsets_file)
+        if self.offsets is None:
+            self.offsets = self._build_offsets()
+            if offsets_file is not None:
+                self.save_offsets(offsets_file)
+
+    # MappedHybFile : Public Methods : Initialization / Closing
+    def __enter__(self) -> Self:
+        """Open "with" syntax."""
+        return self
+
+    # MappedHybFile : Public Methods : Initialization / Closing
+    def __exit__(self, etype, value, traceback) -> None:  # noqa: ANN001
+        """Close "with" syntax."""
+        self.close()
+
+    # MappedHybFile : Public Methods : Initialization / Closing
+    def close(self) -> None:
+        """Close the memory map of the file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    # MappedHybFile : Public Methods : Reading
+    def __len__(self) -> int:
+        """Return the number of records (lines) in the file."""
+        return len(self.offsets) - 1
+
+    # MappedHybFile : Public Methods : Reading
+    def __getitem__(self, index: Union[int, slice]) -> Union[HybRecord, List[HybRecord]]:
+        """Return the record at an index, or a list of records for a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._make_records(self.get_lines(start, stop))
+            return [self[record_index] for record_index in range(start, stop, step)]
+        return self._make_records([self.get_line(index)])[0]
+
+    # MappedHybFile : Public Methods : Reading
+    def __iter__(self) -> Iterator[HybRecord]:
+        """Iterate over all records in the file, in blocks of lines."""
+        from_line = self.record_class.from_line
+        block_records = 10000
+        for start in range(0, len(self), block_records):
+            for line in self.get_lines(start, start + block_records):
+                yield from_line(
+                    line, hybformat_id=self.hybformat_id, hybformat_ref=self.hybformat_ref,
+                )
+
+    # MappedHybFile : Public Methods : Reading
+    def get_line(self, index: int) -> str:
+        """
+        Return the line at an index of the file, without parsing it as a record.
+
+        Args:
+            index (int): Index of the line (negative values count from the end of the file).
+
+        Returns:
+            The line, without the trailing newline.
+        """
+        num_lines = len(self)
+        if index < 0:
+            index += num_lines
+        if not 0 <= index < num_lines:
+            message = 'Record index %i is out of range for file with %i records.' % (
+                index, num_lines)
+            raise IndexError(message)
+        line = self._map[self.offsets[index]:self.offsets[index + 1]].decode()
+        if line.endswith('\n'):
+            return line[:-1]
+        return line
+
+    # MappedHybFile : Public Methods : Reading
+    def get_lines(self, start: int, stop: int) -> List[str]:
+        """
+        Return a list of the lines from index ``start`` up to (but not including) ``stop``.
+
+        The lines are decoded and split as a single block of the file.
+
+        Args:
+            start (int): Index of the first line.
+            stop (int): Index after the last line.
+
+        Returns:
+            :obj:`list` of lines, without trailing newlines.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return []
+        lines = self._map[self.offsets[start]:self.offsets[stop]].decode().split('\n')
+        if len(lines) > stop - start:
+            # Empty string following the final newline.
+            lines.pop()
+        return lines
+
+    # MappedHybFile : Public Methods : Reading
+    def sample(self, num_records: int, seed: Optional[int] = None) -> List[HybRecord]:
+        """
+        Return a random sample of records without replacement, in file order.
+
+        Args:
+            num_records (int): Number of records to sample (up to the number of records).
+            seed (:obj:`int`, optional): Seed of the random number generator.
+
+        Returns:
+            :obj:`list` of sampled records.
+        """
+        rng = np.random.default_rng(seed)
+        num_records = min(num_records, len(self))
+        indexes = np.sort(rng.choice(len(self), size=num_records, replace=False))
+        return self._make_records([self.get_line(int(index)) for index in indexes])
+
+    # MappedHybFile : Public Methods : Reading
+    def byte_ranges(
+            self,
+            num_shards: Optional[int] = None,
+            shard_records: Optional[int] = None,
+            ) -> List['hybkit.parallel.ByteRange']:
+        """
+        Split the file into byte-range shards containing whole records.
+
+        The shards can be read by worker processes with
+        :func:`hybkit.parallel.read_byte_range`.
+
+        Args:
+            num_shards (:obj:`int`, optional): Number of shards containing (nearly)
+                equal numbers of records.
+            shard_records (:obj:`int`, optional): Number of records in each shard
+                (except the last). Exactly one of ``num_shards`` or
+                ``shard_records`` must be provided.
+
+        Returns:
+            :obj:`list` of :data:`hybkit.parallel.ByteRange` tuples covering the file in order.
+        """
+        if (num_shards is None) == (shard_records is None):
+            message = 'Exactly one of "num_shards" and "shard_records" must be provided.'
+            raise HybkitArgError(message)
+        for arg_name, arg_val in (('num_shards', num_shards), ('shard_records', shard_records)):
+            if arg_val is not None and arg_val < 1:
+                message = '%s must be a positive integer. Provided: %s' % (arg_name, arg_val)
+                raise HybkitArgError(message)
+        num_lines = len(self)
+        if num_shards is not None:
+            bounds = np.linspace(0, num_lines, min(num_shards, max(num_lines, 1)) + 1)
+            bounds = np.unique(bounds.round().astype(np.int64))
+        else:
+            bounds = np.append(np.arange(0, num_lines, shard_records), num_lines)
+        return [
+            hybkit.parallel.ByteRange(self.path, int(self.offsets[start]), int(self.offsets[stop]))
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+
+    # MappedHybFile : Public Methods : Index
+    def save_offsets(self, offsets_file: str) -> None:
+        """
+        Save the line-offset index to a NumPy ``.npz`` file.
+
+        Args:
+            offsets_file (str): Path of the file to write.
+        """
+        with open(offsets_file, 'wb') as out_fh:
+            np.savez(out_fh, offsets=self.offsets, source_stat=self._get_source_stat())
+
+    # MappedHybFile : Private Methods
+    def _get_source_stat(self) -> np.ndarray:
+        # Return the size and modification time of the mapped file.
+        file_stat = os.stat(self.path)
+        return np.array([file_stat.st_size, file_stat.st_mtime_ns], dtype=np.int64)
+
+    # MappedHybFile : Private Methods
+    def _load_offsets(self, offsets_file: str) -> Optional[np.ndarray]:
+        # Return a saved line-offset index, or None if it does not match the file.
+        with np.load(offsets_file) as saved:
+            if not np.array_equal(saved['source_stat'], self._get_source_stat()):
+                return None
+            return saved['offsets']
+
+    # MappedHybFile : Private Methods
+    def _build_offsets(self) -> np.ndarray:
+        # Return the byte offsets of the start of each line, followed by the file size.
+        file_size = len(self._map)
+        offsets = [np.zeros(1, dtype=np.int64)]
+        if file_size:
+            data = np.frombuffer(self._map, dtype=np.uint8)
+            for start in range(0, file_size, self._SCAN_BLOCK_SIZE):
+                block = data[start:(start + self._SCAN_BLOCK_SIZE)]
+                offsets.append(np.flatnonzero(block == ord('\n')).astype(np.int64) + start + 1)
+            # Release the exported buffer, so that the map can be closed.
+            del data, block
+        offsets = np.concatenate(offsets)
+        if offsets[-1] != file_size:
+            # Final line without a newline.
+            offsets = np.append(offsets, file_size)
+        return offsets
+
+    # MappedHybFile : Private Methods
+    def _make_records(self, lines: List[str]) -> List[HybRecord]:
+        # Return lines parsed as records.
+        from_line = self.record_class.from_line
+        hybformat_id = self.hybformat_id
+        hybformat_ref = self.hybformat_ref
+        return [
+            from_line(line, hybformat_id=hybformat_id, hybformat_ref=hybformat_ref)
+            for line in lines
+        ]
+
+
+# ----- Begin HybBatch Class -----
+class HybBatch:
+    """
+    Columnar container for a batch of hyb-format records.
+
+    Stores the fields of a group of hyb records as column arrays (as created by
+    :meth:`HybFile.read_batches`), allowing vectorized operations across many records
+    without constructing a :class:`HybRecord` object for each line.
+    Integer columns (segment read/ref start/end) are stored as :class:`numpy.ndarray`
+    objects of dtype ``int64``, with missing values (``"."``) stored as :attr:`MISSING_INT`.
+    Float columns (energy and segment scores) are stored as
+    :class:`numpy.ndarray` objects of dtype ``float64``, with missing values stored as ``nan``.
+    String columns (id, seq, and segment ref_names) are stored as :class:`numpy.ndarray`
+    objects of dtype ``object``. Flags are parsed and stored as a list of dicts.
+
+    :class:`HybRecord` objects are only created on request, via :meth:`get_record`,
+    :meth:`to_records`, or iteration over the batch.
+
+    Args:
+        columns (dict): Dict of column arrays, with keys matching :attr:`COLUMNS`.
+        flags (list): List of flag dicts for each record in the batch.
+        raw_values (dict): Dict of lists containing the original string values for
+            the float columns, used to create records identical to those from
+            :meth:`HybRecord.from_line`.
+
+    Attributes:
+        columns (dict): Dict of column name to column array.
+        flags (list): List of flag dicts for each record in the batch.
+    """
+
+    #: Placeholder value for missing (``"."``) entries in integer columns.
+    MISSING_INT = -1
+
+    #: Columns stored as object (string) arrays.
+    STR_COLUMNS = ('id', 'seq', 'seg1_ref_name', 'seg2_ref_name')
+
+    #: Columns stored as int64 arrays.
+    INT_COLUMNS = (
+        'seg1_read_start', 'seg1_read_end', 'seg1_ref_start', 'seg1_ref_end',
+        'seg2_read_start', 'seg2_read_end', 'seg2_ref_start', 'seg2_ref_end',
+    )
+
+    #: Columns stored as float64 arrays.
+    FLOAT_COLUMNS = ('energy', 'seg1_score', 'seg2_score')
+
+    #: All columns, in hyb-format field order.
+    COLUMNS = tuple(HybRecord.to_fields_header()[:-1])
+
+    # HybBatch : Public Methods : Initialization
+    def __init__(
+            self,
+            columns: Dict[str, 'np.ndarray'],
+            flags: List[FlagsDict],
+            raw_values: Dict[str, List[str]],
+            ) -> None:
+        """Describe __init__ method description in class docstring."""
+        self.columns = columns
+        self.flags = flags
+        self._raw_values = raw_values
+
+    # HybBatch : Public Methods : Records
+    def get_record(self, index: int) -> HybRecord:
+        """
+        Create a :class:`HybRecord` object from the record at position ``index`` of the batch.
+
+        Args:
+            index (int): Position of the record in the batch.
+        """
+        columns = self.columns
+        seg_props = []
+        for seg_n in ('seg1_', 'seg2_'):
+            seg_props.append({
+                'ref_name': columns[seg_n + 'ref_name'][index],
+                'read_start': self._get_int(seg_n + 'read_start', index),
+                'read_end': self._get_int(seg_n + 'read_end', index),
+                'ref_start': self._get_int(seg_n + 'ref_start', index),
+                'ref_end': self._get_int(seg_n + 'ref_end', index),
+                'score': self._raw_values[seg_n + 'score'][index],
+            })
+        return HybRecord._from_parsed(
+            columns['id'][index],
+            columns['seq'][index],
+            self._raw_values['energy'][index],
+            seg_props[0],
+            seg_props[1],
+            dict(self.flags[index]),
+        )
+
+    # HybBatch : Public Methods : Records
+    def to_records(self) -> List[HybRecord]:
+        """Return a list of :class:`HybRecord` objects for all records in the batch."""
+        return [self.get_record(i) for i in range(len(self))]
+
+    # HybBatch : Public Methods : Columns
+    def get_flag_column(self, flag_key: str) -> 'np.ndarray':
+        """
+        Return an object array with the value of flag ``flag_key`` for each record.
+
+        Records without the flag have a value of ``None``.
+
+        Args:
+            flag_key (str): Flag to return values for.
+        """
+        return np.array([flags.get(flag_key) for flags in self.flags], dtype=object)
+
+    # Start HybBatch Magic Methods
+    # HybBatch : Public MagicMethods : Evaluation
+    def __len__(self) -> int:
+        """Return the number of records in the batch."""
+        return len(self.flags)
+
+    # HybBatch : Public MagicMethods : Iteration
+    def __iter__(self) -> Iterable[HybRecord]:
+        """Iterate over the records in the batch as :class:`HybRecord` objects."""
+        for i in range(len(self)):
+            yield self.get_record(i)
+
+    # HybBatch : Public MagicMethods : Iteration
+    def __getitem__(self, index: int) -> HybRecord:
+        """Return the record at position ``index`` as a :class:`HybRecord` object."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('HybBatch index out of range: %s' % index)
+        return self.get_record(index)
+
+    # HybBatch : Public MagicMethods : Printing
+    def __str__(self) -> str:
+        """Print a description of the batch."""
+        return '<HybBatch Records: %i>' % len(self)
+
+    # Start HybBatch Public Classmethods
+    # HybBatch : Public Classmethods : Construction
+    @classmethod
+    def from_lines(
+            cls,
+            lines: Iterable[str],
+            hybformat_id: bool = False,
+            hybformat_ref: bool = False,
+            ) -> Self:
+        """
+        Construct a HybBatch from a sequence of hyb-format lines.
+
+        Args:
+            lines (list): Hyb-format strings, one per record.
+            hybformat_id (:obj:`bool`, optional): If ``True``, read count
+                information from identifier in
+                ``<read_number>_<read_count>`` format.
+            hybformat_ref (:obj:`bool`, optional): If ``True``, read
+                additional record information from
+                identifier in ``<gene_id>_<transcript_id>_<gene_name>_<seg_type>`` format.
+
+        Returns:
+            :class:`HybBatch` instance containing the parsed records.
+        """
+        min_fields = hybkit.settings.MIN_RECORD_FIELDS
+        max_fields = hybkit.settings.MAX_RECORD_FIELDS
+        rows = []
+        for line in lines:
+            line_items = line.strip().split('\t')
+            if not min_fields <= len(line_items) <= max_fields:
+                message = 'Hyb record lines require 15 or 16 fields '
+                message += 'separated by tab ("\\t") characters, '
+                message += 'but only %i were found:\n"%s"' % (len(line_items), line.strip())
+                raise HybkitConstructorError(message)
+            if len(line_items) == min_fields:
+                line_items.append('')
+            rows.append(line_items)
+
+        field_names = (*cls.COLUMNS, 'flags')
+        if rows:
+            fields = dict(zip(field_names, zip(*rows)))
+        else:
+            fields = {name: () for name in field_names}
+
+        for name in ('id', 'seq'):
+            for value in fields[name]:
+                if value == '.' or not value.strip() or (name == 'seq' and not value.isalpha()):
+                    message = 'HybBatch records require valid "id" and "seq" fields. '
+                    message += 'Provided %s: "%s"' % (name, value)
+                    raise HybkitConstructorError(message)
+
+        columns = {}
+        for name in cls.STR_COLUMNS:
+            columns[name] = np.array(fields[name], dtype=object)
+        for name in cls.INT_COLUMNS:
+            columns[name] = cls._make_int_column(name, fields[name])
+        for name in cls.FLOAT_COLUMNS:
+            columns[name] = cls._make_float_column(name, fields[name])
+
+        flags = [HybRecord._read_flags(flag_str) if flag_str else {}
+                 for flag_str in fields['flags']]
+        if hybformat_id or hybformat_ref:
+            for hyb_id, seg1_ref, seg2_ref, record_flags in zip(
+                    fields['id'], fields['seg1_ref_name'], fields['seg2_ref_name'], flags):
+                HybRecord._add_hybformat_flags(
+                    hyb_id, seg1_ref, seg2_ref, record_flags,
+                    hybformat_id=hybformat_id,
+                    hybformat_ref=hybformat_ref,
+                )
+
+        raw_values = {name: list(fields[name]) for name in cls.FLOAT_COLUMNS}
+        return cls(columns, flags, raw_values)
+
+    # Start HybBatch Private Methods
+    # HybBatch : Private Methods : Columns
+    def _get_int(self, name: str, index: int) -> Optional[int]:
+        value = int(self.columns[name][index])
+        if value == self.MISSING_INT:
+            return None
+        return value
+
+    # HybBatch : Private Classmethods : Columns
+    @classmethod
+    def _make_int_column(cls, name: str, values: Tuple[str, ...]) -> 'np.ndarray':
+        try:
+            return np.array(values, dtype=np.int64)
+        except ValueError:
+            pass
+        try:
+            return np.array(
+                [cls.MISSING_INT if value == '.' else int(value) for value in values],
+                dtype=np.int64
+            )
+        except ValueError:
+            message = 'Column "%s" must contain integer values (or ".").' % name
+            raise HybkitConstructorError(message) from None
+
+    # HybBatch : Private Classmethods : Columns
+    @classmethod
+    def _make_float_column(cls, name: str, values: Tuple[str, ...]) -> 'np.ndarray':
+        try:
+            return np.array(values, dtype=np.float64)
+        except ValueError:
+            pass
+        try:
+            return np.array(
+                [np.nan if value == '.' else float(value) for value in values],
+                dtype=np.float64
+            )
+        except ValueError:
+            message = 'Column "%s" must contain numeric values (or ".").' % name
+            raise HybkitConstructorError(message) from None
+
 
 # ----- Begin FoldRecord Class -----
 class FoldRecord:
@@ -2302,6 +3509,8 @@ class FoldRecord:
         hybkit.settings.FoldRecord_settings_info['seq_type'][4]['choices'])
     _error_mode_choices = frozenset(
         hybkit.settings.FoldRecord_settings_info['error_mode'][4]['choices'])
+    # Translation table of matched (zero) / mismatched bytes to comparison string characters
+    _MATCH_CHARS = b'|' + (b'.' * 255)
 
     # Start FoldRecord Public Methods
     # FoldRecord : Public Methods : Initialization
@@ -2417,11 +3626,8 @@ class FoldRecord:
         if (self.seq == hyb_record.seq):
             return 0
         else:
-            mismatches = 0
-            for i in range(max([len(hyb_record.seq), len(self.seq)])):
-                if hyb_record.seq[i:(i + 1)] != self.seq[i:(i + 1)]:
-                    mismatches += 1
-            return mismatches
+            mismatches = self._get_seq_mismatches(hyb_record.seq, self.seq)
+            return len(mismatches) - mismatches.count(0)
 
     # FoldRecord : Public Methods : HybRecord Comparison
     def dynamic_count_hyb_record_mismatches(self, hyb_record: HybRecord) -> int:
@@ -2435,11 +3641,45 @@ class FoldRecord:
         if (self.seq == dynamic_seq):
             return 0
         else:
-            mismatches = 0
-            for i in range(max([len(dynamic_seq), len(self.seq)])):
-                if dynamic_seq[i:(i + 1)] != self.seq[i:(i + 1)]:
-                    mismatches += 1
-            return mismatches
+            mismatches = self._get_seq_mismatches(dynamic_seq, self.seq)
+            return len(mismatches) - mismatches.count(0)
+
+    # FoldRecord : Public Staticmethods : Seq Comparison
+    @staticmethod
+    def batch_count_seq_mismatches(
+            seqs_1: Iterable[str],
+            seqs_2: Iterable[str],
+            ) -> np.ndarray:
+        """
+        Count position-wise mismatches between many pairs of sequences at once.
+
+        Each pair is counted as in :meth:`static_count_hyb_record_mismatches`,
+        where positions beyond the end of the shorter sequence count as mismatches.
+
+        Args:
+            seqs_1 (:obj:`list` of :obj:`str`): First sequence of each pair.
+            seqs_2 (:obj:`list` of :obj:`str`): Second sequence of each pair.
+
+        Returns:
+            :class:`numpy.ndarray` of mismatch counts for each pair.
+        """
+        seqs_1 = list(seqs_1)
+        seqs_2 = list(seqs_2)
+        if len(seqs_1) != len(seqs_2):
+            message = 'seqs_1 and seqs_2 must be the same length: '
+            message += '%i != %i' % (len(seqs_1), len(seqs_2))
+            raise HybkitArgError(message)
+        width = max(map(len, itertools.chain(seqs_1, seqs_2)), default=1) or 1
+        # Compare zero-padded byte (ASCII) or code point arrays, one row per sequence.
+        if all(seq.isascii() for seq in itertools.chain(seqs_1, seqs_2)):
+            use_dtype, code_dtype = 'S%i' % width, np.uint8
+            seqs_1 = [seq.encode('ascii') for seq in seqs_1]
+            seqs_2 = [seq.encode('ascii') for seq in seqs_2]
+        else:
+            use_dtype, code_dtype = '<U%i' % width, np.uint32
+        codes_1 = np.array(seqs_1, dtype=use_dtype).view(code_dtype).reshape(-1, width)
+        codes_2 = np.array(seqs_2, dtype=use_dtype).view(code_dtype).reshape(-1, width)
+        return np.count_nonzero(codes_1 != codes_2, axis=1)
 
     # FoldRecord : Public Methods : HybFile Comparison
     def matches_hyb_record(
@@ -2909,15 +4149,28 @@ class FoldRecord:
             raise RuntimeError
 
     # FoldRecord : Private Methods : Seq Comparison
-    def _get_seq_mismatch_string(self, seq1: str, seq2: str) -> str:
-        match_str = ''
-        for i in range(max([len(seq1), len(seq2)])):
-            if seq1[i:(i + 1)] == seq2[i:(i + 1)]:
-                match_str += '|'
-            else:
-                match_str += '.'
-            mismatch_count = match_str.count('.')
-        return match_str, mismatch_count
+    def _get_seq_mismatch_string(self, seq1: str, seq2: str) -> Tuple[str, int]:
+        mismatches = self._get_seq_mismatches(seq1, seq2)
+        match_str = mismatches.translate(self._MATCH_CHARS).decode('ascii')
+        return match_str, (len(mismatches) - mismatches.count(0))
+
+    # FoldRecord : Private Staticmethods : Seq Comparison
+    @staticmethod
+    def _get_seq_mismatches(seq1: str, seq2: str) -> bytes:
+        # Return a byte for each position of the longer sequence, zero where sequences match.
+        #   ASCII sequences are compared with XOR of their bytes as integers,
+        #   other sequences by code point with numpy.
+        min_len = min(len(seq1), len(seq2))
+        len_diff = abs(len(seq1) - len(seq2))
+        if seq1.isascii() and seq2.isascii():
+            xor_int = (int.from_bytes(seq1[:min_len].encode('ascii'), 'big')
+                       ^ int.from_bytes(seq2[:min_len].encode('ascii'), 'big'))
+            mismatches = xor_int.to_bytes(min_len, 'big')
+        else:
+            codes_1 = np.frombuffer(seq1[:min_len].encode('utf-32-le'), dtype=np.uint32)
+            codes_2 = np.frombuffer(seq2[:min_len].encode('utf-32-le'), dtype=np.uint32)
+            mismatches = (codes_1 != codes_2).astype(np.uint8).tobytes()
+        return mismatches + (b'\x01' * len_diff)
 
 
 # ----- Begin FoldFile Class -----
@@ -2939,8 +4192,8 @@ FOLD_FILE_COMMON_ARGS_ATTRS = (
         from_file_like (:obj:`bool`, optional): If True, treat the first argument
             as a file-like object (such as io.StringIO or gzip.GzipFile) and the
             remaining positional arguments are ignored (Default ``False``).
-        *args: Passed to :func:`open()`.
-        **kwargs: Passed to :func:`open()`.
+        *args: Passed to :func:`hybkit.compression.open_file`.
+        **kwargs: Passed to :func:`hybkit.compression.open_file`.
 
     Attributes:
         fh (:obj:`file`): File handle for the file being wrapped.
@@ -2985,7 +4238,7 @@ class FoldFile:
         if from_file_like:
             self.fh = args[0]
         else:
-            self.fh = open(*args, **kwargs)  # noqa: SIM115
+            self.fh = hybkit.compression.open_file(*args, **kwargs)
 
         # Set foldrecord_type
         if seq_type is None:
@@ -3067,12 +4320,13 @@ class FoldFile:
 
         Unlike the file.writelines() method, this method will add a newline to the
         end of each written record line.
+        Records are written in buffered blocks using a :class:`RecordWriter`.
 
         Args:
             write_records (list): List of :class:`FoldRecord` objects to write.
         """
-        for write_record in write_records:
-            self.write_record(write_record)
+        with RecordWriter(self, close_file=False) as writer:
+            writer.write_records(write_records)
 
     # FoldFile : Public Methods : Writing
     def write_fh(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
@@ -3091,7 +4345,8 @@ class FoldFile:
         Open a path to a text file using :func:`open` and return relevant file object.
 
         Arguments match those of the Python3 built-in :func:`open` function and are
-        passed directly to it.
+        passed to :func:`hybkit.compression.open_file`, which transparently
+        decompresses or compresses files with a compressed suffix (such as ``.gz``).
 
         This method is provided as a convenience function for drop-in replacement of the
         built-in :func:`open` function.
@@ -3111,8 +4366,8 @@ class FoldFile:
                 "raise": Raise an error when encountered and exit program;
                 "warn_return": Print a warning and return the error_value;
                 "return": Return the error value with no warnings.
-            *args: Passed directly to :func:`open`.
-            **kwargs: Passed directly to :func:`open`.
+            *args: Passed to :func:`hybkit.compression.open_file`.
+            **kwargs: Passed to :func:`hybkit.compression.open_file`.
 
         Returns:
             :class:`HybFile` object.
@@ -3202,29 +4457,42 @@ class CtFile(FoldFile):
 
     Warning:
             This class is in beta stage, and is not well-tested.
+
+    .. _CtFile-Attributes:
     """
 
     # Args/Attrs Description in FOLD_FILE_COMMON_ARGS_ATTRS
 
     # Start CtFile Methods
     # CtFile : Public Methods
-    def read_record(self) -> FoldReturn:
+    def read_record(self, override_error_mode: Optional[ErrorModeArg] = None) -> FoldReturn:
         """
         Return the next CT record as a :class:`FoldRecord` object.
 
         Call next(self.fh) to return the first line of the next entry.
         Determine the expected number of following lines in the entry, and read that number
         of lines further. Return lines as a FoldRecord object.
+
+        Args:
+            override_error_mode (str): Override the error_mode set in the
+                :class:`CtFile` object. See the
+                :ref:`CtFile Constructor <CtFile-Attributes>` for more
+                information on allowed error modes.
         """
         header = next(self.fh)
         record_lines = [header]
         expected_line_num = int(header.strip().split()[0])
         for _ in range(expected_line_num):
             record_lines.append(next(self.fh))
-        record_type = self._foldrecord_types[self.settings['foldrecord_type']]
-        record = record_type.from_ct_lines(
+        if override_error_mode is None:
+            use_error_mode = self.error_mode
+        else:
+            use_error_mode = override_error_mode
+        record = FoldRecord.from_ct_lines(
             record_lines,
-            error_mode=self.error_mode)
+            error_mode=use_error_mode,
+            seq_type=self.foldrecord_seq_type,
+        )
         return record
 
     # CtFile : Disable Record Writing Methods
@@ -3252,6 +4520,193 @@ class CtFile(FoldFile):
 CtFile.__doc__ += FOLD_FILE_COMMON_ARGS_ATTRS
 
 
+# ----- Begin RecordWriter Class -----
+class RecordWriter:
+    """
+    Buffered writer of records to a :class:`HybFile` or :class:`ViennaFile`.
+
+    Records are formatted as by the ``write_record()`` method of the file and collected
+    in a buffer, which is written to the underlying file handle as a single joined string
+    once it holds at least ``buffer_size`` characters, or ``flush_records`` records
+    (if provided). This reduces the number of write calls for large outputs
+    to one per buffer rather than one per record.
+
+    Buffered records are written by :meth:`flush` and by :meth:`close`, which
+    also closes the file unless ``close_file=False``. When used with "with" syntax,
+    the writer is closed on exit.
+
+    Example usage:
+        ::
+
+            with hybkit.RecordWriter(hybkit.HybFile('path/to/out.hyb', 'w')) as out_hyb:
+                for hyb_record in hyb_records:
+                    out_hyb.write_record(hyb_record)
+
+    Args:
+        out_file (HybFile or ViennaFile): File object to write records to.
+        buffer_size (:obj:`int`, optional): Number of buffered characters that triggers
+            a write. Defaults to :data:`hybkit.settings.WRITE_BUFFER_SIZE`.
+        flush_records (:obj:`int`, optional): If provided, also write buffered records
+            after this number of records has been buffered.
+        close_file (:obj:`bool`, optional): If ``True`` (default), close ``out_file``
+            when the writer is closed.
+
+    Attributes:
+        out_file (HybFile or ViennaFile): File object records are written to.
+        buffer_size (int): Number of buffered characters that triggers a write.
+        flush_records (int): Number of buffered records that triggers a write (or ``None``).
+        close_file (bool): Close ``out_file`` when the writer is closed.
+        record_count (int): Number of records written (including buffered records).
+    """
+
+    # Start RecordWriter Public Methods
+    # RecordWriter : Public Methods : Initialization / Closing
+    def __init__(
+            self,
+            out_file: Union[HybFile, FoldFile],
+            buffer_size: Optional[int] = None,
+            flush_records: Optional[int] = None,
+            close_file: bool = True,
+            ) -> None:
+        """Describe __init__ method description in class docstring."""
+        if isinstance(out_file, HybFile):
+            self._ensure_record = out_file._ensure_hybrecord
+        elif isinstance(out_file, FoldFile):
+            self._ensure_record = out_file._ensure_foldrecord
+        else:
+            message = 'RecordWriter requires a HybFile or FoldFile object to write to. '
+            message += 'Provided: %s' % out_file
+            raise HybkitArgError(message)
+        if buffer_size is None:
+            buffer_size = hybkit.settings.WRITE_BUFFER_SIZE
+        for arg_name, arg_val in (('buffer_size', buffer_size), ('flush_records', flush_records)):
+            if arg_val is not None and arg_val < 1:
+                message = '%s must be a positive integer. Provided: %s' % (arg_name, arg_val)
+                raise HybkitArgError(message)
+        self.out_file = out_file
+        self.buffer_size = buffer_size
+        self.flush_records = flush_records
+        self.close_file = close_file
+        self.record_count = 0
+        self._to_record_string = out_file._to_record_string
+        self._buffer = []
+        self._buffer_chars = 0
+
+    # RecordWriter : Public Methods : Initialization / Closing
+    def __enter__(self, *args: Any, **kwargs: Any) -> Self:  # noqa: ANN401
+        """Open "with" syntax."""
+        return self
+
+    # RecordWriter : Public Methods : Initialization / Closing
+    def __exit__(self, etype: Any, value: Any, traceback: Any) -> None:  # noqa: ANN401
+        """Close "with" syntax."""
+        self.close()
+
+    # RecordWriter : Public Methods : Writing
+    def write_record(self, write_record: Union[HybRecord, FoldRecord]) -> None:
+        """
+        Add a record to the buffer, writing the buffer if it is full.
+
+        Args:
+            write_record (HybRecord or FoldRecord): Record to write.
+        """
+        self._ensure_record(write_record)
+        record_string = self._to_record_string(write_record, newline=True)
+        self._buffer.append(record_string)
+        self._buffer_chars += len(record_string)
+        self.record_count += 1
+        if (self._buffer_chars >= self.buffer_size
+                or (self.flush_records is not None
+                    and len(self._buffer) >= self.flush_records)):
+            self.flush()
+
+    # RecordWriter : Public Methods : Writing
+    def write_records(self, write_records: Iterable[Union[HybRecord, FoldRecord]]) -> None:
+        """
+        Add a sequence of records to the buffer, writing the buffer whenever it is full.
+
+        Args:
+            write_records (list): Records to write.
+        """
+        ensure_record = self._ensure_record
+        to_record_string = self._to_record_string
+        buffer = self._buffer
+        buffer_size = self.buffer_size
+        flush_records = self.flush_records
+        for write_record in write_records:
+            ensure_record(write_record)
+            record_string = to_record_string(write_record, newline=True)
+            buffer.append(record_string)
+            self._buffer_chars += len(record_string)
+            self.record_count += 1
+            if (self._buffer_chars >= buffer_size
+                    or (flush_records is not None and len(buffer) >= flush_records)):
+                self.flush()
+
+    # RecordWriter : Public Methods : Writing
+    def write_fh(self, write_str: str) -> None:
+        """Add a string to the buffer to be written directly to the file handle."""
+        self._buffer.append(write_str)
+        self._buffer_chars += len(write_str)
+        if self._buffer_chars >= self.buffer_size:
+            self.flush()
+
+    # RecordWriter : Public Methods : Writing
+    def flush(self) -> None:
+        """Write all buffered records to the file handle."""
+        if self._buffer:
+            self.out_file.fh.write(''.join(self._buffer))
+            self._buffer.clear()
+            self._buffer_chars = 0
+
+    # RecordWriter : Public Methods : Initialization / Closing
+    def close(self) -> None:
+        """Write all buffered records, and close the file if :attr:`close_file` is ``True``."""
+        self.flush()
+        if self.close_file:
+            self.out_file.close()
+
+    # Start RecordWriter Public Classmethods
+    # RecordWriter : Public Classmethods : Initialization
+    @classmethod
+    def open(
+            cls,
+            path: str,
+            *args: Any,  # noqa: ANN401
+            file_class: Type[Union[HybFile, FoldFile]] = HybFile,
+            buffer_size: Optional[int] = None,
+            flush_records: Optional[int] = None,
+            **kwargs: Any,  # noqa: ANN401
+            ) -> Self:
+        """
+        Open a path with ``file_class.open()`` and return a RecordWriter writing to the file.
+
+        Example usage:
+            ::
+
+                with RecordWriter.open('path/to/out.vienna', 'w',
+                                       file_class=hybkit.ViennaFile) as out_fold:
+                    out_fold.write_records(fold_records)
+
+        Args:
+            path (str): Path to file to open.
+            file_class (:obj:`type`, optional): File class to open the path with
+                (:class:`HybFile` (default) or :class:`ViennaFile`).
+            buffer_size (:obj:`int`, optional): Passed to :class:`RecordWriter`.
+            flush_records (:obj:`int`, optional): Passed to :class:`RecordWriter`.
+            *args: Passed to ``file_class.open()``.
+            **kwargs: Passed to ``file_class.open()``.
+
+        Returns:
+            :class:`RecordWriter` object.
+        """
+        return cls(
+            file_class.open(path, *args, **kwargs),
+            buffer_size=buffer_size,
+            flush_records=flush_records,
+        )
+
+
 # ----- Begin HybFoldIter Class -----
 class HybFoldIter:
     """
@@ -3319,19 +4774,33 @@ class HybFoldIter:
     # HybFoldIter : Public Methods
     def report(self) -> List[str]:
         """Return a report of information from iteration."""
+        return self.make_report(self.counters)
+
+    # HybFoldIter : Public Staticmethods
+    @staticmethod
+    def make_report(counters: Counter) -> List[str]:
+        """
+        Return a report of information from iteration from a counters object.
+
+        Allows reporting of combined counters from multiple iterators
+        (such as from :mod:`hybkit.parallel` worker processes).
+
+        Args:
+            counters (Counter): Counters as in :attr:`HybFoldIter.counters`.
+        """
         ret_lines = ['HybFoldIter Iteration Report:']
         add_line = 'Combined Iteration Attempts: '
-        add_line += str(self.counters['total_read_attempts'])
+        add_line += str(counters['total_read_attempts'])
         ret_lines.append(add_line)
         add_line = 'Hyb Record Iteration Attempts: '
-        add_line += str(self.counters['hyb_record_read_attempts'])
+        add_line += str(counters['hyb_record_read_attempts'])
         ret_lines.append(add_line)
         add_line = 'Fold Record Iteration Attempts: '
-        add_line += str(self.counters['fold_record_read_attempts'])
+        add_line += str(counters['fold_record_read_attempts'])
         ret_lines.append(add_line)
-        # add_line = 'Total Skipped Fold-Only Records: ' + str(self.counters['fold_only_skips'])
+        # add_line = 'Total Skipped Fold-Only Records: ' + str(counters['fold_only_skips'])
         # ret_lines.append(add_line)
-        add_line = 'Total Skipped Record Pairs: ' + str(self.counters['pair_skips'])
+        add_line = 'Total Skipped Record Pairs: ' + str(counters['pair_skips'])
         ret_lines.append(add_line)
         return ret_lines
 
@@ -3369,53 +4838,8 @@ class HybFoldIter:
                 # Attempt to read next FoldRecord
                 self.counters['fold_record_read_attempts'] += 1
                 next_fold_record = self.foldfile_handle.read_record(override_error_mode='return')
-                # Set initial loop variables
-                error = ''
-                # Check for "NoFold" error
-                if ('foldrecord_nofold' in self.settings['error_checks']
-                        and isinstance(next_fold_record, tuple)
-                        and next_fold_record[0] == 'NOFOLD'
-                    ):
-                    id_string = next_fold_record[1].split()[0]
-                    error = 'Improper FoldRecord : %s : No Fold (Energy = 99*.*)' % id_string
-
-                # Check for "NoEnergy" error
-                if (not error and isinstance(next_fold_record, tuple)
-                        and next_fold_record[0] == 'NOENERGY'):
-                    error = 'Improper FoldRecord: No Energy (no <Tab> in 3rd line)'
-
-                # Check for "InDel" errors
-                if (not error
-                        and 'hybrecord_indel' in self.settings['error_checks']
-                        and next_hyb_record.prop('has_indels')
-                    ):
-                    error = 'HybRecord: %s has InDels.' % str(next_hyb_record)
-
-                # Check for "Mismatch" errors
-                if (not error
-                    and 'max_mismatch' in self.settings['error_checks']
-                    and FoldRecord.settings['allowed_mismatches'] >= 0
-                        ):
-                    hyb_fold_mismatches = next_fold_record.count_hyb_record_mismatches(next_hyb_record)
-                    if hyb_fold_mismatches > FoldRecord.settings['allowed_mismatches']:
-                        error = 'HybRecord: %s ' % str(next_hyb_record)
-                        error += 'has: %i ' % hyb_fold_mismatches
-                        error += 'mismatches of '
-                        error += '%i allowed ' % FoldRecord.settings['allowed_mismatches']
-
-                # Check for "EnergyMismatch" errors
-                if (not error
-                        and 'energy_mismatch' in self.settings['error_checks']
-                        and next_fold_record.energy is not None
-                        and next_hyb_record.energy not in {None, '.'}
-                        and str(next_fold_record.energy) != str(next_hyb_record.energy)
-                    ):
-                        if not error:
-                            error = 'HybRecord: %s ' % str(next_hyb_record)
-                        error += 'has hyb-record / fold-record energy mismatch: '
-                        error += '%s / ' % str(next_hyb_record.energy)
-                        error += '%s\n' % str(next_fold_record.energy)
-                        error += next_fold_record.to_vienna_string()
+
+                error = self._get_pair_error(next_hyb_record, next_fold_record)
 
                 # If an error exists, deal with it depending on the value of iter_error_mode
                 if error:
@@ -3472,7 +4896,69 @@ class HybFoldIter:
         self.sequential_skips = 0
         return ret_obj
 
+    # HybFoldIter : Private Methods
+    def _get_pair_error(
+            self,
+            hyb_record: HybRecord,
+            fold_record: FoldReturn,
+            ) -> str:
+        # Return an error string for a record pair, or an empty string if no error is found.
+        error_checks = self.settings['error_checks']
+        error = ''
+        # Check for "NoFold" error
+        if ('foldrecord_nofold' in error_checks
+                and isinstance(fold_record, tuple)
+                and fold_record[0] == 'NOFOLD'
+            ):
+            id_string = fold_record[1].split()[0]
+            error = 'Improper FoldRecord : %s : No Fold (Energy = 99*.*)' % id_string
+
+        # Check for "NoEnergy" error
+        if (not error and isinstance(fold_record, tuple)
+                and fold_record[0] == 'NOENERGY'):
+            error = 'Improper FoldRecord: No Energy (no <Tab> in 3rd line)'
+
+        # Check for "InDel" errors
+        if (not error
+                and 'hybrecord_indel' in error_checks
+                and hyb_record.prop('has_indels')
+            ):
+            error = 'HybRecord: %s has InDels.' % str(hyb_record)
+
+        # Check for "Mismatch" errors
+        if (not error
+                and 'max_mismatch' in error_checks
+                and FoldRecord.settings['allowed_mismatches'] >= 0
+            ):
+            hyb_fold_mismatches = fold_record.count_hyb_record_mismatches(hyb_record)
+            if hyb_fold_mismatches > FoldRecord.settings['allowed_mismatches']:
+                error = 'HybRecord: %s ' % str(hyb_record)
+                error += 'has: %i ' % hyb_fold_mismatches
+                error += 'mismatches of '
+                error += '%i allowed ' % FoldRecord.settings['allowed_mismatches']
+
+        # Check for "EnergyMismatch" errors
+        if (not error
+                and 'energy_mismatch' in error_checks
+                and fold_record.energy is not None
+                and hyb_record.energy not in {None, '.'}
+                and str(fold_record.energy) != str(hyb_record.energy)
+            ):
+            error = 'HybRecord: %s ' % str(hyb_record)
+            error += 'has hyb-record / fold-record energy mismatch: '
+            error += '%s / ' % str(hyb_record.energy)
+            error += '%s\n' % str(fold_record.energy)
+            error += fold_record.to_vienna_string()
+
+        return error
+
 # Import the remainder of hybkit code to connect.
 import hybkit.analysis
+import hybkit.compression
+import hybkit.index
+import hybkit.parallel
+import hybkit.pipeline
 import hybkit.plot
+import hybkit.query
+import hybkit.sketch
 import hybkit.util
@@ -5,9 +5,11 @@
 
 """Functions for analysis of HybRecord and FoldRecord objects."""
 
+import array
 import copy
+import math
 from collections import Counter
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 import numpy as np
 
@@ -24,7 +26,8 @@ from hybkit.__about__ import (
     __status__,
     __version__,
 )
-from hybkit.errors import HybkitArgError
+from hybkit.errors import HybkitArgError, HybkitMiscError
+from hybkit.sketch import HyperLogLog, SpaceSaving, TDigest
 
 # ----- File-Specific Linting Directives:
 # ruff: noqa: F401 SLF001
@@ -33,6 +36,7 @@ from hybkit.errors import HybkitArgError
 AnalysisOptions = Literal['energy', 'type', 'mirna', 'target']
 AnalysisArg = Union[AnalysisOptions, List[AnalysisOptions]]
 QuantModeArg = Literal['single', 'reads', 'records']
+MemoryModeArg = Literal['exact', 'sketch']
 
 # --- Hybkit Analysis --- #
 class Analysis:
@@ -59,6 +63,27 @@ class Analysis:
     methods, which can return (or plot) the results
     of all analyses or of a specific subset of analyses.
 
+    Records can also be added as columns of values with :meth:`add_batch`, which
+    updates each analysis for many records at once with results identical to adding
+    records individually.
+
+    Analyses of separate groups of records (such as in separate processes)
+    can be combined with the :meth:`merge` method (or the ``+=`` operator).
+    The state of an analysis can be converted to built-in types with :meth:`get_state` for
+    pickling or serialization, and restored with :meth:`from_state`.
+
+    .. _SketchMode:
+
+    With the ``"sketch"`` memory mode, analyses use fixed memory regardless of the number
+    of records analyzed. Target names are counted with a :class:`~hybkit.sketch.SpaceSaving`
+    summary of the most common names, and the number of distinct names is estimated with a
+    :class:`~hybkit.sketch.HyperLogLog` summary. Energy values are summarized with a
+    :class:`~hybkit.sketch.TDigest` to estimate quantiles, and are not stored even if the
+    :attr:`settings['store_energy_vals'] <settings>` setting is ``True``.
+    Sizes of the summaries are set by the ``sketch_capacity``, ``sketch_hll_precision``,
+    and ``sketch_tdigest_compression`` :attr:`settings`. Error bounds for the
+    approximate values are included in the results, as described for each analysis below.
+
     Details for each respective analysis are provided here:
 
     .. _EnergyAnalysis:
@@ -67,6 +92,10 @@ class Analysis:
 
         This analysis evaluates the energy of each :class:`~hybkit.HybRecord` object
         and provides a binned-histogram of all energy values represented.
+        Energy statistics are calculated as running values in constant memory.
+        If the :attr:`settings['store_energy_vals'] <settings>` setting is ``True``,
+        all energy values are instead stored to calculate the exact mean and
+        standard deviation.
 
         Output Results:
             | ``energy_analysis_count`` (:obj:`int`): Count of energy values evaluated
@@ -81,6 +110,15 @@ class Analysis:
               hyb_records with energy values that fall within that range
               (rounded to the next highest integer (e.g. -12.5 -> -12).
 
+        Output Results (``"sketch"`` :ref:`memory mode <SketchMode>` only):
+            | ``energy_quantiles`` (:obj:`dict`): Estimated energy values at quantiles
+              0.05, 0.25, 0.5, 0.75, and 0.95
+            | ``energy_quantile_rank_errors`` (:obj:`dict`): Bound on the difference between each
+              quantile and the actual quantile of its estimated value (0.0 - 1.0)
+
+        As with ``energy_mean`` and ``energy_std``, quantiles are of the energy value of
+        each record, independent of the quantification mode.
+
 
     .. _TypeAnalysis:
 
@@ -165,6 +203,15 @@ class Analysis:
             | ``target_types`` (:obj:`~collections.Counter`): Counter containing types of
               miRNA targets detected.
 
+        Output Results (``"sketch"`` :ref:`memory mode <SketchMode>` only):
+            | ``target_names`` (:obj:`~collections.Counter`): Contains only the most common
+              names, with estimated counts that are never lower than the true count.
+            | ``target_names_max_error`` (:obj:`int`): Maximum overestimate of any count in
+              ``target_names``. Any name with a count greater than this value is included.
+            | ``target_names_distinct`` (:obj:`float`): Estimated count of distinct target names
+            | ``target_names_distinct_error`` (:obj:`float`): Relative standard error of
+              ``target_names_distinct``
+
     .. _FoldAnalysis:
 
     **Fold Analysis:**
@@ -203,6 +250,10 @@ class Analysis:
             all reads in record (else count 1); "records": if the "record_count" flag is set, count
             all individual records within combined record (else count 1). If not provided,
             defaults to the value in :attr:`Analysis.settings['quant_mode'].`
+        memory_mode (:obj:`str`, optional): Mode to use for storing analysis values.
+            Options are "exact": Store exact counts of all values; "sketch": Use fixed-size
+            approximate summaries (see :ref:`Sketch Mode <SketchMode>`). If not provided,
+            defaults to the value in :attr:`Analysis.settings['memory_mode'].`
 
     .. _Analysis-Attributes:
 
@@ -210,6 +261,7 @@ class Analysis:
         name (:obj:`str`): Name of the analysis
         analysis_types (:obj:`list` of :obj:`str`): List of analysis types to perform
         quant_mode (:obj:`str`): Mode to use for record quantification.
+        memory_mode (:obj:`str`): Mode to use for storing analysis values.
     """
 
     #: Class-level settings. See :attr:`hybkit.settings.Analysis_settings` for descriptions.
@@ -242,9 +294,43 @@ class Analysis:
             'fold_match_counts',
         ),
     }
+    _state_attrs = {
+        'energy': (
+            '_energy_analysis_count', '_has_energy_val', '_no_energy_val',
+            '_energy_val_count', '_energy_min', '_energy_max', '_energy_mean', '_energy_m2',
+            '_energy_vals', '_binned_energy_vals',
+        ),
+        'type': (
+            '_types_analysis_count', '_hybrid_types', '_reordered_hybrid_types',
+            '_mirna_hybrid_types', '_seg1_types', '_seg2_types', '_all_seg_types',
+        ),
+        'mirna': (
+            '_mirna_analysis_count', '_mirnas_5p', '_mirnas_3p', '_mirna_dimers',
+            '_non_mirna', '_has_mirna',
+        ),
+        'target': (
+            '_target_analysis_count', '_target_evals', '_target_names', '_target_types',
+        ),
+        'fold': (
+            '_fold_analysis_count', '_folds_recorded', '_mirna_nt_fold_counts',
+            '_fold_match_counts',
+        ),
+    }
+    _sketch_result_keys = {
+        'energy': ('energy_quantiles', 'energy_quantile_rank_errors'),
+        'target': (
+            'target_names_max_error', 'target_names_distinct', 'target_names_distinct_error',
+        ),
+    }
+    _sketch_state_attrs = {
+        'energy': ('_energy_digest',),
+        'target': ('_target_names_distinct',),
+    }
+    _energy_quantiles = (0.05, 0.25, 0.5, 0.75, 0.95)
     _all_result_keys_list_temp = []  # noqa: RUF012
     for key in _result_keys:
         _all_result_keys_list_temp += _result_keys[key]
+        _all_result_keys_list_temp += _sketch_result_keys.get(key, ())
 
     _all_result_keys_list = tuple(_all_result_keys_list_temp)
     _all_result_keys_set = frozenset(_all_result_keys_list_temp)
@@ -253,6 +339,27 @@ class Analysis:
     _quant_mode_options = frozenset(
         hybkit.settings.Analysis_settings_info['quant_mode'][4]['choices']
         )
+    _memory_mode_options = frozenset(
+        hybkit.settings.Analysis_settings_info['memory_mode'][4]['choices']
+        )
+
+    #: Columns of record batches used by each analysis type in :meth:`add_batch`.
+    batch_columns = {
+        'energy': ('energy',),
+        'type': ('seg1_type', 'seg2_type', 'mirna_seg'),
+        'mirna': ('mirna_seg',),
+        'target': ('mirna_seg', 'seg1_type', 'seg2_type', 'seg1_ref_name', 'seg2_ref_name'),
+        'fold': ('mirna_seg', 'mirna_fold'),
+    }
+    _batch_quant_columns = {
+        'single': (),
+        'reads': ('read_count',),
+        'records': ('record_count',),
+    }
+    _batch_flag_columns = (
+        ('seg1_type', 'seg1_type'), ('seg2_type', 'seg2_type'), ('mirna_seg', 'miRNA_seg'),
+    )
+    _batch_count_columns = (('read_count', 'read_count'), ('record_count', 'count_total'))
 
     # ----- Begin Analysis Class -----
     # Start Analysis Public Methods
@@ -262,6 +369,7 @@ class Analysis:
             analysis_types: AnalysisArg,
             name: Optional[str] = None,
             quant_mode: Optional[QuantModeArg] = None,
+            memory_mode: Optional[MemoryModeArg] = None,
             ) -> None:
         """Describe in class docstring."""
         if analysis_types is None or not analysis_types:
@@ -297,6 +405,17 @@ class Analysis:
         else:
             self.quant_mode = quant_mode
 
+        if memory_mode is None:
+            self.memory_mode = self.settings['memory_mode']
+        elif memory_mode not in self._memory_mode_options:
+            message = (
+                f'Memory mode "{memory_mode!s}" not recognized.'
+                '\nChoices: {}'.format(', '.join(sorted(self._memory_mode_options)))
+            )
+            raise HybkitArgError(message)
+        else:
+            self.memory_mode = memory_mode
+
         for analysis_type in self.analysis_types:
             getattr(self, '_init_' + analysis_type)()
 
@@ -340,6 +459,211 @@ class Analysis:
                 hyb_record.eval_mirna()
             self.add_hyb_record(hyb_record)
 
+    # Analysis : Public Methods : Add Batch
+    def add_batch(
+            self,
+            batch: Union[Dict[str, Any], 'hybkit.HybBatch', Iterable['hybkit.HybRecord']],
+            ) -> None:
+        """
+        Add a batch of records to the analysis as columns of values.
+
+        Each active analysis is updated for all records in the batch at once with
+        :mod:`numpy` aggregation, with results identical to adding each record
+        with :meth:`add_hyb_record`. All records in the batch are checked for
+        required information before any are added.
+
+        The batch is a dict of equal-length column arrays (or lists) with one value per record,
+        as created by :meth:`make_batch`. Columns required by each analysis type are listed in
+        :attr:`batch_columns`, with an additional ``read_count`` (for quant_mode "reads") or
+        ``record_count`` (for quant_mode "records") column:
+
+            | ``energy``: Energy values as floats, with missing values as ``nan``
+            | ``seg1_type``, ``seg2_type``: Segment type flags (or ``None``)
+            | ``mirna_seg``: :ref:`miRNA_seg <mirna_seg>` flags (or ``None``)
+            | ``seg1_ref_name``, ``seg2_ref_name``: Segment reference names
+            | ``mirna_fold``: Fold string of the miRNA segment (or ``None``)
+            | ``read_count``, ``record_count``: Integer counts, with missing values as
+              :attr:`hybkit.HybBatch.MISSING_INT`
+
+        Args:
+            batch (:obj:`dict`, :class:`~hybkit.HybBatch`, or :obj:`list` of
+                :class:`~hybkit.HybRecord`): Columns of record values. If a
+                :class:`~hybkit.HybBatch` or records are provided,
+                columns are created using :meth:`make_batch`.
+        """
+        if not isinstance(batch, dict):
+            batch = self.make_batch(batch)
+        batch = self._check_batch(batch)
+        counts = self._get_batch_quant(batch)
+        for analysis_type in self.analysis_types:
+            getattr(self, '_add_batch_' + analysis_type)(batch, counts)
+
+    # Analysis : Public Methods : Add Batch
+    def make_batch(
+            self,
+            hyb_records: Union['hybkit.HybBatch', Iterable['hybkit.HybRecord']],
+            ) -> Dict[str, 'np.ndarray']:
+        """
+        Create a batch of columns for the active analyses for use with :meth:`add_batch`.
+
+        Args:
+            hyb_records (:class:`~hybkit.HybBatch` or :obj:`list` of :class:`~hybkit.HybRecord`):
+                Records to create columns from. For a :class:`~hybkit.HybBatch`,
+                flag values are read from the batch flags, and ``mirna_fold`` values
+                are ``None`` as the batch has no associated fold records.
+
+        Returns:
+            dict: Dict of column name to column array.
+        """
+        column_names = self._get_batch_column_names()
+        if isinstance(hyb_records, hybkit.HybBatch):
+            return self._make_hybbatch_columns(hyb_records, column_names)
+        hyb_records = list(hyb_records)
+        missing_int = hybkit.HybBatch.MISSING_INT
+        batch = {}
+        if 'energy' in column_names:
+            batch['energy'] = np.array(
+                [np.nan if hyb_record.energy is None else float(hyb_record.energy)
+                 for hyb_record in hyb_records],
+                dtype=np.float64,
+            )
+        for column_name, flag_name in self._batch_flag_columns:
+            if column_name in column_names:
+                batch[column_name] = np.array(
+                    [hyb_record.flags.get(flag_name) for hyb_record in hyb_records],
+                    dtype=object,
+                )
+        for seg_n in ('seg1', 'seg2'):
+            if seg_n + '_ref_name' in column_names:
+                batch[seg_n + '_ref_name'] = np.array(
+                    [getattr(hyb_record, seg_n + '_props')['ref_name']
+                     for hyb_record in hyb_records],
+                    dtype=object,
+                )
+        if 'mirna_fold' in column_names:
+            mirna_folds = []
+            for hyb_record in hyb_records:
+                if (hyb_record.fold_record is not None
+                        and hyb_record.is_set('eval_mirna')
+                        and hyb_record.prop('has_mirna')):
+                    mirna_folds.append(
+                        hyb_record.mirna_details('mirna_fold', allow_mirna_dimers=True)
+                    )
+                else:
+                    mirna_folds.append(None)
+            batch['mirna_fold'] = np.array(mirna_folds, dtype=object)
+        for column_name, flag_name in self._batch_count_columns:
+            if column_name in column_names:
+                batch[column_name] = np.array(
+                    [missing_int if hyb_record.flags.get(flag_name) is None
+                     else int(hyb_record.flags[flag_name])
+                     for hyb_record in hyb_records],
+                    dtype=np.int64,
+                )
+        return batch
+
+    # Start Merge Methods
+    # Analysis : Public Methods : Merge
+    def merge(self, other: 'Analysis') -> None:
+        """
+        Add the analysis state of another Analysis object to this analysis.
+
+        The other analysis must have the same analysis types, quantification mode,
+        and memory mode.
+        Merging analyses of separate groups of records (such as separate files, or chunks
+        of a file) provides the same results as a single analysis of all records.
+        Merging is also available using the ``+=`` operator.
+
+        Args:
+            other (:class:`Analysis`): Analysis to add to this analysis.
+        """
+        if not isinstance(other, Analysis):
+            message = 'Object to merge: "%s" is not an Analysis object.' % str(other)
+            raise HybkitArgError(message)
+        if set(other.analysis_types) != set(self.analysis_types):
+            message = 'Analyses to merge have different analysis types:\n'
+            message += '    %s\n' % ', '.join(self.analysis_types)
+            message += '    %s' % ', '.join(other.analysis_types)
+            raise HybkitArgError(message)
+        if other.quant_mode != self.quant_mode:
+            message = 'Analyses to merge have different quantification modes: '
+            message += '%s, %s' % (self.quant_mode, other.quant_mode)
+            raise HybkitArgError(message)
+        if other.memory_mode != self.memory_mode:
+            message = 'Analyses to merge have different memory modes: '
+            message += '%s, %s' % (self.memory_mode, other.memory_mode)
+            raise HybkitArgError(message)
+        if 'energy' in self.analysis_types:
+            if (self._energy_vals is None) != (other._energy_vals is None):
+                message = 'Analyses to merge must both (or neither) store energy values. '
+                message += 'See setting: "store_energy_vals"'
+                raise HybkitArgError(message)
+        for analysis_type in self.analysis_types:
+            getattr(self, '_merge_' + analysis_type)(other)
+
+    # Analysis : Public Methods : Merge
+    def __iadd__(self, other: 'Analysis') -> 'Analysis':
+        """Add the analysis state of another Analysis object using :meth:`merge`."""
+        self.merge(other)
+        return self
+
+    # Start State Methods
+    # Analysis : Public Methods : State
+    def get_state(self) -> dict:
+        """
+        Return the current state of the analysis as a dictionary of built-in types.
+
+        The state contains only :obj:`dict`, :obj:`list`, :obj:`str`, :obj:`int`,
+        :obj:`float`, and ``None`` values, so can be pickled or serialized as JSON to
+        send partial analysis results between processes or hosts. Analyses can be
+        recreated from the state with :meth:`from_state`.
+
+        Returns:
+            dict: Analysis state.
+        """
+        state = {
+            'analysis_types': list(self.analysis_types),
+            'name': self.name,
+            'quant_mode': self.quant_mode,
+            'memory_mode': self.memory_mode,
+            'data': {},
+        }
+        for analysis_type in self.analysis_types:
+            state['data'][analysis_type] = {
+                attr_name.lstrip('_'): self._encode_state_value(getattr(self, attr_name))
+                for attr_name in self._get_state_attrs(analysis_type)
+            }
+        return state
+
+    # Analysis : Public Methods : State
+    @classmethod
+    def from_state(cls, state: dict) -> 'Analysis':
+        """
+        Create an Analysis object from an analysis state.
+
+        Args:
+            state (dict): Analysis state, as returned by :meth:`get_state`.
+
+        Returns:
+            :class:`Analysis` object.
+        """
+        analysis = cls(
+            analysis_types=state['analysis_types'],
+            name=state['name'],
+            quant_mode=state['quant_mode'],
+            memory_mode=state.get('memory_mode', 'exact'),
+        )
+        for analysis_type in analysis.analysis_types:
+            if analysis_type not in state['data']:
+                message = 'State does not contain data for analysis type: %s' % analysis_type
+                raise HybkitArgError(message)
+            type_data = state['data'][analysis_type]
+            for attr_name in analysis._get_state_attrs(analysis_type):
+                init_value = getattr(analysis, attr_name)
+                value = cls._decode_state_value(type_data[attr_name.lstrip('_')], init_value)
+                setattr(analysis, attr_name, value)
+        return analysis
+
     # Start Results Methods
     # Analysis : Public Methods : Results : get_all_results
     def get_all_results(self) -> dict:
@@ -394,13 +718,19 @@ class Analysis:
             )
             raise HybkitArgError(message)
         for analysis_type in self.analysis_options:
-            if result_key in self._result_keys[analysis_type]:
+            sketch_result_keys = self._sketch_result_keys.get(analysis_type, ())
+            if result_key in self._result_keys[analysis_type] or result_key in sketch_result_keys:
                 if analysis_type not in self.analysis_types:
                     message = (
                         f'Result "{result_key}" cannot be gotten because analysis '
                         f'type "{analysis_type}" is not active'
                     )
                     raise HybkitArgError(message)
+                if result_key in sketch_result_keys and self.memory_mode != 'sketch':
+                    message = (
+                        f'Result "{result_key}" is only available with the "sketch" memory mode.'
+                    )
+                    raise HybkitArgError(message)
                 return getattr(self, '_get_' + analysis_type + '_results')()[result_key]
         raise HybkitArgError('Result key "%s" not found.' % result_key)
 
@@ -589,13 +919,149 @@ class Analysis:
         else:
             raise HybkitArgError('Quantification mode "%s" not recognized.' % self.quant_mode)
 
+    # Analysis : Private Methods : Helper Methods : Batches
+    def _get_batch_column_names(self) -> Tuple[str, ...]:
+        column_names = []
+        for analysis_type in self.analysis_types:
+            column_names += self.batch_columns[analysis_type]
+        column_names += self._batch_quant_columns[self.quant_mode]
+        return tuple(dict.fromkeys(column_names))
+
+    # Analysis : Private Methods : Helper Methods : Batches
+    def _make_hybbatch_columns(
+            self,
+            hyb_batch: 'hybkit.HybBatch',
+            column_names: Tuple[str, ...],
+            ) -> Dict[str, 'np.ndarray']:
+        batch = {}
+        if 'energy' in column_names:
+            batch['energy'] = hyb_batch.columns['energy'].copy()
+        for column_name, flag_name in self._batch_flag_columns:
+            if column_name in column_names:
+                batch[column_name] = hyb_batch.get_flag_column(flag_name)
+        for column_name in ('seg1_ref_name', 'seg2_ref_name'):
+            if column_name in column_names:
+                batch[column_name] = hyb_batch.columns[column_name].copy()
+        if 'mirna_fold' in column_names:
+            batch['mirna_fold'] = np.full(len(hyb_batch), None, dtype=object)
+        for column_name, flag_name in self._batch_count_columns:
+            if column_name in column_names:
+                batch[column_name] = np.array(
+                    [hybkit.HybBatch.MISSING_INT if value is None else int(value)
+                     for value in hyb_batch.get_flag_column(flag_name)],
+                    dtype=np.int64,
+                )
+        return batch
+
+    # Analysis : Private Methods : Helper Methods : Batches
+    def _check_batch(self, batch: Dict[str, Any]) -> Dict[str, 'np.ndarray']:
+        checked_batch = {}
+        num_records = None
+        for column_name in self._get_batch_column_names():
+            if column_name not in batch:
+                message = 'Batch is missing column "%s" ' % column_name
+                message += 'required for analysis types: %s ' % ', '.join(self.analysis_types)
+                message += 'with quant_mode: %s' % self.quant_mode
+                raise HybkitArgError(message)
+            if column_name == 'energy':
+                column = np.asarray(batch[column_name], dtype=np.float64)
+            elif column_name in {'read_count', 'record_count'}:
+                column = np.asarray(batch[column_name], dtype=np.int64)
+            else:
+                column = np.asarray(batch[column_name], dtype=object)
+            if num_records is None:
+                num_records = len(column)
+            elif len(column) != num_records:
+                message = 'Batch columns must have the same length, '
+                message += 'column "%s" has %i values ' % (column_name, len(column))
+                message += 'instead of: %i' % num_records
+                raise HybkitArgError(message)
+            checked_batch[column_name] = column
+        checked_batch['num_records'] = num_records
+        return checked_batch
+
+    # Analysis : Private Methods : Helper Methods : Batches
+    def _get_batch_quant(self, batch: Dict[str, 'np.ndarray']) -> 'np.ndarray':
+        num_records = batch['num_records']
+        if self.quant_mode == 'single':
+            return np.ones(num_records, dtype=np.int64)
+        if self.quant_mode == 'reads':
+            counts, flag_name = batch['read_count'], 'read_count'
+        elif self.quant_mode == 'records':
+            counts, flag_name = batch['record_count'], 'count_total'
+        else:
+            raise HybkitArgError('Quantification mode "%s" not recognized.' % self.quant_mode)
+        if (counts == hybkit.HybBatch.MISSING_INT).any():
+            message = 'Expected Flag Key: %s, but it is not present in record.' % flag_name
+            raise HybkitMiscError(message)
+        return counts
+
+    # Analysis : Private Methods : Helper Methods : Batches
+    @staticmethod
+    def _ensure_batch_set(prop: str, missing: 'np.ndarray') -> None:
+        if missing.any():
+            message = 'Problem with batch record at index: %i\n' % int(np.argmax(missing))
+            message += 'Method requires set attribute/evaluation: "%s" before use.' % prop
+            raise HybkitMiscError(message)
+
+    # Analysis : Private Methods : Helper Methods : Batches
+    @staticmethod
+    def _get_batch_mirna_segs(
+            mirna_segs: 'np.ndarray',
+            ) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        # Return masks for "5p_mirna", "3p_mirna", and "mirna_dimer" properties.
+        upper_segs = np.array(
+            [None if mirna_seg is None else mirna_seg.upper() for mirna_seg in mirna_segs],
+            dtype=object,
+        )
+        is_dimer = np.equal(upper_segs, 'B')
+        is_5p = np.equal(upper_segs, '5P') | is_dimer
+        is_3p = np.equal(upper_segs, '3P') | is_dimer
+        return is_5p, is_3p, is_dimer
+
+    # Analysis : Private Methods : Helper Methods : Batches
+    @staticmethod
+    def _add_batch_counts(
+            counter: Counter,
+            keys: 'np.ndarray',
+            counts: 'np.ndarray',
+            key_func: Optional[Any] = None,
+            ) -> None:
+        # Add summed counts for each key, adding new keys in order of first occurrence
+        # (as when adding records individually).
+        if not len(keys):
+            return
+        unique_keys, first_indexes, key_codes = np.unique(
+            keys, return_index=True, return_inverse=True
+        )
+        key_counts = np.bincount(key_codes.ravel(), weights=counts, minlength=len(unique_keys))
+        unique_keys = unique_keys.tolist()
+        for i in np.argsort(first_indexes, kind='stable').tolist():
+            key = unique_keys[i] if key_func is None else key_func(unique_keys[i])
+            counter[key] += int(key_counts[i])
+
     # Start Init Methods
     # Analysis : Private Methods : Init Methods : Energy Analysis
     def _init_energy(self) -> None:
         self._energy_analysis_count = 0
         self._has_energy_val = 0
         self._no_energy_val = 0
-        self._energy_vals = np.array([], dtype=float)
+        # Running statistics of energy values (Welford's algorithm).
+        self._energy_val_count = 0
+        self._energy_min = None
+        self._energy_max = None
+        self._energy_mean = 0.0
+        self._energy_m2 = 0.0
+        # Optional buffer of all energy values, for exact statistics.
+        if self.settings['store_energy_vals'] and self.memory_mode != 'sketch':
+            self._energy_vals = array.array('d')
+        else:
+            self._energy_vals = None
+        # Optional summary of energy values, for quantiles in fixed memory.
+        if self.memory_mode == 'sketch':
+            self._energy_digest = TDigest(self.settings['sketch_tdigest_compression'])
+        else:
+            self._energy_digest = None
         self._binned_energy_vals = Counter()
         for i in range(0, -31, -1):
             self._binned_energy_vals[i] = 0
@@ -623,7 +1089,12 @@ class Analysis:
     def _init_target(self) -> None:
         self._target_analysis_count = 0
         self._target_evals = 0
-        self._target_names = Counter()
+        if self.memory_mode == 'sketch':
+            self._target_names = SpaceSaving(self.settings['sketch_capacity'])
+            self._target_names_distinct = HyperLogLog(self.settings['sketch_hll_precision'])
+        else:
+            self._target_names = Counter()
+            self._target_names_distinct = None
         self._target_types = Counter()
 
     # Analysis : Private Methods : Init Methods : Fold Analysis
@@ -640,9 +1111,20 @@ class Analysis:
         self._energy_analysis_count += 1
         if hyb_record.energy is not None:
             self._has_energy_val += count
-            self._energy_vals = np.append(self._energy_vals, float(hyb_record.energy))
-            if hyb_record.energy is not None:
-                energy_bin = int(np.ceil(float(hyb_record.energy)))
+            energy = float(hyb_record.energy)
+            self._energy_val_count += 1
+            if self._energy_min is None or energy < self._energy_min:
+                self._energy_min = energy
+            if self._energy_max is None or energy > self._energy_max:
+                self._energy_max = energy
+            delta = energy - self._energy_mean
+            self._energy_mean += delta / self._energy_val_count
+            self._energy_m2 += delta * (energy - self._energy_mean)
+            if self._energy_vals is not None:
+                self._energy_vals.append(energy)
+            if self._energy_digest is not None:
+                self._energy_digest.add(energy)
+            energy_bin = math.ceil(energy)
             self._binned_energy_vals[energy_bin] += count
         else:
             self._no_energy_val += count
@@ -696,6 +1178,8 @@ class Analysis:
             self._target_evals += 1
             mirna_details = hyb_record.mirna_details(allow_mirna_dimers=True)
             self._target_names[mirna_details['target_ref']] += count
+            if self._target_names_distinct is not None:
+                self._target_names_distinct.add(mirna_details['target_ref'])
             self._target_types[mirna_details['target_seg_type']] += count
 
     # Analysis : Private Methods : Add Methods : Fold Analysis
@@ -714,6 +1198,216 @@ class Analysis:
                     match_count += 1
         self._fold_match_counts[match_count] += count
 
+    # Start Add Batch Methods
+    # Analysis : Private Methods : Add Batch Methods : Energy Analysis
+    def _add_batch_energy(self, batch: Dict[str, 'np.ndarray'], counts: 'np.ndarray') -> None:
+        energies = batch['energy']
+        has_energy = ~np.isnan(energies)
+        self._energy_analysis_count += len(energies)
+        self._has_energy_val += int(counts[has_energy].sum())
+        self._no_energy_val += int(counts[~has_energy].sum())
+        energies = energies[has_energy]
+        if not energies.size:
+            return
+        energy_min = float(energies.min())
+        energy_max = float(energies.max())
+        if self._energy_min is None or energy_min < self._energy_min:
+            self._energy_min = energy_min
+        if self._energy_max is None or energy_max > self._energy_max:
+            self._energy_max = energy_max
+        # Running statistics are updated in record order to give identical floating-point
+        # results to adding records individually.
+        energy_val_count = self._energy_val_count
+        energy_mean = self._energy_mean
+        energy_m2 = self._energy_m2
+        for energy in energies.tolist():
+            energy_val_count += 1
+            delta = energy - energy_mean
+            energy_mean += delta / energy_val_count
+            energy_m2 += delta * (energy - energy_mean)
+        self._energy_val_count = energy_val_count
+        self._energy_mean = energy_mean
+        self._energy_m2 = energy_m2
+        if self._energy_vals is not None:
+            self._energy_vals.frombytes(energies.tobytes())
+        if self._energy_digest is not None:
+            self._energy_digest.update(energies.tolist())
+        energy_bins = np.ceil(energies).astype(np.int64)
+        self._add_batch_counts(self._binned_energy_vals, energy_bins, counts[has_energy])
+
+    # Analysis : Private Methods : Add Batch Methods : Type Analysis
+    def _add_batch_type(self, batch: Dict[str, 'np.ndarray'], counts: 'np.ndarray') -> None:
+        seg1_types = batch['seg1_type']
+        seg2_types = batch['seg2_type']
+        self._ensure_batch_set(
+            'eval_types', np.equal(seg1_types, None) | np.equal(seg2_types, None)
+        )
+        num_records = len(seg1_types)
+        self._types_analysis_count += num_records
+        # Sorted type names, with codes for each segment in sorted order.
+        type_names, type_codes = np.unique(
+            np.concatenate([seg1_types, seg2_types]), return_inverse=True
+        )
+        type_names = type_names.tolist()
+        seg1_codes = type_codes[:num_records]
+        seg2_codes = type_codes[num_records:]
+        low_codes = np.minimum(seg1_codes, seg2_codes)
+        high_codes = np.maximum(seg1_codes, seg2_codes)
+        is_5p, is_3p, is_dimer = self._get_batch_mirna_segs(batch['mirna_seg'])
+        mirna_first = is_5p | is_dimer
+        mirna_second = is_3p & ~is_dimer
+        mirna_codes_1 = np.where(mirna_first, seg1_codes, np.where(mirna_second, seg2_codes,
+                                                                   low_codes))
+        mirna_codes_2 = np.where(mirna_first, seg2_codes, np.where(mirna_second, seg1_codes,
+                                                                   high_codes))
+        num_types = len(type_names)
+        for counter, codes_1, codes_2 in [
+                (self._hybrid_types, seg1_codes, seg2_codes),
+                (self._reordered_hybrid_types, low_codes, high_codes),
+                (self._mirna_hybrid_types, mirna_codes_1, mirna_codes_2)]:
+            self._add_batch_counts(
+                counter, codes_1 * num_types + codes_2, counts,
+                key_func=lambda code: (type_names[code // num_types],
+                                       type_names[code % num_types]),
+            )
+        for counter, codes, type_counts in [
+                (self._seg1_types, seg1_codes, counts),
+                (self._seg2_types, seg2_codes, counts),
+                (self._all_seg_types, np.column_stack([seg1_codes, seg2_codes]).ravel(),
+                 np.repeat(counts, 2))]:
+            self._add_batch_counts(counter, codes, type_counts, key_func=type_names.__getitem__)
+
+    # Analysis : Private Methods : Add Batch Methods : miRNA Analysis
+    def _add_batch_mirna(self, batch: Dict[str, 'np.ndarray'], counts: 'np.ndarray') -> None:
+        mirna_segs = batch['mirna_seg']
+        self._ensure_batch_set('eval_mirna', np.equal(mirna_segs, None))
+        is_5p, is_3p, is_dimer = self._get_batch_mirna_segs(mirna_segs)
+        has_mirna = is_5p | is_3p
+        self._mirna_analysis_count += len(mirna_segs)
+        self._has_mirna += int(counts[has_mirna].sum())
+        self._mirna_dimers += int(counts[is_dimer].sum())
+        self._mirnas_5p += int(counts[is_5p & ~is_dimer].sum())
+        self._mirnas_3p += int(counts[is_3p & ~is_dimer].sum())
+        self._non_mirna += int(counts[~has_mirna].sum())
+
+    # Analysis : Private Methods : Add Batch Methods : Target Analysis
+    def _add_batch_target(self, batch: Dict[str, 'np.ndarray'], counts: 'np.ndarray') -> None:
+        mirna_segs = batch['mirna_seg']
+        self._ensure_batch_set('eval_mirna', np.equal(mirna_segs, None))
+        is_5p, is_3p, _is_dimer = self._get_batch_mirna_segs(mirna_segs)
+        has_mirna = is_5p | is_3p
+        self._target_analysis_count += len(mirna_segs)
+        self._target_evals += int(has_mirna.sum())
+        if not has_mirna.any():
+            return
+        # As in HybRecord.mirna_details(allow_mirna_dimers=True), with the 3p miRNA
+        # of dimers assigned as the "target".
+        target_seg2 = is_5p[has_mirna]
+        target_seg1 = ~target_seg2
+        target_types = np.where(
+            target_seg2, batch['seg2_type'][has_mirna], batch['seg1_type'][has_mirna]
+        )
+        for seg_n, seg_mask in [('seg1', target_seg1), ('seg2', target_seg2)]:
+            if np.equal(target_types[seg_mask], None).any():
+                message = 'Expected Flag Key: %s_type, but it is not present in record.' % seg_n
+                raise HybkitMiscError(message)
+        target_names = np.where(
+            target_seg2, batch['seg2_ref_name'][has_mirna], batch['seg1_ref_name'][has_mirna]
+        )
+        self._add_batch_counts(self._target_names, target_names, counts[has_mirna])
+        if self._target_names_distinct is not None:
+            self._target_names_distinct.update(np.unique(target_names).tolist())
+        self._add_batch_counts(self._target_types, target_types, counts[has_mirna])
+
+    # Analysis : Private Methods : Add Batch Methods : Fold Analysis
+    def _add_batch_fold(self, batch: Dict[str, 'np.ndarray'], counts: 'np.ndarray') -> None:
+        mirna_segs = batch['mirna_seg']
+        mirna_folds = batch['mirna_fold']
+        self._ensure_batch_set('eval_mirna', np.equal(mirna_segs, None))
+        is_5p, is_3p, is_dimer = self._get_batch_mirna_segs(mirna_segs)
+        if not (is_5p | is_3p).all():
+            message = 'Fold analysis of record batches requires all records to contain a miRNA.'
+            raise HybkitMiscError(message)
+        if is_dimer.any():
+            message = 'Fold analysis requires hybrids containing a single miRNA, '
+            message += 'but batch contains miRNA dimers.'
+            raise HybkitMiscError(message)
+        self._ensure_batch_set('fold_record', np.equal(mirna_folds, None))
+        self._fold_analysis_count += len(mirna_folds)
+        self._folds_recorded += int(counts.sum())
+        if not len(mirna_folds):
+            return
+        # Mark paired "(" / ")" positions of zero-padded fold strings.
+        fold_width = max(1, max(len(mirna_fold) for mirna_fold in mirna_folds))
+        fold_codes = np.array(
+            [mirna_fold.encode('ascii') for mirna_fold in mirna_folds], dtype='S%i' % fold_width
+        ).view(np.uint8).reshape(-1, fold_width)
+        is_paired = (fold_codes == ord('(')) | (fold_codes == ord(')'))
+        record_indexes, nt_indexes = np.nonzero(is_paired)
+        self._add_batch_counts(
+            self._mirna_nt_fold_counts, nt_indexes + 1, counts[record_indexes]
+        )
+        self._add_batch_counts(self._fold_match_counts, is_paired.sum(axis=1), counts)
+
+    # Start Merge Methods
+    # Analysis : Private Methods : Merge Methods : Energy Analysis
+    def _merge_energy(self, other: 'Analysis') -> None:
+        # Combine running statistics (Chan et al. parallel algorithm).
+        self_count = self._energy_val_count
+        other_count = other._energy_val_count
+        if other_count:
+            if not self_count:
+                self._energy_min = other._energy_min
+                self._energy_max = other._energy_max
+                self._energy_mean = other._energy_mean
+                self._energy_m2 = other._energy_m2
+            else:
+                total_count = self_count + other_count
+                delta = other._energy_mean - self._energy_mean
+                self._energy_mean += delta * other_count / total_count
+                self._energy_m2 += (
+                    other._energy_m2 + delta * delta * self_count * other_count / total_count
+                )
+                self._energy_min = min(self._energy_min, other._energy_min)
+                self._energy_max = max(self._energy_max, other._energy_max)
+            self._energy_val_count += other_count
+        if self._energy_vals is not None:
+            self._energy_vals.extend(other._energy_vals)
+        if self._energy_digest is not None:
+            self._energy_digest.merge(other._energy_digest)
+        self._energy_analysis_count += other._energy_analysis_count
+        self._has_energy_val += other._has_energy_val
+        self._no_energy_val += other._no_energy_val
+        self._binned_energy_vals.update(other._binned_energy_vals)
+
+    # Analysis : Private Methods : Merge Methods : Type Analysis
+    def _merge_type(self, other: 'Analysis') -> None:
+        self._merge_state_attrs(other, 'type')
+
+    # Analysis : Private Methods : Merge Methods : miRNA Analysis
+    def _merge_mirna(self, other: 'Analysis') -> None:
+        self._merge_state_attrs(other, 'mirna')
+
+    # Analysis : Private Methods : Merge Methods : Target Analysis
+    def _merge_target(self, other: 'Analysis') -> None:
+        self._merge_state_attrs(other, 'target')
+
+    # Analysis : Private Methods : Merge Methods : Fold Analysis
+    def _merge_fold(self, other: 'Analysis') -> None:
+        self._merge_state_attrs(other, 'fold')
+
+    # Analysis : Private Methods : Merge Methods : Count-Based Analyses
+    def _merge_state_attrs(self, other: 'Analysis', analysis_type: str) -> None:
+        for attr_name in self._get_state_attrs(analysis_type):
+            self_value = getattr(self, attr_name)
+            if isinstance(self_value, Counter):
+                # Use update() to retain zero-count keys.
+                self_value.update(getattr(other, attr_name))
+            elif isinstance(self_value, (SpaceSaving, HyperLogLog)):
+                self_value.merge(getattr(other, attr_name))
+            else:
+                setattr(self, attr_name, self_value + getattr(other, attr_name))
+
     # Start Get Results Methods
     # Analysis : Private Methods : Get Methods : Energy Analysis
     def _get_energy_results(self) -> dict:
@@ -722,10 +1416,17 @@ class Analysis:
         energy_results['has_energy_val'] = copy.deepcopy(self._has_energy_val)
         energy_results['no_energy_val'] = copy.deepcopy(self._no_energy_val)
         if energy_results['has_energy_val'] > 0:
-            energy_results['energy_min'] = self._energy_vals.min()
-            energy_results['energy_max'] = self._energy_vals.max()
-            energy_results['energy_mean'] = self._energy_vals.mean()
-            energy_results['energy_std'] = self._energy_vals.std()
+            energy_results['energy_min'] = self._energy_min
+            energy_results['energy_max'] = self._energy_max
+            if self._energy_vals is not None:
+                energy_vals = np.frombuffer(self._energy_vals, dtype=float)
+                energy_results['energy_mean'] = energy_vals.mean()
+                energy_results['energy_std'] = energy_vals.std()
+            else:
+                energy_results['energy_mean'] = self._energy_mean
+                energy_results['energy_std'] = math.sqrt(
+                    self._energy_m2 / self._energy_val_count
+                )
         else:
             energy_results['energy_min'] = None
             energy_results['energy_max'] = None
@@ -749,6 +1450,13 @@ class Analysis:
         if (ret_vals[ret_range_min + 1]) == 0:
             del ret_vals[ret_range_min + 1]
         energy_results['binned_energy_vals'] = ret_vals
+        if self._energy_digest is not None:
+            energy_results['energy_quantiles'] = {
+                q: self._energy_digest.quantile(q) for q in self._energy_quantiles
+            }
+            energy_results['energy_quantile_rank_errors'] = {
+                q: self._energy_digest.get_rank_error(q) for q in self._energy_quantiles
+            }
         return energy_results
 
     # Analysis : Private Methods : Get Methods : Type Analysis
@@ -779,8 +1487,17 @@ class Analysis:
         target_results = {}
         target_results['target_analysis_count'] = copy.deepcopy(self._target_analysis_count)
         target_results['target_evals'] = copy.deepcopy(self._target_evals)
-        target_results['target_names'] = copy.deepcopy(self._target_names)
+        if isinstance(self._target_names, SpaceSaving):
+            target_results['target_names'] = self._target_names.to_counter()
+        else:
+            target_results['target_names'] = copy.deepcopy(self._target_names)
         target_results['target_types'] = copy.deepcopy(self._target_types)
+        if self._target_names_distinct is not None:
+            target_results['target_names_max_error'] = self._target_names.max_error
+            target_results['target_names_distinct'] = self._target_names_distinct.estimate()
+            target_results['target_names_distinct_error'] = (
+                self._target_names_distinct.relative_error
+            )
         return target_results
 
     # Analysis : Private Methods : Get Methods : Fold Analysis
@@ -805,9 +1522,23 @@ class Analysis:
         if out_delim is None:
             out_delim = self.settings['out_delim']
 
+        analysis_results_str = ''
+        for key, subkey, val in self._get_analysis_results_rows(analysis):
+            if subkey is None:
+                analysis_results_str += out_delim.join([key, val]) + '\n'
+            else:
+                analysis_results_str += out_delim.join([key, subkey, val]) + '\n'
+        return analysis_results_str
+
+    # Analysis : Private Methods : Result String Methods : All Analyses
+    def _get_analysis_results_rows(
+            self,
+            analysis: AnalysisOptions,
+            ) -> List[Tuple[str, Optional[str], str]]:
+        # Return (result key, subkey or None, value) strings for each result value.
         analysis_results = getattr(self, f'_get_{analysis}_results')()
 
-        analysis_results_str = ''
+        analysis_results_rows = []
         for key, val in analysis_results.items():
             if isinstance(val, dict):
                 for subkey, subval in val.items():
@@ -819,14 +1550,14 @@ class Analysis:
                         use_subval = f'{subval:.3f}'
                     else:
                         use_subval = str(subval)
-                    analysis_results_str += out_delim.join([key, use_subkey, use_subval]) + '\n'
+                    analysis_results_rows.append((key, use_subkey, use_subval))
             else:
                 if isinstance(val, float):
                     use_val = f'{val:.3f}'
                 else:
                     use_val = str(val)
-                analysis_results_str += out_delim.join([key, use_val]) + '\n'
-        return analysis_results_str
+                analysis_results_rows.append((key, None, use_val))
+        return analysis_results_rows
 
     # Start Write Methods
     # Analysis : Private Methods : Result Special Writing Methods : Energy Analysis
@@ -857,6 +1588,15 @@ class Analysis:
             for val, count in energy_results['binned_energy_vals'].items():
                 binned_energy_vals_file.write(out_delim.join([str(val), str(count)]) + '\n')
         out_file_names.append(binned_energy_vals_file_name)
+
+        if 'energy_quantiles' in energy_results:
+            quantiles_file_name = basename + '_energy_quantiles.csv'
+            with open(quantiles_file_name, 'w') as quantiles_file:
+                quantiles_file.write(out_delim.join(['quantile', 'energy', 'rank_error']) + '\n')
+                for q, val in energy_results['energy_quantiles'].items():
+                    rank_error = energy_results['energy_quantile_rank_errors'][q]
+                    quantiles_file.write(out_delim.join([str(q), str(val), str(rank_error)]) + '\n')
+            out_file_names.append(quantiles_file_name)
         return out_file_names
 
     # Analysis : Private Methods : Result Special Writing Methods : Type Analysis
@@ -938,6 +1678,8 @@ class Analysis:
         main_keys = [
             'target_analysis_count', 'target_evals'
         ]
+        if self.memory_mode == 'sketch':
+            main_keys += self._sketch_result_keys['target']
         main_outfile_name = basename + '_target_results.csv'
         with open(main_outfile_name, 'w') as out_file:
             for key in main_keys:
@@ -1173,9 +1915,423 @@ class Analysis:
                 )
                 raise HybkitArgError(message)
 
+    # Analysis : Private Methods : State Methods
+    def _get_state_attrs(self, analysis_type: str) -> Tuple[str, ...]:
+        state_attrs = self._state_attrs[analysis_type]
+        if self.memory_mode == 'sketch':
+            state_attrs += self._sketch_state_attrs.get(analysis_type, ())
+        return state_attrs
+
+    # Analysis : Private Methods : State Methods
+    @staticmethod
+    def _encode_state_value(value: Any) -> Any:  # noqa: ANN401
+        if isinstance(value, Counter):
+            return [
+                [list(key) if isinstance(key, tuple) else key, count]
+                for key, count in value.items()
+            ]
+        elif isinstance(value, array.array):
+            return value.tolist()
+        elif isinstance(value, (SpaceSaving, HyperLogLog, TDigest)):
+            return value.get_state()
+        return value
+
+    # Analysis : Private Methods : State Methods
+    @staticmethod
+    def _decode_state_value(value: Any, init_value: Any) -> Any:  # noqa: ANN401
+        if isinstance(init_value, Counter):
+            return Counter({
+                (tuple(key) if isinstance(key, list) else key): count for key, count in value
+            })
+        elif isinstance(init_value, (SpaceSaving, HyperLogLog, TDigest)):
+            return type(init_value).from_state(value)
+        elif isinstance(value, list):
+            return array.array('d', value)
+        return value
+
     # Analysis : Private Classmethods
     @classmethod
     def _sanitize_name(cls, file_name: str) -> str:
         for char, replace in [('*', 'star'), (',', 'com')]:
             file_name = file_name.replace(char, replace)
         return file_name
+
+
+# --- Hybkit Grouped Analysis --- #
+class GroupedAnalysis:
+    """
+    Class for separate analyses of groups of HybRecord objects in a single pass.
+
+    Each record is assigned to a group by a group key, and added to an :class:`Analysis`
+    for that group. Group analyses are created when the first record with that key is
+    added, so only the groups present in the records are stored. The results for all groups
+    can be written as a single long-format table with :meth:`write_grouped_delim_str`,
+    with one row per group result value.
+
+    The group key is determined from the ``group_by`` argument, which is either a function
+    that returns the key for a :class:`~hybkit.HybRecord` object, or one of the string options:
+
+        | :meth:`miRNA details <hybkit.HybRecord.mirna_details>`:
+          ``mirna_ref``, ``target_ref``, ``mirna_seg_type``, or ``target_seg_type``.
+          Requires the :ref:`mirna_seg <mirna_seg>` flag to be set for each HybRecord,
+          and the key is ``None`` for records without a miRNA.
+        | Any other string is used as a flag name
+          (such as ``dataset``, ``seg1_type``, or ``miRNA_seg``),
+          and the key is ``None`` for records without the flag.
+
+    Records can be added individually with :meth:`add_hyb_record`, or in batches with
+    :meth:`add_batch`, where groups with many records in the batch are added as columns of
+    values using :meth:`Analysis.add_batch`. Grouped analyses of separate sets of records
+    can be combined with :meth:`merge` (or the ``+=`` operator), and the state converted to
+    built-in types with :meth:`get_state`.
+
+    Args:
+        analysis_types (:obj:`str` or :obj:`list` of :obj:`str`): Analysis types to perform
+            for each group (see :class:`Analysis`).
+        group_by (:obj:`str` or :obj:`~typing.Callable`): Function or string option
+            used to determine the group key of each record.
+        name (:obj:`str`, optional): Name of the analysis
+        quant_mode (:obj:`str`, optional): Mode to use for record quantification
+            (see :class:`Analysis`).
+        memory_mode (:obj:`str`, optional): Mode to use for storing analysis values
+            (see :class:`Analysis`).
+
+    Attributes:
+        name (:obj:`str`): Name of the analysis
+        analysis_types (:obj:`list` of :obj:`str`): List of analysis types to perform
+        group_by (:obj:`str` or :obj:`~typing.Callable`): Function or string option
+            used to determine the group key of each record.
+        groups (:obj:`dict`): Dict of group key to :class:`Analysis` object for that group,
+            in order of the first record added for each group.
+    """
+
+    #: Columns of the long-format table written by :meth:`write_grouped_delim_str`.
+    table_columns = ('group', 'analysis', 'result', 'subkey', 'value')
+
+    # Class private variables:
+    _mirna_detail_keys = frozenset({
+        'mirna_ref', 'target_ref', 'mirna_seg_type', 'target_seg_type',
+    })
+    # Groups with fewer records in a batch are added individually.
+    _min_batch_group_size = 32
+
+    # ----- Begin GroupedAnalysis Class -----
+    # Start GroupedAnalysis Public Methods
+    # GroupedAnalysis : Public Methods
+    def __init__(
+            self,
+            analysis_types: AnalysisArg,
+            group_by: Union[str, Any],
+            name: Optional[str] = None,
+            quant_mode: Optional[QuantModeArg] = None,
+            memory_mode: Optional[MemoryModeArg] = None,
+            ) -> None:
+        """Describe in class docstring."""
+        # Create an empty analysis to validate arguments and copy settings for each group.
+        template = Analysis(
+            analysis_types, name=name, quant_mode=quant_mode, memory_mode=memory_mode,
+        )
+        self.analysis_types = template.analysis_types
+        self.name = template.name
+        self.quant_mode = template.quant_mode
+        self.memory_mode = template.memory_mode
+        self.group_by = group_by
+        self._get_key = self._compile_group_key(group_by)
+        self.groups = {}
+
+    # GroupedAnalysis : Public Methods : Add HybRecord
+    def add_hyb_record(self, hyb_record: hybkit.HybRecord) -> None:
+        """
+        Add a HybRecord object to the analysis of its group.
+
+        Args:
+            hyb_record (:class:`~hybkit.HybRecord`): HybRecord object to be added to the
+                analysis.
+        """
+        key = self._get_key(hyb_record)
+        group_analysis = self.groups.get(key)
+        if group_analysis is None:
+            group_analysis = self._add_group(key)
+        group_analysis.add_hyb_record(hyb_record)
+
+    # GroupedAnalysis : Public Methods : Add HybRecords
+    def add_hyb_records(
+            self,
+            hyb_records: List[hybkit.HybRecord],
+            eval_types: bool = False,
+            eval_mirna: bool = False
+            ) -> None:
+        """
+        Add a list of HybRecord objects to the analyses of their groups.
+
+        Args:
+            hyb_records (:class:`~hybkit.HybFile` or :obj:`list` of :class:`~hybkit.HybRecord`):
+                HybFile to iterate over, or iterable of HybRecord objects to be added
+                to the analysis.
+            eval_types (bool): If ``True``, evaluate the hybrid type of the HybRecord before adding
+                it to the analysis using :meth:`hybkit.HybRecord.eval_types`.
+            eval_mirna (bool): If ``True``, evaluate the miRNA segment of the HybRecord before
+                adding it to the analysis using :meth:`hybkit.HybRecord.eval_mirna`.
+        """
+        for hyb_record in hyb_records:
+            if eval_types:
+                hyb_record.eval_types()
+            if eval_mirna:
+                hyb_record.eval_mirna()
+            self.add_hyb_record(hyb_record)
+
+    # GroupedAnalysis : Public Methods : Add Batch
+    def add_batch(
+            self,
+            batch: Union[Dict[str, Any], 'hybkit.HybBatch', Iterable['hybkit.HybRecord']],
+            keys: Optional[Iterable[Any]] = None,
+            ) -> None:
+        """
+        Add a batch of records to the analyses of their groups.
+
+        Records are divided by group key, and each group with many records in the batch
+        is added with :meth:`Analysis.add_batch`, while records of smaller groups are added
+        individually. Results are identical to adding each record with :meth:`add_hyb_record`.
+
+        Args:
+            batch (:obj:`dict`, :class:`~hybkit.HybBatch`, or :obj:`list` of
+                :class:`~hybkit.HybRecord`): Records, or columns of record values as
+                described in :meth:`Analysis.add_batch`.
+            keys (:obj:`list`, optional): Group key of each record. Required if
+                ``batch`` is a dict of columns, otherwise keys are determined from the records.
+        """
+        if isinstance(batch, dict):
+            if keys is None:
+                message = 'Group keys must be provided for a batch of columns.'
+                raise HybkitArgError(message)
+            hyb_records = None
+            batch = {column_name: np.asarray(column) for column_name, column in batch.items()}
+        else:
+            hyb_records = list(batch)
+            if keys is None:
+                keys = [self._get_key(hyb_record) for hyb_record in hyb_records]
+        keys = list(keys)
+        num_records = len(keys) if hyb_records is None else len(hyb_records)
+        if len(keys) != num_records:
+            message = 'Number of group keys (%i) does not match ' % len(keys)
+            message += 'the number of records: %i' % num_records
+            raise HybkitArgError(message)
+        group_indexes = {}
+        for i, key in enumerate(keys):
+            if key in group_indexes:
+                group_indexes[key].append(i)
+            else:
+                group_indexes[key] = [i]
+        for key, indexes in group_indexes.items():
+            group_analysis = self.groups.get(key)
+            if group_analysis is None:
+                group_analysis = self._add_group(key)
+            if hyb_records is None:
+                index_array = np.array(indexes)
+                group_analysis.add_batch({
+                    column_name: column[index_array] for column_name, column in batch.items()
+                })
+            elif len(indexes) < self._min_batch_group_size:
+                for i in indexes:
+                    group_analysis.add_hyb_record(hyb_records[i])
+            else:
+                group_analysis.add_batch([hyb_records[i] for i in indexes])
+
+    # GroupedAnalysis : Public Methods : Merge
+    def merge(self, other: 'GroupedAnalysis') -> None:
+        """
+        Add the group analyses of another GroupedAnalysis object to this analysis.
+
+        The other analysis must have the same analysis types, quantification mode, memory mode,
+        and group_by argument. Analyses of groups present in both are merged
+        with :meth:`Analysis.merge`.
+
+        Args:
+            other (:class:`GroupedAnalysis`): Analysis to add to this analysis.
+        """
+        if not isinstance(other, GroupedAnalysis):
+            message = 'Object to merge: "%s" is not a GroupedAnalysis object.' % str(other)
+            raise HybkitArgError(message)
+        if other.group_by != self.group_by:
+            message = 'Analyses to merge have different group_by arguments: '
+            message += '%s, %s' % (str(self.group_by), str(other.group_by))
+            raise HybkitArgError(message)
+        for key, other_analysis in other.groups.items():
+            group_analysis = self.groups.get(key)
+            if group_analysis is None:
+                group_analysis = self._add_group(key)
+            group_analysis.merge(other_analysis)
+
+    # GroupedAnalysis : Public Methods : Merge
+    def __iadd__(self, other: 'GroupedAnalysis') -> 'GroupedAnalysis':
+        """Add the group analyses of another GroupedAnalysis object using :meth:`merge`."""
+        self.merge(other)
+        return self
+
+    # GroupedAnalysis : Public Methods : State
+    def get_state(self) -> dict:
+        """
+        Return the current state of the analysis as a dictionary of built-in types.
+
+        Group keys and the state of each group analysis (from :meth:`Analysis.get_state`)
+        are stored as a list of [key, state] pairs. Tuple keys are stored as lists.
+
+        Returns:
+            dict: Analysis state.
+        """
+        return {
+            'analysis_types': list(self.analysis_types),
+            'name': self.name,
+            'quant_mode': self.quant_mode,
+            'memory_mode': self.memory_mode,
+            'group_by': self.group_by if isinstance(self.group_by, str) else None,
+            'groups': [
+                [list(key) if isinstance(key, tuple) else key, group_analysis.get_state()]
+                for key, group_analysis in self.groups.items()
+            ],
+        }
+
+    # GroupedAnalysis : Public Methods : State
+    @classmethod
+    def from_state(
+            cls,
+            state: dict,
+            group_by: Optional[Union[str, Any]] = None,
+            ) -> 'GroupedAnalysis':
+        """
+        Create a GroupedAnalysis object from an analysis state.
+
+        Args:
+            state (dict): Analysis state, as returned by :meth:`get_state`.
+            group_by (:obj:`str` or :obj:`~typing.Callable`, optional): Function or string
+                option used to determine the group key of each record. Required if the
+                analysis was created with a function.
+
+        Returns:
+            :class:`GroupedAnalysis` object.
+        """
+        if group_by is None:
+            group_by = state['group_by']
+        if group_by is None:
+            message = 'A group_by argument must be provided for states of analyses '
+            message += 'grouped with a function.'
+            raise HybkitArgError(message)
+        grouped_analysis = cls(
+            analysis_types=state['analysis_types'],
+            group_by=group_by,
+            name=state['name'],
+            quant_mode=state['quant_mode'],
+            memory_mode=state['memory_mode'],
+        )
+        for key, group_state in state['groups']:
+            if isinstance(key, list):
+                key = tuple(key)  # noqa: PLW2901
+            grouped_analysis.groups[key] = Analysis.from_state(group_state)
+        return grouped_analysis
+
+    # GroupedAnalysis : Public Methods : Results
+    def get_all_results(self) -> dict:
+        """
+        Return a dictionary with all results for each group.
+
+        Returns:
+            dict: Dict of group key to results for that group,
+                as returned by :meth:`Analysis.get_all_results`.
+        """
+        return {
+            key: group_analysis.get_all_results() for key, group_analysis in self.groups.items()
+        }
+
+    # GroupedAnalysis : Public Methods : Results
+    def get_grouped_delim_str(self, out_delim: Optional[str] = None) -> str:
+        """
+        Return a long-format delimited table containing the results of all groups.
+
+        The table has a header line with the columns in :attr:`table_columns`, then
+        one line for each result value of each group. The ``subkey`` column contains the
+        key of values of dict results (such as a target name in ``target_names``),
+        and is empty for single-value results.
+
+        Args:
+            out_delim (str): Delimiter to use for output. If not provided, defaults to
+                the value in :attr:`Analysis.settings['out_delim'] <Analysis.settings>`.
+        """
+        if out_delim is None:
+            out_delim = Analysis.settings['out_delim']
+        ret_str = out_delim.join(self.table_columns) + '\n'
+        for key, group_analysis in self.groups.items():
+            group_label = self._get_group_label(key)
+            for analysis_type in self.analysis_types:
+                for result_key, subkey, val in group_analysis._get_analysis_results_rows(
+                        analysis_type):
+                    ret_str += out_delim.join([
+                        group_label, analysis_type, result_key,
+                        '' if subkey is None else subkey, val,
+                    ]) + '\n'
+        return ret_str
+
+    # GroupedAnalysis : Public Methods : Results
+    def write_grouped_delim_str(
+            self,
+            out_file_name: Optional[str] = None,
+            out_delim: Optional[str] = None,
+            ) -> None:
+        """
+        Write the results of all groups to a long-format delimited text file.
+
+        See :meth:`get_grouped_delim_str` for the table format.
+
+        Args:
+            out_file_name (str): Path to output file. If not provided, defaults to:
+                ./<analysis_name>_grouped_analysis.csv
+            out_delim (str): Delimiter to use for output. If not provided, defaults to
+                the value in :attr:`Analysis.settings['out_delim'] <Analysis.settings>`.
+        """
+        if out_file_name is None:
+            if self.name is not None:
+                out_file_name = self.name + '_grouped_analysis.csv'
+            else:
+                out_file_name = 'analysis_grouped_analysis.csv'
+        with open(out_file_name, 'w') as out_file:
+            out_file.write(self.get_grouped_delim_str(out_delim=out_delim))
+
+    # GroupedAnalysis : Public Methods
+    def __len__(self) -> int:
+        """Return the number of groups."""
+        return len(self.groups)
+
+    # Start GroupedAnalysis Private Methods
+    # GroupedAnalysis : Private Methods
+    def _add_group(self, key: Any) -> Analysis:  # noqa: ANN401
+        group_analysis = Analysis(
+            self.analysis_types, quant_mode=self.quant_mode, memory_mode=self.memory_mode,
+        )
+        self.groups[key] = group_analysis
+        return group_analysis
+
+    # GroupedAnalysis : Private Methods
+    @staticmethod
+    def _get_group_label(key: Any) -> str:  # noqa: ANN401
+        if isinstance(key, tuple):
+            return '--'.join(str(key_item) for key_item in key)
+        return str(key)
+
+    # GroupedAnalysis : Private Classmethods
+    @classmethod
+    def _compile_group_key(cls, group_by: Union[str, Any]) -> Any:  # noqa: ANN401
+        if callable(group_by):
+            return group_by
+        if not isinstance(group_by, str) or not group_by:
+            message = 'group_by must be a function or a non-empty string, '
+            message += 'not: %s' % str(group_by)
+            raise HybkitArgError(message)
+        if group_by in cls._mirna_detail_keys:
+            def get_mirna_detail_key(hyb_record: hybkit.HybRecord) -> Optional[str]:
+                if not hyb_record.prop('has_mirna'):
+                    return None
+                return hyb_record.mirna_details(group_by, allow_mirna_dimers=True)
+            return get_mirna_detail_key
+
+        def get_flag_key(hyb_record: hybkit.HybRecord) -> Optional[str]:
+            return hyb_record.flags.get(group_by)
+        return get_flag_key
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Functions for transparent reading and writing of compressed hyb and fold files.
+
+Files are opened by :func:`open_file`, which detects the compression format from the
+file suffix (see :data:`hybkit.settings.COMPRESSION_SUFFIXES`), and otherwise behaves
+as the built-in :func:`open` function. :class:`hybkit.HybFile` and
+:class:`hybkit.FoldFile` objects, and the hybkit toolkit scripts,
+open paths with this function, so compressed files can be used directly:
+
+    =========== ============ ==========================================================
+    Suffix      Format       Description
+    =========== ============ ==========================================================
+    ``.gz``     ``gzip``     gzip-format file (may contain multiple gzip members)
+    ``.bgz``    ``bgzf``     Blocked gzip file, as written by ``bgzip``
+                             (readable as a gzip-format file)
+    ``.zst``    ``zstd``     Zstandard-format file (requires the optional
+                             `zstandard <https://pypi.org/project/zstandard/>`_ package)
+    =========== ============ ==========================================================
+
+Decompression runs in a background thread that fills a queue of decompressed blocks,
+so that parsing of records overlaps with reading and decompression.
+Output is compressed in independent blocks by a pool of threads in the manner of
+``pigz``, with each block written as a complete gzip member (or BGZF block,
+or Zstandard frame) in order. The result is a standard file of the same format,
+readable by any decompressor.
+The underlying codecs release the Python GIL, so threads compress and decompress
+in parallel with record processing.
+
+Example:
+    ::
+
+        with hybkit.HybFile.open('my_file.hyb.gz', 'r') as hyb_file:
+            for hyb_record in hyb_file:
+                ...
+
+        with hybkit.compression.open_file('my_file.vienna.zst', 'w', threads=8) as out_file:
+            out_file.write(vienna_text)
+"""
+
+import collections
+import concurrent.futures
+import gzip
+import io
+import os
+import queue
+import struct
+import threading
+import zlib
+from typing import IO, Callable, Iterator, Optional, Tuple
+
+zstandard = None
+try:
+    import zstandard
+except ModuleNotFoundError:
+    pass
+
+from hybkit import settings
+from hybkit.errors import HybkitArgError, HybkitMiscError
+
+#: Supported compression formats.
+COMPRESSION_FORMATS = ('gzip', 'bgzf', 'zstd')
+
+# Maximum uncompressed size of a BGZF block, as used by htslib.
+_BGZF_BLOCK_SIZE = 65280
+
+# Empty BGZF block marking the end of a BGZF file.
+_BGZF_EOF = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+# Timeout in seconds between checks for closing of a file by a waiting thread.
+_THREAD_WAIT = 0.1
+
+
+# ----- Begin Compression Functions -----
+# Compression : Public Functions
+def get_compression(file_name: str) -> Optional[str]:
+    """
+    Return the compression format of a file name from its suffix.
+
+    Suffixes are matched case-insensitively to :data:`hybkit.settings.COMPRESSION_SUFFIXES`.
+
+    Args:
+        file_name (str): Name of the file.
+
+    Returns:
+        Name of the compression format, or ``None`` for uncompressed files.
+    """
+    return split_compression_suffix(file_name)[2]
+
+
+# Compression : Public Functions
+def split_compression_suffix(file_name: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Split a compression suffix from a file name.
+
+    Example:
+        ::
+
+            split_compression_suffix('my_file.hyb.gz')  # ('my_file.hyb', '.gz', 'gzip')
+            split_compression_suffix('my_file.hyb')     # ('my_file.hyb', '', None)
+
+    Args:
+        file_name (str): Name of the file.
+
+    Returns:
+        Tuple of (``base_name``, ``compression_suffix``, ``compression``),
+        where ``compression_suffix`` is an empty string and ``compression``
+        is ``None`` for uncompressed files.
+    """
+    lower_name = str(file_name).lower()
+    for suffix, compression in settings.COMPRESSION_SUFFIXES.items():
+        if lower_name.endswith(suffix):
+            split_index = len(file_name) - len(suffix)
+            return file_name[:split_index], file_name[split_index:], compression
+    return file_name, '', None
+
+
+# Compression : Public Functions
+def open_file(
+        file_name: str,
+        mode: str = 'r',
+        buffering: int = -1,
+        encoding: Optional[str] = None,
+        errors: Optional[str] = None,
+        newline: Optional[str] = None,
+        *,
+        compression: Optional[str] = 'auto',
+        threads: Optional[int] = None,
+        level: Optional[int] = None,
+        ) -> IO:
+    """
+    Open a file, transparently decompressing or compressing it based on its suffix.
+
+    Arguments through ``newline`` match those of the built-in :func:`open` function.
+    Uncompressed files are opened by :func:`open` directly.
+    Compressed files can be opened for reading (``'r'``), writing (``'w'``),
+    exclusive creation (``'x'``), or appending (``'a'``), in text (default) or
+    binary (``'b'``) mode.
+
+    Args:
+        file_name (str): Name of the file to open.
+        mode (:obj:`str`, optional): Mode to open the file.
+        buffering (:obj:`int`, optional): Buffer size for uncompressed files,
+            and for the decompressed or uncompressed stream of compressed files.
+        encoding (:obj:`str`, optional): Text encoding, as for :func:`open`.
+        errors (:obj:`str`, optional): Encoding error handling, as for :func:`open`.
+        newline (:obj:`str`, optional): Newline handling, as for :func:`open`.
+        compression (:obj:`str`, optional): Compression format (``'gzip'``, ``'bgzf'``,
+            or ``'zstd'``). If ``'auto'``, the format is detected from the file suffix
+            with :func:`get_compression`. If ``None``, the file is opened uncompressed.
+        threads (:obj:`int`, optional): Number of threads compressing blocks of output.
+            Defaults to :data:`hybkit.settings.COMPRESSION_THREADS`.
+        level (:obj:`int`, optional): Compression level of output. Defaults to the value
+            for the format in :data:`hybkit.settings.COMPRESSION_LEVELS`.
+
+    Returns:
+        File object for the opened file.
+    """
+    if compression == 'auto':
+        compression = get_compression(file_name)
+    if compression is None:
+        return open(file_name, mode, buffering, encoding, errors, newline)  # noqa: SIM115
+    if compression not in COMPRESSION_FORMATS:
+        message = 'Unknown compression format: %s\n' % compression
+        message += 'Allowed formats: %s' % ', '.join(COMPRESSION_FORMATS)
+        raise HybkitArgError(message)
+    if compression == 'zstd' and zstandard is None:
+        message = 'Reading or writing Zstandard-compressed file: %s\n' % file_name
+        message += 'requires the "zstandard" package. Install with "pip install zstandard".'
+        raise HybkitMiscError(message)
+
+    raw_mode = mode.replace('t', '').replace('b', '')
+    if raw_mode not in {'r', 'w', 'x', 'a'}:
+        message = 'Mode "%s" is not supported for compressed files.' % mode
+        raise HybkitArgError(message)
+    if 'b' in mode and (encoding is not None or errors is not None or newline is not None):
+        message = 'Binary mode does not take encoding, errors, or newline arguments.'
+        raise HybkitArgError(message)
+    if buffering in {-1, 0, 1}:
+        buffering = settings.COMPRESSION_BLOCK_SIZE
+
+    raw_fh = open(file_name, raw_mode + 'b')  # noqa: SIM115
+    try:
+        if raw_mode == 'r':
+            stream = io.BufferedReader(
+                _ThreadedReader(raw_fh, _DECOMPRESS_FUNCS[compression]),
+                buffer_size=buffering,
+            )
+        else:
+            if level is None:
+                level = settings.COMPRESSION_LEVELS[compression]
+            if threads is None:
+                threads = settings.COMPRESSION_THREADS
+            if threads is None:
+                threads = min(4, os.cpu_count() or 1)
+            if threads < 1:
+                message = 'threads must be a positive integer. Provided: %s' % threads
+                raise HybkitArgError(message)
+            stream = io.BufferedWriter(
+                _ThreadedWriter(
+                    raw_fh,
+                    _make_compress_func(compression, level),
+                    block_size=settings.COMPRESSION_BLOCK_SIZE,
+                    threads=threads,
+                    trailer=(_BGZF_EOF if compression == 'bgzf' else b''),
+                ),
+                buffer_size=buffering,
+            )
+    except BaseException:
+        raw_fh.close()
+        raise
+    if 'b' in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, errors=errors, newline=newline)
+
+
+# ----- Begin Compression Helper Functions -----
+# Compression : Private Functions
+def _iter_decompress_gzip(raw_fh: IO, read_size: int) -> Iterator[bytes]:
+    """Yield blocks of decompressed data from a gzip file of one or more members."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    member_started = False
+    while True:
+        data = raw_fh.read(read_size)
+        if not data:
+            break
+        while data:
+            member_started = True
+            out_data = decompressor.decompress(data)
+            if out_data:
+                yield out_data
+            if decompressor.eof:
+                # Start decompression of the next member, as in bgzf or pigz output.
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                member_started = False
+            else:
+                data = b''
+    if member_started:
+        message = 'Compressed file ended before the end-of-stream marker was reached'
+        raise EOFError(message)
+
+
+# Compression : Private Functions
+def _iter_decompress_zstd(raw_fh: IO, read_size: int) -> Iterator[bytes]:
+    """Yield blocks of decompressed data from a Zstandard file of one or more frames."""
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        raw_fh, read_size=read_size, read_across_frames=True, closefd=False,
+    )
+    while True:
+        out_data = reader.read(read_size)
+        if not out_data:
+            return
+        yield out_data
+
+
+_DECOMPRESS_FUNCS = {
+    'gzip': _iter_decompress_gzip,
+    'bgzf': _iter_decompress_gzip,
+    'zstd': _iter_decompress_zstd,
+}
+
+
+# Compression : Private Functions
+def _compress_bgzf(data: bytes, level: int) -> bytes:
+    """Compress data into one or more BGZF blocks."""
+    blocks = []
+    for start in range(0, len(data), _BGZF_BLOCK_SIZE):
+        block_data = data[start:(start + _BGZF_BLOCK_SIZE)]
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(block_data) + compressor.flush()
+        # Gzip header with a "BC" extra subfield holding the total block size minus one.
+        blocks.append(b'\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00')
+        blocks.append(struct.pack('<H', len(compressed) + 25))
+        blocks.append(compressed)
+        blocks.append(struct.pack('<II', zlib.crc32(block_data), len(block_data)))
+    return b''.join(blocks)
+
+
+# Compression : Private Functions
+def _make_compress_func(compression: str, level: int) -> Callable[[bytes], bytes]:
+    """Return a function compressing a block of data into a complete member of a format."""
+    if compression == 'gzip':
+        def compress_func(data: bytes) -> bytes:
+            return gzip.compress(data, compresslevel=level, mtime=0)
+    elif compression == 'bgzf':
+        def compress_func(data: bytes) -> bytes:
+            return _compress_bgzf(data, level)
+    else:
+        # Compressor objects are not thread-safe, so each thread uses its own.
+        local_data = threading.local()
+
+        def compress_func(data: bytes) -> bytes:
+            if not hasattr(local_data, 'compressor'):
+                local_data.compressor = zstandard.ZstdCompressor(level=level)
+            return local_data.compressor.compress(data)
+    return compress_func
+
+
+# ----- Begin Threaded Stream Classes -----
+class _ThreadedReader(io.RawIOBase):
+    """
+    Raw stream returning data decompressed from a file by a background thread.
+
+    Args:
+        raw_fh (file): Binary file object of the compressed file.
+        decompress_func (callable): Function taking ``raw_fh`` and a read size,
+            and yielding blocks of decompressed data.
+    """
+
+    def __init__(self, raw_fh: IO, decompress_func: Callable) -> None:
+        self.raw_fh = raw_fh
+        self._queue = queue.Queue(maxsize=settings.COMPRESSION_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b'')
+        self._finished = False
+        self._thread = threading.Thread(
+            target=self._run, args=(decompress_func,), daemon=True,
+        )
+        self._thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:
+        while not self._chunk:
+            if self._finished:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._finished = True
+                return 0
+            if isinstance(item, BaseException):
+                self._finished = True
+                raise item
+            self._chunk = memoryview(item)
+        read_size = min(len(buffer), len(self._chunk))
+        buffer[:read_size] = self._chunk[:read_size]
+        self._chunk = self._chunk[read_size:]
+        return read_size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self.raw_fh.close()
+        super().close()
+
+    def _run(self, decompress_func: Callable) -> None:
+        try:
+            for out_data in decompress_func(self.raw_fh, settings.COMPRESSION_BLOCK_SIZE):
+                if not self._put(out_data):
+                    return
+        except Exception as error:  # noqa: BLE001
+            self._put(error)
+            return
+        self._put(None)
+
+    def _put(self, item: object) -> bool:
+        """Queue an item, returning ``False`` if the stream is closed first."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_THREAD_WAIT)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+
+class _ThreadedWriter(io.RawIOBase):
+    """
+    Raw stream compressing blocks of written data with a pool of threads.
+
+    Compressed blocks are written to the file in order. Data is compressed
+    in complete blocks of ``block_size``, with the final partial block compressed
+    when the stream is closed.
+
+    Args:
+        raw_fh (file): Binary file object of the compressed file.
+        compress_func (callable): Function compressing a block of data.
+        block_size (int): Number of bytes compressed by each task.
+        threads (int): Number of compressing threads.
+        trailer (bytes): Data written to the end of the file when closed.
+    """
+
+    def __init__(
+            self,
+            raw_fh: IO,
+            compress_func: Callable[[bytes], bytes],
+            block_size: int,
+            threads: int,
+            trailer: bytes = b'',
+            ) -> None:
+        self.raw_fh = raw_fh
+        self._compress_func = compress_func
+        self._block_size = block_size
+        self._max_pending = threads * 2
+        self._trailer = trailer
+        self._buffer = bytearray()
+        self._pending = collections.deque()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self._block_size:
+            self._submit_blocks(final=False)
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._submit_blocks(final=True)
+                self.raw_fh.write(self._trailer)
+            finally:
+                self._executor.shutdown()
+                self.raw_fh.close()
+        super().close()
+
+    def _submit_blocks(self, final: bool) -> None:
+        """Submit complete blocks for compression, and write finished blocks in order."""
+        block_size = self._block_size
+        while len(self._buffer) >= block_size or (final and self._buffer):
+            block = bytes(self._buffer[:block_size])
+            del self._buffer[:block_size]
+            self._pending.append(self._executor.submit(self._compress_func, block))
+        max_pending = 0 if final else self._max_pending
+        while len(self._pending) > max_pending:
+            self.raw_fh.write(self._pending.popleft().result())
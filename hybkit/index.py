@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Functions and classes for persistent on-disk indexes of hyb files.
+
+An index is a sidecar SQLite database (by default named as the hyb file with an added
+:data:`hybkit.settings.INDEX_SUFFIX` suffix, such as ``my_file.hyb.hki``) that maps
+the values of the fields in :data:`INDEX_FIELDS` to the byte offsets of the records
+containing them. Indexes are created with :func:`build_index` (or the ``hyb_index``
+script), and queried with a :class:`HybIndex`, or directly from a hyb file
+with :meth:`HybFile.query_index <hybkit.HybFile.query_index>`, which seeks to
+each matching record without reading the remainder of the file.
+
+Index keys are stored in a sorted B-tree, so exact (``is``) and ``prefix`` matches
+are found without scanning all keys. ``contains`` and ``suffix`` matches scan
+the keys of the queried field, without reading the hyb file.
+
+Example:
+    ::
+
+        hybkit.index.build_index('my_file.hyb')  # Creates 'my_file.hyb.hki'
+
+        with hybkit.HybFile.open('my_file.hyb', 'r') as hyb_file:
+            read_records = hyb_file.query_index('id', '2407_718')
+            target_records = hyb_file.query_index('any_ref_name', '_TUBB2C_', match='contains')
+"""
+
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+import hybkit
+from hybkit import settings
+from hybkit.errors import HybkitArgError, HybkitMiscError
+
+#: Record fields stored in the index.
+INDEX_FIELDS = ('id', 'seg1_ref_name', 'seg2_ref_name', 'seg1_type', 'seg2_type')
+
+#: Query fields that match a value in either of two index fields.
+ANY_FIELDS = {
+    'any_ref_name': ('seg1_ref_name', 'seg2_ref_name'),
+    'any_seg_type': ('seg1_type', 'seg2_type'),
+}
+
+#: Methods of matching query values to index keys.
+MATCH_MODES = ('is', 'prefix', 'contains', 'suffix')
+
+#: Version of the index file format.
+INDEX_VERSION = 1
+
+# Number of records inserted into the index at once.
+_INSERT_BATCH_SIZE = 10000
+
+
+# ----- Begin Index Functions -----
+# Index : Public Functions
+def get_index_file_name(hyb_file_name: str) -> str:
+    """Return the default sidecar index file name for a hyb file."""
+    return hyb_file_name + settings.INDEX_SUFFIX
+
+
+# Index : Public Functions
+def build_index(
+        hyb_file_name: str,
+        index_file_name: Optional[str] = None,
+        hybformat_id: Optional[bool] = None,
+        hybformat_ref: Optional[bool] = None,
+        ) -> int:
+    """
+    Build a sidecar index of a hyb file, replacing any existing index.
+
+    Segment types are indexed from the ``seg1_type`` and ``seg2_type`` flags, as set
+    by ``hyb_eval`` (or by parsing with ``hybformat_ref``). Records without a segment
+    type flag are indexed by id and reference names only.
+
+    Args:
+        hyb_file_name (str): Path to an uncompressed hyb file.
+        index_file_name (:obj:`str`, optional): Path of the index file to write.
+            Defaults to the name from :func:`get_index_file_name`.
+        hybformat_id (:obj:`bool`, optional): Parse records with ``hybformat_id``.
+            Defaults to value in :attr:`settings['hybformat_id'] <hybkit.HybFile.settings>`.
+        hybformat_ref (:obj:`bool`, optional): Parse records with ``hybformat_ref``.
+            Defaults to value in :attr:`settings['hybformat_ref'] <hybkit.HybFile.settings>`.
+
+    Returns:
+        Number of indexed records.
+    """
+    if hybkit.compression.get_compression(hyb_file_name) is not None:
+        message = 'Compressed file: %s cannot be indexed, ' % hyb_file_name
+        message += 'as records in compressed files cannot be read by seeking.'
+        raise HybkitArgError(message)
+    if index_file_name is None:
+        index_file_name = get_index_file_name(hyb_file_name)
+    if hybformat_id is None:
+        hybformat_id = hybkit.HybFile.settings['hybformat_id']
+    if hybformat_ref is None:
+        hybformat_ref = hybkit.HybFile.settings['hybformat_ref']
+
+    # Write to a temporary file, so an existing index is only replaced when complete.
+    temp_file_name = index_file_name + '.tmp'
+    if os.path.exists(temp_file_name):
+        os.remove(temp_file_name)
+    source_stat = _get_source_stat(hyb_file_name)
+    connection = sqlite3.connect(temp_file_name)
+    try:
+        connection.executescript(
+            """
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE records (
+                record_num INTEGER PRIMARY KEY, offset INTEGER, length INTEGER
+            );
+            CREATE TEMP TABLE staged_keys (field INTEGER, value TEXT, record_num INTEGER);
+            """
+        )
+        num_records = 0
+        with open(hyb_file_name, 'rb') as hyb_file:
+            offset = 0
+            record_rows, key_rows = [], []
+            for num_records, raw_line in enumerate(hyb_file, start=1):
+                record = hybkit.HybRecord.from_line(
+                    raw_line.decode(), hybformat_id=hybformat_id, hybformat_ref=hybformat_ref,
+                )
+                record_rows.append((num_records, offset, len(raw_line)))
+                offset += len(raw_line)
+                key_rows.append((0, record.id, num_records))
+                key_rows.append((1, record.seg1_props['ref_name'], num_records))
+                key_rows.append((2, record.seg2_props['ref_name'], num_records))
+                for field_num, flag in ((3, 'seg1_type'), (4, 'seg2_type')):
+                    if record.flags.get(flag) is not None:
+                        key_rows.append((field_num, record.flags[flag], num_records))
+                if len(record_rows) >= _INSERT_BATCH_SIZE:
+                    _insert_rows(connection, record_rows, key_rows)
+                    record_rows, key_rows = [], []
+            _insert_rows(connection, record_rows, key_rows)
+
+        # Keys are stored in a table clustered by (field, value), filled in sorted order
+        #   after all keys are read. Fields are stored as their index in INDEX_FIELDS.
+        connection.executescript(
+            """
+            CREATE TABLE keys (
+                field INTEGER, value TEXT, record_num INTEGER,
+                PRIMARY KEY (field, value, record_num)
+            ) WITHOUT ROWID;
+            INSERT INTO keys SELECT * FROM staged_keys ORDER BY field, value, record_num;
+            DROP TABLE staged_keys;
+            """
+        )
+        connection.executemany('INSERT INTO meta VALUES (?, ?)', [
+            ('version', str(INDEX_VERSION)),
+            ('num_records', str(num_records)),
+            ('source_size', str(source_stat[0])),
+            ('source_mtime_ns', str(source_stat[1])),
+            ('hybformat_id', str(hybformat_id)),
+            ('hybformat_ref', str(hybformat_ref)),
+        ])
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(temp_file_name, index_file_name)
+    return num_records
+
+
+# Index : Private Functions
+def _insert_rows(connection: sqlite3.Connection, record_rows: List, key_rows: List) -> None:
+    connection.executemany('INSERT INTO records VALUES (?, ?, ?)', record_rows)
+    connection.executemany('INSERT INTO staged_keys VALUES (?, ?, ?)', key_rows)
+
+
+# Index : Private Functions
+def _get_source_stat(hyb_file_name: str) -> Tuple[int, int]:
+    file_stat = os.stat(hyb_file_name)
+    return file_stat.st_size, file_stat.st_mtime_ns
+
+
+# ----- Begin HybIndex Class -----
+class HybIndex:
+    """
+    Reader for a sidecar index of a hyb file, as created by :func:`build_index`.
+
+    Example usage:
+        ::
+
+            with hybkit.index.HybIndex('my_file.hyb.hki') as hyb_index:
+                offsets = hyb_index.query('seg2_type', 'mRNA')
+
+    Args:
+        index_file_name (str): Path to the index file.
+
+    Attributes:
+        index_file_name (str): Path to the index file.
+        meta (dict): Information stored with the index, including the number of
+            records (``'num_records'``) and the size and modification time of the
+            source hyb file (``'source_size'`` and ``'source_mtime_ns'``).
+    """
+
+    # HybIndex : Public Methods : Initialization / Closing
+    def __init__(self, index_file_name: str) -> None:
+        """Describe __init__ method description in class docstring."""
+        if not os.path.isfile(index_file_name):
+            message = 'Index file: %s does not exist.\n' % index_file_name
+            message += 'Indexes can be created with the "hyb_index" script.'
+            raise HybkitMiscError(message)
+        self.index_file_name = index_file_name
+        self._connection = sqlite3.connect('file:%s?mode=ro' % index_file_name, uri=True)
+        try:
+            self.meta = dict(self._connection.execute('SELECT key, value FROM meta'))
+        except sqlite3.DatabaseError as error:
+            self._connection.close()
+            message = 'File: %s is not a valid hybkit index.' % index_file_name
+            raise HybkitMiscError(message) from error
+        if self.meta.get('version') != str(INDEX_VERSION):
+            self._connection.close()
+            message = 'Index file: %s has version %s, ' % (
+                index_file_name, self.meta.get('version'))
+            message += 'but version %i is required. Please rebuild the index.' % INDEX_VERSION
+            raise HybkitMiscError(message)
+
+    # HybIndex : Public Methods : Initialization / Closing
+    def __enter__(self) -> 'HybIndex':
+        """Open "with" syntax."""
+        return self
+
+    # HybIndex : Public Methods : Initialization / Closing
+    def __exit__(self, etype, value, traceback) -> None:  # noqa: ANN001
+        """Close "with" syntax."""
+        self.close()
+
+    # HybIndex : Public Methods : Initialization / Closing
+    def close(self) -> None:
+        """Close the connection to the index file."""
+        self._connection.close()
+
+    # HybIndex : Public Methods : Querying
+    def __len__(self) -> int:
+        """Return the number of indexed records."""
+        return int(self.meta['num_records'])
+
+    # HybIndex : Public Methods : Querying
+    def is_current(self, hyb_file_name: str) -> bool:
+        """Return ``True`` if a hyb file is unchanged since the index was built."""
+        source_stat = _get_source_stat(hyb_file_name)
+        return source_stat == (int(self.meta['source_size']), int(self.meta['source_mtime_ns']))
+
+    # HybIndex : Public Methods : Querying
+    def query(self, field: str, value: str, match: str = 'is') -> List[Tuple[int, int]]:
+        """
+        Return the locations of records with a field matching a value.
+
+        Args:
+            field (str): Field to query, from :data:`INDEX_FIELDS` or :data:`ANY_FIELDS`.
+            value (str): Value to match.
+            match (:obj:`str`, optional): Method of matching index keys to the value,
+                from :data:`MATCH_MODES`.
+
+        Returns:
+            :obj:`list` of tuples of (``offset``, ``length``) in bytes of each matching
+            record, in file order.
+        """
+        fields = self._get_fields(field)
+        match_clause, match_args = self._get_match_clause(match, value)
+        field_marks = ', '.join('?' * len(fields))
+        rows = self._connection.execute(
+            'SELECT DISTINCT records.record_num, records.offset, records.length'
+            ' FROM keys JOIN records ON records.record_num = keys.record_num'
+            ' WHERE keys.field IN (%s) AND %s' % (field_marks, match_clause)
+            + ' ORDER BY records.record_num',
+            (*(INDEX_FIELDS.index(field) for field in fields), *match_args),
+        )
+        return [(offset, length) for _record_num, offset, length in rows]
+
+    # HybIndex : Public Methods : Querying
+    def get_counts(self, field: str) -> Dict[str, int]:
+        """
+        Return the number of records containing each value of a field.
+
+        Args:
+            field (str): Field from :data:`INDEX_FIELDS`.
+
+        Returns:
+            :obj:`dict` of record counts keyed by field value, in sorted order.
+        """
+        if field not in INDEX_FIELDS:
+            message = 'Field: %s is not an indexed field. ' % field
+            message += 'Options: %s' % ', '.join(INDEX_FIELDS)
+            raise HybkitArgError(message)
+        return dict(self._connection.execute(
+            'SELECT value, COUNT(*) FROM keys WHERE field = ? GROUP BY value ORDER BY value',
+            (INDEX_FIELDS.index(field),),
+        ))
+
+    # HybIndex : Private Methods
+    @staticmethod
+    def _get_fields(field: str) -> Tuple[str, ...]:
+        if field in ANY_FIELDS:
+            return ANY_FIELDS[field]
+        if field in INDEX_FIELDS:
+            return (field,)
+        message = 'Field: %s cannot be queried. ' % field
+        message += 'Options: %s' % ', '.join((*INDEX_FIELDS, *ANY_FIELDS))
+        raise HybkitArgError(message)
+
+    # HybIndex : Private Methods
+    @staticmethod
+    def _get_match_clause(match: str, value: str) -> Tuple[str, tuple]:
+        if match == 'is':
+            return 'keys.value = ?', (value,)
+        if match == 'prefix':
+            # Range comparison allows the sorted keys index to be used.
+            return 'keys.value >= ? AND keys.value < ?', (value, value + '\U0010ffff')
+        if match == 'contains':
+            return 'instr(keys.value, ?) > 0', (value,)
+        if match == 'suffix':
+            return 'substr(keys.value, length(keys.value) - ? + 1) = ?', (len(value), value)
+        message = 'Match mode: %s is not allowed. ' % match
+        message += 'Options: %s' % ', '.join(MATCH_MODES)
+        raise HybkitArgError(message)
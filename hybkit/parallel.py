@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Functions for multi-process execution of hybkit toolkit tasks.
+
+Input files are split into line-aligned chunks of records, which are processed
+by a :class:`multiprocessing.pool.Pool` of worker processes. Results are returned
+to the parent process in input order, so output files are identical to those created
+by serial processing.
+
+Class-level hybkit settings and the :class:`~hybkit.type_finder.TypeFinder` method
+are not shared between processes by default, so each worker is initialized with a
+snapshot of the parent-process settings (see :func:`get_settings_snapshot`).
+"""
+
+import collections
+import copy
+import io
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import hybkit
+from hybkit import settings
+from hybkit.errors import HybkitArgError, HybkitIterError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+# ----- Begin Typing Variables ----- #
+SettingsSnapshot = Dict[str, Dict[str, Any]]
+LinesChunk = Tuple[List[str], Optional[List[str]]]
+FileTask = Tuple[str, Optional[str], Dict[str, Any]]
+
+#: Byte range of a file, with ``start`` and ``end`` offsets at line boundaries.
+ByteRange = collections.namedtuple('ByteRange', ['file_name', 'start', 'end'])
+
+#: Classes with class-level settings copied to worker processes.
+SETTINGS_CLASSES = ('HybRecord', 'HybFile', 'FoldRecord', 'FoldFile', 'HybFoldIter', 'Analysis')
+
+#: Number of lines per record in each supported fold-file type.
+FOLD_LINES_PER_RECORD = {'vienna': 3}
+
+
+# ----- Begin Settings Functions -----
+# Parallel : Settings Functions
+def get_settings_snapshot() -> SettingsSnapshot:
+    """
+    Return a copy of the current class-level settings of all hybkit classes.
+
+    Returns:
+        dict: Dict of ``{class_name: settings_dict}`` for each class in :data:`SETTINGS_CLASSES`.
+    """
+    return {
+        class_name: copy.deepcopy(getattr(settings, class_name + '_settings'))
+        for class_name in SETTINGS_CLASSES
+    }
+
+
+# Parallel : Settings Functions
+def apply_settings_snapshot(snapshot: SettingsSnapshot) -> None:
+    """
+    Update the class-level settings of all hybkit classes from a settings snapshot.
+
+    Settings dictionaries are updated in place, so references held by hybkit classes
+    remain valid.
+
+    Args:
+        snapshot (dict): Settings snapshot as returned by :func:`get_settings_snapshot`.
+    """
+    for class_name, class_settings in snapshot.items():
+        getattr(settings, class_name + '_settings').update(copy.deepcopy(class_settings))
+    # Reset the cached set of allowed flags, which depends on the "custom_flags" setting.
+    hybkit.HybRecord._flagset = None
+
+
+# Parallel : Settings Functions
+def init_worker(
+        settings_snapshot: SettingsSnapshot,
+        type_method: Optional[str] = None,
+        type_params: Optional[dict] = None,
+        ) -> None:
+    """
+    Initialize a worker process with parent-process settings and TypeFinder method.
+
+    Args:
+        settings_snapshot (dict): Settings snapshot as returned by :func:`get_settings_snapshot`.
+        type_method (:obj:`str`, optional): :class:`~hybkit.type_finder.TypeFinder`
+            method to set with :meth:`~hybkit.type_finder.TypeFinder.set_method`.
+        type_params (:obj:`dict`, optional): Parameters for ``type_method``.
+    """
+    apply_settings_snapshot(settings_snapshot)
+    if type_method is not None:
+        hybkit.HybRecord.TypeFinder.set_method(type_method, type_params)
+
+
+# ----- Begin Pool Functions -----
+# Parallel : Pool Functions
+def make_pool(
+        processes: int,
+        type_method: Optional[str] = None,
+        type_params: Optional[dict] = None,
+        ) -> multiprocessing.pool.Pool:
+    """
+    Create a process pool with workers initialized with the current hybkit settings.
+
+    Args:
+        processes (int): Number of worker processes.
+        type_method (:obj:`str`, optional): :class:`~hybkit.type_finder.TypeFinder`
+            method to set in each worker.
+        type_params (:obj:`dict`, optional): Parameters for ``type_method``.
+
+    Returns:
+        :class:`multiprocessing.pool.Pool` object.
+    """
+    if processes < 1:
+        message = 'Number of processes must be a positive integer. Provided: %s' % processes
+        raise HybkitArgError(message)
+    return multiprocessing.Pool(
+        processes,
+        initializer=init_worker,
+        initargs=(get_settings_snapshot(), type_method, type_params),
+    )
+
+
+# Parallel : Pool Functions
+def ordered_map(
+        pool: multiprocessing.pool.Pool,
+        func: Callable,
+        tasks: Iterable[Any],
+        max_pending: int,
+        ) -> Iterator[Any]:
+    """
+    Apply ``func`` to each task using ``pool``, yielding results in task order.
+
+    Unlike :meth:`multiprocessing.pool.Pool.imap`, at most ``max_pending`` tasks are
+    submitted ahead of the results consumed, which bounds memory use for large inputs.
+
+    Args:
+        pool (multiprocessing.pool.Pool): Process pool to use.
+        func (Callable): Picklable (module-level) function to apply to each task.
+        tasks (Iterable): Task arguments, each passed to ``func`` as a single argument.
+        max_pending (int): Maximum number of submitted tasks awaiting consumption.
+
+    Yields:
+        Results of ``func`` for each task, in task order.
+    """
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(pool.apply_async(func, (task,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+# Parallel : Pool Functions
+def iter_file_results(
+        func: Callable,
+        file_tasks: Iterable[FileTask],
+        processes: int,
+        chunk_size: int = 10000,
+        counters: Optional[collections.Counter] = None,
+        type_method: Optional[str] = None,
+        type_params: Optional[dict] = None,
+        ) -> Iterator[Tuple[int, Iterator[Dict[str, Any]]]]:
+    """
+    Process chunks of multiple files using a process pool, yielding the results of each file.
+
+    Each file is split into chunks with :func:`iter_file_chunks`, and ``func`` is applied
+    to a task of (``chunk``, ``options``) for each chunk. Chunks of the following files are
+    processed while the results of each file are consumed. Files without records are
+    submitted as a single empty chunk, so that all files have results.
+
+    For each file, the :class:`~hybkit.HybFoldIter` "max_sequential_skips" limit is checked
+    across chunks (see :func:`check_sequential_skips`), and the counters of each chunk are
+    added to ``counters``, with the final read attempt at the end of the file
+    counted once as for a single iterator.
+
+    The pool is created with :func:`make_pool`, and is closed once all results have been
+    consumed, or terminated if an error occurs or iteration is stopped early.
+
+    Args:
+        func (Callable): Picklable (module-level) task function, such as :func:`filter_chunk`,
+            returning a dict with ``counters`` and ``skips`` keys.
+        file_tasks (Iterable): Tuples of (``in_hyb_file``, ``in_fold_file``, ``options``)
+            for each file, where ``in_fold_file`` may be ``None``.
+        processes (int): Number of worker processes.
+        chunk_size (:obj:`int`, optional): Number of records per chunk.
+        counters (:obj:`collections.Counter`, optional): Counter to update with the
+            :class:`~hybkit.HybFoldIter` counters of all chunks.
+        type_method (:obj:`str`, optional): :class:`~hybkit.type_finder.TypeFinder`
+            method to set in each worker.
+        type_params (:obj:`dict`, optional): Parameters for ``type_method``.
+
+    Yields:
+        Tuples of (``file_index``, ``chunk_results``), where ``chunk_results`` iterates over
+        the results of ``func`` for each chunk of the file, in order. Each ``chunk_results``
+        must be consumed before the results of the next file are requested.
+    """
+    file_tasks = list(file_tasks)
+    if counters is None:
+        counters = collections.Counter()
+    max_skips = hybkit.HybFoldIter.settings['max_sequential_skips']
+    # File index of each submitted task. Results are returned in task order,
+    #   so each result corresponds to the oldest remaining index.
+    task_file_indexes = collections.deque()
+
+    def iter_tasks() -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        for file_i, (in_hyb_file, in_fold_file, options) in enumerate(file_tasks):
+            num_chunks = 0
+            for chunk in iter_file_chunks(in_hyb_file, in_fold_file, chunk_size):
+                num_chunks += 1
+                task_file_indexes.append(file_i)
+                yield chunk, options
+            # Submit an empty chunk for empty files, so that all files have results.
+            if not num_chunks:
+                task_file_indexes.append(file_i)
+                yield ([], None if in_fold_file is None else []), options
+
+    def iter_chunk_results(
+            chunk_results: Iterator[Dict[str, Any]],
+            ) -> Iterator[Dict[str, Any]]:
+        sequential_skips = 0
+        for chunk_i, result in enumerate(chunk_results):
+            chunk_counters = result['counters']
+            if chunk_counters:
+                sequential_skips = check_sequential_skips(
+                    sequential_skips, result['skips'], max_skips
+                )
+                # Count the final read attempt at the end of input once, as for serial.
+                if chunk_i > 0:
+                    chunk_counters['total_read_attempts'] -= 1
+                    chunk_counters['hyb_record_read_attempts'] -= 1
+                counters.update(chunk_counters)
+            yield result
+
+    pool = make_pool(processes, type_method, type_params)
+    try:
+        results = ordered_map(pool, func, iter_tasks(), max_pending=(processes * 2))
+        file_results = itertools.groupby(results, key=lambda _: task_file_indexes.popleft())
+        for file_i, chunk_results in file_results:
+            yield file_i, iter_chunk_results(chunk_results)
+    except BaseException:
+        pool.terminate()
+        raise
+    pool.close()
+    pool.join()
+
+
+# ----- Begin Chunking Functions -----
+# Parallel : Chunking Functions
+def iter_line_chunks(
+        hyb_fh: Iterable[str],
+        fold_fh: Optional[Iterable[str]] = None,
+        chunk_size: int = 10000,
+        fold_type: str = 'vienna',
+        ) -> Iterator[LinesChunk]:
+    """
+    Read line-aligned chunks of records from a hyb file and optional paired fold file.
+
+    Each chunk contains up to ``chunk_size`` hyb lines and the corresponding
+    fold-file lines for the same records.
+
+    Args:
+        hyb_fh (file): Hyb-format file handle (or other iterable of lines).
+        fold_fh (:obj:`file`, optional): Paired fold-file handle (or other iterable of lines).
+        chunk_size (:obj:`int`, optional): Number of records per chunk.
+        fold_type (:obj:`str`, optional): Type of fold file, from :data:`FOLD_LINES_PER_RECORD`.
+
+    Yields:
+        Tuples of (``hyb_lines``, ``fold_lines``), where ``fold_lines`` is ``None``
+        if no fold file is provided.
+    """
+    if chunk_size < 1:
+        message = 'Chunk size must be a positive integer. Provided: %s' % chunk_size
+        raise HybkitArgError(message)
+    if fold_fh is not None and fold_type not in FOLD_LINES_PER_RECORD:
+        message = 'Fold file type "%s" cannot be split into chunks. ' % fold_type
+        message += 'Supported types: ' + ', '.join(FOLD_LINES_PER_RECORD)
+        raise HybkitArgError(message)
+    while True:
+        hyb_lines = list(itertools.islice(hyb_fh, chunk_size))
+        if not hyb_lines:
+            return
+        fold_lines = None
+        if fold_fh is not None:
+            num_fold_lines = chunk_size * FOLD_LINES_PER_RECORD[fold_type]
+            fold_lines = list(itertools.islice(fold_fh, num_fold_lines))
+        yield hyb_lines, fold_lines
+
+
+# Parallel : Chunking Functions
+def iter_file_chunks(
+        in_hyb_file: str,
+        in_fold_file: Optional[str] = None,
+        chunk_size: int = 10000,
+        ) -> Iterator[Any]:
+    """
+    Split a hyb file, with an optional paired ".vienna" fold file, into chunks of records.
+
+    Uncompressed hyb files without a fold file are split into :data:`ByteRange` chunks of
+    approximately ``chunk_size`` lines, which are read by worker processes. Otherwise, files
+    are read in order and split into chunks of lines with :func:`iter_line_chunks`.
+
+    Args:
+        in_hyb_file (str): Path to hyb-format file.
+        in_fold_file (:obj:`str`, optional): Path to a paired ".vienna"-format file.
+        chunk_size (:obj:`int`, optional): Number of records per chunk.
+
+    Yields:
+        :data:`ByteRange` tuples, or tuples of (``hyb_lines``, ``fold_lines``) as yielded
+        by :func:`iter_line_chunks`.
+    """
+    if in_fold_file is None and hybkit.compression.get_compression(in_hyb_file) is None:
+        # Hyb files are split at line boundaries by byte offset, and read by workers.
+        line_bytes = estimate_line_bytes(in_hyb_file)
+        chunk_bytes = max(int(chunk_size * line_bytes), 1)
+        yield from iter_byte_ranges(in_hyb_file, chunk_bytes)
+    elif in_fold_file is None:
+        # Compressed hyb files are decompressed in order, and split by record count.
+        with hybkit.compression.open_file(in_hyb_file) as in_hyb:
+            yield from iter_line_chunks(in_hyb, None, chunk_size)
+    else:
+        # Paired hyb and fold files are split by record count.
+        with hybkit.compression.open_file(in_hyb_file) as in_hyb, \
+             hybkit.compression.open_file(in_fold_file) as in_fold:
+            yield from iter_line_chunks(in_hyb, in_fold, chunk_size)
+
+
+# Parallel : Chunking Functions
+def estimate_line_bytes(file_name: str, num_lines: int = 1000) -> float:
+    """
+    Estimate the mean number of bytes per line of a text file from its first lines.
+
+    Args:
+        file_name (str): Name of the file.
+        num_lines (:obj:`int`, optional): Number of lines to sample.
+
+    Returns:
+        float: Mean bytes per line (1.0 for an empty file).
+    """
+    with open(file_name, 'rb') as file_obj:
+        line_lengths = [len(line) for line in itertools.islice(file_obj, num_lines)]
+    if not line_lengths:
+        return 1.0
+    return sum(line_lengths) / len(line_lengths)
+
+
+# Parallel : Chunking Functions
+def iter_byte_ranges(file_name: str, chunk_bytes: int) -> Iterator[ByteRange]:
+    """
+    Split a text file into byte ranges of approximately ``chunk_bytes``, at line boundaries.
+
+    Only file offsets are read by this function, so the ranges can be read by
+    worker processes with :func:`read_byte_range`.
+
+    Args:
+        file_name (str): Name of the file.
+        chunk_bytes (int): Target size of each byte range.
+
+    Yields:
+        :data:`ByteRange` tuples covering the file in order.
+    """
+    if chunk_bytes < 1:
+        message = 'Chunk size must be a positive integer. Provided: %s' % chunk_bytes
+        raise HybkitArgError(message)
+    file_size = os.path.getsize(file_name)
+    with open(file_name, 'rb') as file_obj:
+        start = 0
+        while start < file_size:
+            file_obj.seek(min(start + chunk_bytes, file_size) - 1)
+            # Extend the range to the end of the line containing the target offset.
+            file_obj.readline()
+            end = file_obj.tell()
+            yield ByteRange(file_name, start, end)
+            start = end
+
+
+# Parallel : Chunking Functions
+def read_byte_range(byte_range: ByteRange) -> List[str]:
+    """
+    Read the lines of a text file within a byte range.
+
+    Lines are read with universal newlines, as for a file opened in text mode.
+
+    Args:
+        byte_range (ByteRange): Byte range, as returned by :func:`iter_byte_ranges`.
+
+    Returns:
+        list: Lines within the byte range.
+    """
+    with open(byte_range.file_name, 'rb') as file_obj:
+        file_obj.seek(byte_range.start)
+        text = file_obj.read(byte_range.end - byte_range.start).decode()
+    return list(io.StringIO(text, newline=None))
+
+
+# Parallel : Chunking Functions
+def iter_chunk_records(
+        hyb_lines: List[str],
+        fold_lines: Optional[List[str]] = None,
+        ) -> Tuple[Iterator[hybkit.HybRecord], Optional[hybkit.HybFoldIter]]:
+    """
+    Return an iterator over the records in a chunk of lines.
+
+    If ``fold_lines`` are provided, records are read with a :class:`~hybkit.HybFoldIter`
+    using ``combine=True``, and the iterator is also returned to allow access to its counters.
+
+    Args:
+        hyb_lines (list): Hyb-format lines.
+        fold_lines (:obj:`list`, optional): Vienna-format lines for the same records.
+
+    Returns:
+        Tuple of (``record_iterator``, ``hyb_fold_iter``), where ``hyb_fold_iter`` is
+        ``None`` if no ``fold_lines`` are provided.
+    """
+    in_hyb = hybkit.HybFile(io.StringIO(''.join(hyb_lines)), from_file_like=True)
+    if fold_lines is None:
+        return in_hyb, None
+    in_fold = hybkit.ViennaFile(io.StringIO(''.join(fold_lines)), from_file_like=True)
+    hyb_fold_iter = hybkit.HybFoldIter(in_hyb, in_fold, combine=True)
+    return hyb_fold_iter, hyb_fold_iter
+
+
+# Parallel : Chunking Functions
+def check_sequential_skips(
+        prior_skips: int,
+        chunk_skips: Tuple[Optional[int], int],
+        max_skips: int,
+        ) -> int:
+    """
+    Check the :class:`~hybkit.HybFoldIter` "max_sequential_skips" limit across chunks.
+
+    Each chunk is read by a separate :class:`~hybkit.HybFoldIter`, so record pairs
+    skipped at the end of one chunk and the start of the next are counted here
+    to match the behavior of a single iterator.
+
+    Args:
+        prior_skips (int): Sequential skips at the end of previous chunks.
+        chunk_skips (tuple): Tuple of (``leading_skips``, ``trailing_skips``)
+            for the chunk, where ``leading_skips`` is ``None`` if no record pairs
+            in the chunk were returned.
+        max_skips (int): Maximum allowed sequential skips.
+
+    Returns:
+        int: Sequential skips at the end of the chunk.
+    """
+    leading_skips, trailing_skips = chunk_skips
+    sequential_skips = prior_skips + (trailing_skips if leading_skips is None else leading_skips)
+    if sequential_skips > max_skips:
+        message = 'ERROR: Skipped %i ' % sequential_skips
+        message += 'record pairs in a row '
+        message += '(max: %i)\n' % max_skips
+        message += 'Check for misalignment of records, or disable setting.'
+        raise HybkitIterError(message)
+    return sequential_skips if leading_skips is None else trailing_skips
+
+
+# ----- Begin Task Functions -----
+# Parallel : Task Functions : hyb_eval
+def eval_chunk(
+        task: Tuple[Any, Dict[str, Any]],
+        ) -> Dict[str, Any]:
+    """
+    Evaluate the records in a chunk, as performed by the ``hyb_eval`` script.
+
+    Args:
+        task (tuple): Tuple of (``chunk``, ``options``), where ``chunk`` is either a
+            :data:`ByteRange` of a hyb file or a tuple of (``hyb_lines``, ``fold_lines``),
+            and ``options`` is a dict with keys: ``eval_types`` (list of evaluations
+            to perform), and ``dataset`` (value to set as the "dataset" flag, or ``None``).
+
+    Returns:
+        dict: Dict with keys: ``hyb_text`` and ``fold_text`` (output hyb-format text,
+        and output vienna-format text or ``None``), ``counters`` (the
+        :class:`~hybkit.HybFoldIter` counters for the chunk), and ``skips`` (the leading
+        and trailing skipped record pairs, for use with :func:`check_sequential_skips`).
+    """
+    chunk, options = task
+    hyb_lines, fold_lines = _read_chunk(chunk)
+    do_type = 'type' in options['eval_types']
+    do_mirna = 'mirna' in options['eval_types']
+    dataset = options.get('dataset')
+
+    record_iter, hyb_fold_iter = iter_chunk_records(hyb_lines, fold_lines)
+    out_hyb = hybkit.HybFile(io.StringIO(), from_file_like=True)
+    out_fold = None
+    if fold_lines is not None:
+        out_fold = hybkit.ViennaFile(io.StringIO(), from_file_like=True)
+
+    leading_skips = None
+    for hyb_record in record_iter:
+        if leading_skips is None and hyb_fold_iter is not None:
+            leading_skips = hyb_fold_iter.counters['pair_skips']
+        if dataset:
+            hyb_record.set_flag('dataset', dataset)
+        if do_type:
+            hyb_record.eval_types()
+        if do_mirna:
+            hyb_record.eval_mirna()
+        out_hyb.write_record(hyb_record)
+        if out_fold is not None:
+            out_fold.write_record(hyb_record.fold_record)
+
+    if hyb_fold_iter is not None:
+        counters = hyb_fold_iter.counters
+        skips = (leading_skips, hyb_fold_iter.sequential_skips)
+    else:
+        counters = collections.Counter()
+        skips = (0, 0)
+    return {
+        'hyb_text': out_hyb.fh.getvalue(),
+        'fold_text': out_fold.fh.getvalue() if out_fold is not None else None,
+        'counters': counters,
+        'skips': skips,
+    }
+
+
+# Parallel : Task Functions : hyb_filter
+def filter_chunk(
+        task: Tuple[Any, Dict[str, Any]],
+        ) -> Dict[str, Any]:
+    """
+    Filter the records in a chunk, as performed by the ``hyb_filter`` script.
+
+    Records are filtered as if the chunk were a complete file. Results for chunks after
+    the first must be corrected with :func:`join_filter_chunk` for the
+    ``skip_dup_id_before`` and ``skip_dup_id_after`` options.
+
+    Args:
+        task (tuple): Tuple of (``chunk``, ``options``), where ``chunk`` is either a
+            :data:`ByteRange` of a hyb file or a tuple of (``hyb_lines``, ``fold_lines``),
+            and ``options`` is a dict with keys: ``filter_params``, ``exclude_params``,
+            ``filter_mode``, ``skip_dup_id_before``, ``skip_dup_id_after``
+            (as for the ``hyb_filter`` script), ``dataset``
+            (value to set as the "dataset" flag, or ``None``), and optionally ``where``
+            and ``where_optimize`` (arguments of :class:`hybkit.query.WhereQuery`).
+
+    Returns:
+        dict: Dict with keys: ``hyb_text`` and ``fold_text`` (output text,
+        ``fold_text`` is ``None`` without fold lines), ``include_count``,
+        ``exclude_count``, ``first_id`` (id of the first record), ``first_included``
+        (whether the first record was included), ``first_output_id`` and ``first_output_ends``
+        (id and end offsets in the output texts of the first included record),
+        ``last_record_id`` (the final duplicate-id tracking value), ``counters``
+        and ``skips`` (as returned by :func:`eval_chunk`), and ``where_counts``
+        (as returned by :meth:`hybkit.query.WhereQuery.get_counts`, or ``None``).
+    """
+    chunk, options = task
+    hyb_lines, fold_lines = _read_chunk(chunk)
+    where_query = None
+    if options.get('where'):
+        where_query = hybkit.query.WhereQuery(options['where'], options['where_optimize'])
+    record_filter = hybkit.query.compile_filter(
+        options['filter_params'], options['exclude_params'], options['filter_mode'],
+        where=where_query,
+    )
+    skip_dup_id_before = options['skip_dup_id_before']
+    skip_dup_id_after = options['skip_dup_id_after']
+    dataset = options.get('dataset')
+
+    record_iter, hyb_fold_iter = iter_chunk_records(hyb_lines, fold_lines)
+    out_hyb = hybkit.HybFile(io.StringIO(), from_file_like=True)
+    out_fold = None
+    if fold_lines is not None:
+        out_fold = hybkit.ViennaFile(io.StringIO(), from_file_like=True)
+    include_count = 0
+    exclude_count = 0
+    first_id = None
+    first_included = False
+    first_output_id = None
+    first_output_ends = (0, 0)
+    leading_skips = None
+    last_record_id = None
+
+    for i, hyb_record in enumerate(record_iter):
+        if i == 0:
+            first_id = hyb_record.id
+            if hyb_fold_iter is not None:
+                leading_skips = hyb_fold_iter.counters['pair_skips']
+
+        if skip_dup_id_before:
+            if hyb_record.id == last_record_id:
+                continue
+            last_record_id = hyb_record.id
+
+        use_record = record_filter(hyb_record)
+
+        if skip_dup_id_after and use_record:
+            if hyb_record.id == last_record_id:
+                use_record = False
+            else:
+                last_record_id = hyb_record.id
+
+        if use_record:
+            if dataset:
+                hyb_record.set_flag('dataset', dataset)
+            out_hyb.write_record(hyb_record)
+            include_count += 1
+            if out_fold is not None:
+                out_fold.write_record(hyb_record.fold_record)
+            if include_count == 1:
+                first_included = (i == 0)
+                first_output_id = hyb_record.id
+                first_output_ends = (
+                    len(out_hyb.fh.getvalue()),
+                    len(out_fold.fh.getvalue()) if out_fold is not None else 0,
+                )
+        else:
+            exclude_count += 1
+
+    if hyb_fold_iter is not None:
+        counters = hyb_fold_iter.counters
+        skips = (leading_skips, hyb_fold_iter.sequential_skips)
+    else:
+        counters = collections.Counter()
+        skips = (0, 0)
+    return {
+        'hyb_text': out_hyb.fh.getvalue(),
+        'fold_text': out_fold.fh.getvalue() if out_fold is not None else None,
+        'include_count': include_count,
+        'exclude_count': exclude_count,
+        'first_id': first_id,
+        'first_included': first_included,
+        'first_output_id': first_output_id,
+        'first_output_ends': first_output_ends,
+        'last_record_id': last_record_id,
+        'counters': counters,
+        'skips': skips,
+        'where_counts': where_query.get_counts() if where_query is not None else None,
+    }
+
+
+# Parallel : Task Functions : hyb_filter
+def join_filter_chunk(
+        result: Dict[str, Any],
+        last_record_id: Optional[str],
+        options: Dict[str, Any],
+        ) -> Optional[str]:
+    """
+    Correct a :func:`filter_chunk` result for the records in all previous chunks.
+
+    The ``skip_dup_id_before`` and ``skip_dup_id_after`` options compare each record
+    to the id of a previous record, which may be in a previous chunk. Only the first record
+    of a chunk can be affected, so ``result`` is modified in place to match the result
+    of serial filtering.
+
+    Args:
+        result (dict): Result of :func:`filter_chunk` for the chunk.
+        last_record_id (:obj:`str`, optional): Duplicate-id tracking value after all
+            previous chunks (``None`` for the first chunk).
+        options (dict): Filtering options, as for :func:`filter_chunk`.
+
+    Returns:
+        :obj:`str` or ``None``: Duplicate-id tracking value after this chunk.
+    """
+    if last_record_id is not None:
+        if options['skip_dup_id_before']:
+            # The first record is skipped without counting during serial filtering.
+            if result['first_id'] == last_record_id:
+                if result['first_included']:
+                    _drop_first_output_record(result)
+                    result['include_count'] -= 1
+                else:
+                    result['exclude_count'] -= 1
+        elif options['skip_dup_id_after']:
+            # The first included record is excluded as a duplicate during serial filtering.
+            if result['first_output_id'] == last_record_id:
+                _drop_first_output_record(result)
+                result['include_count'] -= 1
+                result['exclude_count'] += 1
+    if result['last_record_id'] is None:
+        return last_record_id
+    return result['last_record_id']
+
+
+# Parallel : Task Functions : hyb_analyze
+def analyze_chunk(
+        task: Tuple[Any, Dict[str, Any]],
+        ) -> Dict[str, Any]:
+    """
+    Analyze the records in a chunk, as performed by the ``hyb_analyze`` script.
+
+    Args:
+        task (tuple): Tuple of (``chunk``, ``options``), where ``chunk`` is either a
+            :data:`ByteRange` of a hyb file or a tuple of (``hyb_lines``, ``fold_lines``),
+            and ``options`` is a dict with key: ``analysis_types``
+            (analysis types of :class:`hybkit.analysis.Analysis`).
+
+    Returns:
+        dict: Dict with keys: ``state`` (the state of the chunk analysis, as returned by
+        :meth:`hybkit.analysis.Analysis.get_state`), and ``counters`` and ``skips``
+        (as returned by :func:`eval_chunk`).
+    """
+    chunk, options = task
+    hyb_lines, fold_lines = _read_chunk(chunk)
+    analysis = hybkit.analysis.Analysis(options['analysis_types'])
+
+    record_iter, hyb_fold_iter = iter_chunk_records(hyb_lines, fold_lines)
+    leading_skips = None
+    for hyb_record in record_iter:
+        if leading_skips is None and hyb_fold_iter is not None:
+            leading_skips = hyb_fold_iter.counters['pair_skips']
+        analysis.add_hyb_record(hyb_record)
+
+    if hyb_fold_iter is not None:
+        counters = hyb_fold_iter.counters
+        skips = (leading_skips, hyb_fold_iter.sequential_skips)
+    else:
+        counters = collections.Counter()
+        skips = (0, 0)
+    return {'state': analysis.get_state(), 'counters': counters, 'skips': skips}
+
+
+# Parallel : Private Functions
+def _read_chunk(chunk: Any) -> LinesChunk:
+    # Return the (hyb_lines, fold_lines) of a chunk from iter_file_chunks().
+    if isinstance(chunk, ByteRange):
+        return read_byte_range(chunk), None
+    return chunk
+
+
+# Parallel : Private Functions
+def _drop_first_output_record(result: Dict[str, Any]) -> None:
+    hyb_end, fold_end = result['first_output_ends']
+    result['hyb_text'] = result['hyb_text'][hyb_end:]
+    if result['fold_text'] is not None:
+        result['fold_text'] = result['fold_text'][fold_end:]
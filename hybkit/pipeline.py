@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Generator stages for chaining toolkit tasks over a single parse of the input.
+
+The ``hyb_check``, ``hyb_eval``, ``hyb_filter``, and ``hyb_analyze`` scripts each read
+(and, apart from ``hyb_check``, write) full hyb and fold files. Here the same tasks are
+provided as generator stages, each taking an iterable of :class:`~hybkit.HybRecord`
+objects and yielding records, so that each input record is parsed once and passed through
+all stages in turn:
+
+    ======================= =============================================================
+    :func:`read_records`    Parse (and error-check) records, as by ``hyb_check``
+    :func:`eval_stage`      Evaluate segment types and miRNAs, as by ``hyb_eval``
+    :func:`filter_stage`    Yield only records passing a filter, as by ``hyb_filter``
+    :func:`analyze_stage`   Add records to an :class:`~hybkit.analysis.Analysis`,
+                            as by ``hyb_analyze``
+    :func:`tap`             Write records passing this point to output hyb (/fold) files
+    ======================= =============================================================
+
+Intermediate output files are optional, and are written by placing :func:`tap` stages
+at the desired points of the pipeline. Stages are lazy, so no records are read until
+the pipeline is iterated, such as by :func:`run`.
+
+Example:
+    ::
+
+        analysis = hybkit.analysis.Analysis(['type', 'mirna'])
+        record_filter = hybkit.query.compile_filter(
+            exclude_params=[('any_seg_type_is', 'rRNA')],
+        )
+        records = hybkit.pipeline.read_records('my_file.hyb', 'my_file.vienna')
+        records = hybkit.pipeline.eval_stage(records, eval_types=['type', 'mirna'])
+        records = hybkit.pipeline.filter_stage(records, record_filter)
+        records = hybkit.pipeline.tap(
+            records, 'my_file_evaluated_filtered.hyb', 'my_file_evaluated_filtered.vienna'
+        )
+        records = hybkit.pipeline.analyze_stage(records, analysis)
+        hybkit.pipeline.run(records)
+        analysis.write_analysis_results_special(out_basename='my_file_analysis')
+"""
+
+import collections
+import contextlib
+import functools
+from typing import Iterable, Iterator, Optional, Type, Union
+
+import hybkit
+from hybkit import settings
+from hybkit.errors import HybkitArgError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+# ----- Begin Typing Variables ----- #
+HybRecords = Iterable['hybkit.HybRecord']
+RecordAnalysis = Union['hybkit.analysis.Analysis', 'hybkit.analysis.GroupedAnalysis']
+
+#: Allowed evaluation types for :func:`eval_stage`.
+EVAL_TYPES = ('type', 'mirna')
+
+
+# ----- Begin Pipeline Stages -----
+# Pipeline : Stages
+def read_records(
+        in_hyb_file: str,
+        in_fold_file: Optional[str] = None,
+        counters: Optional[collections.Counter] = None,
+        ) -> Iterator['hybkit.HybRecord']:
+    """
+    Read and yield the records of a hyb file, combined with any matched fold records.
+
+    Records are checked for errors as they are parsed, according to the hybkit settings
+    (as performed by the ``hyb_check`` script).
+
+    Args:
+        in_hyb_file (str): Path to hyb-format file.
+        in_fold_file (:obj:`str`, optional): Path to a matched ".vienna" or ".ct"-format
+            fold file.
+        counters (:obj:`collections.Counter`, optional): If provided, updated with the
+            :attr:`~hybkit.HybFoldIter.counters` of the hyb-fold iteration once all records
+            have been read.
+
+    Yields:
+        :class:`~hybkit.HybRecord`: Each record of the input file.
+    """
+    if in_fold_file is None:
+        in_fold_class = contextlib.nullcontext
+        in_fold_args = ()
+    else:
+        in_fold_class = get_fold_class(in_fold_file)
+        in_fold_args = (in_fold_file, 'r')
+
+    with hybkit.HybFile(in_hyb_file, 'r') as in_hyb, \
+         in_fold_class(*in_fold_args) as in_fold:
+        if in_fold_file is None:
+            yield from in_hyb
+        else:
+            record_iter = hybkit.HybFoldIter(in_hyb, in_fold, combine=True)
+            yield from record_iter
+            if counters is not None:
+                counters.update(record_iter.counters)
+
+
+# Pipeline : Stages
+def eval_stage(
+        hyb_records: HybRecords,
+        eval_types: Iterable[str] = EVAL_TYPES,
+        dataset: Optional[str] = None,
+        ) -> Iterator['hybkit.HybRecord']:
+    """
+    Evaluate and yield each record, as performed by the ``hyb_eval`` script.
+
+    Segment types are evaluated with the current
+    :class:`~hybkit.type_finder.TypeFinder` method
+    (see :meth:`hybkit.HybRecord.eval_types`).
+
+    Args:
+        hyb_records (iterable): Iterable of :class:`~hybkit.HybRecord` objects.
+        eval_types (:obj:`list` of :obj:`str`, optional): Evaluations to perform,
+            from :data:`EVAL_TYPES`.
+        dataset (:obj:`str`, optional): If provided, set the "dataset" flag of each
+            record to this value before evaluation.
+
+    Yields:
+        :class:`~hybkit.HybRecord`: Each evaluated record.
+    """
+    eval_types = list(eval_types)
+    for eval_type in eval_types:
+        if eval_type not in EVAL_TYPES:
+            message = 'Unrecognized evaluation type: %s\n' % eval_type
+            message += 'Options are: %s' % ', '.join(EVAL_TYPES)
+            raise HybkitArgError(message)
+    do_type = 'type' in eval_types
+    do_mirna = 'mirna' in eval_types
+
+    for hyb_record in hyb_records:
+        if dataset is not None:
+            hyb_record.set_flag('dataset', dataset)
+        if do_type:
+            hyb_record.eval_types()
+        if do_mirna:
+            hyb_record.eval_mirna()
+        yield hyb_record
+
+
+# Pipeline : Stages
+def filter_stage(
+        hyb_records: HybRecords,
+        record_filter: 'hybkit.query.Predicate',
+        skip_dup_id_before: bool = False,
+        skip_dup_id_after: bool = False,
+        counts: Optional[collections.Counter] = None,
+        ) -> Iterator['hybkit.HybRecord']:
+    """
+    Yield only records passing a filter, as performed by the ``hyb_filter`` script.
+
+    Args:
+        hyb_records (iterable): Iterable of :class:`~hybkit.HybRecord` objects.
+        record_filter (function): Predicate function of a :class:`~hybkit.HybRecord`,
+            such as returned by :func:`hybkit.query.compile_filter`.
+        skip_dup_id_before (:obj:`bool`, optional): Skip records with the same id as
+            the previous record before filtering.
+        skip_dup_id_after (:obj:`bool`, optional): Skip records with the same id as
+            the previous included record after filtering.
+        counts (:obj:`collections.Counter`, optional): If provided, the number of
+            records included and excluded are added to the ``'included'``
+            and ``'excluded'`` keys.
+
+    Yields:
+        :class:`~hybkit.HybRecord`: Each record passing the filter.
+    """
+    if counts is None:
+        counts = collections.Counter()
+    last_record_id = None
+    for hyb_record in hyb_records:
+        if skip_dup_id_before:
+            if hyb_record.id == last_record_id:
+                continue
+            last_record_id = hyb_record.id
+
+        use_record = record_filter(hyb_record)
+
+        if skip_dup_id_after and use_record:
+            if hyb_record.id == last_record_id:
+                use_record = False
+            else:
+                last_record_id = hyb_record.id
+
+        if use_record:
+            counts['included'] += 1
+            yield hyb_record
+        else:
+            counts['excluded'] += 1
+
+
+# Pipeline : Stages
+def analyze_stage(
+        hyb_records: HybRecords,
+        analysis: RecordAnalysis,
+        ) -> Iterator['hybkit.HybRecord']:
+    """
+    Add each record to an analysis and yield it, as performed by the ``hyb_analyze`` script.
+
+    Args:
+        hyb_records (iterable): Iterable of :class:`~hybkit.HybRecord` objects.
+        analysis (:class:`~hybkit.analysis.Analysis`): Analysis (or
+            :class:`~hybkit.analysis.GroupedAnalysis`) to add records to.
+
+    Yields:
+        :class:`~hybkit.HybRecord`: Each record.
+    """
+    for hyb_record in hyb_records:
+        analysis.add_hyb_record(hyb_record)
+        yield hyb_record
+
+
+# Pipeline : Stages
+def tap(
+        hyb_records: HybRecords,
+        out_hyb_file: str,
+        out_fold_file: Optional[str] = None,
+        ) -> Iterator['hybkit.HybRecord']:
+    """
+    Write each record to output files and yield it.
+
+    Output files are opened when the first record is requested, and closed once
+    all records have been written.
+
+    Args:
+        hyb_records (iterable): Iterable of :class:`~hybkit.HybRecord` objects.
+        out_hyb_file (str): Path to output hyb-format file.
+        out_fold_file (:obj:`str`, optional): Path to output ".vienna"-format file for the
+            fold record of each hyb record.
+
+    Yields:
+        :class:`~hybkit.HybRecord`: Each record.
+    """
+    if out_fold_file is None:
+        out_fold_class = contextlib.nullcontext
+        out_fold_args = ()
+    else:
+        out_fold_class = functools.partial(
+            hybkit.RecordWriter.open, file_class=hybkit.ViennaFile
+        )
+        out_fold_args = (out_fold_file, 'w')
+
+    with hybkit.RecordWriter.open(out_hyb_file, 'w') as out_hyb, \
+         out_fold_class(*out_fold_args) as out_fold:
+        for hyb_record in hyb_records:
+            out_hyb.write_record(hyb_record)
+            if out_fold_file is not None:
+                out_fold.write_record(hyb_record.fold_record)
+            yield hyb_record
+
+
+# ----- Begin Pipeline Functions -----
+# Pipeline : Functions
+def run(hyb_records: HybRecords) -> int:
+    """
+    Iterate over all records of a pipeline, returning the number of records output.
+
+    Args:
+        hyb_records (iterable): Final stage of a pipeline.
+
+    Returns:
+        int: Number of records yielded by the final stage.
+    """
+    record_count = 0
+    for _hyb_record in hyb_records:
+        record_count += 1
+    return record_count
+
+
+# Pipeline : Functions
+def get_fold_class(in_fold_file: str) -> Type['hybkit.FoldFile']:
+    """
+    Return the fold-file class for a fold-file path, based on the file suffix.
+
+    Args:
+        in_fold_file (str): Path to a ".vienna" or ".ct"-format fold file
+            (with an optional compression suffix).
+
+    Returns:
+        type: :class:`~hybkit.ViennaFile` or :class:`~hybkit.CtFile`.
+    """
+    if any(in_fold_file.endswith(s) for s in settings.VIENNA_SUFFIXES):
+        return hybkit.ViennaFile
+    if any(in_fold_file.endswith(s) for s in settings.CT_SUFFIXES):
+        return hybkit.CtFile
+    message = 'Unrecognized fold file type: %s\n' % in_fold_file
+    message += 'Fold files should have a ".vienna" or ".ct" suffix.'
+    raise HybkitArgError(message)
@@ -0,0 +1,924 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Functions for compiling record-property filters into predicate functions.
+
+:meth:`HybRecord.prop <hybkit.HybRecord.prop>` validates and parses the requested
+property on each call. For filtering many records with the same properties, each
+property is instead parsed and validated once by :func:`compile_prop`, returning a
+predicate function that takes a :class:`~hybkit.HybRecord` and returns the same result
+(or raises the same error) as :meth:`~hybkit.HybRecord.prop`.
+:func:`compile_filter` combines multiple properties with "all" / "any" and exclusion
+logic, as used by the ``hyb_filter`` script.
+
+Properties can also be combined in boolean where-expressions with ``AND``, ``OR``,
+``NOT``, and parentheses (see :func:`parse_where`). A :class:`WhereQuery` compiles
+a where-expression after reordering its terms by estimated cost and selectivity
+(see :func:`optimize_where`), and counts the observed selectivity of each term.
+
+Example:
+    ::
+
+        record_filter = hybkit.query.compile_filter(
+            filter_params=[('any_seg_contains', 'kshv'), ('any_seg_type_is', 'rRNA')],
+            exclude_params=[('mirna_dimer', None)],
+            filter_mode='any',
+        )
+        filtered_records = [record for record in hyb_file if record_filter(record)]
+
+        where_query = hybkit.query.WhereQuery(
+            'has_mirna AND NOT (mirna_dimer OR any_seg_type_is rRNA)'
+        )
+        filtered_records = [record for record in hyb_file if where_query(record)]
+        print('\n'.join(where_query.make_report()))
+"""
+
+import abc
+import re
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Literal, Optional, Tuple
+
+import hybkit
+from hybkit.errors import HybkitArgError, HybkitMiscError
+
+# ----- Linting Directives:
+# ruff: noqa: SLF001
+
+# ----- Begin Typing Variables ----- #
+Predicate = Callable[['hybkit.HybRecord'], bool]
+FilterParams = Iterable[Tuple[str, Optional[str]]]
+
+#: Allowed modes for combining filter properties in :func:`compile_filter`.
+FILTER_MODES = ('all', 'any')
+
+# Upper-case miRNA_seg flag values for each miRNA property, and whether the property
+#   is true when the flag is in (``True``) or not in (``False``) the values.
+_MIRNA_PROP_FLAGS = {
+    'has_mirna': (frozenset({'5P', '3P', 'B'}), True),
+    'no_mirna': (frozenset({'5P', '3P', 'B'}), False),
+    'mirna_dimer': (frozenset({'B'}), True),
+    'mirna_not_dimer': (frozenset({'5P', '3P'}), True),
+    '5p_mirna': (frozenset({'5P', 'B'}), True),
+    '3p_mirna': (frozenset({'3P', 'B'}), True),
+}
+
+
+# ----- Begin Compile Functions -----
+# Query : Compile Functions
+def compile_prop(prop: str, prop_compare: Optional[str] = None) -> Predicate:
+    """
+    Return a predicate function equivalent to :meth:`HybRecord.prop <hybkit.HybRecord.prop>`.
+
+    The property is validated when compiled rather than when checked, so an
+    invalid property or missing comparison string raises an error immediately.
+
+    Args:
+        prop (str): Property to check, from :attr:`HybRecord.HAS_PROPS
+            <hybkit.HybRecord.HAS_PROPS>`.
+        prop_compare (:obj:`str`, optional): Comparator to check.
+
+    Returns:
+        function: Function of a :class:`~hybkit.HybRecord` returning ``True``
+        if the record has the property.
+    """
+    record_class = hybkit.HybRecord
+    if prop not in record_class._HAS_PROPS_SET:
+        message = 'Requested Property: %s is not defined. ' % prop
+        message += 'Available properties are:\n' + ', '.join(record_class.HAS_PROPS)
+        raise HybkitMiscError(message)
+
+    if prop in record_class._GEN_PROPS_SET:
+        return _compile_gen_prop(prop)
+    elif prop in record_class._ALL_STR_PROPS_SET:
+        if not prop_compare:
+            message = 'Property: %s  requires a comparison string. ' % prop
+            message += 'Please provide an argument to prop_compare.'
+            raise HybkitMiscError(message)
+        return _compile_str_prop(prop, prop_compare)
+    else:
+        return _compile_mirna_prop(prop)
+
+
+# Query : Compile Functions
+def compile_filter(
+        filter_params: FilterParams = (),
+        exclude_params: FilterParams = (),
+        filter_mode: Literal['all', 'any'] = 'all',
+        where: Optional[Predicate] = None,
+        ) -> Predicate:
+    """
+    Return a predicate function combining multiple record properties.
+
+    A record passes the filter if it has "all" or "any" of the filter properties
+    (as selected by ``filter_mode``), and has none of the exclusion properties.
+    With no filter properties, all records pass in "all" mode and no records
+    pass in "any" mode. Properties are checked in the order provided, and checking
+    stops as soon as the result is determined.
+
+    If a ``where`` predicate (such as a :class:`WhereQuery`) is provided, records must
+    also pass it, checked after the filter properties. With a ``where`` predicate and
+    no filter properties, only the ``where`` predicate and exclusion properties are used.
+
+    Args:
+        filter_params (:obj:`list`, optional): List of (``prop``, ``prop_compare``) tuples
+            of properties for inclusion (``prop_compare`` may be ``None``).
+        exclude_params (:obj:`list`, optional): List of (``prop``, ``prop_compare``) tuples
+            of properties for exclusion.
+        filter_mode (:obj:`str`, optional): Mode for combining filter properties,
+            from :data:`FILTER_MODES`.
+        where (:obj:`function`, optional): Additional predicate function records must pass.
+
+    Returns:
+        function: Function of a :class:`~hybkit.HybRecord` returning ``True``
+        if the record passes the filter.
+    """
+    if filter_mode not in FILTER_MODES:
+        message = 'Unrecognized filtering mode: %s\n' % filter_mode
+        message += 'Options are: %s' % ', '.join(FILTER_MODES)
+        raise HybkitArgError(message)
+
+    filter_preds = [compile_prop(*params) for params in filter_params]
+    exclude_preds = [compile_prop(*params) for params in exclude_params]
+    if where is not None and not filter_preds:
+        include_pred = where
+    elif filter_mode == 'all':
+        include_pred = _combine_all([*filter_preds, *([where] if where is not None else [])])
+    else:
+        include_pred = _combine_any(filter_preds)
+        if where is not None:
+            include_pred = _combine_all([include_pred, where])
+    if not exclude_preds:
+        return include_pred
+    exclude_pred = _combine_any(exclude_preds)
+
+    def filter_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+        return include_pred(hyb_record) and not exclude_pred(hyb_record)
+    return filter_pred
+
+
+# ----- Begin Private Functions -----
+# Query : Private Functions : Combine Predicates
+def _combine_all(preds: list) -> Predicate:
+    if not preds:
+        return lambda hyb_record: True
+    elif len(preds) == 1:
+        return preds[0]
+    elif len(preds) == 2:  # noqa: PLR2004
+        pred_1, pred_2 = preds
+        return lambda hyb_record: pred_1(hyb_record) and pred_2(hyb_record)
+    preds = tuple(preds)
+
+    def all_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+        for pred in preds:
+            if not pred(hyb_record):
+                return False
+        return True
+    return all_pred
+
+
+# Query : Private Functions : Combine Predicates
+def _combine_any(preds: list) -> Predicate:
+    if not preds:
+        return lambda hyb_record: False
+    elif len(preds) == 1:
+        return preds[0]
+    elif len(preds) == 2:  # noqa: PLR2004
+        pred_1, pred_2 = preds
+        return lambda hyb_record: bool(pred_1(hyb_record) or pred_2(hyb_record))
+    preds = tuple(preds)
+
+    def any_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+        for pred in preds:
+            if pred(hyb_record):
+                return True
+        return False
+    return any_pred
+
+
+# Query : Private Functions : Compile Properties
+def _compile_gen_prop(prop: str) -> Predicate:
+    # Only "has_indels" is defined.
+    def has_indels_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+        if not hyb_record.is_set('full_seg_props'):
+            message = 'Checking for indels requires full_seg_props to be set.'
+            raise HybkitMiscError(message)
+        for seg_props in (hyb_record.seg1_props, hyb_record.seg2_props):
+            read_len = seg_props['read_end'] - seg_props['read_start']
+            ref_len = seg_props['ref_end'] - seg_props['ref_start']
+            if read_len != ref_len:
+                return True
+        return False
+    return has_indels_pred
+
+
+# Query : Private Functions : Compile Properties
+def _compile_mirna_prop(prop: str) -> Predicate:
+    flag_values, in_values = _MIRNA_PROP_FLAGS[prop]
+
+    def mirna_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+        mirna_flag = hyb_record._get_flag('miRNA_seg')
+        if mirna_flag is None:
+            hyb_record._ensure_set('eval_mirna')
+        return (mirna_flag.upper() in flag_values) == in_values
+    return mirna_pred
+
+
+# Query : Private Functions : Compile Properties
+def _compile_str_prop(prop: str, prop_compare: str) -> Predicate:
+    check_attr, check_type = prop.rsplit('_', 1)
+    get_values = _compile_get_values(check_attr)
+
+    if check_type == 'is':
+        def str_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+            return prop_compare in get_values(hyb_record)
+    elif check_type == 'prefix':
+        def str_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+            return any(val.startswith(prop_compare) for val in get_values(hyb_record))
+    elif check_type == 'suffix':
+        def str_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+            return any(val.endswith(prop_compare) for val in get_values(hyb_record))
+    elif check_type == 'contains':
+        def str_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+            return any(prop_compare in val for val in get_values(hyb_record))
+    return str_pred
+
+
+# Query : Private Functions : Compile Properties
+def _compile_get_values(check_attr: str) -> Callable[['hybkit.HybRecord'], tuple]:
+    # Return a function returning the tuple of field values of a record to compare,
+    #   raising an error for missing values as in HybRecord.prop().
+    def check_values(hyb_record: 'hybkit.HybRecord', values: tuple) -> tuple:
+        for value in values:
+            if value is None:
+                message = 'HybRecord Instance: %s does not have a ' % (str(hyb_record))
+                message += 'value for requested property: %s' % check_attr
+                raise HybkitMiscError(message)
+        return values
+
+    def ensure_types(hyb_record: 'hybkit.HybRecord') -> tuple:
+        seg_types = (hyb_record.get_seg1_type(), hyb_record.get_seg2_type())
+        if seg_types[0] is None or seg_types[1] is None:
+            hyb_record._ensure_set('eval_types')
+        return seg_types
+
+    if check_attr in {'id', 'seq'}:
+        def get_values(hyb_record: 'hybkit.HybRecord') -> tuple:
+            return check_values(hyb_record, (getattr(hyb_record, check_attr),))
+    elif check_attr == 'seg1':
+        def get_values(hyb_record: 'hybkit.HybRecord') -> tuple:
+            return check_values(hyb_record, (hyb_record.seg1_props['ref_name'],))
+    elif check_attr == 'seg2':
+        def get_values(hyb_record: 'hybkit.HybRecord') -> tuple:
+            return check_values(hyb_record, (hyb_record.seg2_props['ref_name'],))
+    elif check_attr == 'any_seg':
+        def get_values(hyb_record: 'hybkit.HybRecord') -> tuple:
+            return check_values(hyb_record, (
+                hyb_record.seg1_props['ref_name'], hyb_record.seg2_props['ref_name']
+            ))
+    elif check_attr == 'seg1_type':
+        def get_values(hyb_record: 'hybkit.HybRecord') -> tuple:
+            return (ensure_types(hyb_record)[0],)
+    elif check_attr == 'seg2_type':
+        def get_values(hyb_record: 'hybkit.HybRecord') -> tuple:
+            return (ensure_types(hyb_record)[1],)
+    elif check_attr == 'any_seg_type':
+        get_values = ensure_types
+    else:
+        # miRNA string properties: mirna, target, mirna_seg_type, target_seg_type
+        detail = check_attr if check_attr.endswith('_seg_type') else check_attr + '_ref'
+
+        def get_values(hyb_record: 'hybkit.HybRecord') -> tuple:
+            return check_values(hyb_record, (
+                hyb_record.mirna_details(detail, allow_mirna_dimers=True),
+            ))
+    return get_values
+
+
+# ----- Begin Where Expression Functions -----
+# Query : Where Expression Functions
+def parse_where(expression: str) -> 'WhereExpr':
+    """
+    Parse a where-expression into a tree of expression objects.
+
+    Where-expressions combine :meth:`HybRecord.prop <hybkit.HybRecord.prop>`
+    properties with the ``AND``, ``OR``, and ``NOT`` operators (case-insensitive)
+    and parentheses. ``NOT`` has the highest precedence, followed by ``AND``, then ``OR``.
+    String-comparison properties are followed by their comparison string,
+    which may be quoted with ``'`` or ``"`` (Ex: ``id_contains "A B"``).
+
+    Example:
+        ::
+
+            has_mirna AND NOT (mirna_dimer OR any_seg_contains kshv)
+
+    Args:
+        expression (str): Where-expression to parse.
+
+    Returns:
+        :class:`WhereExpr`: Root expression object (:class:`PropTerm`,
+        :class:`AndExpr`, :class:`OrExpr`, or :class:`NotExpr`).
+    """
+    tokens = _tokenize_where(expression)
+    parser = _WhereParser(expression, tokens)
+    return parser.parse()
+
+
+# Query : Where Expression Functions
+def optimize_where(expr: 'WhereExpr') -> 'WhereExpr':
+    """
+    Return a where-expression with terms reordered for faster evaluation.
+
+    Nested ``AND`` / ``OR`` expressions are flattened, and the operands of each
+    ``AND`` / ``OR`` expression are ordered by estimated cost and selectivity
+    (see :meth:`PropTerm.estimate`) so that the result is more often determined
+    by cheap operands. The result of the expression for each record is unchanged.
+
+    Properties requiring segment types, miRNA evaluation, or full segment properties
+    raise an error for records without them, which reordering could hide when other
+    operands determine the result. These requirements (see :meth:`PropTerm.requires`)
+    are instead checked for each record before the expression is evaluated, with a
+    :class:`CheckedExpr`, so an optimized expression raises an error for any record
+    missing a requirement of any of its terms.
+    miRNA string-comparison properties (in
+    :attr:`HybRecord.MIRNA_STR_PROPS <hybkit.HybRecord.MIRNA_STR_PROPS>`) also raise an
+    error for records without a miRNA, so are commonly preceded by a guard such as
+    ``has_mirna``. Operands containing these properties (see :meth:`PropTerm.may_raise`)
+    are kept after all operands preceding them, and so are checked only for records
+    passing the same guards (but may be checked for fewer records).
+
+    Args:
+        expr (:class:`WhereExpr`): Expression to optimize.
+
+    Returns:
+        :class:`WhereExpr`: Optimized expression, sharing :class:`PropTerm` objects
+        with the original expression.
+    """
+    required = frozenset().union(*(term.requires() for term in expr.iter_terms()))
+    optimized = _reorder_where(expr)
+    if not required:
+        return optimized
+    return CheckedExpr(optimized, required)
+
+
+# ----- Begin Where Expression Classes -----
+class WhereExpr(abc.ABC):
+    """Base class for where-expression objects, as returned by :func:`parse_where`."""
+
+    # WhereExpr : Public Methods
+    def iter_terms(self) -> Iterator['PropTerm']:
+        """Iterate over the :class:`PropTerm` objects of the expression, in order."""
+        for child in self.children:
+            yield from child.iter_terms()
+
+    # WhereExpr : Public Methods
+    def may_raise(self) -> bool:
+        """Return ``True`` if checking any term of the expression may raise an error."""
+        return any(term.may_raise() for term in self.iter_terms())
+
+    # WhereExpr : Public Methods
+    @abc.abstractmethod
+    def estimate(self) -> Tuple[float, float]:
+        """Return a tuple of the estimated (cost, probability of being true) of the expression."""
+
+    # WhereExpr : Public Methods
+    @abc.abstractmethod
+    def compile(self, count: bool = False) -> Predicate:
+        """
+        Return a predicate function evaluating the expression.
+
+        Args:
+            count (:obj:`bool`, optional): Count checks and true results of each
+                :class:`PropTerm` (see :attr:`PropTerm.check_count`).
+        """
+
+
+class PropTerm(WhereExpr):
+    """
+    Where-expression term checking a single :meth:`HybRecord.prop <hybkit.HybRecord.prop>`.
+
+    Args:
+        prop (str): Property to check.
+        prop_compare (:obj:`str`, optional): Comparator to check.
+
+    Attributes:
+        prop (str): Property to check.
+        prop_compare (str): Comparator to check, or ``None``.
+        check_count (int): Number of records checked by a counting compiled predicate.
+        true_count (int): Number of checked records having the property.
+    """
+
+    #: Relative cost of retrieving each field of string-comparison properties.
+    FIELD_COSTS = {
+        'id': 1.0, 'seq': 1.0, 'seg1': 1.0, 'seg2': 1.0, 'any_seg': 1.2,
+        'seg1_type': 1.5, 'seg2_type': 1.5, 'any_seg_type': 1.5,
+        'mirna': 10.0, 'target': 10.0, 'mirna_seg_type': 10.0, 'target_seg_type': 10.0,
+    }
+
+    #: Relative additional cost of each string-comparison type.
+    COMPARE_COSTS = {'is': 0.0, 'prefix': 1.0, 'suffix': 1.0, 'contains': 1.2}
+
+    #: Estimated probability of a single field value matching for each string-comparison type.
+    COMPARE_PROBS = {'is': 0.1, 'prefix': 0.2, 'suffix': 0.2, 'contains': 0.3}
+
+    #: Estimated (cost, probability) for other properties.
+    PROP_ESTIMATES = {
+        'has_indels': (6.0, 0.1),
+        'has_mirna': (1.0, 0.7),
+        'no_mirna': (1.0, 0.3),
+        'mirna_dimer': (1.0, 0.05),
+        'mirna_not_dimer': (1.0, 0.65),
+        '5p_mirna': (1.0, 0.5),
+        '3p_mirna': (1.0, 0.25),
+    }
+
+    def __init__(self, prop: str, prop_compare: Optional[str] = None) -> None:
+        """Describe in class docstring."""
+        # Validate property and comparator.
+        compile_prop(prop, prop_compare)
+        self.prop = prop
+        self.prop_compare = prop_compare
+        self.check_count = 0
+        self.true_count = 0
+
+    # PropTerm : Public Methods
+    def iter_terms(self) -> Iterator['PropTerm']:
+        """Iterate over the term itself."""
+        yield self
+
+    # PropTerm : Public Methods
+    def may_raise(self) -> bool:
+        """
+        Return ``True`` if checking the term may raise an error for records with its requirements.
+
+        This is the case for miRNA string-comparison properties, which raise an error
+        for records without a miRNA.
+        """
+        return self.prop in hybkit.HybRecord._MIRNA_STR_PROPS_SET
+
+    # PropTerm : Public Methods
+    def requires(self) -> FrozenSet[str]:
+        """
+        Return the set of record properties required to check the term.
+
+        Properties are as for :meth:`HybRecord.is_set <hybkit.HybRecord.is_set>`:
+        ``eval_types``, ``eval_mirna``, and ``full_seg_props``.
+        """
+        if self.prop in hybkit.HybRecord._GEN_PROPS_SET:
+            return frozenset({'full_seg_props'})
+        elif self.prop in _MIRNA_PROP_FLAGS:
+            return frozenset({'eval_mirna'})
+        check_attr = self.prop.rsplit('_', 1)[0]
+        required = set()
+        if self.prop in hybkit.HybRecord._MIRNA_STR_PROPS_SET:
+            required.add('eval_mirna')
+        if check_attr.endswith('_type'):
+            required.add('eval_types')
+        return frozenset(required)
+
+    # PropTerm : Public Methods
+    def estimate(self) -> Tuple[float, float]:
+        """Return a tuple of the estimated (cost, probability of being true) of the term."""
+        if self.prop in self.PROP_ESTIMATES:
+            return self.PROP_ESTIMATES[self.prop]
+        check_attr, check_type = self.prop.rsplit('_', 1)
+        cost = self.FIELD_COSTS[check_attr] + self.COMPARE_COSTS[check_type]
+        prob = self.COMPARE_PROBS[check_type]
+        if check_attr.startswith('any_'):
+            prob = 1 - (1 - prob) ** 2
+        return cost, prob
+
+    # PropTerm : Public Methods
+    def compile(self, count: bool = False) -> Predicate:
+        """
+        Return a predicate function checking the property.
+
+        Args:
+            count (:obj:`bool`, optional): Count checks and true results in
+                :attr:`check_count` and :attr:`true_count`.
+        """
+        pred = compile_prop(self.prop, self.prop_compare)
+        if not count:
+            return pred
+
+        def count_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+            self.check_count += 1
+            if pred(hyb_record):
+                self.true_count += 1
+                return True
+            return False
+        return count_pred
+
+    # PropTerm : Magic Methods
+    def __str__(self) -> str:
+        """Return the term as a where-expression string."""
+        if self.prop_compare is None:
+            return self.prop
+        return self.prop + ' ' + _quote_where_value(self.prop_compare)
+
+
+class AndExpr(WhereExpr):
+    """
+    Where-expression true if all operand expressions are true.
+
+    Args:
+        children (list): Operand expressions, evaluated in order.
+    """
+
+    def __init__(self, children: List[WhereExpr]) -> None:
+        """Describe in class docstring."""
+        self.children = list(children)
+
+    # AndExpr : Public Methods
+    def estimate(self) -> Tuple[float, float]:
+        """Return a tuple of the estimated (cost, probability of being true) of the expression."""
+        cost, prob = 0.0, 1.0
+        for child in self.children:
+            child_cost, child_prob = child.estimate()
+            cost += prob * child_cost
+            prob *= child_prob
+        return cost, prob
+
+    # AndExpr : Public Methods
+    def compile(self, count: bool = False) -> Predicate:
+        """Return a predicate function evaluating the expression, stopping at a false operand."""
+        return _combine_all([child.compile(count) for child in self.children])
+
+    # AndExpr : Private Methods
+    def _sort_key(self, child: WhereExpr) -> float:
+        # Operands most likely to be false per cost are checked first.
+        child_cost, child_prob = child.estimate()
+        return child_cost / max(1 - child_prob, 1e-6)
+
+    # AndExpr : Magic Methods
+    def __str__(self) -> str:
+        """Return the expression as a where-expression string."""
+        return ' AND '.join(_str_operand(child, self) for child in self.children)
+
+
+class OrExpr(WhereExpr):
+    """
+    Where-expression true if any operand expression is true.
+
+    Args:
+        children (list): Operand expressions, evaluated in order.
+    """
+
+    def __init__(self, children: List[WhereExpr]) -> None:
+        """Describe in class docstring."""
+        self.children = list(children)
+
+    # OrExpr : Public Methods
+    def estimate(self) -> Tuple[float, float]:
+        """Return a tuple of the estimated (cost, probability of being true) of the expression."""
+        cost, false_prob = 0.0, 1.0
+        for child in self.children:
+            child_cost, child_prob = child.estimate()
+            cost += false_prob * child_cost
+            false_prob *= (1 - child_prob)
+        return cost, 1 - false_prob
+
+    # OrExpr : Public Methods
+    def compile(self, count: bool = False) -> Predicate:
+        """Return a predicate function evaluating the expression, stopping at a true operand."""
+        return _combine_any([child.compile(count) for child in self.children])
+
+    # OrExpr : Private Methods
+    def _sort_key(self, child: WhereExpr) -> float:
+        # Operands most likely to be true per cost are checked first.
+        child_cost, child_prob = child.estimate()
+        return child_cost / max(child_prob, 1e-6)
+
+    # OrExpr : Magic Methods
+    def __str__(self) -> str:
+        """Return the expression as a where-expression string."""
+        return ' OR '.join(_str_operand(child, self) for child in self.children)
+
+
+class NotExpr(WhereExpr):
+    """
+    Where-expression true if the operand expression is false.
+
+    Args:
+        child (:class:`WhereExpr`): Operand expression.
+    """
+
+    def __init__(self, child: WhereExpr) -> None:
+        """Describe in class docstring."""
+        self.child = child
+        self.children = [child]
+
+    # NotExpr : Public Methods
+    def estimate(self) -> Tuple[float, float]:
+        """Return a tuple of the estimated (cost, probability of being true) of the expression."""
+        child_cost, child_prob = self.child.estimate()
+        return child_cost, 1 - child_prob
+
+    # NotExpr : Public Methods
+    def compile(self, count: bool = False) -> Predicate:
+        """Return a predicate function evaluating the expression."""
+        child_pred = self.child.compile(count)
+        return lambda hyb_record: not child_pred(hyb_record)
+
+    # NotExpr : Magic Methods
+    def __str__(self) -> str:
+        """Return the expression as a where-expression string."""
+        return 'NOT ' + _str_operand(self.child, self)
+
+
+class CheckedExpr(WhereExpr):
+    """
+    Where-expression checking record requirements before evaluating an operand expression.
+
+    As returned by :func:`optimize_where`. Errors are raised as by
+    :meth:`HybRecord.prop <hybkit.HybRecord.prop>` for records missing any requirement.
+
+    Args:
+        child (:class:`WhereExpr`): Operand expression.
+        required (set): Record properties (see :meth:`PropTerm.requires`) to check.
+    """
+
+    #: Order of checks of record properties, as evaluation of miRNAs requires segment types.
+    REQUIRE_ORDER = ('eval_types', 'eval_mirna', 'full_seg_props')
+
+    def __init__(self, child: WhereExpr, required: Iterable[str]) -> None:
+        """Describe in class docstring."""
+        self.child = child
+        self.children = [child]
+        required = set(required)
+        self.required = tuple(prop for prop in self.REQUIRE_ORDER if prop in required)
+
+    # CheckedExpr : Public Methods
+    def estimate(self) -> Tuple[float, float]:
+        """Return a tuple of the estimated (cost, probability of being true) of the expression."""
+        return self.child.estimate()
+
+    # CheckedExpr : Public Methods
+    def compile(self, count: bool = False) -> Predicate:
+        """Return a predicate function checking requirements, then evaluating the expression."""
+        child_pred = self.child.compile(count)
+        required = self.required
+
+        def checked_pred(hyb_record: 'hybkit.HybRecord') -> bool:
+            for prop in required:
+                if not hyb_record.is_set(prop):
+                    if prop == 'full_seg_props':
+                        message = 'Checking for indels requires full_seg_props to be set.'
+                        raise HybkitMiscError(message)
+                    hyb_record._ensure_set(prop)
+            return child_pred(hyb_record)
+        return checked_pred
+
+    # CheckedExpr : Magic Methods
+    def __str__(self) -> str:
+        """Return the operand expression as a where-expression string."""
+        return str(self.child)
+
+
+# ----- Begin Where Query Class -----
+class WhereQuery:
+    """
+    Compiled where-expression filter with counts of checks of each property.
+
+    Calling the object with a :class:`~hybkit.HybRecord` returns ``True`` if the
+    record matches the expression. The number of records checked and matched
+    by each property is counted, and reported by :meth:`make_report`.
+
+    Args:
+        expression (str): Where-expression (see :func:`parse_where`).
+        optimize (:obj:`bool`, optional): Reorder terms of the expression
+            with :func:`optimize_where` (default: ``True``). Optimized expressions raise
+            an error for records missing an evaluation required by any term.
+
+    Attributes:
+        expression (str): Where-expression.
+        optimize (bool): Whether terms of the expression are reordered.
+        parsed (:class:`WhereExpr`): Expression as parsed.
+        expr (:class:`WhereExpr`): Expression as evaluated.
+        terms (list): :class:`PropTerm` objects of the expression, in parsed order.
+    """
+
+    def __init__(self, expression: str, optimize: bool = True) -> None:
+        """Describe in class docstring."""
+        self.expression = expression
+        self.optimize = optimize
+        self.parsed = parse_where(expression)
+        self.expr = optimize_where(self.parsed) if optimize else self.parsed
+        self.terms = list(self.parsed.iter_terms())
+        self._pred = self.expr.compile(count=True)
+
+    # WhereQuery : Public Methods
+    def get_counts(self) -> List[Tuple[int, int]]:
+        """Return a list of (check_count, true_count) tuples for each term, in parsed order."""
+        return [(term.check_count, term.true_count) for term in self.terms]
+
+    # WhereQuery : Public Methods
+    def add_counts(self, counts: List[Tuple[int, int]]) -> None:
+        """
+        Add counts from another query with the same expression, as from :meth:`get_counts`.
+
+        Args:
+            counts (list): List of (check_count, true_count) tuples for each term.
+        """
+        for term, (check_count, true_count) in zip(self.terms, counts):
+            term.check_count += check_count
+            term.true_count += true_count
+
+    # WhereQuery : Public Methods
+    def make_report(self) -> List[str]:
+        """Return a list of report lines of the observed selectivity of each term."""
+        report = ['Where Expression:     ' + str(self.parsed)]
+        report.append('Evaluated Expression: ' + str(self.expr))
+        term_width = max(len(str(term)) for term in self.terms)
+        for term in self.terms:
+            if term.check_count:
+                selectivity = '%.4f' % (term.true_count / term.check_count)
+            else:
+                selectivity = 'N/A'
+            report.append('    %s  Checked: %i  True: %i  Selectivity: %s' % (
+                str(term).ljust(term_width), term.check_count, term.true_count, selectivity
+            ))
+        return report
+
+    # WhereQuery : Magic Methods
+    def __call__(self, hyb_record: 'hybkit.HybRecord') -> bool:
+        """Return ``True`` if the record matches the expression."""
+        return self._pred(hyb_record)
+
+
+# ----- Begin Where Expression Private Functions -----
+_WHERE_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<paren>[()])
+        | "(?P<dquote>(?:[^"\\]|\\.)*)"
+        | '(?P<squote>(?:[^'\\]|\\.)*)'
+        | (?P<word>[^\s()"']+)
+    )
+""", re.VERBOSE)
+_WHERE_OPERATORS = frozenset({'AND', 'OR', 'NOT'})
+
+
+# Query : Private Functions : Where Expressions
+def _reorder_where(expr: 'WhereExpr') -> 'WhereExpr':
+    if isinstance(expr, PropTerm):
+        return expr
+    elif isinstance(expr, CheckedExpr):
+        return _reorder_where(expr.child)
+    elif isinstance(expr, NotExpr):
+        return NotExpr(_reorder_where(expr.child))
+
+    children = []
+    for child in expr.children:
+        child = _reorder_where(child)
+        # Flatten nested expressions of the same type.
+        if type(child) is type(expr):
+            children.extend(child.children)
+        else:
+            children.append(child)
+
+    # Order operands by sort key, where operands that may raise errors are only
+    #   placed after all operands preceding them (such as guards).
+    keys = [expr._sort_key(child) for child in children]
+    placed = [False] * len(children)
+    ordered_children = []
+    while len(ordered_children) < len(children):
+        best_i = None
+        preceding_placed = True
+        for i, child in enumerate(children):
+            if placed[i]:
+                continue
+            if ((preceding_placed or not child.may_raise())
+                    and (best_i is None or keys[i] < keys[best_i])):
+                best_i = i
+            preceding_placed = False
+        placed[best_i] = True
+        ordered_children.append(children[best_i])
+    return type(expr)(ordered_children)
+
+
+# Query : Private Functions : Where Expressions
+def _tokenize_where(expression: str) -> List[Tuple[str, str, int]]:
+    # Return a list of (token_type, value, position) tuples, where token_type
+    #   is one of: "(", ")", "op", "word", "quoted"
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _WHERE_TOKEN_RE.match(expression, pos)
+        if match is None:
+            message = 'Invalid where-expression: %s\n' % expression
+            message += 'Unable to parse at position %i: %s' % (pos, expression[pos:])
+            raise HybkitArgError(message)
+        if match.group('paren'):
+            tokens.append((match.group('paren'), match.group('paren'), match.start('paren')))
+        elif match.group('word') is not None:
+            word = match.group('word')
+            token_type = 'op' if word.upper() in _WHERE_OPERATORS else 'word'
+            tokens.append((token_type, word, match.start('word')))
+        else:
+            quote_group = 'dquote' if match.group('dquote') is not None else 'squote'
+            value = re.sub(r'\\(.)', r'\1', match.group(quote_group))
+            tokens.append(('quoted', value, match.start(quote_group) - 1))
+        pos = match.end()
+    return tokens
+
+
+# Query : Private Functions : Where Expressions
+def _quote_where_value(value: str) -> str:
+    if re.fullmatch(r"""[^\s()"']+""", value) and value.upper() not in _WHERE_OPERATORS:
+        return value
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+# Query : Private Functions : Where Expressions
+def _str_operand(child: WhereExpr, parent: WhereExpr) -> str:
+    # Parenthesize operands of lower precedence than the parent expression.
+    if isinstance(child, (PropTerm, NotExpr)) or isinstance(parent, OrExpr) \
+            and isinstance(child, AndExpr):
+        return str(child)
+    return '(' + str(child) + ')'
+
+
+class _WhereParser:
+    # Recursive-descent parser of where-expression tokens.
+    def __init__(self, expression: str, tokens: List[Tuple[str, str, int]]) -> None:
+        self.expression = expression
+        self.tokens = tokens
+        self.index = 0
+
+    def parse(self) -> WhereExpr:
+        if not self.tokens:
+            self._error('Expression is empty.')
+        expr = self._parse_or()
+        if self.index < len(self.tokens):
+            self._error('Unexpected token: "%s"' % self.tokens[self.index][1])
+        return expr
+
+    def _peek(self) -> Optional[Tuple[str, str, int]]:
+        if self.index < len(self.tokens):
+            return self.tokens[self.index]
+        return None
+
+    def _peek_op(self, operator: str) -> bool:
+        token = self._peek()
+        return token is not None and token[0] == 'op' and token[1].upper() == operator
+
+    def _parse_or(self) -> WhereExpr:
+        children = [self._parse_and()]
+        while self._peek_op('OR'):
+            self.index += 1
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else OrExpr(children)
+
+    def _parse_and(self) -> WhereExpr:
+        children = [self._parse_not()]
+        while self._peek_op('AND'):
+            self.index += 1
+            children.append(self._parse_not())
+        return children[0] if len(children) == 1 else AndExpr(children)
+
+    def _parse_not(self) -> WhereExpr:
+        if self._peek_op('NOT'):
+            self.index += 1
+            return NotExpr(self._parse_not())
+        return self._parse_atom()
+
+    def _parse_atom(self) -> WhereExpr:
+        token = self._peek()
+        if token is None:
+            self._error('Unexpected end of expression.')
+        token_type, value, _pos = token
+        if token_type == '(':
+            self.index += 1
+            expr = self._parse_or()
+            if self._peek() is None or self._peek()[0] != ')':
+                self._error('Missing closing parenthesis.')
+            self.index += 1
+            return expr
+        elif token_type != 'word':
+            self._error('Expected a property, found: "%s"' % value)
+
+        self.index += 1
+        prop = value
+        if prop not in hybkit.HybRecord._HAS_PROPS_SET:
+            self._error(
+                'Requested Property: %s is not defined. ' % prop
+                + 'Available properties are:\n' + ', '.join(hybkit.HybRecord.HAS_PROPS)
+            )
+        prop_compare = None
+        if prop in hybkit.HybRecord._ALL_STR_PROPS_SET:
+            compare_token = self._peek()
+            if compare_token is None or compare_token[0] not in {'word', 'quoted'}:
+                self._error('Property: %s requires a comparison string.' % prop)
+            self.index += 1
+            prop_compare = compare_token[1]
+        return PropTerm(prop, prop_compare)
+
+    def _error(self, detail: str) -> None:
+        message = 'Invalid where-expression: %s\n' % self.expression
+        token = self._peek()
+        if token is not None:
+            message += 'At position %i: ' % token[2]
+        message += detail
+        raise HybkitArgError(message)
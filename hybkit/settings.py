@@ -23,16 +23,42 @@ def _settings_info_to_settings(settings_info_dict: Dict) -> dict:
     return ret_dict
 
 
+# Util : Settings Helper Functions
+def _add_compression_suffixes(suffixes: List[str]) -> List[str]:
+    ret_list = list(suffixes)
+    for compression_suffix in COMPRESSION_SUFFIXES:
+        for compression_case in _all_str_cases(compression_suffix):
+            ret_list += [suffix + compression_case for suffix in suffixes]
+    return ret_list
+
+
 # ----- Begin Settings Constants -----
 # Util : Global Variables
-#: Allowed suffixes for "Hyb" files.
-HYB_SUFFIXES = _all_str_cases('.hyb')
+#: Suffixes of compressed files, with the compression format used for reading and writing
+#: by :func:`hybkit.compression.open_file`. Suffixes are matched case-insensitively.
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.bgz': 'bgzf', '.zst': 'zstd'}
+
+#: Default compression level of written files for each compression format.
+COMPRESSION_LEVELS = {'gzip': 6, 'bgzf': 6, 'zstd': 3}
+
+#: Default number of threads compressing written files
+#: (if None, the number of CPUs is used, up to a maximum of 4).
+COMPRESSION_THREADS = None
+
+#: Number of uncompressed bytes in each block compressed or decompressed by a thread.
+COMPRESSION_BLOCK_SIZE = 1048576
 
-#: Allowed suffixes for "Vienna" files.
-VIENNA_SUFFIXES = _all_str_cases('.vienna')
+#: Maximum number of decompressed blocks queued ahead of reading.
+COMPRESSION_QUEUE_SIZE = 8
 
-#: Allowed suffixes for "Connection-Table" files.
-CT_SUFFIXES = _all_str_cases('.ct')
+#: Allowed suffixes for "Hyb" files (including compressed variants).
+HYB_SUFFIXES = _add_compression_suffixes(_all_str_cases('.hyb'))
+
+#: Allowed suffixes for "Vienna" files (including compressed variants).
+VIENNA_SUFFIXES = _add_compression_suffixes(_all_str_cases('.vienna'))
+
+#: Allowed suffixes for "Connection-Table" files (including compressed variants).
+CT_SUFFIXES = _add_compression_suffixes(_all_str_cases('.ct'))
 
 #: Allowed suffixes for "Vienna" and "Connection-Table" files.
 FOLD_SUFFIXES = VIENNA_SUFFIXES + CT_SUFFIXES
@@ -56,6 +82,12 @@ MIN_RECORD_FIELDS = 15
 #: Maximum number of fields in hyb line:
 MAX_RECORD_FIELDS = 16
 
+#: Suffix added to hyb file names for sidecar index files created by :mod:`hybkit.index`.
+INDEX_SUFFIX = '.hki'
+
+#: Default number of characters buffered by :class:`hybkit.RecordWriter` before writing.
+WRITE_BUFFER_SIZE = 1048576
+
 # #: Default minimum Gibbs Free Energy for bins in :class:`EnergyAnalysis`
 # #: (range: ENERGY_MIN_BIN <= 0).
 # ENERGY_MIN_BIN = '-45.0'
@@ -173,6 +205,20 @@ HybFile_settings_info = {
         None,
         {'nargs': '?', 'const': True}
     ],
+    'write_source_lines': [
+        False,
+        """
+        Write hyb records that have not been modified since being read from a
+        hyb file as their original line, rather than re-formatting each record.
+        Unmodified records are then written exactly as read, so output can differ
+        from re-formatted records, such as in flag order (the reorder_flags setting
+        is not applied) and trailing flag separators.
+        When set to False, each record is written as returned by its to_line() method.
+        """,
+        'custom_bool_from_str',
+        None,
+        {'nargs': '?', 'const': True}
+    ],
 }
 
 # Start settings_info : FoldRecord
@@ -322,6 +368,57 @@ Analysis_settings_info = {
         None,
         {}
     ],
+    'store_energy_vals': [
+        False,
+        """
+        Store all energy values during energy analysis to calculate the exact
+        mean and standard deviation. If False, these are calculated as running values
+        using constant memory.
+        """,
+        'custom_bool_from_str',
+        None,
+        {'nargs': '?', 'const': True}
+    ],
+    'memory_mode': [
+        'exact',
+        """
+        Method for storing analysis values. Options:
+        "exact": Store exact counts of all values;
+        "sketch": Use fixed-size approximate summaries for target names and energy
+        quantiles, with error bounds included in the results.
+        """,
+        'str',
+        None,
+        {'choices': ['exact', 'sketch']}
+    ],
+    'sketch_capacity': [
+        1000,
+        """
+        Number of most-common target names tracked by the "sketch" memory mode.
+        """,
+        'int',
+        None,
+        {}
+    ],
+    'sketch_hll_precision': [
+        14,
+        """
+        Precision (4 - 18) of the distinct target name count for the "sketch" memory mode,
+        using 2 ^ precision bytes of memory.
+        """,
+        'int',
+        None,
+        {}
+    ],
+    'sketch_tdigest_compression': [
+        100,
+        """
+        Compression of the energy value quantile summary for the "sketch" memory mode.
+        """,
+        'int',
+        None,
+        {}
+    ],
     # 'mirna_sort': [
     #     True,
     #     """
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+# Daniel Stribling  |  ORCID: 0000-0002-0649-9506
+# Renne Lab, University of Florida
+# Hybkit Project : https://www.github.com/RenneLab/hybkit
+
+"""
+Classes for approximate summaries of large numbers of values in fixed memory.
+
+Each summary uses memory set by its size parameter, independent of the number of
+values added, and reports bounds for the error of its estimates. Summaries of separate
+groups of values (such as in separate processes) can be combined with their
+``merge`` method, and converted to built-in types with ``get_state`` for pickling
+or serialization.
+
+    ========================= ======================================================
+    :class:`SpaceSaving`      Counts of the most frequent keys (Space-Saving)
+    :class:`HyperLogLog`      Count of distinct keys (HyperLogLog)
+    :class:`TDigest`          Quantiles of numeric values (merging t-digest)
+    ========================= ======================================================
+
+Example:
+    ::
+
+        top_names = hybkit.sketch.SpaceSaving(capacity=100)
+        for name in names:
+            top_names[name] += 1
+        top_names.most_common(10)  # Ten most frequent names, with estimated counts
+"""
+
+import hashlib
+import heapq
+import itertools
+import math
+from collections import Counter
+from typing import Any, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from hybkit.errors import HybkitArgError
+
+
+# --- Space-Saving Summary --- #
+class SpaceSaving:
+    """
+    Counts of the most frequent keys, using the Space-Saving algorithm.
+
+    At most ``capacity`` keys are tracked. When a new key is added to a full summary,
+    the tracked key with the lowest count is replaced, and the new key inherits
+    that count as its error. Estimated counts are never lower than the true count,
+    and exceed it by at most the error of the key (:meth:`get_error`), which is
+    at most :attr:`max_error`. Any key with a true count greater than :attr:`max_error`
+    is always tracked. If fewer than ``capacity`` distinct keys are added, all counts
+    are exact.
+
+    Keys are added with :meth:`add`, or with the ``+=`` operator as with a
+    :class:`~collections.Counter` (``summary[key] += count``).
+
+    Args:
+        capacity (:obj:`int`, optional): Maximum number of keys to track.
+
+    Attributes:
+        capacity (:obj:`int`): Maximum number of keys to track.
+        total (:obj:`int`): Total of all counts added.
+        max_error (:obj:`int`): Upper bound on the true count of any untracked key,
+            and on the overestimate of the count of any tracked key.
+    """
+
+    # Start SpaceSaving Public Methods
+    # SpaceSaving : Public Methods
+    def __init__(self, capacity: int = 1000) -> None:
+        """Describe in class docstring."""
+        if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity < 1:
+            message = 'SpaceSaving capacity must be an integer >= 1, not: %s' % str(capacity)
+            raise HybkitArgError(message)
+        self.capacity = capacity
+        self.total = 0
+        self.max_error = 0
+        self._counts = {}
+        self._errors = {}
+        self._heap = []
+        self._heap_order = itertools.count()
+
+    # SpaceSaving : Public Methods
+    def add(self, key: Hashable, count: int = 1) -> None:
+        """
+        Add a count for a key.
+
+        Args:
+            key (:obj:`~typing.Hashable`): Key to count.
+            count (:obj:`int`, optional): Count to add (must be >= 0).
+        """
+        if count < 0:
+            message = 'SpaceSaving counts can only be increased, not by: %s' % str(count)
+            raise HybkitArgError(message)
+        self.total += count
+        if key in self._counts:
+            if count:
+                self._counts[key] += count
+                self._push(key)
+            return
+        if len(self._counts) < self.capacity:
+            self._counts[key] = count
+            self._errors[key] = 0
+        elif not count:
+            return
+        else:
+            min_key = self._get_min_key()
+            min_count = self._counts.pop(min_key)
+            del self._errors[min_key]
+            self.max_error = max(self.max_error, min_count)
+            self._counts[key] = min_count + count
+            self._errors[key] = min_count
+        self._push(key)
+
+    # SpaceSaving : Public Methods
+    def get_error(self, key: Hashable) -> int:
+        """
+        Return the maximum overestimate of the count of a key.
+
+        Args:
+            key (:obj:`~typing.Hashable`): Key to return the error for.
+
+        Returns:
+            int: Error of the key if tracked, else :attr:`max_error`.
+        """
+        return self._errors.get(key, self.max_error)
+
+    # SpaceSaving : Public Methods
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        Return tracked keys and estimated counts, from most to least common.
+
+        Args:
+            n (:obj:`int`, optional): Number of keys to return. If None, return all.
+
+        Returns:
+            list: List of (key, estimated count) tuples.
+        """
+        return Counter(self._counts).most_common(n)
+
+    # SpaceSaving : Public Methods
+    def merge(self, other: 'SpaceSaving') -> None:
+        """
+        Add the counts of another summary to this summary.
+
+        Keys missing from either summary are estimated with that summary's
+        :attr:`max_error`, and the ``capacity`` most common keys are retained.
+
+        Args:
+            other (:class:`SpaceSaving`): Summary to add to this summary.
+        """
+        if not isinstance(other, SpaceSaving):
+            message = 'Object to merge: "%s" is not a SpaceSaving object.' % str(other)
+            raise HybkitArgError(message)
+        merged_counts = {}
+        merged_errors = {}
+        for key in itertools.chain(self._counts, other._counts):
+            if key not in merged_counts:
+                merged_counts[key] = (
+                    self._counts.get(key, self.max_error) + other._counts.get(key, other.max_error)
+                )
+                merged_errors[key] = self.get_error(key) + other.get_error(key)
+        max_error = self.max_error + other.max_error
+        keep_counts = Counter(merged_counts).most_common(self.capacity)
+        if len(keep_counts) < len(merged_counts):
+            max_error = max(max_error, keep_counts[-1][1])
+        self.total += other.total
+        self.max_error = max_error
+        self._counts = dict(keep_counts)
+        self._errors = {key: merged_errors[key] for key in self._counts}
+        self._rebuild_heap()
+
+    # SpaceSaving : Public Methods
+    def to_counter(self) -> Counter:
+        """
+        Return the tracked keys and estimated counts as a :class:`~collections.Counter`.
+
+        Keys are inserted from most to least common.
+        """
+        return Counter(dict(self.most_common()))
+
+    # SpaceSaving : Public Methods : State
+    def get_state(self) -> dict:
+        """Return the summary as a dictionary of built-in types."""
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'max_error': self.max_error,
+            'items': [[key, count, self._errors[key]] for key, count in self._counts.items()],
+        }
+
+    # SpaceSaving : Public Methods : State
+    @classmethod
+    def from_state(cls, state: dict) -> 'SpaceSaving':
+        """Create a summary from a state returned by :meth:`get_state`."""
+        summary = cls(state['capacity'])
+        summary.total = state['total']
+        summary.max_error = state['max_error']
+        for key, count, error in state['items']:
+            summary._counts[key] = count
+            summary._errors[key] = error
+        summary._rebuild_heap()
+        return summary
+
+    # SpaceSaving : Public Methods : Container Methods
+    def __getitem__(self, key: Hashable) -> int:
+        """Return the estimated count of a key (0 if untracked)."""
+        return self._counts.get(key, 0)
+
+    # SpaceSaving : Public Methods : Container Methods
+    def __setitem__(self, key: Hashable, value: int) -> None:
+        """Set the count of a key, by adding the difference from the estimated count."""
+        self.add(key, value - self[key])
+
+    # SpaceSaving : Public Methods : Container Methods
+    def __contains__(self, key: Hashable) -> bool:
+        """Return whether a key is tracked."""
+        return key in self._counts
+
+    # SpaceSaving : Public Methods : Container Methods
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._counts)
+
+    # Start SpaceSaving Private Methods
+    # SpaceSaving : Private Methods
+    def _push(self, key: Hashable) -> None:
+        # Heap entries are not removed when counts increase, so the heap is rebuilt
+        # when outdated entries exceed the number of tracked keys.
+        heapq.heappush(self._heap, (self._counts[key], next(self._heap_order), key))
+        if len(self._heap) > 2 * self.capacity + 16:
+            self._rebuild_heap()
+
+    # SpaceSaving : Private Methods
+    def _rebuild_heap(self) -> None:
+        self._heap = [
+            (count, next(self._heap_order), key) for key, count in self._counts.items()
+        ]
+        heapq.heapify(self._heap)
+
+    # SpaceSaving : Private Methods
+    def _get_min_key(self) -> Hashable:
+        # Return the tracked key with the lowest count (and earliest entry for ties).
+        while True:
+            count, _order, key = heapq.heappop(self._heap)
+            if self._counts.get(key) == count:
+                return key
+
+
+# --- HyperLogLog Summary --- #
+class HyperLogLog:
+    """
+    Estimated count of distinct keys, using the HyperLogLog algorithm.
+
+    Keys are hashed to one of ``2 ** precision`` one-byte registers, so memory is
+    fixed by ``precision``. Keys are converted to strings before hashing, with a
+    hash that is consistent between processes. The relative standard error of the
+    estimate is approximately :attr:`relative_error` (``1.04 / sqrt(2 ** precision)``).
+
+    Args:
+        precision (:obj:`int`, optional): Number of hash bits used to select a register
+            (4 - 18).
+
+    Attributes:
+        precision (:obj:`int`): Number of hash bits used to select a register.
+    """
+
+    # Start HyperLogLog Public Methods
+    # HyperLogLog : Public Methods
+    def __init__(self, precision: int = 14) -> None:
+        """Describe in class docstring."""
+        if not isinstance(precision, int) or not (4 <= precision <= 18):  # noqa: PLR2004
+            message = 'HyperLogLog precision must be an integer from 4 to 18, '
+            message += 'not: %s' % str(precision)
+            raise HybkitArgError(message)
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+        self._rank_bits = 64 - precision
+
+    # HyperLogLog : Public Methods
+    def add(self, key: Any) -> None:  # noqa: ANN401
+        """
+        Add a key.
+
+        Args:
+            key: Key to add.
+        """
+        hash_val = int.from_bytes(
+            hashlib.blake2b(str(key).encode(), digest_size=8).digest(), 'big'
+        )
+        register = hash_val >> self._rank_bits
+        rank = self._rank_bits - (hash_val & ((1 << self._rank_bits) - 1)).bit_length() + 1
+        if rank > self._registers[register]:
+            self._registers[register] = rank
+
+    # HyperLogLog : Public Methods
+    def update(self, keys: Iterable[Any]) -> None:
+        """
+        Add multiple keys.
+
+        Args:
+            keys (:obj:`~typing.Iterable`): Keys to add.
+        """
+        for key in keys:
+            self.add(key)
+
+    # HyperLogLog : Public Methods
+    def estimate(self) -> float:
+        """Return the estimated count of distinct keys."""
+        registers = np.frombuffer(self._registers, dtype=np.uint8)
+        num_registers = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / num_registers)
+        estimate = alpha * num_registers ** 2 / np.ldexp(1.0, -registers.astype(int)).sum()
+        num_zero = num_registers - np.count_nonzero(registers)
+        # Use linear counting for small cardinalities.
+        if estimate <= 2.5 * num_registers and num_zero:
+            estimate = num_registers * math.log(num_registers / num_zero)
+        return float(estimate)
+
+    # HyperLogLog : Public Methods
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of :meth:`estimate`."""
+        return 1.04 / math.sqrt(len(self._registers))
+
+    # HyperLogLog : Public Methods
+    def merge(self, other: 'HyperLogLog') -> None:
+        """
+        Add the keys of another summary to this summary.
+
+        Args:
+            other (:class:`HyperLogLog`): Summary with the same precision to add.
+        """
+        if not isinstance(other, HyperLogLog) or other.precision != self.precision:
+            message = 'Object to merge: "%s" is not a HyperLogLog object ' % str(other)
+            message += 'with precision: %i' % self.precision
+            raise HybkitArgError(message)
+        self._registers = bytearray(np.maximum(
+            np.frombuffer(self._registers, dtype=np.uint8),
+            np.frombuffer(other._registers, dtype=np.uint8),
+        ).tobytes())
+
+    # HyperLogLog : Public Methods : State
+    def get_state(self) -> dict:
+        """Return the summary as a dictionary of built-in types."""
+        return {'precision': self.precision, 'registers': self._registers.hex()}
+
+    # HyperLogLog : Public Methods : State
+    @classmethod
+    def from_state(cls, state: dict) -> 'HyperLogLog':
+        """Create a summary from a state returned by :meth:`get_state`."""
+        summary = cls(state['precision'])
+        summary._registers = bytearray.fromhex(state['registers'])
+        return summary
+
+
+# --- t-digest Summary --- #
+class TDigest:
+    """
+    Estimated quantiles of numeric values, using a merging t-digest.
+
+    Values are summarized as weighted centroids, which are smallest near the minimum
+    and maximum values so that extreme quantiles are the most accurate. The number of
+    centroids is limited by ``compression`` (to approximately ``compression * pi / 2``),
+    so memory is fixed. Quantiles are interpolated between centroids, and
+    :meth:`get_rank_error` reports the proportion of values held by the centroids used,
+    which bounds the difference between the requested and actual quantile of the
+    estimate.
+
+    Args:
+        compression (:obj:`int`, optional): Compression parameter (>= 10).
+            Higher values use more memory for more accurate quantiles.
+
+    Attributes:
+        compression (:obj:`int`): Compression parameter.
+        count (:obj:`int`): Number of values added.
+        min (:obj:`float`): Minimum value added.
+        max (:obj:`float`): Maximum value added.
+    """
+
+    # Start TDigest Public Methods
+    # TDigest : Public Methods
+    def __init__(self, compression: int = 100) -> None:
+        """Describe in class docstring."""
+        if not isinstance(compression, int) or compression < 10:  # noqa: PLR2004
+            message = 'TDigest compression must be an integer >= 10, not: %s' % str(compression)
+            raise HybkitArgError(message)
+        self.compression = compression
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._means = np.zeros(0)
+        self._weights = np.zeros(0)
+        self._buffer = []
+        self._buffer_size = 10 * compression
+
+    # TDigest : Public Methods
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value (:obj:`float`): Value to add.
+        """
+        self._buffer.append(value)
+        if len(self._buffer) >= self._buffer_size:
+            self._flush()
+
+    # TDigest : Public Methods
+    def update(self, values: Iterable[float]) -> None:
+        """
+        Add multiple values.
+
+        Args:
+            values (:obj:`~typing.Iterable` or :obj:`numpy.ndarray`): Values to add.
+        """
+        self._buffer.extend(values)
+        if len(self._buffer) >= self._buffer_size:
+            self._flush()
+
+    # TDigest : Public Methods
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return the estimated value at a quantile.
+
+        Args:
+            q (:obj:`float`): Quantile (0.0 - 1.0).
+
+        Returns:
+            float: Estimated value, or None if no values have been added.
+        """
+        self._check_quantile(q)
+        self._flush()
+        if not self.count:
+            return None
+        centers = np.cumsum(self._weights) - self._weights / 2
+        return float(np.interp(
+            q * self.count,
+            np.concatenate(([0.0], centers, [self.count])),
+            np.concatenate(([self.min], self._means, [self.max])),
+        ))
+
+    # TDigest : Public Methods
+    def get_rank_error(self, q: float) -> Optional[float]:
+        """
+        Return the bound on the rank error of the estimated value at a quantile.
+
+        This is the proportion of all values held by the centroid(s) that the
+        estimate is interpolated between.
+
+        Args:
+            q (:obj:`float`): Quantile (0.0 - 1.0).
+
+        Returns:
+            float: Rank error bound (0.0 - 1.0), or None if no values have been added.
+        """
+        self._check_quantile(q)
+        self._flush()
+        if not self.count:
+            return None
+        centers = np.cumsum(self._weights) - self._weights / 2
+        index = int(np.searchsorted(centers, q * self.count))
+        weight = self._weights[max(index - 1, 0):index + 1].sum()
+        return float(weight / self.count)
+
+    # TDigest : Public Methods
+    def merge(self, other: 'TDigest') -> None:
+        """
+        Add the values of another summary to this summary.
+
+        Args:
+            other (:class:`TDigest`): Summary to add to this summary.
+        """
+        if not isinstance(other, TDigest):
+            message = 'Object to merge: "%s" is not a TDigest object.' % str(other)
+            raise HybkitArgError(message)
+        other._flush()
+        if other.count:
+            self._flush(other._means, other._weights, other.min, other.max)
+
+    # TDigest : Public Methods
+    def __len__(self) -> int:
+        """Return the number of centroids (after adding any buffered values)."""
+        self._flush()
+        return len(self._means)
+
+    # TDigest : Public Methods : State
+    def get_state(self) -> dict:
+        """Return the summary as a dictionary of built-in types."""
+        self._flush()
+        return {
+            'compression': self.compression,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'means': self._means.tolist(),
+            'weights': self._weights.tolist(),
+        }
+
+    # TDigest : Public Methods : State
+    @classmethod
+    def from_state(cls, state: dict) -> 'TDigest':
+        """Create a summary from a state returned by :meth:`get_state`."""
+        summary = cls(state['compression'])
+        summary.count = state['count']
+        summary.min = state['min']
+        summary.max = state['max']
+        summary._means = np.array(state['means'], dtype=float)
+        summary._weights = np.array(state['weights'], dtype=float)
+        return summary
+
+    # Start TDigest Private Methods
+    # TDigest : Private Methods
+    @staticmethod
+    def _check_quantile(q: float) -> None:
+        if not (0.0 <= q <= 1.0):
+            message = 'Quantile must be from 0.0 to 1.0, not: %s' % str(q)
+            raise HybkitArgError(message)
+
+    # TDigest : Private Methods
+    def _flush(
+            self,
+            add_means: Optional['np.ndarray'] = None,
+            add_weights: Optional['np.ndarray'] = None,
+            add_min: Optional[float] = None,
+            add_max: Optional[float] = None,
+            ) -> None:
+        # Merge buffered values (and any provided centroids) into the centroids.
+        if self._buffer:
+            add_means = np.array(self._buffer, dtype=float)
+            add_weights = np.ones(len(add_means))
+            add_min = float(add_means.min())
+            add_max = float(add_means.max())
+            self._buffer = []
+        elif add_means is None:
+            return
+        self.min = add_min if self.min is None else min(self.min, add_min)
+        self.max = add_max if self.max is None else max(self.max, add_max)
+        means = np.concatenate((self._means, add_means))
+        weights = np.concatenate((self._weights, add_weights))
+        order = np.argsort(means, kind='stable')
+        self._compress(means[order].tolist(), weights[order].tolist())
+
+    # TDigest : Private Methods
+    def _compress(self, means: List[float], weights: List[float]) -> None:
+        # Combine sorted centroids while the combined centroid spans at most one unit
+        # of the k1 scale function: k(q) = compression / (2 * pi) * asin(2q - 1).
+        total = sum(weights)
+        scale = self.compression / (2 * math.pi)
+        new_means = []
+        new_weights = []
+        weight_before = 0.0
+        cur_mean = means[0]
+        cur_weight = weights[0]
+        q_limit = self._get_q_limit(0.0, scale)
+        for mean, weight in zip(means[1:], weights[1:]):
+            if (weight_before + cur_weight + weight) / total <= q_limit:
+                cur_weight += weight
+                cur_mean += (mean - cur_mean) * weight / cur_weight
+            else:
+                new_means.append(cur_mean)
+                new_weights.append(cur_weight)
+                weight_before += cur_weight
+                q_limit = self._get_q_limit(weight_before / total, scale)
+                cur_mean = mean
+                cur_weight = weight
+        new_means.append(cur_mean)
+        new_weights.append(cur_weight)
+        self._means = np.array(new_means)
+        self._weights = np.array(new_weights)
+        self.count = int(round(total))
+
+    # TDigest : Private Methods
+    @staticmethod
+    def _get_q_limit(q: float, scale: float) -> float:
+        k_limit = scale * math.asin(2 * min(q, 1.0) - 1) + 1
+        if k_limit >= scale * math.pi / 2:
+            return 1.0
+        return (math.sin(k_limit / scale) + 1) / 2
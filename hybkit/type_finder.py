@@ -7,12 +7,14 @@
 hybkit TypeFinder Class.
 
 This module contains the TypeFinder class to work with :class:`HybRecord` to
-parse sequence identifiers to identify sequence type.
+parse sequence identifiers to identify sequence type, and the StringMatcher class
+of compiled search parameters for the "string_match" method.
 """
 
+import collections
 import os
 import types
-from typing import Any, Callable, Dict, List, NoReturn, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, NoReturn, Optional, Tuple, Union
 
 from hybkit.errors import HybkitArgError, HybkitMiscError
 
@@ -47,6 +49,12 @@ class TypeFinder:
     #:   Default method assigned using :meth:`check_set_method`
     default_method = 'hybformat'
 
+    # TypeFinder : Public Attributes
+    #: Maximum number of segment types to cache by segment ``ref_name``
+    #: (see :meth:`cache_info`). Set to 0 to disable caching.
+    #: Changes are applied when the cache is next cleared.
+    cache_size = 100000
+
     # TypeFinder : Public Methods : Flag_Info : find_seg_type
     #:   Dict of provided methods available to assign segment types
     #:
@@ -89,6 +97,12 @@ class TypeFinder:
         'id_map': True,
     }
 
+    # TypeFinder : Private Attributes : Cache
+    # Least-recently-used cache of {ref_name: seg_type}, or None if caching is disabled.
+    _cache = None
+    _cache_hits = 0
+    _cache_misses = 0
+
     # TypeFinder : Public Methods : Initialization
     # STUB, class is designed to be used with class-level functions.
     def __init__(self) -> NoReturn:
@@ -122,7 +136,11 @@ class TypeFinder:
             use_params = params
         else:
             use_params = {}
+        if method == 'string_match' and not isinstance(use_params, StringMatcher):
+            use_params = StringMatcher(use_params)
         cls.params = use_params
+        # Included methods only use the segment "ref_name", so results can be cached.
+        cls.clear_cache(enable=True)
 
     # TypeFinder : Public Classmethods : method
     @classmethod
@@ -156,6 +174,9 @@ class TypeFinder:
 
             seg_type = :meth:`TypeFinder.find_custom_method`(seg_props, :attr`TypeFinder.params`)
 
+        Results are cached by segment ``ref_name`` when caching is enabled
+        (see :meth:`cache_info`).
+
         Args:
             seg_props (dict): :obj:`seg_props` from :class:`hybkit.HybRecord`
 
@@ -165,14 +186,70 @@ class TypeFinder:
         if cls.find_with_params is None:
             message = 'TypeFinder method has not been set.'
             raise RuntimeError(message)
-        return cls.find_with_params(seg_props, cls.params)
+        cache = cls._cache
+        if cache is None:
+            return cls.find_with_params(seg_props, cls.params)
+        ref_name = seg_props['ref_name']
+        if ref_name in cache:
+            cls._cache_hits += 1
+            cache.move_to_end(ref_name)
+            return cache[ref_name]
+        cls._cache_misses += 1
+        seg_type = cls.find_with_params(seg_props, cls.params)
+        cache[ref_name] = seg_type
+        if len(cache) > cls.cache_size:
+            cache.popitem(last=False)
+        return seg_type
+
+    # TypeFinder : Public Classmethods : cache
+    @classmethod
+    def cache_info(cls) -> Dict[str, Any]:
+        """
+        Return statistics for the cache of segment types found with :meth:`find`.
+
+        Segment types are cached by segment ``ref_name`` for the methods in
+        :attr:`methods`, up to :attr:`cache_size` entries (discarding the least-recently
+        used entries). The cache is cleared when the method or parameters are changed
+        with :meth:`set_method` or :meth:`set_custom_method`.
+
+        Returns:
+            dict: Dict with keys: "enabled", "hits", "misses", "size", and "max_size".
+        """
+        return {
+            'enabled': cls._cache is not None,
+            'hits': cls._cache_hits,
+            'misses': cls._cache_misses,
+            'size': len(cls._cache) if cls._cache is not None else 0,
+            'max_size': cls.cache_size,
+        }
+
+    # TypeFinder : Public Classmethods : cache
+    @classmethod
+    def clear_cache(cls, enable: Optional[bool] = None) -> None:
+        """
+        Clear the cache of segment types found with :meth:`find`, and reset statistics.
+
+        Args:
+            enable (:obj:`bool`, optional): If provided, enable or disable caching.
+                Otherwise caching remains enabled if currently enabled.
+                Caching is also disabled if :attr:`cache_size` is 0.
+        """
+        if enable is None:
+            enable = cls._cache is not None
+        if enable and cls.cache_size > 0:
+            cls._cache = collections.OrderedDict()
+        else:
+            cls._cache = None
+        cls._cache_hits = 0
+        cls._cache_misses = 0
 
     # TypeFinder : Public Classmethods : method
     @classmethod
     def set_custom_method(
             cls,
             method: Callable,
-            params: Optional[dict] = None
+            params: Optional[dict] = None,
+            cache: bool = False,
             ) -> None:
         """
         Set the method for use to find seg types.
@@ -191,12 +268,16 @@ class TypeFinder:
         Args:
             method (method): Method to set for use.
             params (dict, optional): dict of custom parameters to set for use.
+            cache (:obj:`bool`, optional): Cache found types by segment ``ref_name``
+                (see :meth:`cache_info`). Only use if the custom method
+                depends only on the ``ref_name`` segment property.
         """
         cls.find_with_params = types.MethodType(method, cls)
         if params is not None:
             cls.params = params
         else:
             cls.params = {}
+        cls.clear_cache(enable=cache)
 
     # TypeFinder : Public Staticmethods : find_seg_type
     @staticmethod
@@ -265,6 +346,10 @@ class TypeFinder:
             endswith,_miR,microRNA
             endswith,_trans,mRNA
 
+        If params is a compiled :class:`StringMatcher` (as returned by
+        :meth:`make_string_match_params`, or set by :meth:`set_method`), the search
+        is performed with its compiled search structures.
+
         Args:
             seg_props (dict): :class:`~hybkit.HybRecord` segment properties dict
                 to evaluate.
@@ -274,6 +359,8 @@ class TypeFinder:
             message = 'method_string_match requires params, but none were provided.'
             raise HybkitArgError(message)
         seg_name = seg_props['ref_name']
+        if isinstance(params, StringMatcher):
+            return params.find(seg_name)
         found_type = None
         if 'startswith' in params and not found_type:
             for search_string, search_type in params['startswith']:
@@ -300,9 +387,9 @@ class TypeFinder:
 
     # TypeFinder : Public Staticmethods : find_seg_type
     @staticmethod
-    def make_string_match_params(legend_file: str) -> dict:
+    def make_string_match_params(legend_file: str) -> 'StringMatcher':
         """
-        Read csv and return a dict of search parameters for :meth:`method_string_match`.
+        Read csv and return a compiled :class:`StringMatcher` for :meth:`method_string_match`.
 
         The my_legend.csv file should have the format::
 
@@ -320,6 +407,8 @@ class TypeFinder:
             {'endswith': [('_miR', 'microRNA'),
                           ('_trans', 'mRNA')   ]}
 
+        This dict is returned as a :class:`StringMatcher`, which compiles
+        the search parameters for faster searching.
         """
         allowed_search_types = {'startswith', 'contains', 'endswith', 'matches'}
         return_dict = {}
@@ -357,7 +446,7 @@ class TypeFinder:
 
                 return_dict[search_type].append((search_string, seg_type))
 
-        return return_dict
+        return StringMatcher(return_dict)
 
     # TypeFinder : Public Methods : Flag_Info : find_seg_type
     @staticmethod
@@ -469,3 +558,144 @@ class TypeFinder:
         """
         cls.find_with_params = None
         cls.params = None
+        cls.clear_cache(enable=False)
+
+
+# ----- Begin StringMatcher Class ----- #
+class StringMatcher(dict):
+    """
+    Compiled search parameters for :meth:`TypeFinder.method_string_match`.
+
+    This dict contains the same search parameters as provided, with keys
+    of search types and values of lists of (``search_string``, ``seg_type``) tuples.
+    On initialization, search strings are compiled into a prefix trie ("startswith"),
+    a trie of reversed strings ("endswith"), an Aho-Corasick automaton ("contains"),
+    and a dict ("matches"). Each lookup then examines each character of the identifier
+    at most once per search type, rather than testing each search string in turn.
+
+    As with the linear search, search types are checked in the order:
+    "startswith", "contains", "endswith", "matches";
+    and within a search type, the first listed search string that matches is used.
+    Search parameters are compiled on initialization, so changes to the dict contents
+    after initialization are not used.
+
+    Args:
+        params (dict): Dict of search parameters, as described in
+            :meth:`TypeFinder.method_string_match`.
+    """
+
+    #: Search types, in order of precedence.
+    search_types = ('startswith', 'contains', 'endswith', 'matches')
+
+    # StringMatcher : Public Methods : Initialization
+    def __init__(self, params: Optional[Dict[str, List[Tuple[str, str]]]] = None) -> None:
+        """Describe in class docstring."""
+        super().__init__(params if params is not None else {})
+        self._prefix_trie = self._make_trie(self.get('startswith', []))
+        self._suffix_trie = self._make_trie(self.get('endswith', []), reverse=True)
+        self._contains_automaton = self._make_automaton(self.get('contains', []))
+        self._matches = {}
+        for search_string, seg_type in self.get('matches', []):
+            self._matches.setdefault(search_string, seg_type)
+
+    # StringMatcher : Public Methods : Search
+    def find(self, seg_name: str) -> Optional[str]:
+        """
+        Return the segment type of the first matching search string, or None if not found.
+
+        Args:
+            seg_name (str): Segment identifier to search.
+
+        Returns:
+            str: Identified segment type, or None if no search string matches.
+        """
+        found = self._search_trie(self._prefix_trie, seg_name)
+        if found is None:
+            found = self._search_automaton(seg_name)
+        if found is None:
+            found = self._search_trie(self._suffix_trie, reversed(seg_name))
+        if found is None:
+            return self._matches.get(seg_name)
+        return found[1]
+
+    # StringMatcher : Public Methods : Pickling
+    def __reduce__(self) -> tuple:
+        """Recompile the search structures after unpickling."""
+        return (self.__class__, (dict(self),))
+
+    # Trie nodes are dicts of {char: child_node}, with the first-listed (index, seg_type)
+    #   pair of search strings ending at the node stored with the key: None.
+    # StringMatcher : Private Staticmethods : Compilation
+    @staticmethod
+    def _make_trie(search_pairs: List[Tuple[str, str]], reverse: bool = False) -> dict:
+        root = {}
+        for index, (search_string, seg_type) in enumerate(search_pairs):
+            node = root
+            for char in (reversed(search_string) if reverse else search_string):
+                node = node.setdefault(char, {})
+            node.setdefault(None, (index, seg_type))
+        return root
+
+    # StringMatcher : Private Staticmethods : Search
+    @staticmethod
+    def _search_trie(root: dict, chars: Iterable[str]) -> Optional[Tuple[int, str]]:
+        # Return the first-listed (index, seg_type) of all search strings along the path.
+        found = root.get(None)
+        node = root
+        for char in chars:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node and (found is None or node[None][0] < found[0]):
+                found = node[None]
+        return found
+
+    # StringMatcher : Private Staticmethods : Compilation
+    @staticmethod
+    def _make_automaton(search_pairs: List[Tuple[str, str]]) -> Tuple[list, list, list]:
+        # Aho-Corasick automaton, as lists indexed by state of:
+        #   goto dicts of {char: state}, failure states, and first-listed (index, seg_type)
+        #   of all search strings ending at the state (including by failure links).
+        goto = [{}]
+        output = [None]
+        for index, (search_string, seg_type) in enumerate(search_pairs):
+            state = 0
+            for char in search_string:
+                if char not in goto[state]:
+                    goto.append({})
+                    output.append(None)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            if output[state] is None:
+                output[state] = (index, seg_type)
+        fail = [0] * len(goto)
+        queue = collections.deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fail_state = fail[state]
+                while fail_state and char not in goto[fail_state]:
+                    fail_state = fail[fail_state]
+                fail[next_state] = goto[fail_state].get(char, 0)
+                fail_output = output[fail[next_state]]
+                if fail_output is not None and (
+                        output[next_state] is None or fail_output[0] < output[next_state][0]):
+                    output[next_state] = fail_output
+        return goto, fail, output
+
+    # StringMatcher : Private Methods : Search
+    def _search_automaton(self, seg_name: str) -> Optional[Tuple[int, str]]:
+        goto, fail, output = self._contains_automaton
+        found = output[0]
+        state = 0
+        for char in seg_name:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            state_output = output[state]
+            if state_output is not None and (found is None or state_output[0] < found[0]):
+                found = state_output
+                if not found[0]:
+                    break
+        return found
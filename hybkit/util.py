@@ -12,7 +12,7 @@ import sys
 import textwrap
 from typing import Any, List, Optional, Union
 
-from hybkit import settings, type_finder
+from hybkit import compression, settings, type_finder
 from hybkit.__about__ import (
     __author__,
     __contact__,
@@ -70,6 +70,16 @@ def _bool_from_string(value: Optional[Union[str, bool]]) -> bool:
     else:
         raise argparse.ArgumentTypeError('Boolean value expected. Provided: %s' % value)
 
+# Util : Argparse Helper Functions
+def _positive_int(value: Union[str, int]) -> int:
+    try:
+        int_value = int(value)
+    except ValueError:
+        int_value = 0
+    if int_value < 1:
+        raise argparse.ArgumentTypeError('Positive integer expected. Provided: %s' % value)
+    return int_value
+
 _custom_types = {
     'custom_bool_from_str': _bool_from_string,
     'str': str,
@@ -260,6 +270,10 @@ def make_out_file_name(
     """
     Given an input file name, generate an output file name.
 
+    If the input file name has a compression suffix (such as ``.gz``,
+    see :data:`hybkit.settings.COMPRESSION_SUFFIXES`) and an ``out_suffix`` is provided,
+    the same compression suffix is added to the output file name.
+
     Args:
         in_file_name (str): Name of input file as template.
         name_suffix (str): Suffix to add to name before file type.
@@ -273,6 +287,9 @@ def make_out_file_name(
     """
     # Normalize the file path
     in_file_basename = os.path.basename(in_file_name)
+    in_file_basename, compression_suffix, _ = compression.split_compression_suffix(
+        in_file_basename
+    )
     if in_suffix and in_file_basename.lower().endswith(in_suffix.lower()):
         suffix_len = len(in_suffix)
         in_file_basename = in_file_basename[:(-1 * suffix_len)]
@@ -280,6 +297,8 @@ def make_out_file_name(
     full_name_suffix = name_suffix
     if out_suffix and not full_name_suffix.lower().endswith(out_suffix.lower()):
         full_name_suffix += out_suffix
+    if out_suffix:
+        full_name_suffix += compression_suffix
     if seg_sep and full_name_suffix and not full_name_suffix.startswith(seg_sep):
         full_name_suffix = seg_sep + full_name_suffix
 
@@ -397,7 +416,8 @@ in_hybs_parser = argparse.ArgumentParser(add_help=False)
 _this_arg_help = (
     """
     REQUIRED path to one or more hyb-format files with a ".hyb" suffix for use
-    in the evaluation.
+    in the evaluation. Compressed files with an added ".gz", ".bgz",
+    or ".zst" suffix are decompressed automatically.
     """
 )
 in_hybs_parser.add_argument(
@@ -413,7 +433,8 @@ in_folds_parser = argparse.ArgumentParser(add_help=False)
 _this_arg_help = (
     """
     REQUIRED path to one or more RNA secondary-structure files with a
-    ".vienna" or ".ct" suffix for use in the evaluation.
+    ".vienna" or ".ct" suffix for use in the evaluation. Compressed files with
+    an added ".gz", ".bgz", or ".zst" suffix are decompressed automatically.
     """
 )
 in_folds_parser.add_argument(
@@ -430,9 +451,11 @@ out_hybs_parser = argparse.ArgumentParser(add_help=False)
 _this_arg_help = (
     """
     Optional path to one or more hyb-format file for
-    output (should include a ".hyb" suffix).
+    output (should include a ".hyb" suffix, with an added ".gz", ".bgz",
+    or ".zst" suffix for compressed output).
     If not provided, the output for input file "PATH_TO/MY_FILE.HYB"
-    will be used as a template for the output "OUT_DIR/MY_FILE_OUT.HYB".
+    will be used as a template for the output "OUT_DIR/MY_FILE_OUT.HYB"
+    (compressed if the input file is compressed).
     """
 )
 out_hybs_parser.add_argument(
@@ -645,6 +668,36 @@ record_manip_parser.add_argument(
     help=_this_arg_help
 )
 
+# Start Parallel Options
+# Argument Parser : Parallel Processing Options
+parallel_parser = argparse.ArgumentParser(add_help=False)
+parallel_group = parallel_parser.add_argument_group('Parallel Processing Options')
+_this_arg_help = (
+    """
+    Number of worker processes to use. With values greater than 1, input files
+    are split into chunks of records that are processed in parallel,
+    with output written in input order.
+    """
+)
+parallel_group.add_argument(
+    '--processes',
+    type=_positive_int,
+    default=1,
+    help=_this_arg_help
+)
+
+_this_arg_help = (
+    """
+    Number of records per chunk when processing with multiple worker processes.
+    """
+)
+parallel_group.add_argument(
+    '--chunk_size',
+    type=_positive_int,
+    default=10000,
+    help=_this_arg_help
+)
+
 # Start Class Settings Parsers
 # Argument Parser : Class Settings Parser
 _class_settings_groups = {}
@@ -867,8 +920,60 @@ for i in range(1, 4):
         help=_this_arg_help
     )
 
+_this_arg_help = (
+    """
+    Boolean filter expression. Records matching the expression will be included in output.
+    Combines filter types with AND, OR, NOT, and parentheses,
+    Ex: "has_mirna AND NOT (mirna_dimer OR any_seg_contains kshv)".
+    Filter types requiring an argument are followed by the argument, which may be quoted.
+    If provided with filter criteria, records must match both.
+    """
+)
+# Argument Parser : hyb_filter : where
+hyb_filter_parser.add_argument(
+    '--where',
+    # required=True,
+    metavar='EXPRESSION',
+    help=_this_arg_help
+)
+
+_this_arg_help = (
+    """
+    Reorder terms of the --where expression by estimated cost and selectivity,
+    so that cheaper and more decisive filters are checked first. Records missing an
+    evaluation required by any term of the expression then raise an error.
+    """
+)
+# Argument Parser : hyb_filter : where_optimize
+hyb_filter_parser.add_argument(
+    '--where_optimize',
+    type=_bool_from_string,
+    default=True,
+    choices=[True, False],
+    help=_this_arg_help
+)
+
+# Start analyze
+# Argument Parser : combined_basename
+combined_basename_parser = argparse.ArgumentParser(add_help=False)
+_this_arg_help = (
+    """
+    Optional path to the basename prefix to use for output of the results
+    combined across all input files, written when more than one input file is provided.
+    If not provided, the basename "OUT_DIR/combined" is used (with the output suffix added).
+    """
+)
+combined_basename_parser.add_argument(
+    '--combined_basename', type=out_path_exists,
+    metavar='PATH_TO/OUT_BASENAME',
+    help=_this_arg_help
+)
+
 # Argument Parser : hyb_fold_analyze
-hyb_analyze_parser = argparse.ArgumentParser(add_help=False)
+hyb_analyze_parser = argparse.ArgumentParser(
+    add_help=False,
+    parents=[combined_basename_parser],
+)
 _this_arg_help = (
     """
     Analysis to perform on input hyb and fold files.
@@ -884,6 +989,76 @@ hyb_analyze_parser.add_argument(
     help=_this_arg_help
 )
 
+# Start pipeline
+# Argument Parser : hyb_pipeline
+hyb_pipeline_parser = argparse.ArgumentParser(
+    add_help=False,
+    parents=[combined_basename_parser],
+)
+_this_arg_help = (
+    """
+    Analyses to perform on the evaluated (and filtered) records.
+    If not provided, no analysis is performed.
+    """
+)
+hyb_pipeline_parser.add_argument(
+    '-a', '--analysis_types',
+    # required=True,
+    nargs='*',
+    default=[],
+    action='store',
+    choices=copy.deepcopy(settings.ANALYSIS_TYPE_OPTIONS),
+    help=_this_arg_help
+)
+
+# Argument Parser : hyb_pipeline : write_evaluated
+_this_arg_help = (
+    """
+    Write evaluated records (before filtering) to output hyb (/fold) files,
+    named as by hyb_eval.
+    """
+)
+hyb_pipeline_parser.add_argument(
+    '--write_evaluated',
+    type=_bool_from_string,
+    default=False,
+    choices=[True, False],
+    help=_this_arg_help
+)
+
+# Argument Parser : hyb_pipeline : write_filtered
+_this_arg_help = (
+    """
+    Write evaluated and filtered records to output hyb (/fold) files,
+    named as by hyb_eval followed by hyb_filter.
+    Ignored if no filter criteria are provided.
+    """
+)
+hyb_pipeline_parser.add_argument(
+    '--write_filtered',
+    type=_bool_from_string,
+    default=True,
+    choices=[True, False],
+    help=_this_arg_help
+)
+
+# Start index
+# Argument Parser : hyb_index
+hyb_index_parser = argparse.ArgumentParser(add_help=False)
+_this_arg_help = (
+    """
+    Optional path to one or more index files for output.
+    If not provided, the index for input file "PATH_TO/MY_FILE.HYB"
+    is written to "PATH_TO/MY_FILE.HYB.HKI".
+    """
+)
+hyb_index_parser.add_argument(
+    '-o', '--out_index', type=out_path_exists,
+    metavar='PATH_TO/OUT_FILE.HYB.HKI',
+    nargs='+',
+    help=_this_arg_help
+)
+
 # Start  all_analyze
 # Argument Parser : all_analyze : analysis_name
 all_analyze_parser = argparse.ArgumentParser(add_help=False)